@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks reading a Main dataset one position at a time and one spectroscopic slice at a time for the chunk
+layouts recommended by pycroscopy.io.chunking.plan_chunks() for each access profile, compared against a contiguous
+dataset. Each chunked layout is read with the default chunk cache of HDF5 and with the recommended chunk cache.
+
+Usage: python benchmarks/bench_chunk_layout.py [number of positions] [number of spectroscopic values]
+
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+import os
+import sys
+import tempfile
+import time
+
+import h5py
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pycroscopy.io.chunking import ACCESS_PROFILES, plan_chunks
+
+num_samples = 64
+
+
+def time_reads(file_path, cache_bytes=None, cache_slots=None):
+    """
+    Returns the mean time in milliseconds to read a single position and a single spectroscopic slice.
+    Consecutive positions and slices are read, starting at random locations, as in a typical traversal
+    """
+    cache_kwargs = dict()
+    if cache_bytes is not None:
+        cache_kwargs = {'rdcc_nbytes': cache_bytes, 'rdcc_nslots': cache_slots}
+    durations = list()
+    with h5py.File(file_path, mode='r', **cache_kwargs) as h5_f:
+        h5_main = h5_f['Raw_Data']
+        for axis in range(2):
+            start = np.random.randint(0, max(1, h5_main.shape[axis] - num_samples))
+            stop = min(start + num_samples, h5_main.shape[axis])
+            t_start = time.time()
+            for index in range(start, stop):
+                _ = h5_main[index] if axis == 0 else h5_main[:, index]
+            durations.append(1E3 * (time.time() - t_start) / (stop - start))
+    return durations
+
+
+def main(num_pos=128 * 128, num_spec=1024):
+    data = np.random.rand(num_pos, num_spec).astype(np.float32)
+    print('Dataset of shape {} and size {:.1f} MB'.format(data.shape, data.nbytes / 1024 ** 2))
+    print('{:<12} {:>14} {:>14} {:>18} {:>18}'.format('Layout', 'Chunks', 'Cache (MB)', 'Position (ms)',
+                                                      'Slice (ms)'))
+    file_path = os.path.join(tempfile.mkdtemp(), 'bench_chunk_layout.h5')
+    try:
+        layouts = [('contiguous', None)] + [(access, plan_chunks(data.shape, data.dtype, access))
+                                            for access in ACCESS_PROFILES]
+        for name, plan in layouts:
+            with h5py.File(file_path, mode='w') as h5_f:
+                h5_f.create_dataset('Raw_Data', data=data, chunks=None if plan is None else plan.chunks)
+            if plan is None:
+                runs = [('-', time_reads(file_path))]
+            else:
+                runs = [('default', time_reads(file_path)),
+                        ('{:.1f}'.format(plan.cache_bytes / 1024 ** 2),
+                         time_reads(file_path, plan.cache_bytes, plan.cache_slots))]
+            chunk_desc = '-' if plan is None else str(plan.chunks)
+            for cache_desc, (pos_time, slice_time) in runs:
+                print('{:<12} {:>14} {:>14} {:>18.3f} {:>18.3f}'.format(name, chunk_desc, cache_desc, pos_time,
+                                                                        slice_time))
+            os.remove(file_path)
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        os.rmdir(os.path.dirname(file_path))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks the time taken to import pycroscopy and some of its commonly used parts in a fresh interpreter.
+
+Usage: python benchmarks/bench_import_time.py [number of repeats]
+
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+repo_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+statements = ['import numpy',
+              'import pycroscopy',
+              'import pycroscopy.io.translators',
+              'from pycroscopy.io.translators import IgorIBWTranslator',
+              'from pycroscopy.processing import fft',
+              'import pycroscopy as px; px.io.translators.all_translators',
+              'import pycroscopy as px; [getattr(px.processing, name) for name in px.processing.__all__]']
+
+
+def time_import(statement, num_repeats):
+    """
+    Returns the wall time in seconds for executing the statement in a fresh interpreter, for each repeat
+    """
+    durations = list()
+    for _ in range(num_repeats):
+        t_start = time.time()
+        subprocess.check_call([sys.executable, '-c', statement], cwd=repo_path)
+        durations.append(time.time() - t_start)
+    return np.array(durations)
+
+
+def main(num_repeats=5):
+    baseline = np.median(time_import('pass', num_repeats))
+    print('Interpreter start-up: {:.3f} s (median of {})'.format(baseline, num_repeats))
+    print('{:<90} {:>10}'.format('Statement', 'Time (s)'))
+    for statement in statements:
+        durations = time_import(statement, num_repeats)
+        print('{:<90} {:>10.3f}'.format(statement, np.median(durations) - baseline))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -1,17 +1,24 @@
 """
 The Pycroscopy package.
 
+Submodules are only imported when they are first accessed, so ``import pycroscopy`` is fast
+and does not import heavy dependencies such as matplotlib or scikit-learn.
+
 Submodules
 ----------
 
 .. autosummary::
     :toctree: _autosummary
 """
-from .io import translators
-from .io.translators import ImageTranslator  # Use pycroscopy version of ImageTranslator rather than pyUSID's
-from . import analysis
-from . import processing
-from . import viz
+from .lazy_loader import attach as _attach
 
 from .__version__ import version as __version__
 from .__version__ import time as __time__
+
+# Use pycroscopy version of ImageTranslator rather than pyUSID's
+__getattr__, __dir__ = _attach(__name__,
+                               submodules=['io', 'analysis', 'processing', 'viz'],
+                               submod_attrs={'io': ['translators'],
+                                             'io.translators': ['ImageTranslator']})
+
+__all__ = ['io', 'analysis', 'processing', 'viz', 'translators', 'ImageTranslator']
@@ -16,18 +16,20 @@ Submodules
     optimize
 
 """
+from ..lazy_loader import attach as _attach
 
-from . import utils
-from .utils import *
-from . import be_sho_fitter
-from .be_sho_fitter import BESHOfitter
-from . import be_loop_fitter
-from .be_loop_fitter import BELoopFitter
-from . import fitter
-from .fitter import Fitter
-from .giv_bayesian import GIVBayesian
-from .be_relax_fit import BERelaxFit
+__getattr__, __dir__ = _attach(__name__,
+                               submodules=['utils', 'contrib', 'be_sho_fitter', 'be_loop_fitter', 'be_relax_fit',
+                                           'fitter', 'giv_bayesian'],
+                               submod_attrs={'utils': ['be_sho', 'be_loop', 'atom_finding', 'giv_utils',
+                                                       'atom_finding_general_gaussian'],
+                                             'be_sho_fitter': ['BESHOfitter'],
+                                             'be_loop_fitter': ['BELoopFitter'],
+                                             'fitter': ['Fitter'],
+                                             'giv_bayesian': ['GIVBayesian'],
+                                             'be_relax_fit': ['BERelaxFit']})
 
 __all__ = ['Fitter', 'BESHOfitter', 'BELoopFitter', 'utils', 'GIVBayesian',
            'BERelaxFit']
-__all__ += utils.__all__
+# Same as utils.__all__:
+__all__ += ['be_sho', 'be_loop', 'atom_finding', 'giv_utils', 'atom_finding_general_gaussian']
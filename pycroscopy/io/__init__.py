@@ -8,13 +8,22 @@ Submodules
     :toctree: _autosummary
 
     translators
+    chunking
+    relayout
     write_utils
 
 """
-from . import translators
-from .translators import *
-from .ingestor import ingest
-from .hdf_writer import HDFwriter
-from .virtual_data import VirtualDataset, VirtualGroup, VirtualData
+from ..lazy_loader import attach as _attach
+from .translators import __all__ as _translator_names
 
-__all__ = translators.__all__
+__getattr__, __dir__ = _attach(__name__,
+                               submodules=['translators', 'chunking', 'relayout', 'write_utils', 'hdf_writer',
+                                           'ingestor', 'virtual_data'],
+                               submod_attrs={'translators': _translator_names,
+                                             'ingestor': ['ingest', 'ingest_many'],
+                                             'chunking': ['plan_chunks'],
+                                             'relayout': ['relayout_file'],
+                                             'hdf_writer': ['HDFwriter'],
+                                             'virtual_data': ['VirtualDataset', 'VirtualGroup', 'VirtualData']})
+
+__all__ = list(_translator_names)
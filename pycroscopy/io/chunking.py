@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Selection of the chunk shape and the chunk cache size of Main datasets based on how they will be read.
+
+Main datasets are read either one (or a few) positions at a time with all their spectroscopic values, as when
+fitting or filtering, or one spectroscopic slice at a time across all positions, as when visualizing maps per
+spectroscopic step. Chunks that span whole rows favor the former, chunks that span whole columns favor the latter.
+
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+from collections import namedtuple
+
+import numpy as np
+
+__all__ = ['ACCESS_PROFILES', 'ChunkPlan', 'plan_chunks']
+
+ACCESS_PROFILES = ('pixel', 'spectral', 'balanced')
+
+ChunkPlan = namedtuple('ChunkPlan', ['chunks', 'cache_bytes', 'cache_slots'])
+
+# Small enough that a few chunks fit within the default chunk cache of HDF5 (1 MB):
+DEFAULT_CHUNK_MEM = 256 * 1024
+_DEFAULT_CACHE_MEM = 1024 ** 2
+_DEFAULT_CACHE_SLOTS = 521
+
+
+def _fill_axis(shape, unit_chunks, chunks, axis, max_items):
+    """
+    Grows the chunk along the provided axis, in steps of the unit chunk, to the extent allowed by max_items
+    """
+    other_items = int(np.prod(chunks)) // chunks[axis]
+    num_units = max(1, max_items // (other_items * unit_chunks[axis]))
+    chunks[axis] = int(min(shape[axis], max(chunks[axis], num_units * unit_chunks[axis])))
+
+
+def _next_prime(num):
+    """
+    Returns the smallest prime number that is greater than or equal to num
+    """
+    num = max(2, int(num))
+    while any(num % fac == 0 for fac in range(2, int(num ** 0.5) + 1)):
+        num += 1
+    return num
+
+
+def plan_chunks(shape, dtype, access='balanced', unit_chunks=None, max_chunk_mem=DEFAULT_CHUNK_MEM,
+                max_cache_mem=64 * 1024 ** 2):
+    """
+    Calculates the chunk shape for a Main dataset based on how it will be read, along with the size of the chunk
+    cache that avoids reading the same chunk more than once when the dataset is traversed in that manner.
+
+    Parameters
+    ----------
+    shape : array-like of unsigned int
+        Shape of the Main dataset - (positions, spectroscopic values)
+    dtype : numpy.dtype or str
+        Data type of the Main dataset
+    access : str, optional. Default = 'balanced'
+        How the dataset will be read:
+        'pixel' - one or more positions at a time, with all their spectroscopic values. Chunks span whole rows
+        'spectral' - one or more spectroscopic values at a time, across all positions. Chunks span whole columns
+        'balanced' - both of the above. Per position and per spectroscopic slice reads touch as many chunks
+    unit_chunks : array-like of unsigned int, optional
+        Chunks will be integer multiples of this shape. Use this to keep spectra or images intact.
+        Default - (1, 1)
+    max_chunk_mem : unsigned int, optional. Default = 256 kB
+        Maximum size of a chunk in bytes. Chunks made of a single unit chunk may exceed this
+    max_cache_mem : unsigned int, optional. Default = 64 MB
+        Maximum size of the recommended chunk cache in bytes
+
+    Returns
+    -------
+    plan : ChunkPlan
+        chunks - tuple of unsigned int: shape of the chunks
+        cache_bytes - unsigned int: recommended size of the chunk cache in bytes
+        cache_slots - unsigned int: recommended number of slots in the hash table of the chunk cache
+
+    Notes
+    -----
+    The chunk cache is applied when opening the file: h5py.File(path, rdcc_nbytes=plan.cache_bytes,
+    rdcc_nslots=plan.cache_slots). HDF5 ignores the cache requested when opening a dataset that is already open,
+    so the file should be opened with the recommended cache before the dataset is accessed
+    """
+    if access not in ACCESS_PROFILES:
+        raise ValueError('access should be one of {}. Provided: {}'.format(ACCESS_PROFILES, access))
+    shape = [int(val) for val in shape]
+    if len(shape) != 2:
+        raise ValueError('Main datasets are two dimensional. Provided shape: {}'.format(shape))
+    if min(shape) < 1:
+        raise ValueError('shape should only contain positive integers')
+    if unit_chunks is None:
+        unit_chunks = [1, 1]
+    if len(unit_chunks) != 2:
+        raise ValueError('unit_chunks should have as many dimensions as shape')
+    unit_chunks = [int(min(max(1, unit), dim)) for unit, dim in zip(unit_chunks, shape)]
+
+    item_size = np.dtype(dtype).itemsize
+    max_items = max(1, int(max_chunk_mem // item_size))
+    chunks = list(unit_chunks)
+
+    if access == 'pixel':
+        _fill_axis(shape, unit_chunks, chunks, 1, max_items)
+        _fill_axis(shape, unit_chunks, chunks, 0, max_items)
+    elif access == 'spectral':
+        _fill_axis(shape, unit_chunks, chunks, 0, max_items)
+        _fill_axis(shape, unit_chunks, chunks, 1, max_items)
+    else:
+        # Same number of chunks along both axes:
+        chunks_per_axis = max(1.0, np.sqrt(shape[0] * shape[1] / max_items))
+        chunks[1] = int(min(shape[1], max(1, int(shape[1] / chunks_per_axis) // unit_chunks[1]) * unit_chunks[1]))
+        # Give any budget left over by an axis that is already whole to the other axis:
+        _fill_axis(shape, unit_chunks, chunks, 0, max_items)
+        _fill_axis(shape, unit_chunks, chunks, 1, max_items)
+
+    # Number of chunks read for a single position / spectroscopic slice:
+    per_pixel = int(np.ceil(shape[1] / chunks[1]))
+    per_slice = int(np.ceil(shape[0] / chunks[0]))
+    stripe = {'pixel': per_pixel, 'spectral': per_slice, 'balanced': max(per_pixel, per_slice)}[access]
+
+    chunk_bytes = int(np.prod(chunks)) * item_size
+    cache_bytes = max(_DEFAULT_CACHE_MEM, chunk_bytes, min(stripe * chunk_bytes, int(max_cache_mem)))
+    # HDF5 recommends at least 10 times as many slots as the chunks that fit in the cache:
+    cached_chunks = min(cache_bytes // chunk_bytes, per_pixel * per_slice)
+    cache_slots = max(_DEFAULT_CACHE_SLOTS, _next_prime(10 * cached_chunks))
+
+    return ChunkPlan(tuple(chunks), int(cache_bytes), int(cache_slots))
+
@@ -9,14 +9,13 @@ Created on Wed Oct 21 12:29:33 2015
 
 from __future__ import division, print_function, absolute_import, unicode_literals
 import os
-import subprocess
 import sys
-from time import time, sleep
 from warnings import warn
 import h5py
 
 from pyUSID.io.hdf_utils import assign_group_index, write_simple_attrs, attempt_reg_ref_build, write_region_references
 from .virtual_data import VirtualGroup, VirtualDataset, VirtualData
+from .relayout import relayout_file
 from ..__version__ import version
 
 if sys.version_info.major == 3:
@@ -71,7 +70,7 @@ class HDFwriter(object):
         Clear h5.file of all contents
 
         file.clear() only removes the contents, it does not free up previously allocated space.
-        To do so, it's necessary to use the h5repack command after clearing.
+        To do so, the file is repacked after clearing.
         Because the file must be closed and reopened, it is best to call this
         function immediately after the creation of the HDFWriter object.
         """
@@ -79,33 +78,27 @@ class HDFwriter(object):
         self.file.clear()
         self.repack()
 
-    def repack(self):
+    def repack(self, **kwargs):
         """
-        Uses the h5repack command to recover cleared space in an hdf5 file.
-        h5repack can also be used to change chunking and compression, but these options have
-        not yet been implemented here.
+        Copies the contents of the hdf5 file into a new file to recover cleared space.
+        The chunking and compression of the datasets are preserved unless specified otherwise.
+
+        Parameters
+        ----------
+        kwargs : dict
+            Keyword arguments for :func:`pycroscopy.io.relayout.relayout_file` such as access and compression,
+            to change the chunking and compression of the datasets
         """
-        warn('This is unlikely to work on Windows due to driver issues')
         self.close()
         tmpfile = self.path + '.tmp'
 
         '''
         Repack the opened hdf5 file into a temporary file
         '''
-        try:
-            repack_line = ' '.join(['h5repack', '"' + self.path + '"', '"' + tmpfile + '"'])
-            subprocess.check_output(repack_line,
-                                    stderr=subprocess.STDOUT,
-                                    shell=True)
-            # Check that the file is done being modified
-            sleep(0.5)
-            while time() - os.stat(tmpfile).st_mtime <= 1:
-                sleep(0.5)
-        except subprocess.CalledProcessError as err:
-            print('Could not repack hdf5 file')
-            raise Exception(err.output)
-        except Exception:
-            raise
+        kwargs.setdefault('access', None)
+        kwargs.setdefault('compression', 'keep')
+        kwargs.setdefault('verbose', False)
+        relayout_file(self.path, tmpfile, **kwargs)
 
         '''
         Delete the original file and move the temporary file to the originals path
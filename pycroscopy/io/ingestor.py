@@ -8,12 +8,19 @@ Created on Fri May 25 11:14:25 2019
 """
 
 from __future__ import division, unicode_literals, print_function, absolute_import
+import os
 import sys
+from functools import partial
+from multiprocessing import Pool
 from warnings import warn
-from . import translators
+
+from pyUSID.processing.comp_utils import recommend_cpu_cores
+from .translators.registry import sniff_translators, get_translator_class
 
 if sys.version_info.major == 3:
     unicode = str
+else:
+    FileNotFoundError = ValueError
 
 
 def ingest(file_path, force_translator=None, unique_translator=True,
@@ -21,6 +28,9 @@ def ingest(file_path, force_translator=None, unique_translator=True,
     """
     Translates raw data file(s) in proprietary file formats into a h5USID file
 
+    Only the Translators registered (see pycroscopy.io.translators.registry) to accept the extension and
+    signature of the provided file are imported and asked to validate the file.
+
     Parameters
     ----------
     file_path : str
@@ -46,14 +56,22 @@ def ingest(file_path, force_translator=None, unique_translator=True,
     if not isinstance(file_path, (str, unicode)):
         raise TypeError('file_path must be a string object')
     if isinstance(force_translator, (str, unicode)):
-        trans_class = getattr(translators, force_translator)
+        trans_class = _get_translator_class(force_translator)
         # Assumes that is_valid_file() would have returned file_path
         valid_translators = [trans_class(), file_path]
     else:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path + ' does not exist')
+
         # Could have used an OrderedDict as well.
         valid_translators = list()
 
-        for trans_class in translators.all_translators:
+        candidates = sniff_translators(file_path)
+        if verbose:
+            print('Candidate translators based on extension and signature: {}'.format(candidates))
+
+        for trans_name in candidates:
+            trans_class = get_translator_class(trans_name)
             trans_obj = trans_class()
             # The following line is in place until the updated Translator class is pushed
             # after that time, all Translators will inherit this function
@@ -95,3 +113,60 @@ def ingest(file_path, force_translator=None, unique_translator=True,
     if verbose:
         print('{} will be provided to {} for translation'.format(valid_translators[1], valid_translators[0].__class__.__name__))
     return valid_translators[0].translate(valid_translators[1], **kwargs)
+
+
+def _get_translator_class(name):
+    """
+    Returns the requested Translator class, importing only its module if it is registered
+    """
+    try:
+        return get_translator_class(name)
+    except KeyError:
+        from . import translators
+        return getattr(translators, name)
+
+
+def ingest_many(file_paths, force_translator=None, unique_translator=True, cores=None, verbose=False, **kwargs):
+    """
+    Translates several independent raw data files, in parallel, into h5USID files
+
+    Parameters
+    ----------
+    file_paths : list of str
+        Paths to raw data file(s). Each path must result in a different h5USID file
+    force_translator : str, Optional. Default - Ignored
+        Name of the Translator class to use for all files
+    unique_translator : bool, Optional. Default - True
+        See ingest()
+    cores : uint, Optional
+        Number of worker processes. Default - as recommended by pyUSID.processing.comp_utils.recommend_cpu_cores
+    verbose : bool, Optional. Default = False
+        Whether or not to print print statements for debugging
+    kwargs : keyword arguments that will be passed on to the translate() function
+
+    Returns
+    -------
+    list of str
+        Absolute paths to the h5USID files in the same order as `file_paths`
+    """
+    if isinstance(file_paths, (str, unicode)) or \
+            not all([isinstance(file_path, (str, unicode)) for file_path in file_paths]):
+        raise TypeError('file_paths must be a list of strings')
+    file_paths = list(file_paths)
+    if len(file_paths) == 0:
+        return list()
+
+    func = partial(ingest, force_translator=force_translator, unique_translator=unique_translator,
+                   verbose=verbose, **kwargs)
+
+    cores = recommend_cpu_cores(len(file_paths), requested_cores=cores, lengthy_computation=True)
+    if cores == 1 or len(file_paths) == 1:
+        return [func(file_path) for file_path in file_paths]
+
+    pool = Pool(processes=min(cores, len(file_paths)))
+    try:
+        # One file per task since each translation is lengthy:
+        return pool.map(func, file_paths, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
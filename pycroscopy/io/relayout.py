@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Copies USID HDF5 files dataset by dataset while changing the chunking and compression of the datasets.
+Recovers space freed by deleting objects, as h5repack does, without depending on the HDF5 command line tools.
+
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+import sys
+import time
+import zlib
+from collections import namedtuple
+from itertools import product
+
+import h5py
+import numpy as np
+from pyUSID.io.hdf_utils import check_if_main
+from pyUSID.processing.comp_utils import recommend_cpu_cores
+
+from .chunking import ACCESS_PROFILES, DEFAULT_CHUNK_MEM, plan_chunks
+from .translators.df_utils.base_utils import gen_ordered_results
+
+if sys.version_info.major == 3:
+    unicode = str
+
+__all__ = ['relayout_file', 'DatasetReport', 'COMPRESSIONS']
+
+COMPRESSIONS = ('gzip', 'lzf', 'blosc', 'keep', None)
+
+DatasetReport = namedtuple('DatasetReport', ['name', 'chunks', 'compression', 'raw_bytes', 'stored_bytes', 'ratio',
+                                             'seconds', 'mb_per_sec'])
+
+
+def _get_filter_kwargs(compression, compression_opts, shuffle, h5_src):
+    """
+    Returns the keyword arguments for h5py.Group.create_dataset() that set up the requested filters
+    """
+    if compression == 'keep':
+        return {'compression': h5_src.compression, 'compression_opts': h5_src.compression_opts,
+                'shuffle': h5_src.shuffle, 'fletcher32': h5_src.fletcher32, 'scaleoffset': h5_src.scaleoffset}
+    if compression is None:
+        return dict()
+    if compression == 'gzip':
+        return {'compression': 'gzip', 'compression_opts': 4 if compression_opts is None else int(compression_opts),
+                'shuffle': shuffle}
+    if compression == 'lzf':
+        return {'compression': 'lzf', 'shuffle': shuffle}
+    try:
+        import hdf5plugin
+    except ImportError:
+        raise ImportError('blosc compression requires the hdf5plugin package')
+    return dict(hdf5plugin.Blosc(clevel=5 if compression_opts is None else int(compression_opts),
+                                 shuffle=hdf5plugin.Blosc.SHUFFLE if shuffle else hdf5plugin.Blosc.NOSHUFFLE))
+
+
+def _is_plain_dtype(dtype):
+    """
+    Whether or not datasets of this dtype can be copied as raw bytes, i.e. - it contains no references or
+    variable length data
+    """
+    if dtype.fields is not None:
+        return all(_is_plain_dtype(field[0]) for field in dtype.fields.values())
+    return dtype.kind != 'O' and h5py.check_dtype(vlen=dtype) is None and h5py.check_dtype(ref=dtype) is None
+
+
+def _remap_refs(value, h5_src_file, h5_dst_file, copied):
+    """
+    Returns the reference(s) to the same objects / regions in the destination file.
+    Objects are looked up by their address so that references do not depend on which of their names exist yet
+    """
+    if isinstance(value, np.ndarray):
+        remapped = np.empty(value.shape, dtype=value.dtype)
+        for index in np.ndindex(value.shape):
+            remapped[index] = _remap_refs(value[index], h5_src_file, h5_dst_file, copied)
+        return remapped
+    if not value:
+        # Null references remain null
+        return value
+    h5_obj = h5_src_file[value]
+    name = copied.get(h5py.h5o.get_info(h5_obj.id).addr, h5_obj.name).encode('utf-8')
+    if isinstance(value, h5py.RegionReference):
+        space = h5py.h5r.get_region(value, h5_src_file.id)
+        return h5py.h5r.create(h5_dst_file.id, name, h5py.h5r.DATASET_REGION, space)
+    return h5py.h5r.create(h5_dst_file.id, name, h5py.h5r.OBJECT)
+
+
+def _copy_attrs(h5_src_obj, h5_dst_obj, h5_dst_file, copied):
+    """
+    Copies all attributes while preserving their dtypes and pointing references to the objects in the new file
+    """
+    for key, value in h5_src_obj.attrs.items():
+        dtype = h5py.h5a.open(h5_src_obj.id, key.encode('utf-8')).dtype
+        if h5py.check_dtype(ref=dtype) is not None:
+            value = _remap_refs(value, h5_src_obj.file, h5_dst_file, copied)
+        if isinstance(value, h5py.Empty):
+            h5_dst_obj.attrs[key] = value
+        else:
+            h5_dst_obj.attrs.create(key, value, dtype=dtype)
+
+
+def _gen_objects(h5_group):
+    """
+    Yields (name, link or object) for all members of the group and its subgroups, parents before children.
+    Soft and external links are yielded as such instead of the objects they point to
+    """
+    for name in h5_group:
+        link = h5_group.get(name, getlink=True)
+        if isinstance(link, (h5py.SoftLink, h5py.ExternalLink)):
+            yield h5_group.name.rstrip('/') + '/' + name, link
+            continue
+        h5_obj = h5_group[name]
+        yield h5_obj.name, h5_obj
+        if isinstance(h5_obj, h5py.Group):
+            for item in _gen_objects(h5_obj):
+                yield item
+
+
+def _guess_chunks(shape, item_size, max_chunk_mem=DEFAULT_CHUNK_MEM):
+    """
+    Returns chunks for a dataset that has no access profile. The largest dimension of the chunk is halved until
+    the chunk fits within max_chunk_mem bytes
+    """
+    chunks = [max(1, int(dim)) for dim in shape]
+    while int(np.prod(chunks)) * item_size > max_chunk_mem and max(chunks) > 1:
+        axis = int(np.argmax(chunks))
+        chunks[axis] = int(np.ceil(chunks[axis] / 2))
+    return tuple(chunks)
+
+
+def _get_target_chunks(h5_src, names, access, compression):
+    """
+    Returns the chunks for the copy of the dataset, which is linked to under the provided names,
+    or None for a contiguous dataset
+    """
+    if isinstance(access, dict):
+        target = 'balanced' if check_if_main(h5_src) else None
+        for name in names:
+            target = access.get(name, target)
+    elif access is not None and check_if_main(h5_src):
+        target = access
+    else:
+        target = None
+
+    if target in ACCESS_PROFILES:
+        return plan_chunks(h5_src.shape, h5_src.dtype, target).chunks
+    if target is not None:
+        return tuple(int(val) for val in target)
+    if h5_src.chunks is not None or h5_src.maxshape != h5_src.shape:
+        return h5_src.chunks
+    if compression in [None, 'keep']:
+        return None
+    # Filters can only be applied to chunked datasets:
+    return _guess_chunks(h5_src.shape, h5_src.dtype.itemsize)
+
+
+def _shuffle(buffer, item_size):
+    """
+    Byte-shuffles the buffer as the HDF5 shuffle filter does
+    """
+    if item_size == 1:
+        return buffer
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(-1, item_size).T.tobytes()
+
+
+def _copy_block(h5_src, h5_dst, start, stop, level=None, shuffle=False):
+    """
+    Copies rows from start to stop of the source dataset. If level is provided, the chunks of the block are
+    compressed here via zlib and written directly, bypassing the filter pipeline of HDF5. Since zlib releases the GIL
+    and h5py only holds its lock while reading and writing, blocks can be compressed in parallel threads.
+
+    Returns
+    -------
+    t_start : float
+        Time at which copying started
+    t_stop : float
+        Time at which copying ended
+    """
+    t_start = time.time()
+    block = h5_src[start: stop]
+    if level is None:
+        h5_dst[start: stop] = block
+        return t_start, time.time()
+
+    chunks = h5_dst.chunks
+    item_size = h5_dst.dtype.itemsize
+    grid = [range(0, dim, chunk) for dim, chunk in zip(h5_dst.shape[1:], chunks[1:])]
+    for row in range(0, stop - start, chunks[0]):
+        for offsets in product(*grid):
+            slices = (slice(row, row + chunks[0]),) + tuple(slice(offset, offset + chunk)
+                                                             for offset, chunk in zip(offsets, chunks[1:]))
+            chunk_data = block[slices]
+            if chunk_data.shape != chunks:
+                # Edge chunks are stored at their full size:
+                padded = np.zeros(chunks, dtype=h5_dst.dtype)
+                padded[tuple(slice(0, dim) for dim in chunk_data.shape)] = chunk_data
+                chunk_data = padded
+            buffer = np.ascontiguousarray(chunk_data).tobytes()
+            if shuffle:
+                buffer = _shuffle(buffer, item_size)
+            h5_dst.id.write_direct_chunk((start + row,) + offsets, zlib.compress(buffer, level))
+    return t_start, time.time()
+
+
+def relayout_file(source_path, target_path, access='balanced', compression='gzip', compression_opts=None,
+                  shuffle=True, cores=None, max_mem_mb=1024, verbose=True):
+    """
+    Copies an HDF5 file dataset by dataset into a new file, rechunking the Main datasets according to their access
+    profile and compressing the datasets. Groups, attributes, links and references, including region references,
+    are preserved.
+
+    Parameters
+    ----------
+    source_path : str
+        Path to the HDF5 file to copy
+    target_path : str
+        Path to the new HDF5 file. Any existing file at this path will be overwritten
+    access : str, dict, or None, optional. Default = 'balanced'
+        str - Access profile (see pycroscopy.io.chunking.plan_chunks) used to chunk all Main datasets.
+        dict - Access profile or chunk shape keyed by the absolute path of the dataset. Main datasets that are not
+        specified are chunked per the 'balanced' profile
+        None - Keep the chunks of all datasets.
+        Datasets that are not Main datasets keep their chunks unless specified in the dict
+    compression : str or None, optional. Default = 'gzip'
+        'gzip', 'lzf', 'blosc' (requires the hdf5plugin package), 'keep' to keep the filters of each dataset,
+        or None to store the datasets without compression
+    compression_opts : int, optional
+        Compression level for 'gzip' (Default = 4) or 'blosc' (Default = 5)
+    shuffle : bool, optional. Default = True
+        Whether or not to shuffle bytes before compressing. Often improves compression of floating point data
+    cores : uint, optional. Default = all available cores
+        Number of threads used to copy and compress datasets. Only gzip compression benefits from multiple threads
+    max_mem_mb : uint, optional. Default = 1024
+        Maximum memory in megabytes used for holding data being copied
+    verbose : bool, optional. Default = True
+        Whether or not to print the compression ratio and throughput for each dataset
+
+    Returns
+    -------
+    reports : list of DatasetReport
+        Name, chunks, compression, raw and stored sizes in bytes, compression ratio, time taken to copy in seconds,
+        and throughput in megabytes of raw data per second for each dataset
+    """
+    for var, var_name in zip([source_path, target_path], ['source_path', 'target_path']):
+        if not isinstance(var, (str, unicode)):
+            raise TypeError(var_name + ' should be a string')
+    if compression not in COMPRESSIONS:
+        raise ValueError('compression should be one of {}. Provided: {}'.format(COMPRESSIONS, compression))
+    if access is not None and not isinstance(access, dict) and access not in ACCESS_PROFILES:
+        raise ValueError('access should be a dict, None, or one of {}. Provided: {}'.format(ACCESS_PROFILES, access))
+
+    with h5py.File(source_path, mode='r') as h5_src_file, h5py.File(target_path, mode='w') as h5_dst_file:
+
+        # Objects may be linked to from several groups:
+        members = list(_gen_objects(h5_src_file))
+        aliases = dict()
+        for name, h5_src in members:
+            if not isinstance(h5_src, (h5py.SoftLink, h5py.ExternalLink)):
+                aliases.setdefault(h5py.h5o.get_info(h5_src.id).addr, list()).append(name)
+
+        # Create the structure of the file:
+        datasets = list()
+        copied = dict()
+        hard_links = list()
+        for name, h5_src in members:
+            if isinstance(h5_src, (h5py.SoftLink, h5py.ExternalLink)):
+                h5_dst_file[name] = h5_src
+                continue
+            addr = h5py.h5o.get_info(h5_src.id).addr
+            if addr in copied:
+                # Another hard link to an object that may not have been created yet:
+                hard_links.append((name, copied[addr]))
+                continue
+            copied[addr] = name
+            if isinstance(h5_src, h5py.Group):
+                h5_dst_file.create_group(name)
+                continue
+            if h5_src.shape is None or h5_src.shape == () or not _is_plain_dtype(h5_src.dtype):
+                # Scalar, empty and reference datasets are small and copied as is:
+                datasets.append((h5_src, None))
+                continue
+            chunks = _get_target_chunks(h5_src, aliases[addr], access, compression)
+            kwargs = _get_filter_kwargs(compression, compression_opts, shuffle, h5_src) if chunks else dict()
+            if h5_src.dtype.fields is None:
+                kwargs['fillvalue'] = h5_src.fillvalue
+            if h5_src.maxshape != h5_src.shape:
+                kwargs['maxshape'] = h5_src.maxshape
+            h5_dst = h5_dst_file.create_dataset(name, shape=h5_src.shape, dtype=h5_src.dtype, chunks=chunks,
+                                                **kwargs)
+            datasets.append((h5_src, h5_dst))
+
+        # Copy data of all datasets in blocks of whole rows of chunks:
+        cores = recommend_cpu_cores(max(1, len(datasets)), requested_cores=cores, lengthy_computation=True)
+        max_block_bytes = max_mem_mb * 1024 ** 2 / (2 * cores)
+        tasks = list()
+        for h5_src, h5_dst in datasets:
+            if h5_dst is None or h5_src.size == 0:
+                continue
+            level = None
+            if compression == 'gzip' and h5_dst.compression == 'gzip':
+                level = h5_dst.compression_opts
+            unit = 1 if h5_dst.chunks is None else h5_dst.chunks[0]
+            bytes_per_unit = unit * h5_src.dtype.itemsize * int(np.prod(h5_src.shape[1:]))
+            rows_per_block = max(1, int(max_block_bytes // bytes_per_unit)) * unit
+            for start in range(0, h5_src.shape[0], rows_per_block):
+                tasks.append((h5_src, h5_dst, start, min(start + rows_per_block, h5_src.shape[0]), level,
+                              h5_dst.shuffle))
+
+        timings = dict()
+        blocks = gen_ordered_results(_copy_block, tasks, cores=cores, max_pending=2 * cores)
+        for (_, h5_dst, _, _, _, _), (t_start, t_stop) in zip(tasks, blocks):
+            prior = timings.get(h5_dst.name, (t_start, t_stop))
+            timings[h5_dst.name] = (min(prior[0], t_start), max(prior[1], t_stop))
+
+        # Create all scalar, empty and reference datasets before filling in the references, which may point to any
+        # of these datasets. Then link to them and copy all attributes:
+        ref_datasets = list()
+        for h5_src, h5_dst in datasets:
+            if h5_dst is not None:
+                continue
+            if h5_src.shape is None:
+                h5_dst_file.create_dataset(h5_src.name, data=h5py.Empty(h5_src.dtype), dtype=h5_src.dtype)
+            elif h5py.check_dtype(ref=h5_src.dtype) is not None:
+                ref_datasets.append((h5_src, h5_dst_file.create_dataset(h5_src.name, shape=h5_src.shape,
+                                                                        dtype=h5_src.dtype)))
+            else:
+                h5_dst_file.create_dataset(h5_src.name, data=h5_src[()], dtype=h5_src.dtype)
+        for h5_src, h5_dst in ref_datasets:
+            h5_dst[()] = _remap_refs(h5_src[()], h5_src_file, h5_dst_file, copied)
+        for name, target in hard_links:
+            # Members of a group that was linked to under this name already exist:
+            if name not in h5_dst_file:
+                h5_dst_file[name] = h5_dst_file[target]
+        _copy_attrs(h5_src_file, h5_dst_file, h5_dst_file, copied)
+        for name in copied.values():
+            _copy_attrs(h5_src_file[name], h5_dst_file[name], h5_dst_file, copied)
+
+        reports = list()
+        for h5_src, _ in datasets:
+            h5_dst = h5_dst_file[h5_src.name]
+            raw_bytes = 0 if h5_src.shape is None else h5_src.size * h5_src.dtype.itemsize
+            stored_bytes = h5_dst.id.get_storage_size()
+            t_start, t_stop = timings.get(h5_dst.name, (0, 0))
+            seconds = t_stop - t_start
+            reports.append(DatasetReport(h5_dst.name, h5_dst.chunks, h5_dst.compression, raw_bytes, stored_bytes,
+                                         raw_bytes / stored_bytes if stored_bytes > 0 else np.nan, seconds,
+                                         raw_bytes / 1024 ** 2 / seconds if seconds > 0 else np.nan))
+
+    if verbose:
+        print('{:<60} {:>12} {:>12} {:>8} {:>10}'.format('Dataset', 'Raw (MB)', 'Stored (MB)', 'Ratio', 'MB/s'))
+        for rep in reports:
+            print('{:<60} {:>12.3f} {:>12.3f} {:>8.2f} {:>10.1f}'.format(rep.name, rep.raw_bytes / 1024 ** 2,
+                                                                         rep.stored_bytes / 1024 ** 2, rep.ratio,
+                                                                         rep.mb_per_sec))
+    return reports
@@ -13,6 +13,8 @@ import re  # used to get note values
 from pyUSID.io.translator import Translator
 from pyUSID.io.write_utils import Dimension, make_indices_matrix
 from pyUSID.io.hdf_utils import create_indexed_group, write_main_dataset, write_simple_attrs, print_tree, get_attributes
+from ..chunking import plan_chunks
+from .df_utils.base_utils import get_rows_per_batch
 
 if sys.version_info.major == 3:
     unicode = str
@@ -34,15 +36,16 @@ class ARhdf5(Translator):
     windows.
     '''
 
-    def __init__(self):
+    def __init__(self, max_mem_mb=1024, *args, **kwargs):
         '''
         Initialize the ARhdf5 class
 
         Parameters
         ----------------
-        data_filepath : String / unicode
-            Absolute path of the data file
+        max_mem_mb : unsigned integer (Optional. Default = 1024)
+            Maximum system memory (in megabytes) that can be used for holding force curves while translating
         '''
+        super(ARhdf5, self).__init__(max_mem_mb=max_mem_mb, *args, **kwargs)
 
         self.debug = False
         self.translated = False # if translate has been run successfully
@@ -116,12 +119,14 @@ class ARhdf5(Translator):
             raise
 
         # Get info from the origin file like Notes and Segments
+        h5_force_map = ARh5_file['ForceMap']
         self.notes = ARh5_file.attrs['Note']
-        self.segments = ARh5_file['ForceMap']['Segments'] #shape: (X, Y, 4)
-        self.segments_name = list(ARh5_file['ForceMap'].attrs['Segments'])
-        self.map_size['X'] = ARh5_file['ForceMap']['Segments'].shape[0]
-        self.map_size['Y'] = ARh5_file['ForceMap']['Segments'].shape[1]
-        self.channels_name = list(ARh5_file['ForceMap'].attrs['Channels'])
+        # The segments table is small (shape: (X, Y, 4)) so read it only once
+        self.segments = np.array(h5_force_map['Segments'])
+        self.segments_name = list(h5_force_map.attrs['Segments'])
+        self.map_size['X'] = self.segments.shape[0]
+        self.map_size['Y'] = self.segments.shape[1]
+        self.channels_name = list(h5_force_map.attrs['Channels'])
         try:
             self.points_per_sec = np.float(self.note_value('ARDoIVPointsPerSec'))
         except NameError:
@@ -133,12 +138,12 @@ class ARhdf5(Translator):
         # Only the extension 'Ext' segment can change size
         # so we get the shortest one and we trim all the others
         extension_idx = self.segments_name.index('Ext')
-        short_ext = np.amin(np.array(self.segments[:, :, extension_idx]))
-        longest_ext = np.amax(np.array(self.segments[:, :, extension_idx]))
+        short_ext = np.amin(self.segments[:, :, extension_idx])
+        longest_ext = np.amax(self.segments[:, :, extension_idx])
         difference = longest_ext - short_ext  # this is a difference between integers
         tot_length = (np.amax(self.segments) - difference) + 1
         # +1 otherwise array(tot_length) will be of 1 position shorter
-        points_trimmed = np.array(self.segments[:, :, extension_idx]) - short_ext
+        points_trimmed = self.segments[:, :, extension_idx] - short_ext
         if self.debug:
             print('Data were trimmed in the extension segment of {} points'.format(difference))
 
@@ -161,44 +166,9 @@ class ARhdf5(Translator):
                     Dimension('Rows', 'm', y_dim)]
         spec_dims = [Dimension('Time', 's', z_dim)]
 
-        # This is quite time consuming, but on magnetic drive is limited from the disk, and therefore is not useful
-        # to parallelize these loops
-        for index, channel in enumerate(self.channels_name):
-            cur_chan = create_indexed_group(h5_meas_group, 'Channel')
-            main_dset = np.empty((self.map_size['X'], self.map_size['Y'], tot_length))
-            for column in np.arange(self.map_size['X']):
-                for row in np.arange(self.map_size['Y']):
-                    AR_pos_string = str(column) + ':' + str(row)
-                    seg_start = self.segments[column, row, extension_idx] - short_ext
-                    main_dset[column, row, :] = ARh5_file['ForceMap'][AR_pos_string][index, seg_start:]
-
-            # Reshape with Fortran order to have the correct position indices
-            main_dset = np.reshape(main_dset, (-1, tot_length), order='F')
-            if index == 0:
-                first_main_dset = cur_chan
-                quant_unit = self.get_def_unit(channel)
-                h5_raw = write_main_dataset(cur_chan, # parent HDF5 group
-                                                           main_dset, # 2D array of raw data
-                                                           'Raw_'+channel, # Name of main dset
-                                                           channel, # Physical quantity
-                                                           self.get_def_unit(channel), # Unit
-                                                           pos_dims, # position dimensions
-                                                           spec_dims, #spectroscopy dimensions
-                                                           )
-            else:
-                h5_raw = write_main_dataset(cur_chan, # parent HDF5 group
-                                                           main_dset, # 2D array of raw data
-                                                           'Raw_'+channel, # Name of main dset
-                                                           channel, # Physical quantity
-                                                           self.get_def_unit(channel), # Unit
-                                                           pos_dims, # position dimensions
-                                                           spec_dims, #spectroscopy dimensions
-                                                           # Link Ancilliary dset to the first
-                                                           h5_pos_inds=first_main_dset['Position_Indices'],
-                                                           h5_pos_vals=first_main_dset['Position_Values'],
-                                                           h5_spec_inds=first_main_dset['Spectroscopic_Indices'],
-                                                           h5_spec_vals=first_main_dset['Spectroscopic_Values'],
-                                                           )
+        h5_raws = self._create_force_datasets(h5_meas_group, h5_force_map, tot_length, pos_dims, spec_dims)
+        first_main_dset = h5_raws[0].parent
+        self._write_force_curves(h5_force_map, h5_raws, extension_idx, short_ext)
 
         # Make Channels with IMAGES.
         # Position indices/values are the same of all other channels
@@ -262,6 +232,98 @@ class ARhdf5(Translator):
         self.translated = True
         return h5_path
 
+    def _create_force_datasets(self, h5_meas_group, h5_force_map, tot_length, pos_dims, spec_dims):
+        """
+        Creates an empty main dataset for each channel of the force map. The ancillary datasets are written only
+        for the first channel and are shared by all other channels
+
+        Parameters
+        ----------
+        h5_meas_group : h5py.Group
+            Measurement group into which the channels will be written
+        h5_force_map : h5py.Group
+            ForceMap group in the Asylum Research HDF5 file
+        tot_length : unsigned int
+            Number of points in each (trimmed) force curve
+        pos_dims : list of pyUSID.io.write_utils.Dimension
+            Position dimensions
+        spec_dims : list of pyUSID.io.write_utils.Dimension
+            Spectroscopic dimensions
+
+        Returns
+        -------
+        h5_raws : list of pyUSID.USIDataset
+            Main datasets, one per channel
+        """
+        num_pos = self.map_size['X'] * self.map_size['Y']
+        # Keep the precision of the curves in the source file:
+        curve_dtype = h5_force_map['0:0'].dtype
+        # Whole force curves in each chunk:
+        chunks = plan_chunks([num_pos, tot_length], curve_dtype, 'pixel', unit_chunks=(1, tot_length)).chunks
+
+        h5_raws = list()
+        for index, channel in enumerate(self.channels_name):
+            cur_chan = create_indexed_group(h5_meas_group, 'Channel')
+            if index == 0:
+                h5_raw = write_main_dataset(cur_chan,  # parent HDF5 group
+                                            (num_pos, tot_length),  # shape of the raw data
+                                            'Raw_' + channel,  # Name of main dset
+                                            channel,  # Physical quantity
+                                            self.get_def_unit(channel),  # Unit
+                                            pos_dims,  # position dimensions
+                                            spec_dims,  # spectroscopy dimensions
+                                            dtype=curve_dtype, chunks=chunks)
+            else:
+                # Link Ancilliary dset to the first
+                h5_raw = write_main_dataset(cur_chan, (num_pos, tot_length), 'Raw_' + channel, channel,
+                                            self.get_def_unit(channel), None, None,
+                                            h5_pos_inds=h5_raws[0].h5_pos_inds, h5_pos_vals=h5_raws[0].h5_pos_vals,
+                                            h5_spec_inds=h5_raws[0].h5_spec_inds,
+                                            h5_spec_vals=h5_raws[0].h5_spec_vals,
+                                            dtype=curve_dtype, chunks=chunks)
+            h5_raws.append(h5_raw)
+        return h5_raws
+
+    def _write_force_curves(self, h5_force_map, h5_raws, extension_idx, short_ext):
+        """
+        Copies the force curves into the main datasets in batches of positions. Each batch contains whole HDF5
+        chunks of the main datasets and is limited in size by the maximum memory. Each curve is read only once
+        for all channels.
+
+        Parameters
+        ----------
+        h5_force_map : h5py.Group
+            ForceMap group in the Asylum Research HDF5 file
+        h5_raws : list of pyUSID.USIDataset
+            Main datasets, one per channel, in the same order as the channels in the force curves
+        extension_idx : unsigned int
+            Index of the extension segment in the segments table
+        short_ext : unsigned int
+            Length of the shortest extension segment
+        """
+        num_cols = self.map_size['X']
+        num_pos, tot_length = h5_raws[0].shape
+        num_chans = len(h5_raws)
+
+        bytes_per_pos = num_chans * tot_length * h5_raws[0].dtype.itemsize
+        pos_per_batch = get_rows_per_batch(h5_raws[0], bytes_per_pos, self.max_ram, num_rows=num_pos)
+
+        batch = np.empty((num_chans, pos_per_batch, tot_length), dtype=h5_raws[0].dtype)
+        for start in range(0, num_pos, pos_per_batch):
+            stop = min(start + pos_per_batch, num_pos)
+            if self.debug:
+                print('Reading force curves {} to {} of {}'.format(start, stop, num_pos))
+            # Positions are ordered with the columns varying fastest
+            for pos_ind in range(start, stop):
+                row, column = divmod(pos_ind, num_cols)
+                seg_start = self.segments[column, row, extension_idx] - short_ext
+                h5_force_map[str(column) + ':' + str(row)].read_direct(batch,
+                                                                      np.s_[:, seg_start: seg_start + tot_length],
+                                                                      np.s_[:, pos_ind - start])
+            for h5_raw, chan_batch in zip(h5_raws, batch):
+                h5_raw[start:stop] = chan_batch[:stop - start]
+        h5_raws[0].file.flush()
+
     def note_value(self, name):
         '''
         Get the value of a single note entry with name "name"
@@ -7,29 +7,38 @@ Created on Tue Jan 05 07:55:56 2016
 
 @author: Suhas Somnath, Chris Smith
 """
-from .be_odf import BEodfTranslator
-from .be_odf_relaxation import BEodfRelaxationTranslator
-from .beps_ndf import BEPSndfTranslator
-from .general_dynamic_mode import GDMTranslator
-from .gmode_iv import GIVTranslator
-from .gmode_line import GLineTranslator
-from .gmode_tune import GTuneTranslator
-from .igor_ibw import IgorIBWTranslator
-from .ndata import NDataTranslator
-from .tr_kpfm import TRKPFMTranslator
-from .oneview import OneViewTranslator
-from .image_stack import PtychographyTranslator
-from .image_stack import ImageStackTranslator
-from .sporc import SporcTranslator
-from .time_series import MovieTranslator
-from .bruker_afm import BrukerAFMTranslator
-from .beps_data_generator import FakeBEPSGenerator
-from .labview_h5_patcher import LabViewH5Patcher
-from .nanonis import NanonisTranslator, NanonisTranslatorCorrect
-from .image import ImageTranslator
-from .pifm import PiFMTranslator
-from .gwyddion import GwyddionTranslator
-from .omicron_asc import AscTranslator
+import sys
+from collections import OrderedDict
+
+from ...lazy_loader import attach as _attach, is_lazy as _is_lazy
+
+# Translators are only imported when they are first accessed
+_translator_modules = OrderedDict([('be_odf', ['BEodfTranslator']),
+                                   ('be_odf_relaxation', ['BEodfRelaxationTranslator']),
+                                   ('beps_ndf', ['BEPSndfTranslator']),
+                                   ('general_dynamic_mode', ['GDMTranslator']),
+                                   ('gmode_iv', ['GIVTranslator']),
+                                   ('gmode_line', ['GLineTranslator']),
+                                   ('gmode_tune', ['GTuneTranslator']),
+                                   ('igor_ibw', ['IgorIBWTranslator']),
+                                   ('ndata', ['NDataTranslator']),
+                                   ('tr_kpfm', ['TRKPFMTranslator']),
+                                   ('oneview', ['OneViewTranslator']),
+                                   ('image_stack', ['PtychographyTranslator', 'ImageStackTranslator']),
+                                   ('sporc', ['SporcTranslator']),
+                                   ('time_series', ['MovieTranslator']),
+                                   ('bruker_afm', ['BrukerAFMTranslator']),
+                                   ('beps_data_generator', ['FakeBEPSGenerator']),
+                                   ('labview_h5_patcher', ['LabViewH5Patcher']),
+                                   ('nanonis', ['NanonisTranslator', 'NanonisTranslatorCorrect']),
+                                   ('image', ['ImageTranslator']),
+                                   ('pifm', ['PiFMTranslator']),
+                                   ('gwyddion', ['GwyddionTranslator']),
+                                   ('omicron_asc', ['AscTranslator'])])
+
+_lazy_getattr, _lazy_dir = _attach(__name__,
+                                   submodules=list(_translator_modules.keys()) + ['df_utils', 'registry'],
+                                   submod_attrs=_translator_modules)
 
 __all__ = ['BEodfTranslator', 'BEPSndfTranslator', 'BEodfRelaxationTranslator',
            'GIVTranslator', 'GLineTranslator', 'GTuneTranslator', 'GDMTranslator',
@@ -38,16 +47,34 @@ __all__ = ['BEodfTranslator', 'BEPSndfTranslator', 'BEodfRelaxationTranslator',
            'LabViewH5Patcher', 'TRKPFMTranslator', 'BrukerAFMTranslator', 'ImageTranslator',
            'PiFMTranslator', 'NanonisTranslator', 'GwyddionTranslator', 'AscTranslator']
 
-be_translators = [BEodfTranslator, BEodfRelaxationTranslator, BEPSndfTranslator, FakeBEPSGenerator, LabViewH5Patcher]
+_translator_groups = OrderedDict([
+    ('be_translators', ['BEodfTranslator', 'BEodfRelaxationTranslator', 'BEPSndfTranslator', 'FakeBEPSGenerator',
+                        'LabViewH5Patcher']),
+    ('gmode_translators', ['GDMTranslator', 'GIVTranslator', 'GLineTranslator', 'GTuneTranslator',
+                           'TRKPFMTranslator', 'SporcTranslator']),
+    ('afm_translators', ['IgorIBWTranslator', 'PiFMTranslator', 'BrukerAFMTranslator', 'GwyddionTranslator']),
+    ('stm_translators', ['NanonisTranslatorCorrect', 'AscTranslator']),
+    ('stem_translators', ['NDataTranslator', 'OneViewTranslator']),
+    ('misc_translators', ['ImageStackTranslator', 'MovieTranslator', 'ImageTranslator'])])
 
-gmode_translators = [GDMTranslator, GIVTranslator, GLineTranslator, GTuneTranslator, TRKPFMTranslator, SporcTranslator]
 
-afm_translators = [IgorIBWTranslator, PiFMTranslator, BrukerAFMTranslator, GwyddionTranslator]
+def __getattr__(name):
+    if name == 'all_translators':
+        value = list()
+        for group_name in _translator_groups.keys():
+            value += getattr(sys.modules[__name__], group_name)
+    elif name in _translator_groups:
+        value = [getattr(sys.modules[__name__], trans_name) for trans_name in _translator_groups[name]]
+    else:
+        return _lazy_getattr(name)
+    globals()[name] = value
+    return value
 
-stm_translators = [NanonisTranslatorCorrect, AscTranslator]
 
-stem_translators = [NDataTranslator, OneViewTranslator]
+def __dir__():
+    return sorted(set(_lazy_dir()) | set(_translator_groups.keys()) | {'all_translators'})
 
-misc_translators = [ImageStackTranslator, MovieTranslator, ImageTranslator]
 
-all_translators = be_translators + gmode_translators + afm_translators + stm_translators + stem_translators + misc_translators
\ No newline at end of file
+if not _is_lazy:
+    for _group_name in list(_translator_groups.keys()) + ['all_translators']:
+        __getattr__(_group_name)
@@ -9,6 +9,7 @@ from __future__ import division, print_function, absolute_import, unicode_litera
 
 from os import path, listdir, remove
 import sys
+from multiprocessing.pool import ThreadPool
 from warnings import warn
 import h5py
 import numpy as np
@@ -17,12 +18,14 @@ from scipy.io.matlab import loadmat  # To load parameters stored in Matlab .mat
 from .df_utils.be_utils import trimUDVS, getSpectroscopicParmLabel, parmsToDict, generatePlotGroups, \
     createSpecVals, requires_conjugate, nf32
 from pyUSID.io.translator import Translator
-from pyUSID.io.write_utils import INDICES_DTYPE, VALUES_DTYPE, Dimension, calc_chunks
+from pyUSID.io.write_utils import INDICES_DTYPE, VALUES_DTYPE, Dimension
 from pyUSID.io.hdf_utils import write_ind_val_dsets, write_main_dataset, write_region_references, \
     create_indexed_group, write_simple_attrs, write_book_keeping_attrs, copy_attributes,\
     write_reduced_anc_dsets
 from pyUSID.io.usi_data import USIDataset
 from pyUSID.processing.comp_utils import get_available_memory
+from ..chunking import plan_chunks
+from .df_utils.base_utils import get_rows_per_batch, follow_acquisition, map_float32_file
 
 if sys.version_info.major == 3:
     unicode = str
@@ -35,10 +38,22 @@ class BEodfTranslator(Translator):
     """
 
     def __init__(self, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        num_rand_spectra : unsigned int, optional. Default = 1000
+            Number of random spectra used to decide whether the data needs to be conjugated
+        cores : unsigned int, optional
+            Number of CPU cores used to decide whether the data needs to be conjugated
+        write_in_background : bool, optional. Default = False
+            Whether or not to write blocks of large BEPS datasets to the file in a separate thread
+            while the next block is being read
+        """
         super(BEodfTranslator, self).__init__(*args, **kwargs)
         self.h5_raw = None
         self.num_rand_spectra = kwargs.pop('num_rand_spectra', 1000)
         self._cores = kwargs.pop('cores', None)
+        self._write_in_background = kwargs.pop('write_in_background', False)
         self.FFT_BE_wave = None
         self.signal_type = None
         self.expt_type = None
@@ -113,7 +128,8 @@ class BEodfTranslator(Translator):
         else:
             return None
 
-    def translate(self, file_path, show_plots=True, save_plots=True, do_histogram=False, verbose=False):
+    def translate(self, file_path, show_plots=True, save_plots=True, do_histogram=False, verbose=False,
+                  follow=False, poll_interval=1.0, timeout=60.0):
         """
         Translates .dat data file(s) to a single .h5 file
         
@@ -130,6 +146,16 @@ class BEodfTranslator(Translator):
             Whether or not to construct histograms to visualize data quality. Note - this takes a fair amount of time
         verbose : (optional) Boolean
             Whether or not to print statements
+        follow : (optional) Boolean. Default = False
+            Set to True to translate an acquisition that is still in progress. The parameter files, including the
+            parms .mat file, must already exist. Pixels are appended to Raw_Data as soon as they are recorded in all
+            data files, and the 'last_pixel' attribute of Raw_Data holds the number of pixels written so far.
+            The pixels are written as recorded. The check for conjugated data, the plot groups and the histograms
+            are deferred until the acquisition completes, after which the written pixels are conjugated if needed
+        poll_interval : (optional) float. Default = 1
+            Time in seconds between checks for new pixels when following an acquisition
+        timeout : (optional) float. Default = 60
+            Time in seconds without any new pixels after which the acquisition is considered to have stopped
             
         Returns
         ----------
@@ -183,7 +209,12 @@ class BEodfTranslator(Translator):
             parm_dict['data_type'] = 'BELineData'
 
         # Check file sizes:
-        if 'read_real' in path_dict.keys():
+        if follow:
+            # The data files are still growing. Their final size is known from the parameters instead:
+            real_size = imag_size = int(parm_dict['grid_num_rows']) * int(parm_dict['grid_num_cols']) * 4 * \
+                self.__get_bins_per_pixel(parm_dict, path_dict, isBEPS, udvs_denom, tot_bins_multiplier,
+                                          ignored_plt_grps)
+        elif 'read_real' in path_dict.keys():
             real_size = path.getsize(path_dict['read_real'])
             imag_size = path.getsize(path_dict['read_imag'])
         else:
@@ -402,22 +433,25 @@ class BEodfTranslator(Translator):
         h5_chan_grp.create_dataset('Noise_Floor', (num_pix, num_actual_udvs_steps), dtype=nf32,
                                    chunks=(1, num_actual_udvs_steps))
 
-        """
-        New Method for chunking the Main_Data dataset.  Chunking is now done in N-by-N squares
-        of UDVS steps by pixels.  N is determined dynamically based on the dimensions of the
-        dataset.  Currently it is set such that individual chunks are less than 10kB in size.
-
-        Chris Smith -- csmith55@utk.edu
-        """
-        BEPS_chunks = calc_chunks([num_pix, tot_bins],
-                                  np.complex64(0).itemsize,
-                                  unit_chunks=(1, bins_per_step))
+        # Raw data is fit one pixel at a time but also visualized as maps per UDVS step. Chunks hold whole UDVS steps:
+        BEPS_chunks = plan_chunks([num_pix, tot_bins], np.complex64, 'balanced',
+                                  unit_chunks=(1, bins_per_step)).chunks
         self.h5_raw = write_main_dataset(h5_chan_grp, (num_pix, tot_bins), 'Raw_Data', 'Piezoresponse', 'V', None, None,
                                          dtype=np.complex64, chunks=BEPS_chunks, compression='gzip',
                                          h5_pos_inds=h5_pos_ind, h5_pos_vals=h5_pos_val, h5_spec_inds=h5_spec_inds,
                                          h5_spec_vals=h5_spec_vals, verbose=verbose)
 
-        self._read_data(UDVS_mat, parm_dict, path_dict, real_size, isBEPS, add_pix)
+        if follow:
+            if isBEPS:
+                mode = parm_dict['VS_measure_in_field_loops']
+            else:
+                # BE-Line data is in the "read" files:
+                mode = 'out-of-field'
+            # Only the UDVS steps that were recorded:
+            self.__follow_data(path_dict, num_actual_udvs_steps, mode, poll_interval=poll_interval,
+                               timeout=timeout)
+        else:
+            self._read_data(UDVS_mat, parm_dict, path_dict, real_size, isBEPS, add_pix)
 
         generatePlotGroups(self.h5_raw, self.mean_resp, folder_path, basename,
                            self.max_resp, self.min_resp, max_mem_mb=self.max_ram,
@@ -476,7 +510,7 @@ class BEodfTranslator(Translator):
 
     def __read_beps_data(self, path_dict, udvs_steps, mode, add_pixel=False):
         """
-        Reads the imaginary and real data files pixelwise and writes to the H5 file 
+        Reads the imaginary and real data files in blocks of pixels and writes to the H5 file 
         
         Parameters 
         --------------------
@@ -494,8 +528,109 @@ class BEodfTranslator(Translator):
         None
         """
 
-        print('---- reading pixel-by-pixel ----------')
+        print('---- reading blocks of pixels ----------')
+
+        parsers, udvs_steps, step_size = self.__get_parsers(path_dict, udvs_steps, mode)
+
+        rand_spectra = self.__get_random_spectra(parsers, self.h5_raw.shape[0], udvs_steps, step_size,
+                                                 num_spectra=self.num_rand_spectra)
+        take_conjugate = requires_conjugate(rand_spectra, cores=self._cores)
+
+        self.max_resp = np.zeros(shape=(self.h5_raw.shape[0]), dtype=np.float32)
+        self.min_resp = np.zeros(shape=(self.h5_raw.shape[0]), dtype=np.float32)
+        mean_sum = np.zeros(shape=(self.h5_raw.shape[1]), dtype=np.complex128)
+
+        numpix = self.h5_raw.shape[0]
+        """ 
+        Don't try to do the last step if a pixel is missing.   
+        This will be handled after the loop. 
+        """
+        if add_pixel:
+            numpix -= 1
+
+        """
+        Read as many pixels at a time as allowed by max_ram, in whole chunks of the HDF5 dataset.
+        With a background writer, one buffer is filled while the other is being written.
+        """
+        num_buffers = 2 if self._write_in_background else 1
+        # complex64 buffers and the float32 amplitudes:
+        bytes_per_row = self.h5_raw.shape[1] * (num_buffers * np.complex64(0).itemsize + np.float32(0).itemsize)
+        pix_per_block = get_rows_per_batch(self.h5_raw, bytes_per_row, self.max_ram, num_rows=numpix)
+
+        buffers = [np.empty((pix_per_block, self.h5_raw.shape[1]), dtype=np.complex64) for _ in range(num_buffers)]
+        pending_writes = [None] * num_buffers
+        writer = ThreadPool(1) if self._write_in_background else None
+
+        next_report = 0
+        try:
+            for block_ind, start in enumerate(range(0, numpix, pix_per_block)):
+                stop = min(start + pix_per_block, numpix)
+                if start >= next_report:
+                    print('Reading... {} complete'.format(round(100 * start / numpix)))
+                    next_report = start + max(1, numpix // 10)
+
+                buf_ind = block_ind % num_buffers
+                if pending_writes[buf_ind] is not None:
+                    # Wait till this buffer has been written. Also raises any errors from the writer
+                    pending_writes[buf_ind].get()
+                raw_mat = buffers[buf_ind][:stop - start]
+
+                self.__read_pixels(parsers, mode, start, stop, raw_mat, udvs_steps, step_size)
+
+                amp_mat = np.abs(raw_mat)
+                self.max_resp[start:stop] = np.max(amp_mat, axis=1)
+                self.min_resp[start:stop] = np.min(amp_mat, axis=1)
+                mean_sum += np.sum(raw_mat, axis=0, dtype=np.complex128)
+                del amp_mat
+
+                if take_conjugate:
+                    np.conjugate(raw_mat, out=raw_mat)
+
+                if writer is None:
+                    self.h5_raw[start:stop, :] = raw_mat
+                else:
+                    pending_writes[buf_ind] = writer.apply_async(self.h5_raw.__setitem__,
+                                                                 ((slice(start, stop), slice(None)), raw_mat))
+            for pending in pending_writes:
+                if pending is not None:
+                    pending.get()
+        finally:
+            if writer is not None:
+                writer.close()
+                writer.join()
+            for prsr in parsers:
+                prsr.close()
+
+        self.mean_resp = np.complex64(mean_sum / max(1, numpix))
+
+        # Add zeros to main_data for the missing pixel. 
+        if add_pixel:
+            self.h5_raw[-1, :] = 0 + 0j
+
+        print('---- Finished reading files -----')
+
+    def __get_parsers(self, path_dict, udvs_steps, mode):
+        """
+        Returns the parsers for the data files that hold the provided mode of data
+
+        Parameters
+        ----------
+        path_dict : dictionary
+            Dictionary containing the absolute paths of the real and imaginary data files
+        udvs_steps : unsigned int
+            Number of UDVS steps
+        mode : String / Unicode
+            'in-field', 'out-of-field', or 'in and out-of-field'
 
+        Returns
+        -------
+        parsers : list of BEodfParser objects
+            One parser per pair of real and imaginary data files
+        udvs_steps : unsigned int
+            Number of UDVS steps in each pair of data files
+        step_size : float or unsigned int
+            Number of bins per UDVS step
+        """
         bytes_per_pix = self.h5_raw.shape[1] * 4
         step_size = self.h5_raw.shape[1] / udvs_steps
 
@@ -522,60 +657,159 @@ class BEodfTranslator(Translator):
 
             step_size = int(step_size)
 
-        rand_spectra = self.__get_random_spectra(parsers, self.h5_raw.shape[0], udvs_steps, step_size,
-                                                 num_spectra=self.num_rand_spectra)
-        take_conjugate = requires_conjugate(rand_spectra, cores=self._cores)
+        return parsers, udvs_steps, step_size
 
-        self.mean_resp = np.zeros(shape=(self.h5_raw.shape[1]), dtype=np.complex64)
-        self.max_resp = np.zeros(shape=(self.h5_raw.shape[0]), dtype=np.float32)
-        self.min_resp = np.zeros(shape=(self.h5_raw.shape[0]), dtype=np.float32)
+    @staticmethod
+    def __read_pixels(parsers, mode, start, stop, raw_mat, udvs_steps, step_size):
+        """
+        Copies a range of pixels from the data files into the provided buffer
 
-        numpix = self.h5_raw.shape[0]
-        """ 
-        Don't try to do the last step if a pixel is missing.   
-        This will be handled after the loop. 
+        Parameters
+        ----------
+        parsers : list of BEodfParser objects
+            Parsers returned by __get_parsers
+        mode : String / Unicode
+            'in-field', 'out-of-field', or 'in and out-of-field'
+        start : unsigned int
+            Index of the first pixel
+        stop : unsigned int
+            Index after the last pixel
+        raw_mat : 2D numpy complex64 array
+            Buffer of shape [stop - start, bins per pixel] to fill
+        udvs_steps : unsigned int
+            Number of UDVS steps in each pair of data files
+        step_size : unsigned int
+            Number of bins per UDVS step
         """
-        if add_pixel:
-            numpix -= 1
+        if mode == 'in and out-of-field':
+            # interleave the in-field and out-of-field UDVS steps while copying from the files
+            # we are ignoring user defined possibilities...
+            raw_3d = raw_mat.reshape(stop - start, 2 * udvs_steps, step_size)
+            for prsr, field_steps in zip(parsers, [raw_3d[:, 0::2], raw_3d[:, 1::2]]):
+                real_mat, imag_mat = prsr.get_pixels(start, stop)
+                field_steps.real = real_mat.reshape(-1, udvs_steps, step_size)
+                field_steps.imag = imag_mat.reshape(-1, udvs_steps, step_size)
+        else:
+            parsers[0].read_pixels(start, stop, out=raw_mat)  # only one parser
 
-        for pix_indx in range(numpix):
-            if self.h5_raw.shape[0] > 5:
-                if pix_indx % int(round(self.h5_raw.shape[0] / 10)) == 0:
-                    print('Reading... {} complete'.format(round(100 * pix_indx / self.h5_raw.shape[0])))
+    def __follow_data(self, path_dict, udvs_steps, mode, poll_interval=1.0, timeout=60.0):
+        """
+        Appends pixels to the H5 file as they are recorded in the data files of an ongoing acquisition.
+        Whether the data needs to be conjugated is only decided once the acquisition completes
 
-            # get the raw stream from each parser
-            pxl_data = list()
-            for prsr in parsers:
-                pxl_data.append(prsr.read_pixel())
+        Parameters
+        ----------
+        path_dict : dictionary
+            Dictionary containing the absolute paths of the real and imaginary data files
+        udvs_steps : unsigned int
+            Number of UDVS steps
+        mode : String / Unicode
+            'in-field', 'out-of-field', or 'in and out-of-field'
+        poll_interval : float, optional. Default = 1
+            Time in seconds between checks for new pixels
+        timeout : float, optional. Default = 60
+            Time in seconds without any new pixels after which the acquisition is considered to have stopped
+        """
+        print('---- following the acquisition ----------')
 
-            # interleave if both in and out of field
-            # we are ignoring user defined possibilities...
-            if mode == 'in and out-of-field':
-                in_fld = pxl_data[0]
-                out_fld = pxl_data[1]
-
-                in_fld_2 = in_fld.reshape(udvs_steps, step_size)
-                out_fld_2 = out_fld.reshape(udvs_steps, step_size)
-                raw_mat = np.empty((udvs_steps * 2, step_size), dtype=out_fld.dtype)
-                raw_mat[0::2, :] = in_fld_2
-                raw_mat[1::2, :] = out_fld_2
-                raw_vec = raw_mat.reshape(in_fld.size + out_fld.size).transpose()
-            else:
-                raw_vec = pxl_data[0]  # only one parser
-            self.max_resp[pix_indx] = np.max(np.abs(raw_vec))
-            self.min_resp[pix_indx] = np.min(np.abs(raw_vec))
-            self.mean_resp = (1 / (pix_indx + 1)) * (raw_vec + pix_indx * self.mean_resp)
-
-            if take_conjugate:
-                raw_vec = np.conjugate(raw_vec)
-            self.h5_raw[pix_indx, :] = np.complex64(raw_vec[:])
+        parsers, udvs_steps, step_size = self.__get_parsers(path_dict, udvs_steps, mode)
+
+        numpix = self.h5_raw.shape[0]
+        self.max_resp = np.zeros(shape=numpix, dtype=np.float32)
+        self.min_resp = np.zeros(shape=numpix, dtype=np.float32)
+        mean_sum = np.zeros(shape=(self.h5_raw.shape[1]), dtype=np.complex128)
+
+        # complex64 buffer and the float32 amplitudes:
+        bytes_per_row = self.h5_raw.shape[1] * (np.complex64(0).itemsize + np.float32(0).itemsize)
+        pix_per_block = get_rows_per_batch(self.h5_raw, bytes_per_row, self.max_ram, num_rows=numpix)
+        buffer = np.empty((pix_per_block, self.h5_raw.shape[1]), dtype=np.complex64)
+
+        def count_pixels():
+            for prsr in parsers:
+                prsr.refresh()
+            return min([prsr.num_complete_pixels for prsr in parsers])
+
+        def write_pixels(start, stop):
+            for blk_start in range(start, stop, pix_per_block):
+                blk_stop = min(blk_start + pix_per_block, stop)
+                raw_mat = buffer[:blk_stop - blk_start]
+                self.__read_pixels(parsers, mode, blk_start, blk_stop, raw_mat, udvs_steps, step_size)
+                amp_mat = np.abs(raw_mat)
+                self.max_resp[blk_start:blk_stop] = np.max(amp_mat, axis=1)
+                self.min_resp[blk_start:blk_stop] = np.min(amp_mat, axis=1)
+                mean_sum[:] += np.sum(raw_mat, axis=0, dtype=np.complex128)
+                self.h5_raw[blk_start:blk_stop, :] = raw_mat
+            self.h5_raw.attrs['last_pixel'] = stop
             self.h5_raw.file.flush()
+            print('Wrote {} of {} pixels'.format(stop, numpix))
 
-        # Add zeros to main_data for the missing pixel. 
-        if add_pixel:
-            self.h5_raw[-1, :] = 0 + 0j
+        try:
+            num_written = follow_acquisition(count_pixels, write_pixels, numpix, poll_interval=poll_interval,
+                                             timeout=timeout)
+            if num_written < numpix:
+                warn('Acquisition stopped after {} of {} pixels'.format(num_written, numpix))
+            self.mean_resp = np.complex64(mean_sum / max(1, num_written))
+
+            if num_written > 0:
+                # Only the recorded pixels can be chosen:
+                rand_spectra = self.__get_random_spectra(parsers, num_written, udvs_steps, step_size,
+                                                         num_spectra=self.num_rand_spectra)
+                if requires_conjugate(rand_spectra, cores=self._cores):
+                    print('Taking conjugate to ensure positive Quality factors')
+                    for start in range(0, num_written, pix_per_block):
+                        stop = min(start + pix_per_block, num_written)
+                        self.h5_raw[start:stop, :] = np.conjugate(self.h5_raw[start:stop, :])
+                    self.mean_resp = np.conjugate(self.mean_resp)
+                self.h5_raw.file.flush()
+        finally:
+            for prsr in parsers:
+                prsr.close()
 
-        print('---- Finished reading files -----')
+        print('---- Finished following the acquisition -----')
+
+    def __get_bins_per_pixel(self, parm_dict, path_dict, is_beps, udvs_denom, tot_bins_multiplier,
+                             ignored_plt_grps):
+        """
+        Calculates the number of bins recorded per pixel in each data file from the parameters
+        rather than from the size of the data files, which may still be growing
+
+        Parameters
+        ----------
+        parm_dict : dict
+            Experimental parameters
+        path_dict : dict
+            Dictionary of data files to be read
+        is_beps : Boolean
+            Whether or not this is BEPS or BE-Line
+        udvs_denom : unsigned int
+            Number of UDVS steps in the table per UDVS step in the data
+        tot_bins_multiplier : unsigned int
+            Number of pairs of data files (in-field and out-of-field) that are combined
+        ignored_plt_grps : list of str
+            Plot groups that are not recorded in the data files
+
+        Returns
+        -------
+        bins_per_pix : unsigned int
+            Number of bins per pixel in each data file
+        """
+        if 'parm_mat' in path_dict.keys():
+            bin_inds = self.__read_parms_mat(path_dict['parm_mat'], is_beps)[0]
+        elif 'old_mat_parms' in path_dict.keys():
+            bin_inds = self.__read_old_mat_be_vecs(path_dict['old_mat_parms'])[0]
+        else:
+            raise IOError('The parms .mat file is required to follow an acquisition')
+
+        bins_per_step = np.size(bin_inds)
+        if not is_beps:
+            return bins_per_step
+
+        udvs_labs, udvs_units, udvs_mat = self.__build_udvs_table(parm_dict)
+        udvs_mat = trimUDVS(udvs_mat, udvs_labs, udvs_units, ignored_plt_grps)[0]
+        if self.expt_type == 2:
+            # Bins are recorded for both excitation waveforms:
+            bins_per_step *= 2
+        return int(bins_per_step * udvs_mat.shape[0] // (udvs_denom * tot_bins_multiplier))
 
     def __quick_read_data(self, real_path, imag_path, udvs_steps):
         """
@@ -598,29 +832,24 @@ class BEodfTranslator(Translator):
         rand_spectra = self.__get_random_spectra([parser], self.h5_raw.shape[0], udvs_steps, step_size,
                                                  num_spectra=self.num_rand_spectra)
         take_conjugate = requires_conjugate(rand_spectra, cores=self._cores)
-        raw_vec = parser.read_all_data()
+        # Copy straight from the memory-mapped files into the buffer that will be written:
+        raw_mat = np.zeros(self.h5_raw.shape, dtype=np.complex64)
+        raw_vec = parser.read_all_data(out=raw_mat.reshape(-1))
+        parser.close()
         if take_conjugate:
             print('Taking conjugate to ensure positive Quality factors')
-            raw_vec = np.conjugate(raw_vec)
+            np.conjugate(raw_mat, out=raw_mat)
 
-        if raw_vec.shape != np.prod(self.h5_raw.shape):
-            percentage_padded = 100 * (np.prod(self.h5_raw.shape) - raw_vec.shape) / np.prod(self.h5_raw.shape)
+        if raw_vec.size != raw_mat.size:
+            percentage_padded = 100 * (raw_mat.size - raw_vec.size) / raw_mat.size
             print('Warning! Raw data length {} is not matching placeholder length {}. '
-                  'Padding zeros for {}% of the data!'.format(raw_vec.shape, np.prod(self.h5_raw.shape), percentage_padded))
-
-            padded_raw_vec = np.zeros(np.prod(self.h5_raw.shape), dtype = np.complex64)
-
-            padded_raw_vec[:raw_vec.shape[0]] = raw_vec
-            raw_mat = padded_raw_vec.reshape(self.h5_raw.shape[0], self.h5_raw.shape[1])
-        else:
-            raw_mat = raw_vec.reshape(self.h5_raw.shape[0], self.h5_raw.shape[1])
-
+                  'Padding zeros for {}% of the data!'.format(raw_vec.size, raw_mat.size, percentage_padded))
 
         # Write to the h5 dataset:
         self.mean_resp = np.mean(raw_mat, axis=0)
         self.max_resp = np.amax(np.abs(raw_mat), axis=0)
         self.min_resp = np.amin(np.abs(raw_mat), axis=0)
-        self.h5_raw[:, :] = np.complex64(raw_mat)
+        self.h5_raw[:, :] = raw_mat
         self.h5_raw.file.flush()
 
         print('---- Finished reading files -----')
@@ -1200,7 +1429,8 @@ class BEodfTranslator(Translator):
         chosen_spectra : 2D complex numpy array
             spectrogram or spectra arranged as [instance, spectrum]
         """
-        num_pixels = int(num_pixels)
+        # Missing pixels (eg - the last pixel of an aborted scan) cannot be selected
+        num_pixels = min([int(num_pixels)] + [prsr.num_complete_pixels for prsr in parsers])
         num_udvs_steps = int(num_udvs_steps)
         num_bins = int(num_bins)
 
@@ -1233,6 +1463,10 @@ class BEodfParser(object):
         """
         This object reads the two binary data files (real and imaginary data).
         Use separate parser instances for in-field and out-field data sets.
+
+        Both files are memory-mapped so that blocks of pixels can be copied straight
+        into the caller's buffers without intermediate arrays. Files that are still being
+        written can be mapped again via refresh() to access the newly recorded pixels.
         
         Parameters 
         --------------------
@@ -1241,17 +1475,95 @@ class BEodfParser(object):
         imag_path : String / Unicode
             absolute path of the binary file containing the imaginary portion of the data
         num_pix : unsigned int
-            Number of pixels in this image
+            Number of pixels in this image. If None, inferred from the size of the files
         bytes_per_pix : unsigned int
             Number of bytes per pixel
         """
-        self.f_real = open(real_path, "rb")
-        self.f_imag = open(imag_path, "rb")
-
-        self.__num_pix__ = num_pix
+        self.__real_path__ = real_path
+        self.__imag_path__ = imag_path
         self.__bytes_per_pix__ = bytes_per_pix
+        self.__pts_per_pix__ = int(bytes_per_pix // 4)
+        self.refresh()
+        if num_pix is None:
+            num_pix = self.__num_values__ // self.__pts_per_pix__
+        self.__num_pix__ = num_pix
         self.__pix_indx__ = 0
 
+    def refresh(self):
+        """
+        Maps both files again so that any values appended to them since they were last mapped can be read.
+        Views returned by get_pixels before this call remain valid
+        """
+        self.__real_mmap__ = map_float32_file(self.__real_path__)
+        self.__imag_mmap__ = map_float32_file(self.__imag_path__)
+        self.__num_values__ = min(self.__real_mmap__.size, self.__imag_mmap__.size)
+
+    @property
+    def num_values(self):
+        """
+        Number of complex values present in the file pair
+        """
+        return self.__num_values__
+
+    @property
+    def num_complete_pixels(self):
+        """
+        Number of pixels fully present in the file pair
+        """
+        return min(self.__num_pix__, self.__num_values__ // self.__pts_per_pix__)
+
+    def get_pixels(self, start, stop):
+        """
+        Returns read-only views of the real and imaginary data of a range of pixels
+
+        Parameters
+        ----------
+        start : unsigned int
+            Index of the first pixel
+        stop : unsigned int
+            Index after the last pixel
+
+        Returns
+        -------
+        real_mat : 2D numpy.memmap
+            Real portion of the data arranged as [pixel, bin]
+        imag_mat : 2D numpy.memmap
+            Imaginary portion of the data arranged as [pixel, bin]
+        """
+        if start < 0 or stop > self.num_complete_pixels or start > stop:
+            raise ValueError('Pixels {} - {} are outside the {} pixels in the files'
+                             '.'.format(start, stop, self.num_complete_pixels))
+        sl = slice(start * self.__pts_per_pix__, stop * self.__pts_per_pix__)
+        return (self.__real_mmap__[sl].reshape(-1, self.__pts_per_pix__),
+                self.__imag_mmap__[sl].reshape(-1, self.__pts_per_pix__))
+
+    def read_pixels(self, start, stop, out=None):
+        """
+        Copies the data of a range of pixels into a complex64 buffer
+
+        Parameters
+        ----------
+        start : unsigned int
+            Index of the first pixel
+        stop : unsigned int
+            Index after the last pixel
+        out : 2D numpy complex64 array, optional
+            Buffer of shape [stop - start, bins per pixel] to fill. Allocated if not provided
+
+        Returns
+        -------
+        out : 2D numpy complex64 array
+            Data arranged as [pixel, bin]
+        """
+        real_mat, imag_mat = self.get_pixels(start, stop)
+        if out is None:
+            out = np.empty(real_mat.shape, dtype=np.complex64)
+        if out.dtype != np.complex64 or out.shape != real_mat.shape:
+            raise ValueError('out should be a complex64 array of shape {}'.format(real_mat.shape))
+        out.real = real_mat
+        out.imag = imag_mat
+        return out
+
     def read_pixel(self):
         """
         Returns the content of the next pixel
@@ -1262,60 +1574,49 @@ class BEodfParser(object):
             Content of one pixel's data
         """
         if self.__num_pix__ is not None:
-            if self.__pix_indx__ is self.__num_pix__:
+            if self.__pix_indx__ == self.__num_pix__:
                 warn('BEodfParser - No more pixels to read!')
                 return None
 
-        self.f_real.seek(self.__pix_indx__ * self.__bytes_per_pix__, 0)
-        real_vec = np.fromstring(self.f_real.read(self.__bytes_per_pix__), dtype='f')
-
-        self.f_imag.seek(self.__pix_indx__ * self.__bytes_per_pix__, 0)
-        imag_vec = np.fromstring(self.f_imag.read(self.__bytes_per_pix__), dtype='f')
-
-        raw_vec = np.zeros(len(real_vec), dtype=np.complex64)
-        raw_vec.real = real_vec
-        raw_vec.imag = imag_vec
+        raw_vec = self.read_pixels(self.__pix_indx__, self.__pix_indx__ + 1)[0]
 
         self.__pix_indx__ += 1
 
-        if self.__pix_indx__ is self.__num_pix__:
-            self.f_real.close()
-            self.f_imag.close()
-
         return raw_vec
 
-    def read_all_data(self):
+    def read_all_data(self, out=None):
         """
         Returns the complete contents of the file pair
 
+        Parameters
+        ----------
+        out : 1D numpy complex64 array, optional
+            Buffer with at least `num_values` elements to fill. Allocated if not provided
+
         Returns 
         -------
         raw_vec : 1D numpy complex64 array
             Entire content of the file pair
         """
-        self.f_real.seek(0, 0)
-        self.f_imag.seek(0, 0)
-
-        d_real = np.fromstring(self.f_real.read(), dtype='f')
-        d_imag = np.fromstring(self.f_imag.read(), dtype='f')
-
-        full_file = d_real + 1j * d_imag
-
-        self.f_real.close()
-        self.f_imag.close()
+        if out is None:
+            out = np.empty(self.__num_values__, dtype=np.complex64)
+        if out.dtype != np.complex64 or out.ndim != 1 or out.size < self.__num_values__:
+            raise ValueError('out should be a 1D complex64 array with at least {} elements'
+                             '.'.format(self.__num_values__))
+        raw_vec = out[:self.__num_values__]
+        raw_vec.real = self.__real_mmap__[:self.__num_values__]
+        raw_vec.imag = self.__imag_mmap__[:self.__num_values__]
 
-        return full_file
+        return raw_vec
 
     def seek_to_pixel(self, pixel_ind):
         """
+        Sets the pixel that will be returned by the next call to read_pixel
 
         Parameters
         ----------
-        pixel_ind
-
-        Returns
-        -------
-
+        pixel_ind : unsigned int
+            Index of the pixel
         """
         if self.__num_pix__ is not None:
             pixel_ind = min(pixel_ind, self.__num_pix__)
@@ -1323,8 +1624,15 @@ class BEodfParser(object):
 
     def reset(self):
         """
-
+        Returns to the first pixel
         """
-        self.f_real.seek(0, 0)
-        self.f_imag.seek(0, 0)
         self.__pix_indx__ = 0
+
+    def close(self):
+        """
+        Releases the memory maps of both files. The files are closed once all views
+        returned by get_pixels are also released
+        """
+        self.__real_mmap__ = None
+        self.__imag_mmap__ = None
+
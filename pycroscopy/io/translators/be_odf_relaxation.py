@@ -14,11 +14,11 @@ import numpy as np  # For array operations
 from scipy.io.matlab import loadmat  # To load parameters stored in Matlab .mat file
 import h5py
 
-from .df_utils.be_utils import trimUDVS, getSpectroscopicParmLabel, generatePlotGroups, createSpecVals, maxReadPixels, \
-    nf32
+from .df_utils.be_utils import trimUDVS, getSpectroscopicParmLabel, generatePlotGroups, createSpecVals, nf32
 from pyUSID.io.translator import Translator
 from pyUSID.io.write_utils import INDICES_DTYPE, Dimension
 from pyUSID.io.hdf_utils import create_indexed_group, write_main_dataset, write_simple_attrs
+from ..chunking import plan_chunks
 
 
 class BEodfRelaxationTranslator(Translator):
@@ -227,13 +227,6 @@ class BEodfRelaxationTranslator(Translator):
         This assumption is fine since we almost do not handle any user defined cases
         """
 
-        """
-        New Method for chunking the Main_Data dataset.  Chunking is now done in N-by-N squares of UDVS steps by pixels.
-        N is determined dinamically based on the dimensions of the dataset.  Currently it is set such that individual
-        chunks are less than 10kB in size.
-        
-        Chris Smith -- csmith55@utk.edu
-        """
         pos_dims = [Dimension('X', 'nm', num_cols), Dimension('Y', 'nm', num_rows)]
 
         # Create Spectroscopic Values and Spectroscopic Values Labels datasets
@@ -249,16 +242,13 @@ class BEodfRelaxationTranslator(Translator):
                                             spec_vals_units[row_ind],
                                             spec_vals[row_ind]))
 
-        pixel_chunking = maxReadPixels(10240, num_pix * num_actual_udvs_steps,
-                                       bins_per_step, np.dtype('complex64').itemsize)
-        chunking = np.floor(np.sqrt(pixel_chunking))
-        chunking = max(1, chunking)
-        chunking = min(num_actual_udvs_steps, num_pix, chunking)
+        # Raw data is fit one pixel at a time but also visualized as maps per UDVS step. Chunks hold whole UDVS steps:
+        raw_chunks = plan_chunks((num_pix, tot_bins), np.complex64, 'balanced', unit_chunks=(1, bins_per_step)).chunks
         self.h5_main = write_main_dataset(chan_grp, (num_pix, tot_bins), 'Raw_Data',
                                           'Piezoresponse', 'V',
                                           pos_dims, spec_dims,
                                           dtype=np.complex64,
-                                          chunks=(chunking, chunking * bins_per_step),
+                                          chunks=raw_chunks,
                                           compression='gzip')
 
         self.mean_resp = np.zeros(shape=(self.ds_main.shape[1]), dtype=np.complex64)
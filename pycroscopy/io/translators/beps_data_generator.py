@@ -11,7 +11,7 @@ from pyUSID.io.hdf_utils import get_h5_obj_refs, link_as_main, get_attr
 from pyUSID.io.dtype_utils import stack_real_to_compound
 from pyUSID.io.translator import Translator
 from pyUSID import USIDataset
-from pyUSID.io.write_utils import Dimension, calc_chunks
+from pyUSID.io.write_utils import Dimension
 from pyUSID.io.image import read_image
 from ...analysis.utils.be_loop import loop_fit_function
 from ...analysis.utils.be_sho import SHOfunc
@@ -24,6 +24,7 @@ from .df_utils.image_utils import no_bin
 from ..hdf_writer import HDFwriter
 from ..write_utils import build_reduced_spec_dsets, build_ind_val_dsets
 from ..virtual_data import VirtualGroup, VirtualDataset
+from ..chunking import plan_chunks
 
 
 class FakeBEPSGenerator(Translator):
@@ -425,10 +426,8 @@ class FakeBEPSGenerator(Translator):
         # Create the Position and Spectroscopic datasets for the Raw Data
         ds_pos_inds, ds_pos_vals, ds_spec_inds, ds_spec_vals = self._build_ancillary_datasets()
 
-        raw_chunking = calc_chunks([self.n_pixels,
-                                    self.n_spec_bins],
-                                   np.complex64(0).itemsize,
-                                   unit_chunks=[1, self.n_bins])
+        raw_chunking = plan_chunks([self.n_pixels, self.n_spec_bins], np.complex64, 'balanced',
+                                   unit_chunks=[1, self.n_bins]).chunks
 
         ds_raw_data = VirtualDataset('Raw_Data', data=None,
                                      maxshape=[self.n_pixels, self.n_spec_bins],
@@ -475,10 +474,7 @@ class FakeBEPSGenerator(Translator):
                                                                       keep_dim=sho_spec_labs != 'Frequency',
                                                                       step_starts=sho_spec_starts)
 
-        sho_chunking = calc_chunks([self.n_pixels,
-                                    self.n_sho_bins],
-                                   sho32.itemsize,
-                                   unit_chunks=[1, 1])
+        sho_chunking = plan_chunks([self.n_pixels, self.n_sho_bins], sho32, 'balanced').chunks
         ds_sho_fit = VirtualDataset('Fit', data=None,
                                     maxshape=[self.n_pixels, self.n_sho_bins],
                                     dtype=sho32,
@@ -524,9 +520,7 @@ class FakeBEPSGenerator(Translator):
                                                                         step_starts=loop_spec_starts)
 
         # Create the loop fit and guess MicroDatasets
-        loop_chunking = calc_chunks([self.n_pixels, self.n_loops],
-                                    loop_fit32.itemsize,
-                                    unit_chunks=[1, 1])
+        loop_chunking = plan_chunks([self.n_pixels, self.n_loops], loop_fit32, 'balanced').chunks
         ds_loop_fit = VirtualDataset('Fit', data=None,
                                      maxshape=[self.n_pixels, self.n_loops],
                                      dtype=loop_fit32,
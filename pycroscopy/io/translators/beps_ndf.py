@@ -16,14 +16,17 @@ import numpy as np
 import xlrd as xlreader  # To read the UDVS spreadsheet
 from scipy.io.matlab import loadmat  # To load parameters stored in Matlab .mat file
 
+from .df_utils.base_utils import gen_ordered_results, follow_acquisition, map_float32_file
 from .df_utils.be_utils import trimUDVS, getSpectroscopicParmLabel, parmsToDict, generatePlotGroups, \
     normalizeBEresponse, createSpecVals, nf32
 from pyUSID.io.translator import Translator
-from pyUSID.io.write_utils import make_indices_matrix, VALUES_DTYPE, INDICES_DTYPE, calc_chunks
+from pyUSID.io.write_utils import make_indices_matrix, VALUES_DTYPE, INDICES_DTYPE
 from pyUSID.io.hdf_utils import get_h5_obj_refs, link_h5_objects_as_attrs
 from pyUSID.io.usi_data import USIDataset
+from pyUSID.processing.comp_utils import recommend_cpu_cores
 from ..hdf_writer import HDFwriter
 from ..virtual_data import VirtualGroup, VirtualDataset
+from ..chunking import plan_chunks
 
 if sys.version_info.major == 3:
     unicode = str
@@ -38,6 +41,7 @@ class BEPSndfTranslator(Translator):
 
     def __init__(self, *args, **kwargs):
         super(BEPSndfTranslator, self).__init__(*args, **kwargs)
+        self._cores = kwargs.pop('cores', None)
         self.debug = False
         self.parm_dict = dict()
         self.field_mode = None
@@ -104,7 +108,8 @@ class BEPSndfTranslator(Translator):
             return None
         return parm_filepath
 
-    def translate(self, data_filepath, show_plots=True, save_plots=True, do_histogram=False, debug=False):
+    def translate(self, data_filepath, show_plots=True, save_plots=True, do_histogram=False, debug=False,
+                  follow=False, poll_interval=1.0, timeout=60.0):
         """
         The main function that translates the provided file into a .h5 file
         
@@ -120,6 +125,15 @@ class BEPSndfTranslator(Translator):
             Whether or not to generate and save 2D histograms of the raw data
         debug : Boolean (Optional. default is false)
             Whether or not to print log statements
+        follow : Boolean (Optional. Default is False)
+            Set to True to translate an acquisition that is still in progress. The first pixel must already have
+            been recorded. Pixels are appended to Raw_Data as soon as they are recorded in all data files, and the
+            'last_pixel' attribute of Raw_Data holds the number of pixels written to it so far. The plot groups
+            and histograms are written once the acquisition completes
+        poll_interval : float (Optional. Default is 1)
+            Time in seconds between checks for new pixels when following an acquisition
+        timeout : float (Optional. Default is 60)
+            Time in seconds without any new pixels after which the acquisition is considered to have stopped
             
         Returns
         --------------
@@ -191,11 +205,19 @@ class BEPSndfTranslator(Translator):
             print('BEndfTranslator: Preparing to set up parsers')
 
         # Preparing objects to parse the file(s)
-        parsers = self.__assemble_parsers()
+        parsers = self.__assemble_parsers(follow=follow)
 
         # Gathering some basic details before parsing the files:
-        self.max_pixels = parsers[0].get_num_pixels()
-        s_pixels = np.array(parsers[0].get_spatial_pixels())
+        if follow:
+            # Only the first pixel may have been recorded so far. Laser spot spectroscopy cannot be inferred from it
+            if parsers[0].get_num_pixels() == 0:
+                raise ValueError('No pixels found in {}'.format(parsers[0].get_file_path()))
+            first_pix = parsers[0].get_pixel(0)
+            s_pixels = np.array([1, first_pix.num_z_steps, first_pix.num_x_steps, first_pix.num_y_steps])
+            self.max_pixels = int(np.prod(s_pixels))
+        else:
+            self.max_pixels = parsers[0].get_num_pixels()
+            s_pixels = np.array(parsers[0].get_spatial_pixels())
         self.pos_labels = ['Laser Spot', 'Z', 'Y', 'X']
         self.pos_labels = [self.pos_labels[i] for i in np.where(s_pixels > 1)[0]]
         self.pos_mat = make_indices_matrix(s_pixels[np.argwhere(s_pixels > 1)].squeeze())
@@ -228,13 +250,15 @@ class BEPSndfTranslator(Translator):
         ########################################################
         # Reading and parsing the .dat file(s) 
 
-        self._read_data(parsers, unique_waves, show_plots, save_plots, do_histogram)
+        self._read_data(parsers, unique_waves, show_plots, save_plots, do_histogram, follow=follow,
+                        poll_interval=poll_interval, timeout=timeout)
 
         self.hdf.close()
 
         return h5_path
 
-    def _read_data(self, parsers, unique_waves, show_plots, save_plots, do_histogram):
+    def _read_data(self, parsers, unique_waves, show_plots, save_plots, do_histogram, follow=False,
+                   poll_interval=1.0, timeout=60.0):
         """
         Loops over all pixels and reads the data into the HDF5 file.
 
@@ -250,6 +274,13 @@ class BEPSndfTranslator(Translator):
             Should generated plots be saved to disk during translation.  Default True
         do_histogram : Boolean, optional
             Should histograms be generated for the different plot groups.  Default False
+        follow : Boolean, optional
+            Should pixels be appended as they are recorded in an ongoing acquisition.  Default False
+        poll_interval : float, optional
+            Time in seconds between checks for new pixels when following an acquisition.  Default 1
+        timeout : float, optional
+            Time in seconds without any new pixels after which the acquisition is considered to have stopped.
+            Default 60
 
         Returns
         -------
@@ -259,41 +290,145 @@ class BEPSndfTranslator(Translator):
         print('Reading data file(s)')
         self.dset_index = 0
         self.ds_pixel_start_indx = 0
-        for pixel_ind in range(self.max_pixels):
 
-            if (100.0 * (pixel_ind + 1) / self.max_pixels) % 10 == 0:
-                print('{} % complete'.format(int(100 * (pixel_ind + 1) / self.max_pixels)))
+        # The BE waveform used for normalization only depends on the wave type
+        bin_ffts = list()
+        for prsr in parsers:
+            wave_type = prsr.get_wave_type()
+            bin_fft = None
+            if self.parm_dict['VS_mode'] == 'AC modulation mode with time reversal' and \
+                    self.BE_bin_inds is not None:
+                if np.sign(wave_type) == -1:
+                    bin_fft = self.BE_wave[self.BE_bin_inds]
+                elif np.sign(wave_type) == 1:
+                    bin_fft = self.BE_wave_rev[self.BE_bin_inds]
+            bin_ffts.append(bin_fft)
+
+        if follow:
+            self.__follow_pixels(parsers, bin_ffts, unique_waves, show_plots, save_plots, do_histogram,
+                                 poll_interval=poll_interval, timeout=timeout)
+            return
+
+        # Blocks of pixels are parsed in worker processes and handed back in order:
+        cores = recommend_cpu_cores(int(self.max_pixels), requested_cores=self._cores)
+        pixel_iter = _iter_ndf_pixels(parsers, bin_ffts, cores=cores)
+
+        h5_refs = None
+        prev_pixels = None
+        try:
+            for pixel_ind in range(self.max_pixels):
+
+                if (100.0 * (pixel_ind + 1) / self.max_pixels) % 10 == 0:
+                    print('{} % complete'.format(int(100 * (pixel_ind + 1) / self.max_pixels)))
+
+                # First read the next pixel from all parsers:
+                current_pixels = next(pixel_iter, None)
+                if current_pixels is None:
+                    raise ValueError('The data files only contain {} of the {} pixels expected from the parameters. '
+                                     'Use follow=True to translate an acquisition that is still in progress'
+                                     ''.format(pixel_ind, self.max_pixels))
+
+                h5_refs = self.__write_pixel(pixel_ind, current_pixels, prev_pixels, h5_refs, unique_waves,
+                                             show_plots, save_plots, do_histogram)
+
+                prev_pixels = current_pixels
+        finally:
+            pixel_iter.close()
+        self.__close_meas_group(h5_refs, show_plots, save_plots, do_histogram)
+
+    def __follow_pixels(self, parsers, bin_ffts, unique_waves, show_plots, save_plots, do_histogram,
+                        poll_interval=1.0, timeout=60.0):
+        """
+        Appends pixels to the HDF5 file as they are recorded in the data files of an ongoing acquisition.
+
+        Parameters
+        ----------
+        parsers : list of BEPSndfParser
+            List of parser object that will read the pixel data from the files
+        bin_ffts : list
+            FFT of the BE waveform (or None) to use for each parser
+        unique_waves : numpy.ndarray of int
+            Array denoting the unique waveforms in the experiment
+        show_plots : Boolean
+            Should generated plots be shown during translation
+        save_plots : Boolean
+            Should generated plots be saved to disk during translation
+        do_histogram : Boolean
+            Should histograms be generated for the different plot groups
+        poll_interval : float, optional
+            Time in seconds between checks for new pixels.  Default 1
+        timeout : float, optional
+            Time in seconds without any new pixels after which the acquisition is considered to have stopped.
+            Default 60
+        """
+        # The latest pixel and measurement group, carried between batches:
+        state = {'h5_refs': None, 'prev_pixels': None}
 
-            # First read the next pixel from all parsers:
-            current_pixels = {}
+        def count_pixels():
             for prsr in parsers:
-                wave_type = prsr.get_wave_type()
-                if self.parm_dict['VS_mode'] == 'AC modulation mode with time reversal' and \
-                        self.BE_bin_inds is not None:
-                    if np.sign(wave_type) == -1:
-                        bin_fft = self.BE_wave[self.BE_bin_inds]
-                    elif np.sign(wave_type) == 1:
-                        bin_fft = self.BE_wave_rev[self.BE_bin_inds]
-                else:
-                    bin_fft = None
-
-                current_pixels[wave_type] = prsr.read_pixel(bin_fft)
-
-            if pixel_ind == 0:
-                h5_refs = self.__initialize_meas_group(self.max_pixels, current_pixels)
-                prev_pixels = current_pixels  # This is here only to avoid annoying warnings.
-            else:
-                if current_pixels[unique_waves[0]].is_different_from(prev_pixels[unique_waves[0]]):
-                    # Some parameter has changed. Write current group and make new group
-                    self.__close_meas_group(h5_refs, show_plots, save_plots, do_histogram)
-                    self.ds_pixel_start_indx = pixel_ind
-                    h5_refs = self.__initialize_meas_group(self.max_pixels - pixel_ind, current_pixels)
+                prsr.refresh()
+            return min([prsr.get_num_pixels() for prsr in parsers])
+
+        def write_pixels(start, stop):
+            for pixel_ind in range(start, stop):
+                current_pixels = dict((prsr.get_wave_type(), prsr.get_pixel(pixel_ind, bin_fft))
+                                      for prsr, bin_fft in zip(parsers, bin_ffts))
+                state['h5_refs'] = self.__write_pixel(pixel_ind, current_pixels, state['prev_pixels'],
+                                                      state['h5_refs'], unique_waves, show_plots, save_plots,
+                                                      do_histogram)
+                state['prev_pixels'] = current_pixels
+            self.ds_main.attrs['last_pixel'] = self.ds_pixel_index
+            self.hdf.file.flush()
+            print('Wrote {} of {} pixels'.format(stop, self.max_pixels))
+
+        num_written = follow_acquisition(count_pixels, write_pixels, self.max_pixels, poll_interval=poll_interval,
+                                         timeout=timeout)
+        if num_written < self.max_pixels:
+            warn('Acquisition stopped after {} of {} pixels'.format(num_written, self.max_pixels))
+        if state['h5_refs'] is not None:
+            self.__close_meas_group(state['h5_refs'], show_plots, save_plots, do_histogram)
+
+    def __write_pixel(self, pixel_ind, current_pixels, prev_pixels, h5_refs, unique_waves, show_plots, save_plots,
+                      do_histogram):
+        """
+        Appends a pixel to the current measurement group, starting a new measurement group if this pixel was
+        acquired with different parameters
 
-            # print('reading Pixel {} of {}'.format(pixel_ind,self.max_pixels))
-            self.__append_pixel_data(current_pixels)
+        Parameters
+        ----------
+        pixel_ind : unsigned int
+            Index of the pixel
+        current_pixels : dict of BEPSndfPixel objects
+            Parsed data of this pixel keyed by wave type
+        prev_pixels : dict of BEPSndfPixel objects
+            Parsed data of the previous pixel keyed by wave type. Not used for the first pixel
+        h5_refs : list of HDF references
+            References to the datasets of the current measurement group. Not used for the first pixel
+        unique_waves : numpy.ndarray of int
+            Array denoting the unique waveforms in the experiment
+        show_plots : Boolean
+            Should generated plots be shown during translation
+        save_plots : Boolean
+            Should generated plots be saved to disk during translation
+        do_histogram : Boolean
+            Should histograms be generated for the different plot groups
 
-            prev_pixels = current_pixels
-        self.__close_meas_group(h5_refs, show_plots, save_plots, do_histogram)
+        Returns
+        -------
+        h5_refs : list of HDF references
+            References to the datasets of the measurement group that this pixel was written to
+        """
+        if pixel_ind == 0:
+            h5_refs = self.__initialize_meas_group(self.max_pixels, current_pixels)
+        elif current_pixels[unique_waves[0]].is_different_from(prev_pixels[unique_waves[0]]):
+            # Some parameter has changed. Write current group and make new group
+            self.__close_meas_group(h5_refs, show_plots, save_plots, do_histogram)
+            self.ds_pixel_start_indx = pixel_ind
+            h5_refs = self.__initialize_meas_group(self.max_pixels - pixel_ind, current_pixels)
+
+        # print('reading Pixel {} of {}'.format(pixel_ind,self.max_pixels))
+        self.__append_pixel_data(current_pixels)
+        return h5_refs
 
     ###################################################################################################
 
@@ -530,9 +665,8 @@ class BEPSndfTranslator(Translator):
         '''
         max_bins_per_pixel = np.max(list(pixel_bins.values()))
 
-        beps_chunks = calc_chunks([num_pix, tot_pts],
-                                  np.complex64(0).itemsize,
-                                  unit_chunks=(1, max_bins_per_pixel))
+        beps_chunks = plan_chunks([num_pix, tot_pts], np.complex64, 'balanced',
+                                  unit_chunks=(1, max_bins_per_pixel)).chunks
         ds_main_data = VirtualDataset('Raw_Data',
                                       np.zeros(shape=(1, tot_pts), dtype=np.complex64),
                                       chunking=beps_chunks,
@@ -717,9 +851,15 @@ class BEPSndfTranslator(Translator):
 
     ###################################################################################################
 
-    def __assemble_parsers(self):
+    def __assemble_parsers(self, follow=False):
         """
         Returns a list of BEPSndfParser objects per excitation wave type
+
+        Parameters
+        ----------
+        follow : Boolean, optional. Default = False
+            Whether or not the files are still being written. If so, the files are neither scouted nor is
+            their index of pixels cached
         
         Returns
         ---------
@@ -737,7 +877,7 @@ class BEPSndfTranslator(Translator):
             if not path.isfile(datapath):
                 raise LookupError('Error!!: {}expected but not found!'.format(filename))
                 # return
-            parsers.append(BEPSndfParser(datapath, wave_type))
+            parsers.append(BEPSndfParser(datapath, wave_type, scout=not follow, use_cache=not follow))
         return parsers
 
     # ##################################################################################################
@@ -876,6 +1016,128 @@ class BEPSndfTranslator(Translator):
         return np.array(uniq)
 
 
+def _index_ndf_pixels(data_vec, max_run=2 ** 16, warn_incomplete=True):
+    """
+    Finds the offset and length of every pixel in the float32 stream of a BEPS new data format file.
+
+    Each pixel starts with its own length. Runs of pixels of equal length are validated with a single
+    vectorized look-up so the file is never walked one pixel at a time unless every pixel differs in length.
+
+    Parameters
+    ----------
+    data_vec : 1D numpy.float32 array or numpy.memmap
+        Contents of the .dat file
+    max_run : unsigned int, optional
+        Maximum number of pixels validated at once
+    warn_incomplete : bool, optional. Default = True
+        Whether or not to warn about an incomplete last pixel. A file that is still being written is expected
+        to end with an incomplete pixel
+
+    Returns
+    -------
+    offsets : 1D numpy int64 array
+        Index of the first element of each pixel within data_vec
+    lengths : 1D numpy int64 array
+        Number of elements in each pixel
+    """
+    num_vals = data_vec.size
+    offsets = list()
+    lengths = list()
+    start = 0
+    while start < num_vals:
+        pix_len = data_vec[start]
+        if pix_len < 1 or pix_len % 1 != 0:
+            raise ValueError('Invalid pixel length: {} at byte {}'.format(pix_len, start * 4))
+        pix_len = int(pix_len)
+        # Assume a run of pixels of this length and find where the assumption breaks:
+        candidates = np.arange(start, min(num_vals, start + pix_len * max_run), pix_len, dtype=np.int64)
+        mismatch = np.flatnonzero(data_vec[candidates] != pix_len)
+        if mismatch.size > 0:
+            candidates = candidates[:mismatch[0]]
+        offsets.append(candidates)
+        lengths.append(np.full(candidates.size, pix_len, dtype=np.int64))
+        start = int(candidates[-1]) + pix_len
+
+    offsets = np.concatenate(offsets) if len(offsets) > 0 else np.zeros(0, dtype=np.int64)
+    lengths = np.concatenate(lengths) if len(lengths) > 0 else np.zeros(0, dtype=np.int64)
+    if offsets.size > 0 and offsets[-1] + lengths[-1] > num_vals:
+        if warn_incomplete:
+            warn('BEPS NDF Parser - the last pixel is incomplete and will be ignored')
+        offsets = offsets[:-1]
+        lengths = lengths[:-1]
+    return offsets, lengths
+
+
+def _parse_ndf_pixels(file_path, wave_type, offsets, lengths, bin_fft=None):
+    """
+    Parses the pixels at the provided locations in a BEPS new data format file.
+    Module-level so that it can be executed in worker processes.
+
+    Parameters
+    ----------
+    file_path : string or unicode
+        Absolute path of the .dat file
+    wave_type : int
+        Integer value signifying type of the excitation waveform
+    offsets : 1D array-like of unsigned int
+        Index (in float32 elements) of the first element of each pixel
+    lengths : 1D array-like of unsigned int
+        Number of float32 elements in each pixel
+    bin_fft : 1D complex numpy array, optional
+        FFT of the BE waveform used to normalize the response
+
+    Returns
+    -------
+    pixels : list of BEPSndfPixel objects
+    """
+    data_vec = np.memmap(file_path, dtype=np.float32, mode='r')
+    return [BEPSndfPixel(np.array(data_vec[offset: offset + length]), abs(wave_type), bin_fft)
+            for offset, length in zip(offsets, lengths)]
+
+
+def _iter_ndf_pixels(parsers, bin_ffts, cores=1, pix_per_task=64):
+    """
+    Yields the parsed pixels from all parsers in order, optionally parsing blocks of pixels in worker processes
+
+    Parameters
+    ----------
+    parsers : list of BEPSndfParser objects
+        One parser per excitation wave type
+    bin_ffts : list
+        FFT of the BE waveform (or None) to use for each parser
+    cores : unsigned int, optional. Default = 1
+        Number of worker processes. Pixels are parsed in this process if 1
+    pix_per_task : unsigned int, optional. Default = 64
+        Number of pixels parsed by a worker at a time
+
+    Returns
+    -------
+    current_pixels : dict
+        BEPSndfPixel objects of the next spatial pixel keyed by wave type
+    """
+    num_pix = min([prsr.get_num_pixels() for prsr in parsers])
+    tasks = list()
+    for start in range(0, num_pix, pix_per_task):
+        stop = min(start + pix_per_task, num_pix)
+        for prsr, bin_fft in zip(parsers, bin_ffts):
+            offsets, lengths = prsr.get_pixel_offsets()
+            tasks.append((prsr.get_file_path(), prsr.get_wave_type(), offsets[start:stop], lengths[start:stop],
+                          bin_fft))
+
+    if len(tasks) <= len(parsers):
+        cores = 1
+    results = gen_ordered_results(_parse_ndf_pixels, tasks, cores=cores, use_processes=True)
+    try:
+        while True:
+            block = [next(results, None) for _ in parsers]
+            if block[0] is None:
+                break
+            for pix_ind in range(len(block[0])):
+                yield dict((prsr.get_wave_type(), pixels[pix_ind]) for prsr, pixels in zip(parsers, block))
+    finally:
+        results.close()
+
+
 class BEPSndfParser(object):
     """
     An object of this class is given the responsibility to step through a 
@@ -885,7 +1147,7 @@ class BEPSndfParser(object):
     Each wave type is given its own Parser object since it has a file of its own
     """
 
-    def __init__(self, file_path, wave_type=1, scout=True):
+    def __init__(self, file_path, wave_type=1, scout=True, use_cache=True):
         """
         Initializes the BEPSndfParser object with following inputs:
         
@@ -898,18 +1160,53 @@ class BEPSndfParser(object):
         scout : Boolean (optional. Default = true) 
             whether or not the parser should figure out basic details such as 
             the number of pixels, and the spatial dimensionality
+        use_cache : Boolean (optional. Default = true)
+            whether or not the byte offsets of the pixels should be loaded from / saved to
+            a sidecar file next to the .dat file
 
         """
-        self.__file_handle__ = open(file_path, "rb")
+        self.__file_path__ = file_path
+        self.__data__ = map_float32_file(file_path)
         self.__EOF__ = False
         self.__curr_Pixel__ = 0
-        self.__start_point__ = 0
         self.__wave_type__ = wave_type
         self.__filesize__ = path.getsize(file_path)
-        self.__pixel_indices__ = list()
+
+        # Files that are not scouted may still be growing, in which case the last pixel is expected to be incomplete:
+        self.__offsets__, self.__lengths__ = self.__load_pixel_index(use_cache, warn_incomplete=scout)
+        # Byte positions of each pixel:
+        self.__pixel_indices__ = self.__offsets__ * 4
+        self.__num_pixels__ = self.__offsets__.size
         if scout:
             self.__scout()
 
+    def refresh(self):
+        """
+        Maps the file again and indexes the pixels that were appended to it since it was last indexed.
+        Use this to access the pixels of a file that is still being written
+        """
+        self.__filesize__ = path.getsize(self.__file_path__)
+        self.__data__ = map_float32_file(self.__file_path__)
+        start = 0
+        if self.__num_pixels__ > 0:
+            start = int(self.__offsets__[-1] + self.__lengths__[-1])
+        offsets, lengths = _index_ndf_pixels(self.__data__[start:], warn_incomplete=False)
+        self.__offsets__ = np.concatenate((self.__offsets__, offsets + start))
+        self.__lengths__ = np.concatenate((self.__lengths__, lengths))
+        self.__pixel_indices__ = self.__offsets__ * 4
+        self.__num_pixels__ = self.__offsets__.size
+        self.__EOF__ = self.__curr_Pixel__ == self.__num_pixels__
+
+    def get_file_path(self):
+        """
+        Returns the absolute path of the .dat file
+
+        Returns
+        -------
+        file_path : string or unicode
+        """
+        return self.__file_path__
+
     def get_wave_type(self):
         """
         Returns the excitation wave type as an integer
@@ -934,6 +1231,19 @@ class BEPSndfParser(object):
         """
         return self.__num_pixels__
 
+    def get_pixel_offsets(self):
+        """
+        Returns the location of every pixel within the file
+
+        Returns
+        -------
+        offsets : 1D numpy int64 array
+            Index of the first float32 element of each pixel
+        lengths : 1D numpy int64 array
+            Number of float32 elements in each pixel
+        """
+        return self.__offsets__, self.__lengths__
+
     def get_spatial_pixels(self):
         """
         Returns the number of steps in each spatial dimension 
@@ -952,54 +1262,70 @@ class BEPSndfParser(object):
         """
         return self.__num_laser_steps__, self.__num_z_steps__, self.__num_x_steps__, self.__num_y_steps__
 
-    # Don't use this to figure out if something changes. You need pixel to previous pixel comparison    
-    def __scout(self):
+    def __load_pixel_index(self, use_cache, warn_incomplete=True):
         """
-        Steps through the file quickly without parsing it. 
-        The idea is to calculate the number of pixels ahead of time so that 
-        it is easier to parse the dataset. 
-        For phase checking, it is recommended that this function be modified to 
-        also keep track of the byte positions of the pixels so that pixels can be 
-        directly accessed if need be.
+        Loads the pixel offsets from the sidecar cache if it matches the size and modification time
+        of the .dat file. Otherwise, indexes the file and updates the cache.
 
-        """
-        count = 0
-        self.__num_pixels__ = 0
-        while True:
-            self.__pixel_indices__.append(self.__start_point__ * 4)
-            self.__file_handle__.seek(self.__start_point__ * 4, 0)
-            spectrogram_length = int(np.fromstring(self.__file_handle__.read(4), dtype='f')[0])  # length of spectrogram
-
-            if count == 0:
-                self.__file_handle__.seek(self.__start_point__ * 4, 0)
-                data_vec = np.fromstring(self.__file_handle__.read(spectrogram_length * 4), dtype='f')
-                pix = BEPSndfPixel(data_vec, self.__wave_type__)
-                self.__num_x_steps__ = pix.num_x_steps
-                self.__num_y_steps__ = pix.num_y_steps
-                self.__num_z_steps__ = pix.num_z_steps
-                self.__num_bins__ = pix.num_bins
-
-            count += 1
-            self.__start_point__ += spectrogram_length
-
-            if self.__filesize__ == self.__start_point__ * 4:
-                self.__num_pixels__ = count
-
-                # Laser position spectroscopy is NOT accounted for anywhere. 
-                # It is impossible to find out from the parms.txt, UD_VS, or the binary .dat file
-                num_laser_steps = 1.0 * count / (self.__num_z_steps__ * self.__num_y_steps__ * self.__num_x_steps__)
-                if num_laser_steps % 1.0 != 0:
-                    print('Some parameter changed inbetween. \
-                          BEPS NDF Translator does not handle this usecase at the moment')
-                else:
-                    self.__num_laser_steps__ = int(num_laser_steps)
+        Parameters
+        ----------
+        use_cache : Boolean
+            Whether or not the index should be loaded from / saved to the sidecar file
+        warn_incomplete : Boolean, optional. Default = True
+            Whether or not to warn about an incomplete last pixel
 
-                break
+        Returns
+        -------
+        offsets : 1D numpy int64 array
+        lengths : 1D numpy int64 array
+        """
+        cache_path = self.__file_path__ + '.pix_index.npz'
+        mod_time = path.getmtime(self.__file_path__)
+        if use_cache and path.isfile(cache_path):
+            try:
+                with np.load(cache_path) as cache:
+                    if int(cache['file_size']) == self.__filesize__ and float(cache['mod_time']) == mod_time:
+                        return cache['offsets'], cache['lengths']
+            except (IOError, OSError, KeyError, ValueError):
+                pass
+
+        offsets, lengths = _index_ndf_pixels(self.__data__, warn_incomplete=warn_incomplete)
+
+        if use_cache:
+            try:
+                with open(cache_path, 'wb') as file_handle:
+                    np.savez(file_handle, offsets=offsets, lengths=lengths, file_size=self.__filesize__,
+                             mod_time=mod_time)
+            except (IOError, OSError):
+                # Read-only location. Index again next time
+                pass
+        return offsets, lengths
 
-            if self.__filesize__ > self.__start_point__ * 4:
-                self.__num_pixels__ = -1
+    # Don't use this to figure out if something changes. You need pixel to previous pixel comparison    
+    def __scout(self):
+        """
+        Gathers basic details such as the number of steps in each spatial dimension
+        from the first pixel and the number of pixels in the file.
 
-        self.__start_point__ = 0
+        """
+        if self.__num_pixels__ == 0:
+            raise ValueError('No pixels found in {}'.format(self.__file_path__))
+
+        pix = self.get_pixel(0)
+        self.__num_x_steps__ = pix.num_x_steps
+        self.__num_y_steps__ = pix.num_y_steps
+        self.__num_z_steps__ = pix.num_z_steps
+        self.__num_bins__ = pix.num_bins
+
+        # Laser position spectroscopy is NOT accounted for anywhere.
+        # It is impossible to find out from the parms.txt, UD_VS, or the binary .dat file
+        num_laser_steps = 1.0 * self.__num_pixels__ / (self.__num_z_steps__ * self.__num_y_steps__ *
+                                                       self.__num_x_steps__)
+        if num_laser_steps % 1.0 != 0:
+            print('Some parameter changed inbetween. \
+                  BEPS NDF Translator does not handle this usecase at the moment')
+        else:
+            self.__num_laser_steps__ = int(num_laser_steps)
 
         spat_dim = 0
         if self.__num_z_steps__ > 1:
@@ -1018,11 +1344,46 @@ class BEPSndfParser(object):
         # print('Total of {} spatial dimensions'.format(spat_dim))
         self.__spat_dim__ = spat_dim
 
+    def get_pixel(self, pixel_ind, bin_fft=None):
+        """
+        Returns a BEpixel object containing the parsed information within any pixel.
+        Does not move the pixel index.
+
+        Parameters
+        ----------
+        pixel_ind : unsigned int
+            Index of the pixel
+        bin_fft : 1D complex numpy array, optional
+            FFT of the BE waveform used to normalize the response
+
+        Returns
+        -------
+        pixel : BEPSndfPixel
+            Object that describes the data contained within the pixel
+        """
+        if pixel_ind < 0 or pixel_ind >= self.__num_pixels__:
+            raise IndexError('Pixel {} is outside the {} pixels in this file'.format(pixel_ind,
+                                                                                   self.__num_pixels__))
+        offset = self.__offsets__[pixel_ind]
+        data_vec = np.array(self.__data__[offset: offset + self.__lengths__[pixel_ind]])
+        return BEPSndfPixel(data_vec, abs(self.__wave_type__), bin_fft)
+
+    def seek_to_pixel(self, pixel_ind):
+        """
+        Sets the pixel that will be returned by the next call to read_pixel
+
+        Parameters
+        ----------
+        pixel_ind : unsigned int
+            Index of the pixel
+        """
+        self.__curr_Pixel__ = min(max(0, pixel_ind), self.__num_pixels__)
+        self.__EOF__ = self.__curr_Pixel__ == self.__num_pixels__
+
     def read_pixel(self, bin_fft=None):
         """
         Returns a BEpixel object containing the parsed information within a pixel.
         Moves pixel index up by one.
-        This is where one could conceivably read the file in one pass instead of making 100,000 file I/Os.
 
         Returns
         -------
@@ -1030,24 +1391,18 @@ class BEPSndfParser(object):
             Object that describes the data contained within the pixel
         """
 
-        if self.__filesize__ == self.__start_point__ * 4:
+        if self.__curr_Pixel__ >= self.__num_pixels__:
             print('BEPS NDF Parser - No more pixels left!')
             return -1
 
-        self.__file_handle__.seek(self.__start_point__ * 4, 0)
-        spectrogram_length = int(np.fromstring(self.__file_handle__.read(4), dtype='f')[0])  # length of spectrogram
-        self.__file_handle__.seek(self.__start_point__ * 4, 0)
-        data_vec = np.fromstring(self.__file_handle__.read(spectrogram_length * 4), dtype='f')
-
-        self.__start_point__ += spectrogram_length
+        pixel = self.get_pixel(self.__curr_Pixel__, bin_fft)
         self.__curr_Pixel__ += 1
 
-        if self.__filesize__ == self.__start_point__ * 4:
+        if self.__curr_Pixel__ == self.__num_pixels__:
             print('BEPS NDF Parser reached End of File')
             self.__EOF__ = True
-            self.__file_handle__.close()
 
-        return BEPSndfPixel(data_vec, abs(self.__wave_type__), bin_fft)
+        return pixel
 
 
 class BEPSndfPixel(object):
@@ -14,7 +14,8 @@ import h5py
 from pyUSID.io.translator import Translator
 from pyUSID.io.write_utils import Dimension
 from pyUSID.io.hdf_utils import create_indexed_group, write_main_dataset, write_simple_attrs, write_ind_val_dsets
-from .df_utils.base_utils import read_binary_data
+from .df_utils.base_utils import read_binary_data, get_rows_per_batch
+from ..chunking import plan_chunks
 # TODO: Adopt missing aspects / features from https://github.com/paruch-group/distortcorrect/blob/master/afm/filereader/readNanoscope.py
 
 
@@ -194,19 +195,44 @@ class BrukerAFMTranslator(Translator):
         # Now work on the force map:
         force_map_parms = self.meta_data['Ciao force image list']
         quantity = force_map_parms.pop('Image Data_4')
-        force_map_vec = self._read_data_vector(force_map_parms)
+        # Map the force curves instead of reading them all into memory:
+        force_map_vec = self._read_data_vector(force_map_parms, mmap=True)
         tr_rt = [int(item) for item in force_map_parms['Samps/line'].split(' ')]
         force_map_2d = force_map_vec.reshape(image_mat.size, np.sum(tr_rt))
         h5_chan_grp = create_indexed_group(h5_meas_grp, 'Channel')
-        write_main_dataset(h5_chan_grp, force_map_2d, 'Raw_Data',
-                           # Quantity and Units needs to be fixed by someone who understands these files better
-                           quantity, 'a. u.',
-                           [Dimension('X', 'nm', image_parms['Samps/line']),
-                            Dimension('Y', 'nm', image_parms['Number of lines'])],
-                           Dimension('Z', 'nm', int(np.sum(tr_rt))), dtype=np.float32, compression='gzip')
+        h5_raw = write_main_dataset(h5_chan_grp, force_map_2d.shape, 'Raw_Data',
+                                    # Quantity and Units needs to be fixed by someone who understands these files
+                                    # better
+                                    quantity, 'a. u.',
+                                    [Dimension('X', 'nm', image_parms['Samps/line']),
+                                     Dimension('Y', 'nm', image_parms['Number of lines'])],
+                                    Dimension('Z', 'nm', int(np.sum(tr_rt))), dtype=np.float32, compression='gzip',
+                                    chunks=plan_chunks(force_map_2d.shape, np.float32, 'pixel',
+                                                       unit_chunks=(1, force_map_2d.shape[1])).chunks)
+        self._write_curves(h5_raw, force_map_2d)
         # Think about standardizing attributes
         write_simple_attrs(h5_chan_grp, force_map_parms)
 
+    def _write_curves(self, h5_raw, force_map_2d):
+        """
+        Copies the force curves into the HDF5 dataset in blocks of whole chunks limited in size by the maximum memory
+
+        Parameters
+        ----------
+        h5_raw : h5py.Dataset
+            Pre-allocated dataset to write the curves into
+        force_map_2d : numpy.ndarray or numpy.memmap
+            Force curves arranged as [position, point]
+        """
+        # Memory for the curves read from the file and their float32 copy:
+        bytes_per_curve = force_map_2d.shape[1] * (force_map_2d.dtype.itemsize + np.float32(0).itemsize)
+        curves_per_block = get_rows_per_batch(h5_raw, bytes_per_curve, self.max_ram,
+                                              num_rows=force_map_2d.shape[0])
+        for start in range(0, force_map_2d.shape[0], curves_per_block):
+            stop = min(start + curves_per_block, force_map_2d.shape[0])
+            h5_raw[start:stop] = np.float32(force_map_2d[start:stop])
+        h5_raw.file.flush()
+
     def _extract_metadata(self):
         """
         Reads the metadata in the header
@@ -281,7 +307,7 @@ class BrukerAFMTranslator(Translator):
 
         return meas_parms, other_parms
 
-    def _read_data_vector(self, layer_info):
+    def _read_data_vector(self, layer_info, mmap=False):
         """
         Reads data relevant to a single image, force curve, or force map
 
@@ -289,14 +315,16 @@ class BrukerAFMTranslator(Translator):
         ----------
         layer_info : OrderedDictionary
             Parameters describing the data offset, length and precision in the binary file
+        mmap : bool, optional. Default = False
+            Whether or not to return a read-only memory-map of the data instead of reading it
 
         Returns
         -------
-        data_vec : np.ndarray
+        data_vec : np.ndarray or np.memmap
             1D array containing data represented by binary data
         """
         data_vec = read_binary_data(self.file_path, layer_info['Data offset'], layer_info['Data length'],
-                                    layer_info['Bytes/pixel'])
+                                    layer_info['Bytes/pixel'], mmap=mmap)
 
         # Remove translation specific values from dictionary:
         for key in ['Data offset', 'Data length', 'Bytes/pixel']:
@@ -1,8 +1,6 @@
-from . import be_utils
-from . import gmode_utils
-from . import dm4reader
-from . import parse_dm3
-from . import beps_gen_utils
-from . import nanonis_utils
-from . import base_utils
-from . import gsf_read
+from ....lazy_loader import attach as _attach
+
+__all__ = ['be_utils', 'gmode_utils', 'dm4reader', 'parse_dm3', 'beps_gen_utils', 'nanonis_utils', 'base_utils',
+           'gsf_read']
+
+__getattr__, __dir__ = _attach(__name__, submodules=__all__)
@@ -7,14 +7,19 @@ Created on Fri May 25 16:04:34 2016
 
 from __future__ import division, print_function, absolute_import, unicode_literals
 import sys
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import numpy as np
-from os.path import exists
+from os.path import exists, getsize
 
 if sys.version_info.major == 3:
     unicode = str
 
 
-def read_binary_data(file_path, offset, num_bytes, bytes_per_data_point):
+def read_binary_data(file_path, offset, num_bytes, bytes_per_data_point, mmap=False):
     """
     Reads numeric data encoded in binary files. Uses instructions such as offset, length and precision
 
@@ -28,10 +33,12 @@ def read_binary_data(file_path, offset, num_bytes, bytes_per_data_point):
     bytes_per_data_point : uint
         Precision of stored data. Currently accounting only for half-precision (16 bit / 2 byte) and full precision
         (32 bit / 4 byte) data
+    mmap : bool, optional. Default = False
+        If True, the data is not read. Instead, a read-only memory-map of the data in the file is returned
 
     Returns
     -------
-    value : np.ndarray
+    value : np.ndarray or np.memmap
         1D array of numeric values
     """
     if not isinstance(file_path, (str, unicode)):
@@ -52,7 +59,155 @@ def read_binary_data(file_path, offset, num_bytes, bytes_per_data_point):
     else:
         raise NotImplementedError('Currently only supporting half and full precision')
 
+    if mmap:
+        # Only map as much as is present in the file, as would be read otherwise:
+        num_points = max(0, min(num_bytes, getsize(file_path) - offset)) // bytes_per_data_point
+        if num_points == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=(num_points,))
+
     with open(file_path, "rb") as file_handle:
         file_handle.seek(offset)
         value = np.fromstring(file_handle.read(num_bytes), dtype=dtype)
     return value
+
+
+def map_float32_file(file_path):
+    """
+    Memory-maps a file of float32 values. Empty files, such as those of an acquisition that has just begun,
+    cannot be memory-mapped and are represented by an empty array instead
+
+    Parameters
+    ----------
+    file_path : String / Unicode
+        Absolute path of the binary file
+
+    Returns
+    -------
+    data_vec : 1D numpy.memmap or numpy.ndarray of float32
+        Values in the file
+    """
+    # A value may be partially written at the end of a file that is still growing:
+    num_values = getsize(file_path) // np.float32(0).itemsize
+    if num_values == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(file_path, dtype=np.float32, mode='r', shape=(num_values,))
+
+
+def get_rows_per_batch(h5_dset, bytes_per_row, max_ram, num_rows=None):
+    """
+    Number of rows of a dataset that can be read or written at a time within the provided memory.
+    Batches larger than a chunk are trimmed to whole rows of chunks so that no chunk is written twice
+
+    Parameters
+    ----------
+    h5_dset : h5py.Dataset
+        Dataset that will be written to (or read from) in batches of rows
+    bytes_per_row : uint
+        Memory needed per row, including any scratch copies
+    max_ram : uint
+        Maximum memory in bytes for a batch
+    num_rows : uint, optional. Default = number of rows in h5_dset
+        Number of rows that will be processed. Batches will be no larger than this
+
+    Returns
+    -------
+    rows_per_batch : uint
+        Number of rows per batch. At least 1
+    """
+    if num_rows is None:
+        num_rows = h5_dset.shape[0]
+    rows_per_batch = max(1, int(max_ram // max(1, bytes_per_row)))
+    chunk_rows = h5_dset.chunks[0] if h5_dset.chunks is not None else 1
+    if rows_per_batch > chunk_rows:
+        rows_per_batch -= rows_per_batch % chunk_rows
+    return max(1, min(rows_per_batch, int(num_rows)))
+
+
+def gen_ordered_results(func, tasks, cores=1, use_processes=False, max_pending=None):
+    """
+    Yields func(*task) for each task in the order of the tasks while the tasks are computed by a pool of workers.
+    Only a bounded number of tasks are submitted ahead of the consumer so that results are not accumulated
+    faster than they are consumed
+
+    Parameters
+    ----------
+    func : callable
+        Function to apply to each task. Must be picklable (module-level) if `use_processes` is True
+    tasks : iterable of tuples
+        Arguments for each call to `func`
+    cores : uint, optional. Default = 1
+        Number of workers. Tasks are computed in this process if 1
+    use_processes : bool, optional. Default = False
+        Whether to use a pool of processes (CPU bound functions that hold the GIL) or threads
+    max_pending : uint, optional. Default = 2 * cores
+        Maximum number of tasks that are submitted but have not yet been yielded
+
+    Returns
+    -------
+    result : object
+        Value returned by func for the next task
+    """
+    if cores is None or cores <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * cores
+    max_pending = max(1, max_pending)
+
+    pool = Pool(processes=cores) if use_processes else ThreadPool(processes=cores)
+    try:
+        pending = deque()
+        task_iter = iter(tasks)
+        for task in islice(task_iter, max_pending):
+            pending.append(pool.apply_async(func, task))
+        while pending:
+            result = pending.popleft().get()
+            for task in islice(task_iter, 1):
+                pending.append(pool.apply_async(func, task))
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def follow_acquisition(count_complete, write_batch, num_total, poll_interval=1.0, timeout=60.0):
+    """
+    Follows an ongoing acquisition by periodically checking how many units (pixels, lines, etc.) have been completely
+    recorded and writing the newly completed units in batches. Returns once all units have been written or if no
+    new units were recorded for `timeout` seconds.
+
+    Parameters
+    ----------
+    count_complete : callable
+        Returns the number of units that have been completely recorded so far
+    write_batch : callable
+        write_batch(start, stop) writes the units from start to stop (exclusive) and records the progress
+    num_total : uint
+        Total number of units expected in the acquisition
+    poll_interval : float, optional. Default = 1
+        Time in seconds to wait before checking for new units again
+    timeout : float, optional. Default = 60
+        Time in seconds after which the acquisition is considered to have stopped if no new units were recorded.
+        Set to None to wait indefinitely
+
+    Returns
+    -------
+    num_written : uint
+        Number of units that were written
+    """
+    num_written = 0
+    last_progress = time.time()
+    while num_written < num_total:
+        num_complete = min(int(count_complete()), num_total)
+        if num_complete > num_written:
+            write_batch(num_written, num_complete)
+            num_written = num_complete
+            last_progress = time.time()
+            continue
+        if timeout is not None and time.time() - last_progress > timeout:
+            break
+        time.sleep(poll_interval)
+    return num_written
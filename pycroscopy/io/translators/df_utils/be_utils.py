@@ -22,7 +22,7 @@ from pyUSID.io.hdf_utils import get_auxiliary_datasets, find_dataset, \
 from pyUSID.io.write_utils import create_spec_inds_from_vals, Dimension
 from pyUSID.processing.comp_utils import get_available_memory, parallel_compute
 
-from ....processing.histogram import build_histogram
+from ....processing.histogram import build_histograms_2d, get_response_range
 from ....analysis.utils.be_sho import SHOestimateGuess
 from ....viz.be_viz_utils import plot_1d_spectrum, plot_2d_spectrogram, \
     plot_histograms
@@ -1228,8 +1228,6 @@ class BEHistogram:
         print('Adding Histograms to file {}'.format(h5_file.name))
         print('Path to HDF5 file is {}'.format(hdf.path))
 
-        max_mem = min(max_mem_mb * 1024 ** 2, 0.75 * get_available_memory())
-
         h5_main = find_dataset(h5_file, 'Raw_Data')
         h5_udvs = find_dataset(h5_file, 'UDVS')
 
@@ -1270,7 +1268,7 @@ class BEHistogram:
                                             actual_udvs_steps,
                                             max_response=max_resp,
                                             min_response=min_resp,
-                                            max_mem_mb=max_mem)
+                                            max_mem_mb=max_mem_mb)
 
                 ds_hist = VirtualDataset('Histograms', hist_mat, dtype=np.int32,
                                          chunking=(1, hist_mat.shape[1]), compression='gzip')
@@ -1298,7 +1296,8 @@ class BEHistogram:
 
         hdf.close()
 
-    def buildBEHist(self, h5_main, max_response=[], min_response=[], max_mem_mb=1024, max_bins=256, debug=False):
+    def buildBEHist(self, h5_main, max_response=[], min_response=[], max_mem_mb=1024, max_bins=256, cores=None,
+                    debug=False):
         """
         Creates Histograms from dataset
 
@@ -1306,9 +1305,13 @@ class BEHistogram:
         ----------
         h5_main : hdf5.Dataset
         max_response : list
+            maximum amplitude at each pixel. Computed in a single pass through h5_main if not provided
         min_response : list
+            minimum amplitude at each pixel. Computed in a single pass through h5_main if not provided
         max_mem_mb : int
         max_bins : int
+        cores : int, optional
+            number of threads used to bin the data. Default - as recommended by pyUSID
         debug : bool
 
         Returns
@@ -1325,9 +1328,8 @@ class BEHistogram:
         Check that max_response and min_response have been defined.
         Call __getminmaxresponse__ is not
         """
-        if max_response == [] or min_response == []:
-            max_response = np.max(np.abs(h5_main), axis=1)
-            min_response = np.min(np.abs(h5_main), axis=1)
+        if len(max_response) == 0 or len(min_response) == 0:
+            max_response, min_response = get_response_range(h5_main, np.abs, max_mem_mb=max_mem_mb, cores=cores)
 
         self.max_response = np.mean(max_response) + 3 * np.std(max_response)
         self.min_response = np.max([0, np.mean(min_response) - 3 * np.std(min_response)])
@@ -1355,20 +1357,21 @@ class BEHistogram:
         # print('There are {} total frequencies in this dataset'.format(self.N_bins))
         del freqs_mat, spec_ind_mat
 
-        self.N_pixels = np.shape(h5_main)[1]
+        self.N_pixels = np.shape(h5_main)[0]
         # print('There are {} pixels in this dataset'.format(self.N_pixels))
 
         self.N_y_bins = np.int(np.min((max_bins, np.rint(np.sqrt(self.N_pixels * self.N_spectral_steps)))))
         #         self.N_y_bins = np.min( (max_bins, np.rint(2*(self.N_pixels*self.N_spectral_steps)**(1.0/3.0))))
         # print('{} bins will be used'.format(self.N_y_bins))
 
-        ds_hist = self.__datasetHist(h5_main, active_udvs_steps, x_hist, debug)
+        ds_hist = self.__datasetHist(h5_main, active_udvs_steps, x_hist, max_mem_mb=max_mem_mb, cores=cores,
+                                     debug=debug)
 
         return ds_hist
 
     def buildPlotGroupHist(self, h5_main, active_spec_steps, max_response=[],
                            min_response=[], max_mem_mb=1024, max_bins=256,
-                           std_mult=3, debug=False):
+                           std_mult=3, cores=None, debug=False):
         """
         Creates Histograms for a given plot group
 
@@ -1379,9 +1382,13 @@ class BEHistogram:
         active_spec_steps : numpy array
             active spectral steps in the current plot group
         max_response : numpy array
-            maximum amplitude at each pixel
+            maximum amplitude at each pixel. If not provided, the maximum
+            amplitude of each spectral step over all pixels is computed in
+            a single pass through h5_main
         min_response : numpy array
-            minimum amplitude at each pixel
+            minimum amplitude at each pixel. If not provided, the minimum
+            amplitude of each spectral step over all pixels is computed in
+            a single pass through h5_main
         max_mem_mb : Unsigned integer
             maximum number of Mb allowed for use.  Used to calculate the
             number of pixels to load in a chunk
@@ -1391,6 +1398,9 @@ class BEHistogram:
             number of standard deviations from the mean of
             max_response and min_response to include in
             binning
+        cores : integer, optional
+            number of threads used to bin the data.  Default - as
+            recommended by pyUSID
         debug : boolean
             Turns on debug printing statements if true.  Default False.
 
@@ -1409,15 +1419,15 @@ class BEHistogram:
         free_mem = get_available_memory()
         if debug:
             print('We have {} bytes of memory available'.format(free_mem))
-        self.max_mem = min(max_mem_mb, 0.75 * free_mem)
+        self.max_mem = min(max_mem_mb * 1024 ** 2, 0.75 * free_mem)
 
         """
         Check that max_response and min_response have been defined.
         Call __getminmaxresponse__ is not
         """
-        if max_response == [] or min_response == []:
-            max_response = np.amax(np.abs(h5_main), axis=0)
-            min_response = np.amin(np.abs(h5_main), axis=0)
+        if len(max_response) == 0 or len(min_response) == 0:
+            max_response, min_response = get_response_range(h5_main, np.abs, max_mem_mb=max_mem_mb, cores=cores,
+                                                             axis=0)
 
         self.max_response = np.mean(max_response) + std_mult * np.std(max_response)
         self.min_response = np.mean(min_response) - std_mult * np.std(min_response)
@@ -1449,7 +1459,8 @@ class BEHistogram:
         #         self.N_y_bins = np.int(np.min( (max_bins, np.rint(np.sqrt(self.N_pixels*self.N_spectral_steps)))))
         self.N_y_bins = np.int(np.min((max_bins, np.rint(2 * (self.N_pixels * self.N_spectral_steps) ** (1.0 / 3.0)))))
 
-        ds_hist = self.__datasetHist(h5_main, active_udvs_steps, x_hist, debug)
+        ds_hist = self.__datasetHist(h5_main, active_udvs_steps, x_hist, max_mem_mb=max_mem_mb, cores=cores,
+                                     debug=debug)
         if debug:
             print(np.shape(ds_hist))
         if debug:
@@ -1498,7 +1509,7 @@ class BEHistogram:
 
         return hist_mat, hist_labels, hist_indices, hist_index_labels
 
-    def __datasetHist(self, h5_main, active_udvs_steps, x_hist, debug=False):
+    def __datasetHist(self, h5_main, active_udvs_steps, x_hist, max_mem_mb=1024, cores=None, debug=False):
         """
         Create the histogram for a single dataset
 
@@ -1511,6 +1522,12 @@ class BEHistogram:
         x_hist : 1d numpy array
             the spectroscopic indices matrix, used to find the
             spectroscopic indices of each udvs step
+        max_mem_mb : Unsigned integer
+            maximum number of Mb allowed for use by all threads
+        cores : integer, optional
+            number of threads used to bin the data
+        debug : boolean
+            Turns on debug printing statements if true.  Default False.
 
         Returns
         -------
@@ -1520,106 +1537,32 @@ class BEHistogram:
         """
 
         """
-        Estimate maximum number of pixels to read at once
-        """
-        max_pixels = maxReadPixels(self.max_mem, self.N_pixels, self.num_udvs_steps,
-                                   bytes_per_bin=h5_main.dtype.itemsize * self.N_y_bins * self.N_freqs)
-
-        """
-        Divide the pixels into chunks that will fit in memory
+        Get the Spectroscopic bins of all active UDVS steps and
+        the frequency of each bin relative to the first bin of its UDVS step
         """
-        pix_chunks = np.append(np.arange(0, self.N_pixels, max_pixels, dtype=np.int), self.N_pixels)
+        step_inds = np.asarray(x_hist[1])
+        udvs_bins = np.where(np.in1d(step_inds, active_udvs_steps))[0]
+        steps, first_bins = np.unique(step_inds, return_index=True)
+        step_starts = first_bins[np.searchsorted(steps, step_inds[udvs_bins])]
+        freq_bins = np.take(x_hist[0], udvs_bins) - np.take(x_hist[0], step_starts)
+        if debug:
+            print('{} spectroscopic bins in {} UDVS steps'.format(udvs_bins.size, self.num_udvs_steps))
 
         """
-        Initialize the histograms
+        Set up the list of functions to call and their corresponding maxima and minima
         """
-        ds_hist = np.zeros((4, self.N_freqs, self.N_y_bins), dtype=np.int32)
+        func_list = [np.abs, np.angle, np.real, np.imag]
+        max_list = [self.max_response, np.pi, self.max_response, self.max_response]
+        min_list = [self.min_response, -np.pi, self.min_response, self.min_response]
 
         """
-        loop over pixels
+        Stream the pixels through the threads and accumulate the histograms
         """
-        for ichunk in range(len(pix_chunks) - 1):
-            if debug:
-                print('pixel chunk', ichunk)
-
-            chunk = range(pix_chunks[ichunk], pix_chunks[ichunk + 1])
+        print('Binning BEHistogram...')
+        ds_hist = build_histograms_2d(h5_main, freq_bins, self.N_freqs, self.N_y_bins, func_list, min_list, max_list,
+                                      col_inds=udvs_bins, max_mem_mb=max_mem_mb, cores=cores, verbose=debug)
 
-            """
-        Loop over active UDVS steps
-            """
-            for iudvs in range(self.num_udvs_steps):
-                selected = (iudvs + chunk[0] * self.num_udvs_steps) % np.rint(
-                    self.num_udvs_steps * self.N_pixels / 10) == 0
-                if selected:
-                    per_done = np.rint(
-                        100 * (iudvs + chunk[0] * self.num_udvs_steps) / (self.num_udvs_steps * self.N_pixels))
-                    print('Binning BEHistogram...{}% --pixels {}-{}, step # {}'.format(per_done, chunk[0],
-                                                                                       chunk[-1], iudvs))
-                udvs_step = active_udvs_steps[iudvs]
-                if debug:
-                    print('udvs step', udvs_step)
-
-                """
-        Get the correct Spectroscopic bins for the current UDVS step
-        Read desired pixel chunk from these bins for Main_Data into data_mat
-                """
-                udvs_bins = np.where(x_hist[1] == udvs_step)[0]
-                if debug:
-                    print(np.shape(x_hist))
-                data_mat = h5_main[pix_chunks[ichunk]:pix_chunks[ichunk + 1], udvs_bins]
-
-                """
-        Get the frequecies that correspond to the current UDVS bins from the total x_hist
-                """
-                this_x_hist = np.take(x_hist[0], udvs_bins)
-                this_x_hist = this_x_hist - this_x_hist[0]
-                this_x_hist = np.transpose(np.tile(this_x_hist, (1, pix_chunks[ichunk + 1] - pix_chunks[ichunk])))
-                this_x_hist = np.squeeze(this_x_hist)
-
-                N_x_bins = np.shape(this_x_hist)[0]
-                if debug:
-                    print('N_x_bins', N_x_bins)
-                    print(this_x_hist)
-                    print(np.shape(this_x_hist))
-                """
-        Create weighting vector.  If setting all to one value, can be a scalar.
-                """
-                weighting_vec = 1
-
-                if debug:
-                    print(np.shape(data_mat))
-
-                """
-        Set up the list of functions to call and their corresponding maxima and minima
-                """
-                func_list = [np.abs, np.angle, np.real, np.imag]
-                max_list = [self.max_response, np.pi, self.max_response, self.max_response]
-                min_list = [self.min_response, -np.pi, self.min_response, self.min_response]
-                """
-        Get the Histograms and store in correct place in ds_hist
-                """
-                for ifunc, func in enumerate(func_list):
-                    chunk_hist = build_histogram(this_x_hist,
-                                                 data_mat,
-                                                 N_x_bins,
-                                                 self.N_y_bins,
-                                                 weighting_vec,
-                                                 min_list[ifunc],
-                                                 max_list[ifunc],
-                                                 func,
-                                                 debug)
-                    if debug:
-                        print('chunkhist-{}'.format(func.__name__), np.shape(chunk_hist))
-                        print(chunk_hist.dtype)
-
-                    for (i, ifreq) in enumerate(udvs_bins):
-                        ids_freq = this_x_hist[i]
-                        if debug:
-                            print(i, ifreq)
-                            print(ids_freq)
-                        ds_hist[ifunc, ids_freq, :] = np.add(ds_hist[ifunc, ids_freq, :], chunk_hist[i, :])
-
-        return ds_hist
+        return ds_hist.astype(np.int32)
 
 
 def maxReadPixels(max_memory, tot_pix, bins_per_step, bytes_per_bin=4):
@@ -7,6 +7,10 @@ Created on Nov 8, 2016
 from __future__ import division, print_function, absolute_import, unicode_literals
 
 import array
+import numpy as np
+
+from pyUSID.processing.comp_utils import get_available_memory, recommend_cpu_cores
+from .base_utils import gen_ordered_results
 
 
 def unnest_parm_dicts(image_parms, prefix=''):
@@ -106,3 +110,73 @@ def no_bin(image, *args, **kwargs):
         The input image
     """
     return image
+
+
+def write_image_stack(read_func, tasks, h5_main, h5_mean_spec, h5_ronch, images_in_rows=True, cores=None,
+                      use_processes=False, max_mem_mb=1024):
+    """
+    Decodes images with a pool of workers and writes them, in order, into `h5_main` in slabs of whole chunks.
+    The mean of each image and the mean image are accumulated as the images are written.
+
+    Parameters
+    ----------
+    read_func : callable
+        Function that returns the (binned) image given the arguments in a task.
+        Must be picklable (module-level) if `use_processes` is True
+    tasks : list of tuples
+        Arguments to `read_func` for each image
+    h5_main : h5py.Dataset
+        Dataset which will hold the flattened images
+    h5_mean_spec : h5py.Dataset
+        Dataset which will hold the mean of each image
+    h5_ronch : h5py.Dataset
+        Dataset which will hold the mean image
+    images_in_rows : bool, optional. Default = True
+        Whether each image is a row (True) or a column (False) of `h5_main`
+    cores : uint, optional
+        Number of decoders. Default - as recommended by pyUSID.processing.comp_utils.recommend_cpu_cores
+    use_processes : bool, optional. Default = False
+        Whether to decode in processes instead of threads
+    max_mem_mb : uint, optional. Default = 1024
+        Maximum memory in megabytes for the slab of images waiting to be written
+
+    Returns
+    -------
+    None
+    """
+    num_images = len(tasks)
+    if num_images == 0:
+        return
+    img_axis = 0 if images_in_rows else 1
+    num_pixels = h5_main.shape[1 - img_axis]
+
+    # Slabs span whole chunks along the image axis:
+    img_chunk = 1 if h5_main.chunks is None else h5_main.chunks[img_axis]
+    max_mem = min(max_mem_mb * 1024 ** 2, 0.75 * get_available_memory())
+    imgs_per_slab = int(max_mem // (num_pixels * h5_main.dtype.itemsize)) // img_chunk * img_chunk
+    imgs_per_slab = min(max(img_chunk, imgs_per_slab), num_images)
+
+    cores = recommend_cpu_cores(num_images, requested_cores=cores)
+
+    slab = np.zeros((imgs_per_slab, num_pixels), dtype=h5_main.dtype)
+    mean_spec = np.zeros(num_images, dtype=np.float32)
+    mean_ronch = np.zeros(num_pixels, dtype=np.float64)
+
+    images = gen_ordered_results(read_func, tasks, cores=cores, use_processes=use_processes)
+    for img_ind, image in enumerate(images):
+        image = np.ravel(image)
+        slab_ind = img_ind % imgs_per_slab
+        slab[slab_ind] = image
+        mean_spec[img_ind] = np.mean(image)
+        mean_ronch += image
+
+        if slab_ind == imgs_per_slab - 1 or img_ind == num_images - 1:
+            start = img_ind - slab_ind
+            if images_in_rows:
+                h5_main[start: img_ind + 1] = slab[:slab_ind + 1]
+            else:
+                h5_main[:, start: img_ind + 1] = slab[:slab_ind + 1].T
+
+    h5_mean_spec[:num_images] = mean_spec
+    h5_ronch[:] = mean_ronch / num_images
+    h5_main.file.flush()
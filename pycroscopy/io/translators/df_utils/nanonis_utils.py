@@ -8,7 +8,7 @@ import os
 from . import nanonispy as nap
 
 # TODO: Consider moving this to NanonisTranslator
-def read_nanonis_file(file_path):
+def read_nanonis_file(file_path, mmap=False):
     """
     Function to read the nanonis data file and return the header dictionary containing the parameters
     and the signal dictionary containing the data
@@ -17,6 +17,8 @@ def read_nanonis_file(file_path):
     ----------
     file_path : str
         Path to the file to be read
+    mmap : bool, optional. Default = False
+        Whether or not to memory-map the data in grid (.3ds) files instead of reading it into memory
 
     Returns
     -------
@@ -40,7 +42,10 @@ def read_nanonis_file(file_path):
     else:
         raise ValueError("Nanosis file must be either '.3ds', '.sxm', or '.dat'.")
 
-    data = reader(file_path)
+    if file_ext == '.3ds':
+        data = reader(file_path, mmap=mmap)
+    else:
+        data = reader(file_path)
 
     return data, file_ext
 
@@ -168,6 +168,10 @@ class Grid(NanonisFile):
         A dict of key:value to override any corresponding key:value should
         they be wrong or missing in your header. Keys in header_override must
         match keys in Grid.header_raw.
+    mmap : bool, optional
+        If True, the data is memory-mapped instead of being read into
+        memory and the arrays in signals are read-only strided views into
+        the file. Default is False.
 
     Attributes
     ----------
@@ -184,19 +188,25 @@ class Grid(NanonisFile):
         If fname does not have a '.3ds' extension.
     """
 
-    def __init__(self, fname, header_override=None):
+    def __init__(self, fname, header_override=None, mmap=False):
         _is_valid_file(fname, ext='3ds')
         super().__init__(fname)
         self.header = _parse_3ds_header(self.header_raw,
                                         header_override=header_override)
-        self.signals = self._load_data()
+        self.signals = self._load_data(mmap=mmap)
         self.signals['sweep_signal'] = self._derive_sweep_signal()
         self.signals['topo'] = self._extract_topo()
 
-    def _load_data(self):
+    def _load_data(self, mmap=False):
         """
         Read binary data for Nanonis 3ds file.
 
+        Parameters
+        ----------
+        mmap : bool, optional
+            Whether to memory-map the data instead of reading it.
+            Default is False.
+
         Returns
         -------
         dict
@@ -209,16 +219,21 @@ class Grid(NanonisFile):
         num_chan = self.header['num_channels']
         data_dict = dict()
 
-        # open and seek to start of data
-        f = open(self.fname, 'rb')
-        f.seek(self.byte_offset)
-        data_format = '>f4'
-        griddata = np.fromfile(f, dtype=data_format)
-        f.close()
-
         # pixel size in bytes
         exp_size_per_pix = num_param + num_sweep * num_chan
 
+        data_format = '>f4'
+        if mmap:
+            griddata = np.memmap(self.fname, dtype=data_format, mode='r',
+                                 offset=self.byte_offset,
+                                 shape=(nx * ny * exp_size_per_pix,))
+        else:
+            # open and seek to start of data
+            f = open(self.fname, 'rb')
+            f.seek(self.byte_offset)
+            griddata = np.fromfile(f, dtype=data_format)
+            f.close()
+
         # reshape from 1d to 3d
         griddata_shaped = griddata.reshape((nx, ny, exp_size_per_pix))
 
@@ -18,6 +18,7 @@ from pyUSID.io.translator import Translator  # Because this class extends the ab
 from pyUSID.io.write_utils import VALUES_DTYPE, Dimension
 from pyUSID.io.hdf_utils import link_h5_objects_as_attrs, create_indexed_group, \
     write_simple_attrs, write_main_dataset
+from ..chunking import plan_chunks
 
 
 class GVSTranslator(Translator):
@@ -115,7 +116,9 @@ class GVSTranslator(Translator):
         h5_main = write_main_dataset(chan_grp, (num_pix, num_bins), 'Raw_Data',
                                      'Deflection', 'V',
                                      pos_dims, spec_dims,
-                                     chunks=(1, num_bins), dtype=np.float32)
+                                     chunks=plan_chunks((num_pix, num_bins), np.float32, 'pixel',
+                                                        unit_chunks=(1, num_bins)).chunks,
+                                     dtype=np.float32)
 
         h5_ex_freqs = chan_grp.create_dataset('Excitation_Frequencies', freq_array)
         h5_bin_freq = chan_grp.create_dataset('Bin_Frequencies', w_vec)
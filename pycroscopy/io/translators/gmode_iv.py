@@ -16,6 +16,9 @@ import numpy as np  # For array operations
 from pyUSID.io.translator import Translator
 from pyUSID.io.write_utils import Dimension
 from pyUSID.io.hdf_utils import write_main_dataset, create_indexed_group, write_simple_attrs
+from pyUSID.processing.comp_utils import recommend_cpu_cores
+from .df_utils.base_utils import gen_ordered_results, follow_acquisition, get_rows_per_batch
+from ..chunking import plan_chunks
 
 
 class GIVTranslator(Translator):
@@ -23,13 +26,22 @@ class GIVTranslator(Translator):
     Translates G-mode Fast IV datasets from .mat files to .h5
     """
     def __init__(self, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        max_mem_mb : unsigned integer, optional. Default = 1024
+            Maximum system memory (in megabytes) that can be used for holding lines before writing them
+        cores : unsigned int, optional. Default = all available cores
+            Number of threads used to read the line files
+        """
         super(GIVTranslator, self).__init__(*args, **kwargs)
+        self._cores = kwargs.pop('cores', None)
         self.raw_datasets = None
 
     def _parse_file_path(self, input_path):
         pass
 
-    def translate(self, parm_path):
+    def translate(self, parm_path, follow=False, poll_interval=1.0, timeout=60.0):
         """      
         The main function that translates the provided file into a .h5 file
         
@@ -37,6 +49,15 @@ class GIVTranslator(Translator):
         ------------
         parm_path : string / unicode
             Absolute file path of the parameters .mat file. 
+        follow : bool, optional. Default = False
+            Set to True to translate an acquisition that is still in progress. The first line file must already
+            exist. Lines are appended to the HDF5 file as their files appear, and the 'last_pixel' attribute of each
+            Raw_Data dataset holds the number of lines written so far, so that readers can restrict themselves to
+            the lines that are complete.
+        poll_interval : float, optional. Default = 1
+            Time in seconds between checks for new line files when following an acquisition
+        timeout : float, optional. Default = 60
+            Time in seconds without any new line files after which the acquisition is considered to have stopped
             
         Returns
         ----------
@@ -69,6 +90,8 @@ class GIVTranslator(Translator):
                                                        parm_dict['grid_num_rows']))
 
             self.raw_datasets = list()
+            raw_chunks = plan_chunks((parm_dict['grid_num_rows'], excit_wfm.size), np.float16, 'pixel',
+                                     unit_chunks=(1, excit_wfm.size)).chunks
 
             for chan_index in range(num_ai_chans):
 
@@ -82,16 +105,60 @@ class GIVTranslator(Translator):
                 h5_raw = write_main_dataset(h5_chan_grp, (parm_dict['grid_num_rows'], excit_wfm.size), 'Raw_Data',
                                             'Current',
                                             '1E-{} A'.format(parm_dict['IO_amplifier_gain']), pos_dims, spec_dims,
-                                            dtype=np.float16, chunks=(1, excit_wfm.size), compression='gzip')
+                                            dtype=np.float16, chunks=raw_chunks, compression='gzip')
 
                 self.raw_datasets.append(h5_raw)
 
             # Now that the N channels have been made, populate them with the actual data....
-            self._read_data(parm_dict, folder_path)
+            if follow:
+                self._follow_data(parm_dict, folder_path, poll_interval=poll_interval, timeout=timeout)
+            else:
+                self._read_data(parm_dict, folder_path)
 
         return h5_path
 
-    def _read_data(self, parm_dict, folder_path):
+    def _follow_data(self, parm_dict, folder_path, poll_interval=1.0, timeout=60.0):
+        """
+        Populates the h5 datasets while the line files are still being written.
+        Lines are appended in batches as soon as all preceding lines are available
+
+        Parameters
+        ----------
+        parm_dict : Dictionary
+            dictionary containing parameters for this data
+        folder_path : string / unicode
+            Absolute path of folder containing the data
+        poll_interval : float, optional. Default = 1
+            Time in seconds between checks for new line files
+        timeout : float, optional. Default = 60
+            Time in seconds without any new line files after which the acquisition is considered to have stopped
+        """
+        num_rows = int(parm_dict['grid_num_rows'])
+        num_complete = [0]
+
+        def count_lines():
+            # Files that are still being written cannot be opened yet:
+            while num_complete[0] < num_rows:
+                try:
+                    with h5py.File(path.join(folder_path, 'line_' + str(num_complete[0] + 1) + '.mat'), 'r') as h5_f:
+                        _ = h5_f['data'].shape
+                except (IOError, OSError, KeyError):
+                    break
+                num_complete[0] += 1
+            return num_complete[0]
+
+        def write_lines(start_row, end_row):
+            self._read_data(parm_dict, folder_path, start_row=start_row, end_row=end_row)
+            for h5_chan in self.raw_datasets:
+                h5_chan.attrs['last_pixel'] = end_row
+            self.raw_datasets[0].file.flush()
+
+        num_written = follow_acquisition(count_lines, write_lines, num_rows, poll_interval=poll_interval,
+                                         timeout=timeout)
+        if num_written < num_rows:
+            warn('Acquisition stopped after {} of {} lines'.format(num_written, num_rows))
+
+    def _read_data(self, parm_dict, folder_path, start_row=0, end_row=None):
         """
         Reads raw data and populates the h5 datasets
 
@@ -101,29 +168,51 @@ class GIVTranslator(Translator):
             dictionary containing parameters for this data
         folder_path : string / unicode
             Absolute path of folder containing the data
+        start_row : unsigned int, optional. Default = 0
+            First line to read
+        end_row : unsigned int, optional. Default = all lines
+            Line at which to stop reading
         """
         if parm_dict['excitation_extra_pts'] == 0:
             main_data = slice(parm_dict['excitation_pulse_points'], None)
         else:
             main_data = slice(parm_dict['excitation_pulse_points'], -1 * parm_dict['excitation_extra_pts'])
 
-        for line_ind in range(parm_dict['grid_num_rows']):
-            if line_ind % np.round(parm_dict['grid_num_rows']/10) == 0:
-                print('Reading data in line {} of {}'.format(line_ind+1, parm_dict['grid_num_rows']))
-            file_path = path.join(folder_path, 'line_'+str(line_ind+1)+'.mat')
-            if path.exists(file_path):
-                with h5py.File(file_path, 'r') as h5_f:
-                    h5_data = h5_f['data']
-                    if h5_data.shape[0] >= parm_dict['excitation_length'] and \
-                            h5_data.shape[1] == len(self.raw_datasets):
-                        for chan, h5_chan in enumerate(self.raw_datasets):
-                            h5_chan[line_ind, :] = np.float16(h5_data[main_data, chan])
-                            h5_chan.file.flush()
-                    else:
-                        warn('No data found for Line '+str(line_ind))
+        num_rows = int(parm_dict['grid_num_rows'])
+        if end_row is None:
+            end_row = num_rows
+        num_chans = len(self.raw_datasets)
+        num_pts = self.raw_datasets[0].shape[1]
+
+        # Lines are collected for all channels and written in batches of whole chunks.
+        # Half the memory is left for the lines read ahead by the workers:
+        lines_per_batch = get_rows_per_batch(self.raw_datasets[0], 2 * num_chans * num_pts * np.float16(0).itemsize,
+                                             self.max_ram, num_rows=end_row - start_row)
+        batch = np.zeros((num_chans, lines_per_batch, num_pts), dtype=np.float16)
+
+        tasks = [(path.join(folder_path, 'line_' + str(line_ind + 1) + '.mat'), main_data, num_chans,
+                  parm_dict['excitation_length']) for line_ind in range(start_row, end_row)]
+        # h5py holds its global lock while reading, so the threads only overlap opening and decoding the files
+        # with the writes in this thread:
+        cores = recommend_cpu_cores(end_row - start_row, requested_cores=self._cores)
+        lines = gen_ordered_results(_read_line_file, tasks, cores=cores)
+
+        batch_start = start_row
+        for line_ind, (line_data, message) in enumerate(lines, start=start_row):
+            if line_ind % max(1, np.round(num_rows / 10)) == 0:
+                print('Reading data in line {} of {}'.format(line_ind + 1, num_rows))
+            if line_data is None:
+                warn(message + str(line_ind))
+                batch[:, line_ind - batch_start] = 0
             else:
-                warn('File not found for: line '+str(line_ind))
-        print('Finished reading all data!')
+                batch[:, line_ind - batch_start] = line_data
+            if line_ind + 1 - batch_start == lines_per_batch or line_ind + 1 == end_row:
+                for h5_chan, chan_batch in zip(self.raw_datasets, batch):
+                    h5_chan[batch_start: line_ind + 1] = chan_batch[:line_ind + 1 - batch_start]
+                batch_start = line_ind + 1
+        self.raw_datasets[0].file.flush()
+        if end_row == num_rows:
+            print('Finished reading all data!')
 
     @staticmethod
     def _read_parms(parm_path):
@@ -202,3 +291,34 @@ class GIVTranslator(Translator):
             parm_dict['grid_scan_speed_[ms-1]'] = np.float32(h5_f['scan_speed'][0][0])
 
         return parm_dict, excit_wfm
+
+
+def _read_line_file(file_path, main_data, num_chans, min_length):
+    """
+    Reads the data for all channels in a single line file in one contiguous read
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the line_N.mat file
+    main_data : slice
+        Points in the line that contain the response to the excitation waveform
+    num_chans : unsigned int
+        Number of channels expected in the file
+    min_length : unsigned int
+        Minimum number of points expected in the file
+
+    Returns
+    -------
+    line_data : 2D numpy.float16 array or None
+        Data arranged as [channel, point]. None if the data could not be read
+    message : str
+        Reason why the data could not be read, if any
+    """
+    if not path.exists(file_path):
+        return None, 'File not found for: line '
+    with h5py.File(file_path, 'r') as h5_f:
+        h5_data = h5_f['data']
+        if h5_data.shape[0] < min_length or h5_data.shape[1] != num_chans:
+            return None, 'No data found for Line '
+        return np.float16(h5_data[main_data].T), ''
@@ -8,14 +8,17 @@ from __future__ import division, print_function, absolute_import, unicode_litera
 import sys
 from os import path, listdir, remove
 from warnings import warn
+from multiprocessing.pool import ThreadPool
 import h5py
 import numpy as np
 from scipy.io.matlab import loadmat  # To load parameters stored in Matlab .mat file
 
 from .df_utils.be_utils import parmsToDict
+from .df_utils.base_utils import follow_acquisition, get_rows_per_batch
 from pyUSID.io.translator import Translator
 from pyUSID.io.write_utils import VALUES_DTYPE, Dimension
 from pyUSID.io.hdf_utils import write_main_dataset, create_indexed_group, write_simple_attrs, write_ind_val_dsets
+from ..chunking import plan_chunks
 
 if sys.version_info.major == 3:
     unicode = str
@@ -26,7 +29,7 @@ class GLineTranslator(Translator):
     Translated G-mode line (bigtimedata.dat) files from actual BE line experiments to HDF5
     """
     def __init__(self, *args, **kwargs):
-        super(Translator, self).__init__(*args, **kwargs)
+        super(GLineTranslator, self).__init__(*args, **kwargs)
         self.points_per_pixel = 1
         self.num_rows = 1
         self.__bytes_per_row__ = 1
@@ -79,7 +82,7 @@ class GLineTranslator(Translator):
 
         return None
 
-    def translate(self, file_path):
+    def translate(self, file_path, follow=False, poll_interval=1.0, timeout=60.0):
         """
         The main function that translates the provided file into a .h5 file
         
@@ -87,6 +90,15 @@ class GLineTranslator(Translator):
         ----------
         file_path : String / unicode
             Absolute path of any file in the directory
+        follow : bool, optional. Default = False
+            Set to True to translate an acquisition that is still in progress. The data files must already exist.
+            Lines are appended to the HDF5 file as they are completed, and the 'last_pixel' attribute of each
+            Raw_Data dataset holds the number of lines written so far, so that readers can restrict themselves to
+            the lines that are complete.
+        poll_interval : float, optional. Default = 1
+            Time in seconds between checks for new lines when following an acquisition
+        timeout : float, optional. Default = 60
+            Time in seconds without any new lines after which the acquisition is considered to have stopped
 
         Returns
         -------
@@ -117,17 +129,22 @@ class GLineTranslator(Translator):
         # Load parameters from .txt file - 'BE_center_frequency_[Hz]', 'IO rate'
         is_beps, parm_dict = parmsToDict(parm_paths['parm_txt'])
         
-        # Get file byte size:
-        # For now, assume that bigtime_00 always exists and is the main file
-        file_size = path.getsize(data_paths[0])
-        
-        # Calculate actual number of lines since the first few lines may not be saved
-        self.num_rows = 1.0 * file_size / (4 * self.points_per_pixel * num_cols)
-        if self.num_rows % 1:
-            warn('Error - File has incomplete rows')
-            return None
+        if follow:
+            # Lines are still being recorded so allocate space for all the lines:
+            self.num_rows = expected_rows
+            file_size = 4 * self.points_per_pixel * num_cols * self.num_rows
         else:
-            self.num_rows = int(self.num_rows)
+            # Get file byte size:
+            # For now, assume that bigtime_00 always exists and is the main file
+            file_size = path.getsize(data_paths[0])
+
+            # Calculate actual number of lines since the first few lines may not be saved
+            self.num_rows = 1.0 * file_size / (4 * self.points_per_pixel * num_cols)
+            if self.num_rows % 1:
+                warn('Error - File has incomplete rows')
+                return None
+            else:
+                self.num_rows = int(self.num_rows)
 
         samp_rate = parm_dict['IO_rate_[Hz]']
         ex_freq_nominal = parm_dict['BE_center_frequency_[Hz]']
@@ -174,6 +191,7 @@ class GLineTranslator(Translator):
         spec_desc = Dimension('Excitation', 'V', np.tile(VALUES_DTYPE(be_wave), num_cols))
 
         first_dat = True
+        data_files = list()
         for key in data_paths.keys():
             # Now that the file has been created, go over each raw data file:
             # 1. write all ancillary data. Link data. 2. Write main data sequentially
@@ -202,11 +220,19 @@ class GLineTranslator(Translator):
                                          None, None,
                                          h5_pos_inds=h5_pos_inds, h5_pos_vals=h5_pos_vals,
                                          h5_spec_inds=h5_spec_inds, h5_spec_vals=h5_spec_vals,
-                                         chunks=(1, self.points_per_pixel), dtype=np.float16)
+                                         chunks=plan_chunks((self.num_rows, self.points_per_pixel * num_cols),
+                                                            np.float16, 'pixel',
+                                                            unit_chunks=(1, self.points_per_pixel)).chunks,
+                                         dtype=np.float16)
+
+            data_files.append((data_paths[key], h5_main))
+
+        # Now transfer scan data in the dat files to the h5 file:
+        if follow:
+            self._follow_channels(data_files, poll_interval=poll_interval, timeout=timeout)
+        else:
+            self._read_channels(data_files)
 
-            # Now transfer scan data in the dat file to the h5 file:
-            self._read_data(data_paths[key], h5_main)
-            
         h5_f.close()
         print('G-Line translation complete!')
 
@@ -258,7 +284,63 @@ class GLineTranslator(Translator):
 
         return basename, parm_paths, data_paths
 
-    def _read_data(self, filepath, h5_dset):
+    def _read_channels(self, data_files):
+        """
+        Populates the .h5 datasets of all analog input channels. Channels are independent of each other
+        and are therefore read concurrently, each with an equal share of the available memory
+
+        Parameters
+        ----------
+        data_files : list of tuples
+            (absolute path of the data file, reference to the target Raw_Data dataset) for each channel
+        """
+        if len(data_files) == 1:
+            self._read_data(*data_files[0])
+            return
+
+        max_mem = self.max_ram / len(data_files)
+
+        def _read_channel(args):
+            self._read_data(*args, max_mem=max_mem)
+
+        pool = ThreadPool(processes=len(data_files))
+        try:
+            pool.map(_read_channel, data_files)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _follow_channels(self, data_files, poll_interval=1.0, timeout=60.0):
+        """
+        Populates the .h5 datasets of all analog input channels while the data files are still being written.
+        Lines that have been completely recorded in all channels are appended in batches
+
+        Parameters
+        ----------
+        data_files : list of tuples
+            (absolute path of the data file, reference to the target Raw_Data dataset) for each channel
+        poll_interval : float, optional. Default = 1
+            Time in seconds between checks for new lines
+        timeout : float, optional. Default = 60
+            Time in seconds without any new lines after which the acquisition is considered to have stopped
+        """
+        max_mem = self.max_ram / len(data_files)
+
+        def count_lines():
+            return min([path.getsize(file_path) for file_path, _ in data_files]) // self.__bytes_per_row__
+
+        def write_lines(start_row, end_row):
+            for file_path, h5_dset in data_files:
+                self._read_data(file_path, h5_dset, max_mem=max_mem, start_row=start_row, end_row=end_row)
+                h5_dset.attrs['last_pixel'] = end_row
+            data_files[0][1].file.flush()
+
+        num_written = follow_acquisition(count_lines, write_lines, self.num_rows, poll_interval=poll_interval,
+                                         timeout=timeout)
+        if num_written < self.num_rows:
+            warn('Acquisition stopped after {} of {} lines'.format(num_written, self.num_rows))
+
+    def _read_data(self, filepath, h5_dset, max_mem=None, start_row=0, end_row=None):
         """
         Reads the .dat file and populates the .h5 dataset
 
@@ -268,23 +350,36 @@ class GLineTranslator(Translator):
             absolute path of the data file for a particular analog input channel
         h5_dset : HDF5 dataset reference
             Reference to the target Raw_Data dataset
+        max_mem : unsigned int, optional
+            Maximum memory in bytes that can be used for reading this file. Default = self.max_ram
+        start_row : unsigned int, optional. Default = 0
+            First line to read
+        end_row : unsigned int, optional. Default = all lines
+            Line at which to stop reading
 
         Returns
         ---------
         None
         """
-        # Create data matrix - Only need 16 bit floats (time) 
-                
-        # Read line by line and write to h5                 
-        with open(filepath, 'rb') as file_handl:
-            for row_indx in range(self.num_rows):
-                
-                if row_indx % 10 == 0:
-                    print('Reading line {} of {}'.format(row_indx, self.num_rows))
-                
-                file_handl.seek(row_indx*self.__bytes_per_row__, 0)
-                data_vec = np.fromstring(file_handl.read(self.__bytes_per_row__), dtype='f')
-                h5_dset[row_indx] = np.float16(data_vec)
-                h5_dset.file.flush()
-        
+        if max_mem is None:
+            max_mem = self.max_ram
+        if end_row is None:
+            end_row = self.num_rows
+
+        points_per_row = self.__bytes_per_row__ // 4
+        # Only map the lines that have been recorded so far:
+        data_mat = np.memmap(filepath, dtype=np.float32, mode='r', shape=(end_row, points_per_row))
+
+        # Blocks of whole rows of chunks. Each row takes 4 bytes (float32 file pages) + 2 bytes (float16) per point:
+        rows_per_block = get_rows_per_batch(h5_dset, 6 * points_per_row, max_mem, num_rows=self.num_rows)
+
+        # Only need 16 bit floats (time)
+        for block_start in range(start_row, end_row, rows_per_block):
+            block_end = min(block_start + rows_per_block, end_row)
+            print('Reading lines {} - {} of {}'.format(block_start, block_end, self.num_rows))
+            h5_dset[block_start: block_end] = data_mat[block_start: block_end].astype(np.float16)
+
+        h5_dset.file.flush()
+        del data_mat
+
         print('Finished reading file: {}!'.format(filepath))
@@ -18,6 +18,7 @@ from .df_utils.be_utils import parmsToDict
 from .gmode_line import GLineTranslator
 from pyUSID.io.write_utils import VALUES_DTYPE, Dimension
 from pyUSID.io.hdf_utils import write_simple_attrs, create_indexed_group, write_ind_val_dsets, write_main_dataset
+from ..chunking import plan_chunks
 
 
 class GTuneTranslator(GLineTranslator):
@@ -26,7 +27,7 @@ class GTuneTranslator(GLineTranslator):
     """
 
     def __init__(self, *args, **kwargs):
-        super(GLineTranslator, self).__init__(*args, **kwargs)
+        super(GTuneTranslator, self).__init__(*args, **kwargs)
 
     @staticmethod
     def is_valid_file(file_path):
@@ -135,6 +136,7 @@ class GTuneTranslator(GLineTranslator):
         h5_spec_inds, h5_spec_vals = write_ind_val_dsets(meas_grp, spec_desc, is_spectral=True)
 
 
+        data_files = list()
         for f_index in data_paths.keys():
             chan_grp = create_indexed_group(meas_grp, 'Channel')
 
@@ -143,10 +145,15 @@ class GTuneTranslator(GLineTranslator):
                                          None, None,
                                          h5_pos_inds=h5_pos_ind, h5_pos_vals=h5_pos_val,
                                          h5_spec_inds=h5_spec_inds, h5_spec_vals=h5_spec_vals,
-                                         chunks=(1, self.points_per_pixel), dtype=np.float16)
+                                         chunks=plan_chunks((self.num_rows, self.points_per_pixel * num_cols),
+                                                            np.float16, 'pixel',
+                                                            unit_chunks=(1, self.points_per_pixel)).chunks,
+                                         dtype=np.float16)
 
-            # Now transfer scan data in the dat file to the h5 file:
-            super(GTuneTranslator, self)._read_data(data_paths[f_index], h5_main)
+            data_files.append((data_paths[f_index], h5_main))
+
+        # Now transfer scan data in the dat files to the h5 file:
+        self._read_channels(data_files)
 
         h5_file.close()
         print('G-Tune translation complete!')
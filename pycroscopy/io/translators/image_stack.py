@@ -14,13 +14,14 @@ from PIL import Image
 from skimage.measure import block_reduce
 import h5py
 
-from .df_utils.image_utils import no_bin
+from .df_utils.image_utils import no_bin, write_image_stack
 from .df_utils.dm_utils import read_dm3
 from pyUSID.io.image import read_image
 from pyUSID.io.translator import Translator
-from pyUSID.io.write_utils import Dimension, calc_chunks
+from pyUSID.io.write_utils import Dimension
 from pyUSID.io.hdf_utils import get_h5_obj_refs, link_as_main, write_main_dataset, \
     write_simple_attrs, create_indexed_group
+from ..chunking import plan_chunks
 
 
 class ImageStackTranslator(Translator):
@@ -28,7 +29,19 @@ class ImageStackTranslator(Translator):
     Translate Image data from a set of images to an HDF5 file
     """
     def __init__(self, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        max_mem_mb : unsigned integer, optional. Default = 1024
+            Maximum system memory (in megabytes) that the translator can use
+        cores : unsigned integer, optional
+            Number of workers decoding the images. Default - as recommended by pyUSID
+        use_processes : bool, optional. Default = False
+            Whether the images are decoded in processes instead of threads
+        """
         super(ImageStackTranslator, self).__init__(*args, **kwargs)
+        self._cores = kwargs.pop('cores', None)
+        self._use_processes = kwargs.pop('use_processes', False)
 
         self.rebin = False
         self.bin_factor = 1
@@ -135,6 +148,7 @@ class ImageStackTranslator(Translator):
         Iterates over the images in `file_list`, reading each image and downsampling if
         reqeusted, and writes the flattened image to file.  Also builds the Mean_Ronchigram
         and the Spectroscopic_Mean datasets at the same time.
+        Images are decoded concurrently and written in order in slabs of whole chunks.
 
         Parameters
         ----------
@@ -148,49 +162,18 @@ class ImageStackTranslator(Translator):
             Dataset which will hold the Mean Ronchigram
         image_path : str
             Absolute file path to the directory which hold the images
+        image_type : str
+            File extension of the images
 
         Returns
         -------
         None
         """
+        tasks = [(os.path.join(image_path, thisfile), image_type, self.binning_func, self.bin_factor, self.bin_func)
+                 for thisfile in file_list]
 
-        mean_ronch = np.zeros(h5_ronch.shape, dtype=np.float32)
-
-        num_files = len(file_list)
-        if image_type == '.dm3':
-            for ifile, thisfile in enumerate(file_list):
-        
-                image, _ = read_dm3(thisfile)
-                image = self.binning_func(image, self.bin_factor, self.bin_func)
-                image = image.flatten()
-                h5_main[ifile, :] = image
-
-                h5_mean_spec[ifile] = np.mean(image)
-
-                mean_ronch += image
-
-                self.h5_file.flush()
-        
-        else:
-            for ifile, thisfile in enumerate(file_list):
-
-     #           selected = (ifile + 1) % round(num_files / 16) == 0
-     #           if selected:
-     #               print('Processing file...{}% - reading: {}'.format(round(100 * ifile / num_files), thisfile))
-
-                image, _ = read_image(os.path.join(image_path, thisfile), as_gray=True)
-                image = self.binning_func(image, self.bin_factor, self.bin_func)
-                image = image.flatten()
-                h5_main[ifile, :] = image
-
-                h5_mean_spec[ifile] = np.mean(image)
-
-                mean_ronch += image
-
-                self.h5_file.flush()
-
-        h5_ronch[:] = mean_ronch / num_files
-        self.h5_file.flush()
+        write_image_stack(_read_stack_image, tasks, h5_main, h5_mean_spec, h5_ronch, images_in_rows=True,
+                          cores=self._cores, use_processes=self._use_processes, max_mem_mb=self.max_ram / 1024 ** 2)
 
     # def downSampRoncVec(self, ronch_vec, binning_factor):
     #     """
@@ -336,9 +319,8 @@ class ImageStackTranslator(Translator):
         pos_desc = [Dimension('X', 'pixel', np.arange(scan_size_x)),
                     Dimension('Y', 'pixel', np.arange(scan_size_y))]
 
-        ds_chunking = calc_chunks([num_files, num_pixels],
-                                  data_type(0).itemsize,
-                                  unit_chunks=(1, num_pixels))
+        # One whole image per position:
+        ds_chunking = plan_chunks([num_files, num_pixels], data_type, 'pixel', unit_chunks=(1, num_pixels)).chunks
 
     # Allocate space for Main_Data and Pixel averaged Data
         h5_main = write_main_dataset(chan_grp, (num_files, num_pixels), 'Raw_Data',
@@ -357,6 +339,37 @@ class ImageStackTranslator(Translator):
         return h5_main, h5_mean_spec, h5_ronch
 
 
+def _read_stack_image(file_path, image_type, binning_func, bin_factor, bin_func):
+    """
+    Reads a single image of the stack and downsamples it if requested.
+    Module-level so that it can be executed in worker processes.
+
+    Parameters
+    ----------
+    file_path : str
+        Absolute path to the image file
+    image_type : str
+        File extension of the image
+    binning_func : callable
+        Function that downsamples the image
+    bin_factor : tuple of uint
+        Downsampling factor for each dimension
+    bin_func : callable
+        Function which calculates the value of each block
+
+    Returns
+    -------
+    image : numpy.ndarray
+        Flattened image
+    """
+    if image_type == '.dm3':
+        image, _ = read_dm3(file_path)
+    else:
+        image, _ = read_image(file_path, as_gray=True)
+    image = binning_func(image, bin_factor, bin_func)
+    return image.flatten()
+
+
 class PtychographyTranslator(ImageStackTranslator):
 
     def __init__(self, *args, **kwargs):
@@ -12,6 +12,8 @@ from pyUSID.io.hdf_utils import (create_indexed_group, write_main_dataset,
                                  write_ind_val_dsets)
 from pyUSID.io.translator import Translator
 from .df_utils.nanonis_utils import read_nanonis_file
+from .df_utils.base_utils import get_rows_per_batch
+from ..chunking import plan_chunks
 # TODO: Adopt any missing features from https://github.com/paruch-group/distortcorrect/blob/master/afm/filereader/nanonisFileReader.py
 
 
@@ -24,7 +26,7 @@ class NanonisTranslatorCorrect(Translator):
 
     """
     def __init__(self, *args, **kwargs):
-        super(Translator, self).__init__(*args, **kwargs)
+        super(NanonisTranslatorCorrect, self).__init__(*args, **kwargs)
 
         self.data_path = None
         self.folder = None
@@ -113,7 +115,9 @@ class NanonisTranslatorCorrect(Translator):
         # Create the datasets for all the channels
         num_points = h5_pos_inds.shape[0]
         for data_channel in data_channels:
+            # Grid data is memory-mapped so this is only a view:
             raw_data = self.data_dict[data_channel].reshape([num_points, -1])
+            dtype = raw_data.dtype.newbyteorder('=')
 
             chan_grp = create_indexed_group(meas_grp, 'Channel')
             data_label = data_channel
@@ -121,23 +125,53 @@ class NanonisTranslatorCorrect(Translator):
             write_simple_attrs(
                 chan_grp, self.parm_dict['channel_parms'][data_channel]
             )
-            write_main_dataset(chan_grp, raw_data, 'Raw_Data',
-                               data_label, data_unit,
-                               None, None,
-                               h5_pos_inds=h5_pos_inds,
-                               h5_pos_vals=h5_pos_vals,
-                               h5_spec_inds=h5_spec_inds,
-                               h5_spec_vals=h5_spec_vals)
-            h5_file.flush()
+            h5_raw = write_main_dataset(chan_grp, raw_data.shape, 'Raw_Data',
+                                        data_label, data_unit,
+                                        None, None,
+                                        h5_pos_inds=h5_pos_inds,
+                                        h5_pos_vals=h5_pos_vals,
+                                        h5_spec_inds=h5_spec_inds,
+                                        h5_spec_vals=h5_spec_vals,
+                                        dtype=dtype,
+                                        # Spectra and maps per bias are both common:
+                                        chunks=plan_chunks(raw_data.shape, dtype, 'balanced').chunks)
+            self._write_channel(h5_raw, raw_data)
 
         h5_file.close()
         print('Nanonis translation complete.')
 
         return self.h5_path
 
+    def _write_channel(self, h5_raw, raw_data):
+        """
+        Copies the data of a channel into the HDF5 dataset in blocks of positions
+        that span whole chunks and are limited in size by the maximum memory.
+
+        Parameters
+        ----------
+        h5_raw : h5py.Dataset
+            Pre-allocated dataset to write the data into
+        raw_data : numpy.ndarray
+            Data of the channel arranged as [position, spectral point].
+            Typically a strided view into a memory-mapped file
+
+        Returns
+        -------
+        None
+
+        """
+        # Memory for the block read from the file and its native copy:
+        bytes_per_pos = 2 * raw_data.shape[1] * raw_data.dtype.itemsize
+        pos_per_block = get_rows_per_batch(h5_raw, bytes_per_pos, self.max_ram, num_rows=raw_data.shape[0])
+        for start in range(0, raw_data.shape[0], pos_per_block):
+            stop = min(start + pos_per_block, raw_data.shape[0])
+            h5_raw[start:stop] = np.asarray(raw_data[start:stop], dtype=h5_raw.dtype)
+        h5_raw.file.flush()
+
     def _read_data(self, file_path):
         """
         Extracting data and parameters from Nanonis files.
+        Data in grid (.3ds) files is memory-mapped rather than read.
 
         Parameters
         ----------
@@ -149,7 +183,7 @@ class NanonisTranslatorCorrect(Translator):
         None
 
         """
-        data, file_ext = read_nanonis_file(file_path)
+        data, file_ext = read_nanonis_file(file_path, mmap=True)
 
         header_dict = data.header
         signal_dict = data.signals
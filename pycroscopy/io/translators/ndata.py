@@ -16,11 +16,14 @@ import numpy as np
 from skimage.measure import block_reduce
 from skimage.util import crop
 
+from .df_utils.base_utils import gen_ordered_results
 from .df_utils.image_utils import unnest_parm_dicts
 from .df_utils.dm_utils import read_dm3
 from pyUSID.io.translator import Translator
-from pyUSID.io.write_utils import Dimension, calc_chunks
+from pyUSID.io.write_utils import Dimension
 from pyUSID.io.hdf_utils import write_main_dataset, create_indexed_group, write_simple_attrs
+from pyUSID.processing.comp_utils import recommend_cpu_cores
+from ..chunking import plan_chunks
 
 
 class NDataTranslator(Translator):
@@ -29,7 +32,16 @@ class NDataTranslator(Translator):
     """
 
     def __init__(self, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        max_mem_mb : unsigned integer, optional. Default = 1024
+            Maximum system memory (in megabytes) that the translator can use
+        cores : unsigned integer, optional
+            Number of threads loading, cropping and binning the files. Default - as recommended by pyUSID
+        """
         super(NDataTranslator, self).__init__(*args, **kwargs)
+        self._cores = kwargs.pop('cores', None)
 
         self.rebin = False
         self.bin_factor = (1, 1, 1, 1)
@@ -229,32 +241,24 @@ class NDataTranslator(Translator):
         '''
 
         '''
-        Get zipfile handles for all the ndata1 files that were found in the image_path
+        Files are loaded, cropped and binned by a pool of threads (decompression and numpy release the GIL, and
+        the arrays are too large to send between processes) while this thread writes them in order.
+        Only as many files are loaded ahead as fit within max_ram along with the file being written.
+        Each loaded file takes up to twice its decoded size (the array and its cropped / binned copy)
         '''
-
-        for ifile, (this_file, this_channel) in enumerate(zip(file_list, h5_channels)):
-            _, ext = os.path.splitext(this_file)
-            if ext in ['.ndata1', '.ndata']:
-                '''
-                Extract the data file from the zip archive and read it into an array
-                '''
-                this_zip = zipfile.ZipFile(this_file, 'r')
-                tmp_path = this_zip.extract('data.npy')
-                this_data = np.load(tmp_path)
-                os.remove(tmp_path)
-            elif ext == '.npy':
-                # Read data directly from npy file
-                this_data = np.load(this_file)
-
+        bytes_per_file = max(1, 2 * max([_get_ndata_nbytes(this_file) for this_file in file_list] + [0]))
+        max_pending = max(1, int(self.max_ram // bytes_per_file) - 1)
+        cores = recommend_cpu_cores(max(1, len(file_list)), requested_cores=self._cores, lengthy_computation=True)
+        cores = min(cores, max_pending)
+        tasks = [(this_file,) for this_file in file_list]
+        loaded = gen_ordered_results(self._load_file, tasks, cores=cores, max_pending=max_pending)
+
+        for ifile, ((crop_shape, this_data), this_channel) in enumerate(zip(loaded, h5_channels)):
             '''
             Find the shape of the data, then calculate the final dimensions based on the crop and
             downsampling parameters
             '''
-            while this_data.ndim < 4:
-                this_data = np.expand_dims(this_data, 0)
-
-            this_data = self.crop_ronc(this_data)
-            scan_size_x, scan_size_y, usize, vsize = this_data.shape
+            scan_size_x, scan_size_y, usize, vsize = crop_shape
 
             usize = int(round(1.0 * usize / self.bin_factor[-2]))
             vsize = int(round(1.0 * vsize / self.bin_factor[-1]))
@@ -278,9 +282,8 @@ class NDataTranslator(Translator):
             pos_desc = [Dimension('X', 'pixel', np.arange(scan_size_x)),
                         Dimension('Y', 'pixel', np.arange(scan_size_y))]
 
-            ds_chunking = calc_chunks([num_images, num_pixels],
-                                      np.float32(0).itemsize,
-                                      unit_chunks=(1, num_pixels))
+            # One whole image per position:
+            ds_chunking = plan_chunks([num_images, num_pixels], np.float32, 'pixel', unit_chunks=(1, num_pixels)).chunks
 
             # Allocate space for Main_Data and Pixel averaged DataX
             h5_main = write_main_dataset(this_channel, (num_images, num_pixels), 'Raw_Data',
@@ -294,7 +297,7 @@ class NDataTranslator(Translator):
             h5_mean_spec = this_channel.create_dataset('Mean_Spectrogram',
                                                        data=np.zeros(num_images, dtype=np.float32))
 
-            this_data = self.binning_func(this_data, self.bin_factor, self.bin_func).reshape(h5_main.shape)
+            this_data = this_data.reshape(h5_main.shape)
 
             h5_main[:, :] = this_data
 
@@ -302,12 +305,37 @@ class NDataTranslator(Translator):
 
             h5_ronch[:] = np.mean(this_data, axis=0)
 
-            self.h5_f.flush()
-
             h5_main_list.append(h5_main)
 
+        loaded.close()
         self.h5_f.flush()
 
+    def _load_file(self, file_path):
+        """
+        Reads the data in a single .ndata, .ndata1 or .npy file, crops and downsamples it if requested
+
+        Parameters
+        ----------
+        file_path : str
+            Absolute path to the file
+
+        Returns
+        -------
+        crop_shape : tuple of uint
+            Shape of the 4D data after cropping and before downsampling
+        this_data : numpy.ndarray
+            Cropped and downsampled 4D data
+        """
+        this_data = _read_ndata_array(file_path)
+
+        while this_data.ndim < 4:
+            this_data = np.expand_dims(this_data, 0)
+
+        this_data = self.crop_ronc(this_data)
+        crop_shape = this_data.shape
+
+        return crop_shape, self.binning_func(this_data, self.bin_factor, self.bin_func)
+
     def crop_ronc(self, ronc):
         """
         Crop the input Ronchigram by the specified ammount using the specified method.
@@ -433,8 +461,11 @@ class NDataTranslator(Translator):
         for fpath in file_list:
             base, ext = os.path.splitext(fpath)
             if ext in ['.ndata1', '.ndata']:
-                zfile = zipfile.ZipFile(fpath, 'r')
-                tmp_path = zfile.extract('metadata.json')
+                # Read the metadata straight from the archive
+                with zipfile.ZipFile(fpath, 'r') as zfile:
+                    metastring = zfile.read('metadata.json').decode('utf-8')
+                parm_list.append(unnest_parm_dicts(json.loads(metastring)))
+                continue
             elif ext == '.npy':
                 folder, basename = os.path.split(base)
                 same_name_path = base+'.json'
@@ -448,9 +479,6 @@ class NDataTranslator(Translator):
             parm_list.append(unnest_parm_dicts(json.loads(metastring)))
             metafile.close()
 
-            if ext == '.ndata1':
-                os.remove(tmp_path)
-
         return parm_list
 
     def _setupH5(self, image_parms):
@@ -516,3 +544,63 @@ class NDataTranslator(Translator):
             The input image
         """
         return image
+
+
+def _read_ndata_array(file_path):
+    """
+    Reads the array within a .npy file or the data.npy file within a .ndata / .ndata1 zip archive.
+    The array is decompressed straight from the archive without extracting it to a temporary file.
+
+    Parameters
+    ----------
+    file_path : str
+        Absolute path to the file
+
+    Returns
+    -------
+    this_data : numpy.ndarray
+        Array in the file
+    """
+    _, ext = os.path.splitext(file_path)
+    if ext in ['.ndata1', '.ndata']:
+        with zipfile.ZipFile(file_path, 'r') as this_zip:
+            with this_zip.open('data.npy', 'r') as file_handle:
+                return np.lib.format.read_array(file_handle)
+    # Read data directly from npy file
+    return np.load(file_path)
+
+
+def _get_ndata_nbytes(file_path):
+    """
+    Size in bytes of the array within a .npy file or the data.npy file within a .ndata / .ndata1 zip archive.
+    Only the header of the array is read
+
+    Parameters
+    ----------
+    file_path : str
+        Absolute path to the file
+
+    Returns
+    -------
+    nbytes : uint
+        Size of the decoded array in bytes
+    """
+    _, ext = os.path.splitext(file_path)
+    if ext in ['.ndata1', '.ndata']:
+        with zipfile.ZipFile(file_path, 'r') as this_zip:
+            with this_zip.open('data.npy', 'r') as file_handle:
+                return _read_npy_nbytes(file_handle)
+    with open(file_path, 'rb') as file_handle:
+        return _read_npy_nbytes(file_handle)
+
+
+def _read_npy_nbytes(file_handle):
+    """
+    Size in bytes of the array in an open .npy file, read from its header
+    """
+    version = np.lib.format.read_magic(file_handle)
+    if version == (1, 0):
+        shape, _, dtype = np.lib.format.read_array_header_1_0(file_handle)
+    else:
+        shape, _, dtype = np.lib.format.read_array_header_2_0(file_handle)
+    return int(np.prod(shape)) * dtype.itemsize
@@ -17,9 +17,10 @@ from skimage.util import crop
 from .df_utils import dm4reader
 from .df_utils.dm_utils import parse_dm4_parms, read_dm3
 from pyUSID.io.translator import Translator
-from pyUSID.io.write_utils import Dimension, calc_chunks
+from pyUSID.io.write_utils import Dimension
 from pyUSID.io.hdf_utils import create_indexed_group, write_main_dataset, write_simple_attrs
 from pycroscopy.io.translators.image import read_image
+from ..chunking import plan_chunks
 
 
 class OneViewTranslator(Translator):
@@ -438,9 +439,8 @@ class OneViewTranslator(Translator):
         pos_desc = [Dimension('X', 'pixel', np.arange(scan_size_x)),
                     Dimension('Y', 'pixel', np.arange(scan_size_y))]
 
-        ds_chunking = calc_chunks([num_files, num_pixels],
-                                  data_type(0).itemsize,
-                                  unit_chunks=(1, num_pixels))
+        # One whole image per position:
+        ds_chunking = plan_chunks([num_files, num_pixels], data_type, 'pixel', unit_chunks=(1, num_pixels)).chunks
 
         # Allocate space for Main_Data and Pixel averaged Data
         h5_main = write_main_dataset(chan_grp, (num_files, num_pixels), 'Raw_Data',
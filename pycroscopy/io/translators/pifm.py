@@ -5,6 +5,7 @@ from pyUSID.io import write_utils
 from pyUSID import USIDataset
 import pyUSID as usid
 import h5py
+from ..chunking import plan_chunks
 
 class PiFMTranslator(Translator):
     """
@@ -134,7 +135,9 @@ class PiFMTranslator(Translator):
         self.pspectrum_desc = pspectrum_desc
 
     def read_spectrograms(self):
-        """reads spectrograms, associated spectral values, and saves them in two dictionaries"""
+        """reads spectrograms, associated spectral values, and saves them in two dictionaries.
+        raw_spectrograms holds memory-mapped [x, y, spec] views of the raw (unscaled) int32 readings.
+        Use get_spectrogram() to get the scaled values of a few columns at a time"""
         spectrograms = {}
         spectrogram_spec_vals = {}
         for file_name, descriptors in self.spectrogram_desc.items():
@@ -148,26 +151,56 @@ class PiFMTranslator(Translator):
                 self.attenuation = attenuation
             else:
                 spectrogram_spec_vals[file_name] = spec_vals_i
-            #load and save spectrograms
-            spectrogram_i = np.fromfile(os.path.join(self.directory, file_name), dtype='i4')
-            spectrograms[file_name] = np.zeros((self.x_len, self.y_len, len(spec_vals_i)))
-            for y, line in enumerate(np.split(spectrogram_i, self.y_len)):
-                for x, pt_spectrum in enumerate(np.split(line, self.x_len)):
-                    spectrograms[file_name][x, y, :] = pt_spectrum * float(descriptors[2])
-        self.spectrograms = spectrograms
+            #map spectrograms without reading them
+            spectrograms[file_name] = _map_int_data(os.path.join(self.directory, file_name), self.x_len,
+                                                    self.y_len, len(spec_vals_i))
+        self.raw_spectrograms = spectrograms
+        self._spectrograms = None
         self.spectrogram_spec_vals = spectrogram_spec_vals
 
     def read_imgs(self):
         """reads images and saves to dictionary"""
         imgs = {}
         for file_name, descriptors in self.img_desc.items():
-            img_i = np.fromfile(os.path.join(self.directory, file_name), dtype='i4')
-            imgs[file_name] = np.zeros((self.x_len, self.y_len))
-            for y, line in enumerate(np.split(img_i, self.y_len)):
-                for x, pixel in enumerate(np.split(line, self.x_len)):
-                    imgs[file_name][x, y] = pixel * float(descriptors[1])
+            img_i = _map_int_data(os.path.join(self.directory, file_name), self.x_len, self.y_len)
+            imgs[file_name] = _scale_int_data(img_i, descriptors[1])
         self.imgs = imgs
 
+    @property
+    def spectrograms(self):
+        """dictionary of the scaled spectrograms arranged as [x, y, spec].
+        All spectrograms are read into memory the first time this is accessed.
+        Note that the spectrograms are now float32 (previously float64), same as get_spectrogram().
+        Spectrograms assigned to this property are the ones written to the h5 file"""
+        if self._spectrograms is None:
+            self._spectrograms = {file_name: self.get_spectrogram(file_name) for file_name in self.raw_spectrograms}
+        return self._spectrograms
+
+    @spectrograms.setter
+    def spectrograms(self, spectrograms):
+        self._spectrograms = spectrograms
+
+    def get_spectrogram(self, file_name, x_slice=slice(None)):
+        """
+        Returns the scaled spectrogram
+
+        Parameters
+        ----------
+        file_name : str
+            Name of the spectrogram file
+        x_slice : slice, optional
+            Columns of the spectrogram to read. Default - all columns
+
+        Returns
+        -------
+        spectrogram : 3D numpy.float32 array
+            Spectrogram arranged as [x, y, spec]
+        """
+        if self._spectrograms is not None:
+            # Already in memory or assigned by the user:
+            return np.asarray(self._spectrograms[file_name][x_slice], dtype=np.float32)
+        return _scale_int_data(self.raw_spectrograms[file_name][x_slice], self.spectrogram_desc[file_name][2])
+
     def read_spectra(self):
         """reads all point spectra and saves to dictionary"""
         spectra = {}
@@ -245,6 +278,10 @@ class PiFMTranslator(Translator):
                                                            self.pos_dims,  # Position dimensions
                                                            spectrogram_spec_dims,  # Spectroscopic dimensions
                                                            dtype=np.float32,  # data type / precision
+                                                           # Spectra and maps per wavelength are both common:
+                                                           chunks=plan_chunks([self.x_len * self.y_len,
+                                                                               len(spec_vals_i)],
+                                                                              np.float32, 'balanced').chunks,
                                                            main_dset_attrs={'Caption': descriptors[0],
                                                                             'Bytes_Per_Pixel': descriptors[1],
                                                                             'Scale': descriptors[2],
@@ -255,7 +292,14 @@ class PiFMTranslator(Translator):
                                                                             'Wavelength_File': descriptors[7],
                                                                             'Wavelength_Units': descriptors[8]})
                 h5_raw.h5_pos_vals[:, :] = self.pos_val
-                h5_raw[:, :] = self.spectrograms[spectrogram_f].reshape(h5_raw.shape)
+                # Positions are ordered as [x, y]. Decode and write whole columns (x) at a time:
+                bytes_per_col = self.y_len * len(spec_vals_i) * (np.int32(0).itemsize + np.float32(0).itemsize)
+                cols_per_batch = max(1, int(self.max_ram // bytes_per_col))
+                for x_start in range(0, self.x_len, cols_per_batch):
+                    x_stop = min(x_start + cols_per_batch, self.x_len)
+                    spectrogram = self.get_spectrogram(spectrogram_f, slice(x_start, x_stop))
+                    h5_raw[x_start * self.y_len: x_stop * self.y_len] = spectrogram.reshape(-1, h5_raw.shape[1])
+                self.h5_f.flush()
 
     def write_images(self):
         if bool(self.img_desc):
@@ -396,3 +440,46 @@ class PiFMTranslator(Translator):
                                                                             'YLoc': 0})
                 h5_raw[:, :] = self.spectra[spec_f].reshape(h5_raw.shape)
 
+
+def _map_int_data(file_path, x_len, y_len, num_pts=None):
+    """
+    Memory-maps the int32 readings in an ANFATEC image or spectrogram file
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the .int file
+    x_len : unsigned int
+        Number of pixels in each line
+    y_len : unsigned int
+        Number of lines
+    num_pts : unsigned int, optional
+        Number of points in each spectrum if the file contains a spectrogram
+
+    Returns
+    -------
+    raw_data : numpy.memmap
+        Read-only view of the readings arranged as [x, y] or [x, y, spec]
+    """
+    shape = (y_len, x_len) if num_pts is None else (y_len, x_len, num_pts)
+    # Files are written line (y) by line:
+    return np.swapaxes(np.memmap(file_path, dtype='i4', mode='r', shape=shape), 0, 1)
+
+
+def _scale_int_data(raw_data, scale):
+    """
+    Converts the raw int32 readings to float32 physical values
+
+    Parameters
+    ----------
+    raw_data : numpy.ndarray
+        Raw readings
+    scale : str or float
+        Scale factor from the file description
+
+    Returns
+    -------
+    data : numpy.ndarray
+        float32 array with the same shape as the readings
+    """
+    return np.multiply(raw_data, np.float32(scale), dtype=np.float32)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of the file extensions and magic-byte signatures that each Translator accepts.
+Used to quickly narrow down the Translators that could read a given file before importing them and
+calling their (potentially expensive) is_valid_file() functions.
+
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+import os
+import sys
+from collections import OrderedDict, namedtuple
+from importlib import import_module
+
+if sys.version_info.major == 3:
+    unicode = str
+
+__all__ = ['register_translator', 'get_registered_translators', 'get_translator_class', 'sniff_translators']
+
+TranslatorSpec = namedtuple('TranslatorSpec', ['name', 'module', 'extensions', 'magic', 'folders', 'siblings',
+                                               'parents'])
+
+_registry = OrderedDict()
+
+_HDF5_MAGIC = [(0, b'\x89HDF\r\n\x1a\n'), (512, b'\x89HDF\r\n\x1a\n')]
+_IGOR_MAGIC = [(0, bytes(bytearray(pair))) for version in [1, 2, 3, 5] for pair in [(version, 0), (0, version)]]
+_BE_FOLDER_EXTS = ['jpg', 'png', 'jpeg', 'tiff', 'mat', 'txt', 'dat', 'xls', 'xlsx']
+_IMAGE_EXTS = ['tif', 'tiff', 'png', 'jpg', 'jpeg', 'bmp', 'dm3', 'dm4']
+
+
+def register_translator(name, module, extensions=None, magic=None, folders=False, siblings=None, parents=None):
+    """
+    Registers a Translator so that it can be found by pycroscopy.io.ingest() without importing it upfront.
+    Registering a Translator under an existing name replaces the prior registration.
+
+    Parameters
+    ----------
+    name : str
+        Name of the Translator class
+    module : str
+        Absolute name or name relative to pycroscopy.io.translators of the module containing the Translator
+    extensions : list of str, optional
+        File extensions (without the leading period) that this Translator reads. Default - any extension
+    magic : list of tuples, optional
+        (byte offset, bytes) signatures, one of which must be present in any file this Translator reads.
+        Default - no check on the contents of the file
+    folders : bool, optional. Default = False
+        Whether or not this Translator can be given the path to a folder
+    siblings : list of str, optional
+        Endings of file names, one of which identifies the folders this Translator reads. Any file, regardless of
+        its extension, within a folder containing a file with one of these endings is accepted. Default - none
+    parents : list of str, optional
+        Names of the folders this Translator reads. Any file, regardless of its extension, within a folder with
+        one of these names is accepted. Default - none
+    """
+    if not isinstance(name, (str, unicode)) or not isinstance(module, (str, unicode)):
+        raise TypeError('name and module must be strings')
+    if extensions is not None:
+        extensions = tuple(ext.lower().lstrip('.') for ext in extensions)
+    if magic is not None:
+        magic = tuple((int(offset), bytes(sig)) for offset, sig in magic)
+    if siblings is not None:
+        siblings = tuple(ending.lower() for ending in siblings)
+    if parents is not None:
+        parents = tuple(folder_name.lower() for folder_name in parents)
+    _registry[name] = TranslatorSpec(name, module, extensions, magic, bool(folders), siblings, parents)
+
+
+def get_registered_translators():
+    """
+    Returns the specifications of all registered Translators in the order in which they were registered
+
+    Returns
+    -------
+    specs : list of TranslatorSpec
+    """
+    return list(_registry.values())
+
+
+def get_translator_class(name):
+    """
+    Imports and returns the requested Translator class
+
+    Parameters
+    ----------
+    name : str
+        Name of a registered Translator class
+
+    Returns
+    -------
+    trans_class : class
+        Translator class
+    """
+    if name not in _registry:
+        raise KeyError('{} is not a registered Translator'.format(name))
+    module = import_module(_registry[name].module, package=__name__.rsplit('.', 1)[0])
+    return getattr(module, name)
+
+
+def _read_header(file_path, num_bytes):
+    """
+    Returns the first `num_bytes` of the file or fewer if the file is smaller
+    """
+    try:
+        with open(file_path, 'rb') as file_handle:
+            return file_handle.read(num_bytes)
+    except (IOError, OSError):
+        return b''
+
+
+def _list_folder(folder_path):
+    """
+    Returns the lower-case names of the files in the folder or an empty list if the folder cannot be read
+    """
+    try:
+        return [item.lower() for item in os.listdir(folder_path or os.curdir)]
+    except (IOError, OSError):
+        return []
+
+
+def sniff_translators(file_path):
+    """
+    Cheaply finds the Translators that may be able to read the provided file or folder, based only on the
+    file extension (or the name of its folder and the other files in it) and, if declared, a signature at the start
+    of the file.
+    The candidates must still be validated via their is_valid_file() functions.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to a file or folder
+
+    Returns
+    -------
+    names : list of str
+        Names of the candidate Translator classes in the order in which they were registered
+    """
+    if not isinstance(file_path, (str, unicode)):
+        raise TypeError('file_path must be a string object')
+
+    if os.path.isdir(file_path):
+        return [spec.name for spec in _registry.values() if spec.folders]
+
+    ext = os.path.splitext(file_path)[1][1:].lower()
+    parent = os.path.basename(os.path.dirname(os.path.abspath(file_path))).lower()
+    # The folder is only listed if a Translator identifies its files by their siblings:
+    siblings = None
+    candidates = list()
+    for spec in _registry.values():
+        if spec.extensions is None or ext in spec.extensions:
+            candidates.append(spec)
+        elif spec.parents and parent in spec.parents:
+            candidates.append(spec)
+        elif spec.siblings:
+            if siblings is None:
+                siblings = _list_folder(os.path.dirname(file_path))
+            if any(item.endswith(spec.siblings) for item in siblings):
+                candidates.append(spec)
+
+    # Read the header only once, for all candidates that need it:
+    header_size = max([offset + len(sig) for spec in candidates if spec.magic for offset, sig in spec.magic] + [0])
+    header = _read_header(file_path, header_size) if header_size > 0 else b''
+
+    names = list()
+    for spec in candidates:
+        if spec.magic and not any(header[offset: offset + len(sig)] == sig for offset, sig in spec.magic):
+            continue
+        names.append(spec.name)
+    return names
+
+
+# Same order as translators.all_translators since ingest() picks the last valid Translator:
+register_translator('BEodfTranslator', '.be_odf', extensions=_BE_FOLDER_EXTS, folders=True)
+register_translator('BEodfRelaxationTranslator', '.be_odf_relaxation', extensions=_BE_FOLDER_EXTS, folders=True)
+# Any file within the 'newdataformat' folder or within the folder containing it:
+register_translator('BEPSndfTranslator', '.beps_ndf', extensions=['txt', 'mat', 'dat', 'xls', 'xlsx'],
+                    folders=True, siblings=['newdataformat'], parents=['newdataformat'])
+register_translator('FakeBEPSGenerator', '.beps_data_generator', extensions=[])
+register_translator('LabViewH5Patcher', '.labview_h5_patcher', extensions=['h5', 'hdf5'], magic=_HDF5_MAGIC)
+register_translator('GDMTranslator', '.general_dynamic_mode', extensions=['mat', 'txt'], folders=True)
+register_translator('GIVTranslator', '.gmode_iv', extensions=['mat', 'txt'], folders=True)
+register_translator('GLineTranslator', '.gmode_line', extensions=_BE_FOLDER_EXTS, folders=True)
+register_translator('GTuneTranslator', '.gmode_tune', extensions=_BE_FOLDER_EXTS, folders=True)
+# Any file within a folder containing the parameters file:
+register_translator('TRKPFMTranslator', '.tr_kpfm', extensions=['mat', 'dat'], folders=True, siblings=['parm.mat'])
+register_translator('SporcTranslator', '.sporc', extensions=['mat'], folders=True)
+register_translator('IgorIBWTranslator', '.igor_ibw', extensions=['ibw'], magic=_IGOR_MAGIC)
+register_translator('PiFMTranslator', '.pifm', extensions=['txt'])
+# Bruker files have numeric extensions such as .001
+register_translator('BrukerAFMTranslator', '.bruker_afm', magic=[(0, b'\\*')])
+register_translator('GwyddionTranslator', '.gwyddion', extensions=['gwy', 'gsf'],
+                    magic=[(0, b'GWYP'), (0, b'Gwyddion Simple Field')])
+register_translator('NanonisTranslatorCorrect', '.nanonis', extensions=['3ds', 'sxm', 'dat'])
+register_translator('AscTranslator', '.omicron_asc', extensions=['asc'])
+register_translator('NDataTranslator', '.ndata', extensions=['ndata', 'ndata1', 'npy'],
+                    magic=[(0, b'PK\x03\x04'), (0, b'\x93NUMPY')], folders=True)
+register_translator('OneViewTranslator', '.oneview', extensions=_IMAGE_EXTS, folders=True)
+register_translator('ImageStackTranslator', '.image_stack', extensions=_IMAGE_EXTS, folders=True)
+register_translator('MovieTranslator', '.time_series', extensions=_IMAGE_EXTS, folders=True)
+register_translator('ImageTranslator', '.image', extensions=_IMAGE_EXTS + ['txt', 'csv'])
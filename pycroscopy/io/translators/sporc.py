@@ -16,10 +16,13 @@ from scipy.io.matlab import loadmat  # To load parameters stored in Matlab .mat
 from pyUSID.io.translator import Translator  # Because this class extends the abstract Translator class
 from pyUSID.io.write_utils import Dimension, INDICES_DTYPE, VALUES_DTYPE
 from pyUSID.io.hdf_utils import get_h5_obj_refs, link_h5_objects_as_attrs
+from pyUSID.processing.comp_utils import recommend_cpu_cores
+from .df_utils.base_utils import gen_ordered_results, get_rows_per_batch
 from ..write_utils import build_ind_val_dsets
 from ..hdf_writer import HDFwriter  # Now the translator is responsible for writing the data.
 # The building blocks for defining heirarchical storage in the H5 file
 from ..virtual_data import VirtualGroup, VirtualDataset
+from ..chunking import plan_chunks
 
 
 class SporcTranslator(Translator):
@@ -27,6 +30,18 @@ class SporcTranslator(Translator):
     Translates G-mode SPORC datasets from .mat files to .h5
     """
 
+    def __init__(self, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        max_mem_mb : unsigned integer, optional. Default = 1024
+            Maximum system memory (in megabytes) that can be used for holding pixels before writing them
+        cores : unsigned int, optional. Default = all available cores
+            Number of worker processes used to decode the pixel files
+        """
+        super(SporcTranslator, self).__init__(*args, **kwargs)
+        self._cores = kwargs.pop('cores', None)
+
     def _read_data(self):
         pass
 
@@ -80,9 +95,11 @@ class SporcTranslator(Translator):
 
         ds_excit_wfm = VirtualDataset('Excitation_Waveform', np.float32(excit_wfm))
 
-        ds_raw_data = VirtualDataset('Raw_Data', data=[],
+        ds_raw_data = VirtualDataset('Raw_Data', data=None,
                                      maxshape=(num_pix, len(excit_wfm)),
-                                     dtype=np.float16, chunking=(1, len(excit_wfm)),
+                                     dtype=np.float16,
+                                     chunking=plan_chunks((num_pix, len(excit_wfm)), np.float16, 'pixel',
+                                                          unit_chunks=(1, len(excit_wfm))).chunks,
                                      compression='gzip')
 
         # technically should change the date, etc.
@@ -125,29 +142,57 @@ class SporcTranslator(Translator):
         print('reading raw data now...')
 
         # Now read the raw data files:
-        pos_ind = 0
-        for row_ind in range(1, num_rows + 1):
-            for col_ind in range(1, num_cols + 1):
-                file_path = path.join(folder_path, 'result_r' + str(row_ind) + '_c' + str(col_ind) + '.mat')
-                # print('Working on row {} col {}'.format(row_ind,col_ind))
-                if path.exists(file_path):
-                    # Load data file
-                    pix_data = loadmat(file_path, squeeze_me=True)
-                    # Take the inverse FFT on 1st dimension
-                    pix_vec = np.fft.ifft(np.fft.ifftshift(pix_data['data']))
-                    # Verified with Matlab - no conjugate required here.
-                    h5_main[pos_ind, :] = np.float16(np.real(pix_vec))
-                    hdf.flush()  # flush from memory!
-                else:
-                    print('File for row {} col {} not found'.format(row_ind, col_ind))
-                pos_ind += 1
-                if (100.0 * pos_ind / num_pix) % 10 == 0:
-                    print('Finished reading {} % of data'.format(int(100 * pos_ind / num_pix)))
+        file_paths = [path.join(folder_path, 'result_r' + str(row_ind) + '_c' + str(col_ind) + '.mat')
+                      for row_ind in range(1, num_rows + 1) for col_ind in range(1, num_cols + 1)]
+        self._write_pixels(h5_main, file_paths, num_cols)
 
         hdf.close()
 
         return h5_path
 
+    def _write_pixels(self, h5_main, file_paths, num_cols, pix_per_task=16):
+        """
+        Decodes the pixel files in worker processes and writes the pixels, in order, into the main dataset in
+        batches of whole chunks that are limited in size by the maximum memory. Missing pixels are reported and
+        left as zeros.
+
+        Parameters
+        ----------
+        h5_main : h5py.Dataset
+            Main dataset to write into
+        file_paths : list of str
+            Path of the .mat file of each pixel in the order of the positions
+        num_cols : unsigned int
+            Number of columns in the grid. Used to report missing pixels
+        pix_per_task : unsigned int, optional. Default = 16
+            Number of pixel files decoded by a worker at a time
+        """
+        num_pix, num_pts = len(file_paths), h5_main.shape[1]
+
+        pix_per_batch = get_rows_per_batch(h5_main, num_pts * h5_main.dtype.itemsize, self.max_ram, num_rows=num_pix)
+        batch = np.zeros((pix_per_batch, num_pts), dtype=h5_main.dtype)
+
+        tasks = [(file_paths[start: start + pix_per_task], num_pts) for start in range(0, num_pix, pix_per_task)]
+        cores = recommend_cpu_cores(len(tasks), requested_cores=self._cores, lengthy_computation=True)
+        results = gen_ordered_results(_read_sporc_pixels, tasks, cores=cores, use_processes=True)
+
+        batch_start = pos_ind = 0
+        next_report = 0
+        for pix_mat, found in results:
+            for pix_vec, is_found in zip(pix_mat, found):
+                if not is_found:
+                    row_ind, col_ind = divmod(pos_ind, num_cols)
+                    print('File for row {} col {} not found'.format(row_ind + 1, col_ind + 1))
+                batch[pos_ind - batch_start] = pix_vec
+                pos_ind += 1
+                if pos_ind - batch_start == pix_per_batch or pos_ind == num_pix:
+                    h5_main[batch_start: pos_ind] = batch[:pos_ind - batch_start]
+                    batch_start = pos_ind
+            if pos_ind >= next_report:
+                print('Finished reading {} % of data'.format(int(100 * pos_ind / num_pix)))
+                next_report = pos_ind + max(1, num_pix // 10)
+        h5_main.file.flush()
+
     @staticmethod
     def __readparms(parm_path):
         """
@@ -203,3 +248,36 @@ class SporcTranslator(Translator):
             h5_sporc_parms.close()
 
         return parm_dict, excit_wfm, spec_ind_mat
+
+
+def _read_sporc_pixels(file_paths, num_pts):
+    """
+    Decodes the provided SPORC pixel files. Defined at the module level so that it can be used by worker processes
+
+    Parameters
+    ----------
+    file_paths : list of str
+        Paths to the .mat files of consecutive pixels
+    num_pts : unsigned int
+        Number of points in each pixel
+
+    Returns
+    -------
+    pix_mat : 2D numpy.float16 array
+        Real part of the inverse FFT of each pixel. Zeros for missing files
+    found : 1D numpy bool array
+        Whether or not the file for each pixel was found
+    """
+    pix_mat = np.zeros((len(file_paths), num_pts), dtype=np.float16)
+    found = np.zeros(len(file_paths), dtype=bool)
+    for pix_ind, file_path in enumerate(file_paths):
+        if not path.exists(file_path):
+            continue
+        # Load data file
+        pix_data = loadmat(file_path, squeeze_me=True)
+        # Take the inverse FFT on 1st dimension
+        pix_vec = np.fft.ifft(np.fft.ifftshift(pix_data['data']))
+        # Verified with Matlab - no conjugate required here.
+        pix_mat[pix_ind] = np.real(pix_vec)
+        found[pix_ind] = True
+    return pix_mat, found
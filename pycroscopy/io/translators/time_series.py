@@ -13,11 +13,13 @@ from skimage.measure import block_reduce
 import h5py
 
 from .df_utils.dm_utils import read_dm3
+from .df_utils.image_utils import no_bin, write_image_stack
 from pyUSID.io.image import read_image
 from pyUSID.io.translator import Translator
-from pyUSID.io.write_utils import Dimension, calc_chunks
+from pyUSID.io.write_utils import Dimension
 from pyUSID.io.hdf_utils import get_h5_obj_refs, link_as_main, write_main_dataset, \
     write_simple_attrs, create_indexed_group
+from ..chunking import plan_chunks
 
 
 class MovieTranslator(Translator):
@@ -26,12 +28,25 @@ class MovieTranslator(Translator):
     """
 
     def __init__(self, *args, **kwargs):
+        """
+        Parameters
+        ----------
+        max_mem_mb : unsigned integer, optional. Default = 1024
+            Maximum system memory (in megabytes) that the translator can use
+        cores : unsigned integer, optional
+            Number of workers decoding the frames. Default - as recommended by pyUSID
+        use_processes : bool, optional. Default = False
+            Whether the frames are decoded in processes instead of threads
+        """
         super(MovieTranslator, self).__init__(*args, **kwargs)
+        self._cores = kwargs.pop('cores', None)
+        self._use_processes = kwargs.pop('use_processes', False)
 
         self.rebin = False
         self.bin_factor = 1
         self.h5_file = None
-        self.binning_func = self.__no_bin
+        # Module-level function so that it can be sent to worker processes
+        self.binning_func = no_bin
         self.bin_func = None
         self.image_ext = None
 
@@ -141,76 +156,52 @@ class MovieTranslator(Translator):
         -------
         None
         """
-
-        mean_ronch = np.zeros(h5_ronch.shape, dtype=np.float32)
-
-        num_files = len(image_stack)
-
         if os.path.isfile(image_path):
-            self.__save_dm3_frames(image_stack, h5_main, h5_mean_spec, h5_ronch, mean_ronch, num_files)
+            self.__save_dm3_frames(image_stack, h5_main, h5_mean_spec, h5_ronch)
         else:
-            self.__read_image_files(image_stack, h5_main, h5_mean_spec, h5_ronch, image_path, mean_ronch, num_files)
+            self.__read_image_files(image_stack, h5_main, h5_mean_spec, h5_ronch, image_path)
 
-    def __save_dm3_frames(self, image_stack, h5_main, h5_mean_spec, h5_ronch, mean_ronch, num_frames):
+    def __save_dm3_frames(self, image_stack, h5_main, h5_mean_spec, h5_ronch):
         """
+        Bins each frame of the dm3 movie in `image_stack` and saves it in `h5_main`.
 
-        :param image_stack:
-        :param h5_main:
-        :param h5_mean_spec:
-        :param h5_ronch:
-        :param mean_ronch:
-        :param num_frames:
-        :return:
+        Parameters
+        ----------
+        image_stack : numpy.ndarray
+            Frames of the movie
+        h5_main : h5py.Dataset
+            Dataset which will hold the frames
+        h5_mean_spec : h5py.Dataset
+            Dataset which will hold the Spectroscopic Mean
+        h5_ronch : h5py.Dataset
+            Dataset which will hold the Mean Ronchigram
         """
-        for iframe, thisframe in enumerate(image_stack):
-            selected = (iframe + 1) % round(num_frames / 16) == 0
-            if selected:
-                print('Processing file...{}% - reading: {}'.format(round(100 * iframe / num_frames), iframe))
-            image = self.binning_func(thisframe, self.bin_factor, self.bin_func).flatten()
-            h5_main[:, iframe] = image
-
-            h5_mean_spec[iframe] = np.mean(image)
-
-            mean_ronch += image
-
-            self.h5_file.flush()
-
-        h5_ronch[:] = mean_ronch / num_frames
-        self.h5_file.flush()
+        tasks = [(thisframe, self.binning_func, self.bin_factor, self.bin_func) for thisframe in image_stack]
+        write_image_stack(_bin_movie_frame, tasks, h5_main, h5_mean_spec, h5_ronch, images_in_rows=False,
+                          cores=self._cores, use_processes=self._use_processes, max_mem_mb=self.max_ram / 1024 ** 2)
 
-    def __read_image_files(self, image_stack, h5_main, h5_mean_spec, h5_ronch, image_path, mean_ronch, num_files):
+    def __read_image_files(self, image_stack, h5_main, h5_mean_spec, h5_ronch, image_path):
         """
         Read each image from `file_list` and save it in `h5_main`.
+        Images are decoded concurrently and written in order in slabs of whole chunks.
 
         Parameters
         ----------
-        image_stack:
-        :param h5_main:
-        :param h5_mean_spec:
-        :param h5_ronch:
-        :param image_path:
-        :param mean_ronch:
-        :param num_files:
-        :return:
+        image_stack : list of str
+            List of all files in `image_path` that will be read
+        h5_main : h5py.Dataset
+            Dataset which will hold the frames
+        h5_mean_spec : h5py.Dataset
+            Dataset which will hold the Spectroscopic Mean
+        h5_ronch : h5py.Dataset
+            Dataset which will hold the Mean Ronchigram
+        image_path : str
+            Absolute file path to the directory which hold the images
         """
-        for ifile, thisfile in enumerate(image_stack):
-
-            selected = (ifile + 1) % round(num_files / 16) == 0
-            if selected:
-                print('Processing file...{}% - reading: {}'.format(round(100 * ifile / num_files), thisfile))
-
-            image = read_image(os.path.join(image_path, thisfile), greyscale=True)
-            image = self.binning_func(image, self.bin_factor, self.bin_func)
-            image = image.flatten()
-            h5_main[:, ifile] = image
-
-            h5_mean_spec[ifile] = np.mean(image)
-
-            mean_ronch += image
-
-            self.h5_file.flush()
-        h5_ronch[:] = mean_ronch / num_files
-        self.h5_file.flush()
+        tasks = [(os.path.join(image_path, thisfile), self.binning_func, self.bin_factor, self.bin_func)
+                 for thisfile in image_stack]
+        write_image_stack(_read_movie_image, tasks, h5_main, h5_mean_spec, h5_ronch, images_in_rows=False,
+                          cores=self._cores, use_processes=self._use_processes, max_mem_mb=self.max_ram / 1024 ** 2)
 
     @staticmethod
     def downSampRoncVec(ronch_vec, binning_factor):
@@ -352,9 +343,8 @@ class MovieTranslator(Translator):
         spec_dim = Dimension('Time', 's', np.arange(num_images))
         pos_dims = [Dimension('X', 'a.u.', np.arange(usize)), Dimension('Y', 'a.u.', np.arange(vsize))]
 
-        ds_chunking = calc_chunks([num_pixels, num_images],
-                                  data_type(0).itemsize,
-                                  unit_chunks=(num_pixels, 1))
+        # One whole image per time step:
+        ds_chunking = plan_chunks([num_pixels, num_images], data_type, 'spectral', unit_chunks=(num_pixels, 1)).chunks
 
         # Allocate space for Main_Data and Pixel averaged Data
         h5_main = write_main_dataset(chan_grp, (num_pixels, num_images), 'Raw_Data',
@@ -372,24 +362,29 @@ class MovieTranslator(Translator):
 
         return h5_main, h5_mean_spec, h5_ronch
 
-    @staticmethod
-    def __no_bin(image, *args, **kwargs):
-        """
-        Does absolutely nothing to the image.  Exists so that we can have
-        a bin function to call whether we actually rebin the image or not.
 
-        Parameters
-        ----------
-        image : ndarray
-            Image
-        args:
-            Argument list
-        kwargs:
-            Keyword argument list
+def _bin_movie_frame(frame, binning_func, bin_factor, bin_func):
+    """
+    Downsamples a single frame of the movie if requested.
+    Module-level so that it can be executed in worker processes.
 
-        Returns
-        -------
-        image : ndarray
-            The input image
-        """
-        return image
+    Returns
+    -------
+    image : numpy.ndarray
+        Flattened frame
+    """
+    return binning_func(frame, bin_factor, bin_func).flatten()
+
+
+def _read_movie_image(file_path, binning_func, bin_factor, bin_func):
+    """
+    Reads a single image of the movie and downsamples it if requested.
+    Module-level so that it can be executed in worker processes.
+
+    Returns
+    -------
+    image : numpy.ndarray
+        Flattened image
+    """
+    image = read_image(file_path, greyscale=True)
+    return _bin_movie_frame(image, binning_func, bin_factor, bin_func)
@@ -7,6 +7,7 @@ Created on Thursday July 27 2017
 
 from __future__ import division, print_function, absolute_import, unicode_literals
 import sys
+import hashlib
 from os import path, remove, listdir  # File Path formatting
 import re
 import numpy as np  # For array operations
@@ -16,6 +17,8 @@ from pyUSID.io.translator import Translator
 from pyUSID.io.write_utils import Dimension
 from pyUSID.io.hdf_utils import write_simple_attrs, write_main_dataset, \
     create_indexed_group
+from ..chunking import plan_chunks
+from .df_utils.base_utils import get_rows_per_batch
 
 if sys.version_info.major == 3:
     unicode = str
@@ -233,14 +236,14 @@ class TRKPFMTranslator(Translator):
                                         spec_dims,  # Spectroscopic dimensions
                                         dtype=np.complex64,  # data type / precision
                                         compression='gzip',
-                                        chunks=(1, spectrogram_size - 5),
+                                        chunks=plan_chunks((num_pixels, spectrogram_size - 5), np.complex64, 'pixel',
+                                                           unit_chunks=(1, spectrogram_size - 5)).chunks,
                                         main_dset_attrs={'quantity': 'Complex'})
 
             #h5_refs = hdf.write(chan_grp, print_log=False)
             #h5_raw = get_h5_obj_refs(['Raw_Data'], h5_refs)[0]
             #link_h5_objects_as_attrs(h5_raw, get_h5_obj_refs(aux_ds_names, h5_refs))
             self.raw_datasets.append(h5_raw)
-            self.raw_datasets.append(h5_raw)
 
         # Now that the N channels have been made, populate them with the actual data....
         self._read_data(parm_dict, parm_path, spectrogram_size)
@@ -252,7 +255,8 @@ class TRKPFMTranslator(Translator):
 
     def _read_data(self, parm_dict, parm_path, data_length):
         """
-        Reads raw data and populates the h5 datasets
+        Reads raw data and populates the h5 datasets. The real and imaginary files of each harmonic are read
+        together in blocks of pixels and each block is written to the dataset only once
 
         Parameters
         ----------
@@ -260,84 +264,115 @@ class TRKPFMTranslator(Translator):
             dictionary containing parameters for this data
         folder_path : string / unicode
             Absolute path of folder containing the data
+        data_length : int
+            Number of values per pixel in the data files, including the 5 header values
         """
         # Determine number of pixels
         num_pixels = parm_dict['grid_num_rows'] * parm_dict['grid_num_cols']
 
         # The four files in TRKPFM are for real and imaginary parts for 1st, 2nd harmonic
-        # Create a list of [True,False,True,False] so files can be written to
-        # the appropraite channel
-
-        real_imag = np.zeros(shape=(len(self.file_list), 1))
-        real_imag[::2] = 1
-        real_cond = []
-        for entry in real_imag:
-            if entry > 0:
-                real_cond.append(True)
-            else:
-                real_cond.append(False)
-
-        # Scan through all the .dat files available
-        for ifile, file_path in enumerate(self.file_list):
-            f = open(file_path, 'rb')
-            results_p = self.read_file(data_length, f)
-            spectrogram_matrix = np.array(results_p[:])
-            b_axis = spectrogram_matrix.shape[2]
-            c_axis = spectrogram_matrix.shape[1]
-            # dall = np.transpose(spectrogram_matrix, (0, 2, 1)).reshape(num_pixels * c_axis, b_axis)
-            dall = np.transpose(spectrogram_matrix, (0, 2, 1)).reshape(-1, b_axis)
-
-            _, ia, ic = np.unique(dall, axis=0, return_index=True, return_inverse=True)
-            reprowind = np.setdiff1d(ic, ia)
-
-            if len(reprowind > 0):
-                dall[reprowind, :] = np.nan
-
-            # Write to the datasets
-            h5_main = self.raw_datasets[ifile]
-
-            if real_cond[ifile]:
-                print('Dall Size is: ', dall.shape)
-                # Do some error catching. In case the last pixel is absent, then just ignore it.
-                try:
-                    h5_main[:, :] = dall.reshape(h5_main.shape) + 1j * 0
-                except ValueError:
-                    h5_main[:-1, :] = dall.reshape(h5_main.shape[0] - 1, h5_main.shape[1]) + 1j * 0
-            else:
-                # Error catching. In case the last pixel is absent, then just ignore it.
-                try:
-                    h5_main[:, :] += 0 + 1j * dall.reshape(h5_main.shape)
-                except ValueError:
-                    h5_main[:-1, :] += 0 + 1j * dall.reshape(h5_main.shape[0] - 1, h5_main.shape[1])
+        # The files for the real and imaginary parts of each harmonic are consecutive in the sorted file list
+        for h5_main, real_path, imag_path in zip(self.raw_datasets, self.file_list[0::2], self.file_list[1::2]):
+            # Complex buffer and the float32 values read from both files:
+            bytes_per_pix = h5_main.shape[1] * (np.complex64(0).itemsize + 4 * np.float32(0).itemsize)
+            pix_per_block = get_rows_per_batch(h5_main, bytes_per_pix, self.max_ram, num_rows=num_pixels)
+            buffer = np.empty((pix_per_block, h5_main.shape[1]), dtype=np.complex64)
+
+            with open(real_path, 'rb') as real_file, open(imag_path, 'rb') as imag_file:
+                # Rows repeated anywhere within each file are masked:
+                real_seen, imag_seen = set(), set()
+                start = 0
+                while start < num_pixels:
+                    block_size = min(pix_per_block, num_pixels - start)
+                    # In case the last pixel is absent, it is just ignored:
+                    real_mat = self._read_spectrograms(data_length, real_file, block_size, real_seen)
+                    imag_mat = self._read_spectrograms(data_length, imag_file, block_size, imag_seen)
+                    num_read = min(len(real_mat), len(imag_mat))
+                    if num_read == 0:
+                        break
+                    block = buffer[:num_read]
+                    block.real = real_mat[:num_read]
+                    block.imag = imag_mat[:num_read]
+                    h5_main[start: start + num_read] = block
+                    start += num_read
+                    if num_read < block_size:
+                        break
+            print('Read {} of {} pixels from {} and {}'.format(start, num_pixels, path.basename(real_path),
+                                                               path.basename(imag_path)))
             h5_main.file.flush()
 
-    @staticmethod
-    def read_file(data_length, f):
-        start_point = 0
-        count = 0
-        count_vals = []
-        f.seek(start_point * 4, 0)
-        cont_cond = True
-        results_p = []
-        while cont_cond:
-            count_vals.append(count)
-            count += 1
+    def _read_spectrograms(self, data_length, f, num_pixels, seen_rows):
+        """
+        Reads the next block of pixels from the provided file via read_file(). Rows that repeat any row read
+        earlier from the same file, in this block or in prior blocks, are replaced with NaNs
 
-            data_vec = np.fromfile(f, dtype=np.float32, count=int(data_length))
-            data_vec1 = data_vec[5:int(data_length)]
+        Parameters
+        ----------
+        data_length : int
+            Number of values per pixel in the data files, including the 5 header values
+        f : file handle
+            Handle to the data file
+        num_pixels : int
+            Maximum number of pixels to read
+        seen_rows : set
+            Digests of the rows read so far from this file. Updated with the rows in this block
+
+        Returns
+        -------
+        spectrograms : 2D numpy.float32 array
+            Flattened spectrogram of each pixel that was read
+        """
+        results_p = self.read_file(data_length, f, max_pixels=num_pixels)
+        if len(results_p) == 0:
+            return np.zeros((0, data_length - 5), dtype=np.float32)
+        # Back to the order of the data in the file: [pixel, row, column]
+        spectrogram_matrix = np.ascontiguousarray(np.transpose(np.array(results_p), (0, 2, 1)))
+        all_rows = spectrogram_matrix.reshape(-1, spectrogram_matrix.shape[2])
+        # Only a digest of each row is kept so that memory does not grow with the size of the file:
+        for row in all_rows:
+            digest = hashlib.md5(row.tobytes()).digest()
+            if digest in seen_rows:
+                row[:] = np.nan
+            else:
+                seen_rows.add(digest)
+        return spectrogram_matrix.reshape(len(results_p), -1)
 
-            if len(data_vec) > 1:
+    @staticmethod
+    def read_file(data_length, f, max_pixels=None):
+        """
+        Reads the spectrograms of the pixels in the provided file, starting from the current position of the file
 
-                s1 = data_vec[3]
-                s2 = data_vec[4]
-                # print('Data_mat and s1,s2:', data_vec1.shape, s1, s2)
-                data_mat1 = data_vec1.reshape(int(s2), int(s1)).T
-                results_p.append(data_mat1)
+        Parameters
+        ----------
+        data_length : int
+            Number of values per pixel in the data files, including the 5 header values
+        f : file handle
+            Handle to the data file. The file is closed once its end has been reached
+        max_pixels : int, optional
+            Maximum number of pixels to read. Default - all remaining pixels
 
-            else:
-                cont_cond = False
+        Returns
+        -------
+        results_p : list of 2D numpy.float32 arrays
+            Spectrogram of each pixel
+        """
+        data_length = int(data_length)
+        if max_pixels is None:
+            count = -1
+        else:
+            count = data_length * max_pixels
+        data_vecs = np.fromfile(f, dtype=np.float32, count=count)
+        num_pixels = data_vecs.size // data_length
+        if max_pixels is None or num_pixels < max_pixels:
+            f.close()
+        data_vecs = data_vecs[:num_pixels * data_length].reshape(num_pixels, data_length)
 
-        f.close()
+        results_p = []
+        for data_vec in data_vecs:
+            s1 = data_vec[3]
+            s2 = data_vec[4]
+            data_mat1 = data_vec[5:].reshape(int(s2), int(s1)).T
+            results_p.append(data_mat1)
         return results_p
 
     @staticmethod
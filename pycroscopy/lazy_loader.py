@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy loading of the submodules of a package and the attributes they export, via module-level __getattr__ (PEP 562).
+Nothing is imported until it is accessed for the first time, so that importing a package does not import all
+of its (heavy) dependencies.
+
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+import sys
+from importlib import import_module
+
+__all__ = ['attach', 'is_lazy']
+
+# Whether or not module-level __getattr__ is supported. Packages import all their contents eagerly otherwise
+is_lazy = sys.version_info[:2] >= (3, 7)
+
+
+def attach(package_name, submodules=None, submod_attrs=None):
+    """
+    Builds the __getattr__ and __dir__ functions that lazily import the submodules of a package and the attributes
+    exported by these submodules. Imports everything immediately if this version of python does not support
+    module-level __getattr__.
+
+    Parameters
+    ----------
+    package_name : str
+        __name__ of the package
+    submodules : list of str, optional
+        Names of the submodules that should be available as attributes of the package
+    submod_attrs : dict, optional
+        Names of the attributes to expose from each submodule, keyed by the name of the submodule relative to the
+        package. Attributes that are not found within the submodule are imported as its submodules
+
+    Returns
+    -------
+    __getattr__ : callable
+        Module-level __getattr__ for the package
+    __dir__ : callable
+        Module-level __dir__ for the package
+    """
+    submodules = set(submodules or [])
+    attr_to_module = dict()
+    for submod_name, attr_names in (submod_attrs or dict()).items():
+        for attr_name in attr_names:
+            attr_to_module[attr_name] = submod_name
+    lazy_names = sorted(submodules | set(attr_to_module))
+
+    def __getattr__(name):
+        if name in submodules:
+            value = import_module('.' + name, package_name)
+        elif name in attr_to_module:
+            submod = import_module('.' + attr_to_module[name], package_name)
+            try:
+                value = getattr(submod, name)
+            except AttributeError:
+                value = import_module('.' + name, submod.__name__)
+        else:
+            raise AttributeError('module {} has no attribute {}'.format(package_name, name))
+        # Cache so that __getattr__ is not called for this name again:
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | set(lazy_names))
+
+    if not is_lazy:
+        for name in lazy_names:
+            __getattr__(name)
+
+    return __getattr__, __dir__
@@ -18,20 +18,17 @@ Submodules
     svd_utils
 
 """
-from . import fft
-from . import gmode_utils
-from . import histogram
-from . import svd_utils
-from .svd_utils import SVD, rebuild_svd
-from . import decomposition
-from .decomposition import Decomposition
-from . import cluster
-from .cluster import Cluster
-from . import image_processing
-from .image_processing import ImageWindow
-from .signal_filter import SignalFilter
-from .tree import ClusterTree
-from . import proc_utils
+from ..lazy_loader import attach as _attach
+
+__getattr__, __dir__ = _attach(__name__,
+                               submodules=['cluster', 'contrib', 'decomposition', 'fft', 'gmode_utils', 'histogram',
+                                           'image_processing', 'proc_utils', 'signal_filter', 'svd_utils', 'tree'],
+                               submod_attrs={'svd_utils': ['SVD', 'rebuild_svd'],
+                                             'decomposition': ['Decomposition'],
+                                             'cluster': ['Cluster'],
+                                             'image_processing': ['ImageWindow'],
+                                             'signal_filter': ['SignalFilter'],
+                                             'tree': ['ClusterTree']})
 
 __all__ = ['Cluster', 'Decomposition', 'ImageWindow', 'SVD', 'fft', 'gmode_utils', 'histogram', 'svd_utils',
            'rebuild_svd', 'SignalFilter', 'ClusterTree', 'proc_utils']
@@ -13,7 +13,8 @@ import numpy as np  # for all array, data operations
 import matplotlib.pyplot as plt  # for all plots
 from scipy.special import erf
 from scipy import signal as sps
-from collections import Iterable
+from collections import Iterable, OrderedDict
+from threading import Lock
 from warnings import warn
 
 
@@ -183,6 +184,75 @@ def down_sample(fft_vec, freq_ratio):
 ###############################################################################
 
 
+_filter_cache = OrderedDict()
+_filter_cache_lock = Lock()
+_filter_cache_size = 32
+
+
+def set_filter_cache_size(max_items):
+    """
+    Sets the maximum number of filter arrays held in the cache shared by all FrequencyFilter objects
+
+    Parameters
+    ----------
+    max_items : unsigned int
+        Maximum number of individual and composite filters to keep. 0 disables caching
+    """
+    global _filter_cache_size
+    if max_items % 1 != 0 or max_items < 0:
+        raise ValueError('max_items must be an unsigned integer')
+    with _filter_cache_lock:
+        _filter_cache_size = int(max_items)
+        while len(_filter_cache) > _filter_cache_size:
+            _filter_cache.popitem(last=False)
+
+
+def clear_filter_cache():
+    """
+    Removes all individual and composite filters from the cache
+    """
+    with _filter_cache_lock:
+        _filter_cache.clear()
+
+
+def _freeze_parms(value):
+    """
+    Converts the parameters of a filter into a hashable object that can be used as a cache key
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze_parms(val)) for key, val in value.items()))
+    if isinstance(value, np.ndarray):
+        return value.dtype.str, value.shape, value.tobytes()
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_parms(val) for val in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _get_cached_filter(key):
+    with _filter_cache_lock:
+        value = _filter_cache.pop(key, None)
+        if value is not None:
+            # Most recently used filters are at the end
+            _filter_cache[key] = value
+    return value
+
+
+def _cache_filter(key, value):
+    """
+    Makes `value` read-only and adds it to the cache, discarding the least recently used filters if necessary
+    """
+    value.flags.writeable = False
+    with _filter_cache_lock:
+        if _filter_cache_size > 0:
+            _filter_cache.pop(key, None)
+            _filter_cache[key] = value
+            while len(_filter_cache) > _filter_cache_size:
+                _filter_cache.popitem(last=False)
+    return value
+
+
 class FrequencyFilter(object):
     def __init__(self, signal_length, samp_rate, *args, **kwargs):
         for val, name in zip([signal_length, samp_rate], ['Signal length', 'Sampling rate']):
@@ -191,6 +261,7 @@ class FrequencyFilter(object):
         self.signal_length = abs(int(signal_length))
         self.samp_rate = samp_rate
         self.value = None
+        self.cache_key = None
 
     def get_parms(self):
         return {'samp_rate': self.samp_rate, 'signal_length': self.signal_length}
@@ -199,6 +270,33 @@ class FrequencyFilter(object):
         assert isinstance(other, FrequencyFilter), "Other object must be a FrequencyFilter object"
         return self.signal_length == other.signal_length and self.samp_rate == other.samp_rate
 
+    def _get_cache_key(self):
+        return type(self).__name__, _freeze_parms(self.get_parms())
+
+    def _load_cached_value(self):
+        """
+        Sets `value` from the cache if an identical filter was built before
+
+        Returns
+        -------
+        found : bool
+            Whether or not the filter was found in the cache
+        """
+        key = self._get_cache_key()
+        value = _get_cached_filter(key)
+        if value is None:
+            return False
+        self.value = value
+        self.cache_key = key
+        return True
+
+    def _set_cached_value(self, value):
+        """
+        Sets `value` as a read-only array and caches it for other filters with the same parameters
+        """
+        self.cache_key = self._get_cache_key()
+        self.value = _cache_filter(self.cache_key, value)
+
 
 def are_compatible_filters(frequency_filters):
     if isinstance(frequency_filters, FrequencyFilter):
@@ -222,11 +320,22 @@ def build_composite_freq_filter(frequency_filters):
     if not isinstance(frequency_filters, Iterable):
         frequency_filters = [frequency_filters]
 
-    comp_filter = np.float32(frequency_filters[0].value)
+    # Composite filters can only be looked up if every component was built from (and cached by) its parameters
+    key = None
+    if all(freq_filter.cache_key is not None for freq_filter in frequency_filters):
+        key = ('composite',) + tuple(freq_filter.cache_key for freq_filter in frequency_filters)
+        comp_filter = _get_cached_filter(key)
+        if comp_filter is not None:
+            return comp_filter
+
+    comp_filter = np.array(frequency_filters[0].value, dtype=np.float32)
 
     for ind in range(1, len(frequency_filters)):
         comp_filter *= frequency_filters[ind].value
 
+    if key is not None:
+        comp_filter = _cache_filter(key, comp_filter)
+
     return comp_filter
 
 
@@ -274,6 +383,9 @@ class NoiseBandFilter(FrequencyFilter):
         self.freqs = freqs
         self.freq_widths = freq_widths
 
+        if not show_plots and self._load_cached_value():
+            return
+
         cent = int(round(0.5 * signal_length))
 
         noise_filter = np.ones(signal_length, dtype=np.int16)
@@ -302,7 +414,7 @@ class NoiseBandFilter(FrequencyFilter):
             ax[1].set_title('After clean up')
             plt.show()
 
-        self.value = noise_filter
+        self._set_cached_value(noise_filter)
 
     def get_parms(self):
         basic_parms = super(NoiseBandFilter, self).get_parms()
@@ -343,6 +455,9 @@ class LowPassFilter(FrequencyFilter):
 
         super(LowPassFilter, self).__init__(signal_length, samp_rate)
 
+        if self._load_cached_value():
+            return
+
         cent = int(round(0.5 * signal_length))
 
         # BW = 0.1; %MHz - Nothing beyond BW.
@@ -361,7 +476,7 @@ class LowPassFilter(FrequencyFilter):
         lpf[cent - ind + sz:cent + ind - sz + 1] = 1
         lpf[cent + ind - sz + 1:cent + ind + 1] = 1 - smoothing
 
-        self.value = lpf
+        self._set_cached_value(lpf)
 
     def get_parms(self):
         basic_parms = super(LowPassFilter, self).get_parms()
@@ -404,14 +519,17 @@ class HarmonicPassFilter(FrequencyFilter):
 
         signal_length = abs(int(signal_length))
 
-        harm_filter = np.ones(signal_length, dtype=np.int16)
-
-        cent = int(round(0.5 * signal_length))
-
         self.first_freq = first_freq
         self.band_width = band_width
         self.num_harm = num_harm
 
+        if not do_plots and self._load_cached_value():
+            return
+
+        harm_filter = np.ones(signal_length, dtype=np.int16)
+
+        cent = int(round(0.5 * signal_length))
+
         w_vec = 1
 
         if do_plots:
@@ -459,7 +577,7 @@ class HarmonicPassFilter(FrequencyFilter):
                     ax4.plot(w_vec, harm_filter)
                     ax4.set_title('Step %d' % (harm_ind + 2))
 
-        self.value = harm_filter
+        self._set_cached_value(harm_filter)
 
     def get_parms(self):
         basic_parms = super(HarmonicPassFilter, self).get_parms()
@@ -528,9 +646,14 @@ class BandPassFilter(FrequencyFilter):
 
         self.f_center = f_center
         self.f_width = f_width
+        self.fir = fir
+        self.fir_taps = fir_taps
 
         super(BandPassFilter, self).__init__(signal_length, samp_rate)
 
+        if self._load_cached_value():
+            return
+
         cent = int(round(0.5 * signal_length))
         ind = int(round(signal_length * (f_center / samp_rate)))
         sz = int(round(cent * f_width / samp_rate))
@@ -552,7 +675,7 @@ class BandPassFilter(FrequencyFilter):
 
             bpf = np.abs(np.fft.fftshift(np.fft.fft(taps, n=signal_length)))
 
-        self.value = bpf
+        self._set_cached_value(bpf)
 
     def get_parms(self):
         basic_parms = super(BandPassFilter, self).get_parms()
@@ -560,3 +683,8 @@ class BandPassFilter(FrequencyFilter):
         this_parms = {prefix + 'start_freq': self.f_center, prefix + 'band_width': self.f_width}
         this_parms.update(basic_parms)
         return this_parms
+
+    def _get_cache_key(self):
+        # The FIR settings are not part of the parameters written to file but change the filter
+        taps = int(self.fir_taps) if self.fir else None
+        return super(BandPassFilter, self)._get_cache_key() + (taps,)
@@ -12,6 +12,11 @@ import sys
 from collections import Iterable
 from warnings import warn
 from numbers import Number
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd  # Python 2
+import h5py
 import matplotlib.pyplot as plt
 import numpy as np
 from .fft import get_noise_floor, are_compatible_filters, build_composite_freq_filter
@@ -19,6 +24,8 @@ from pyUSID import USIDataset
 from pyUSID.io.hdf_utils import check_if_main, get_attr, write_main_dataset, create_results_group
 from pyUSID.viz.plot_utils import set_tick_font_size, plot_curves
 from pyUSID.io.write_utils import Dimension
+from pyUSID.processing.comp_utils import get_available_memory
+from ..io.chunking import plan_chunks
 
 if sys.version_info.major == 3:
     unicode = str
@@ -206,8 +213,7 @@ def decompress_response(f_condensed_mat, num_pts, hot_inds):
         
     Notes
     -----
-    Memory is given higher priority here, so this function loops over the position
-    instead of doing the inverse FFT on the complete data.
+    See decompress_response_batch for reconstructing large datasets block by block.
 
     """
     if num_pts % 1 != 0:
@@ -222,21 +228,149 @@ def decompress_response(f_condensed_mat, num_pts, hot_inds):
     if hot_inds.ndim > 1:
         raise ValueError('hot_inds should be a 1D array')
 
-    f_condensed_mat = np.array(f_condensed_mat)
-    f_condensed_mat = np.atleast_2d(f_condensed_mat)
-    hot_inds_mirror = np.flipud(num_pts - hot_inds)
-    time_resp = np.zeros(shape=(f_condensed_mat.shape[0], num_pts), dtype=np.float32)
-    for pos in range(f_condensed_mat.shape[0]):
-        f_complete = np.zeros(shape=num_pts, dtype=np.complex)
-        f_complete[hot_inds] = f_condensed_mat[pos, :]
-        # Now add the mirror (FFT in negative X axis that was removed)
-        f_complete[hot_inds_mirror] = np.flipud(f_condensed_mat[pos, :])
-        time_resp[pos, :] = np.real(np.fft.ifft(np.fft.ifftshift(f_complete)))
+    f_condensed_mat = np.atleast_2d(np.array(f_condensed_mat))
+    time_resp = decompress_response_batch(f_condensed_mat, num_pts, hot_inds)
 
     return np.squeeze(time_resp)
 
 
-def reshape_from_lines_to_pixels(h5_main, pts_per_cycle, scan_step_x_m=None):
+def decompress_response_batch(f_condensed_mat, num_pts, hot_inds, h5_target=None, max_mem_mb=1024,
+                              block_size=None, dtype=np.float32, verbose=False):
+    """
+    Returns the time domain representation of waveforms that are compressed in the frequency space, reconstructing
+    blocks of positions at a time. Use this function to reconstruct large `Condensed_Data` datasets written by
+    `SignalFilter`, optionally writing straight into a HDF5 dataset.
+
+    Parameters
+    ----------
+    f_condensed_mat : 2D complex numpy array or h5py.Dataset
+        Frequency domain signals arranged as [position, frequency].
+        Only the positive frequency bins must be in the compressed dataset.
+        The dataset is assumed to have been FFT shifted (such that 0 Hz is at the center).
+    num_pts : unsigned int
+        Number of points in the time domain signal
+    hot_inds : 1D unsigned int numpy array
+        Indices of the frequency bins (in the FFT shifted spectrum) in the compressed data.
+    h5_target : h5py.Dataset, optional. Default = None
+        Dataset of shape [position, num_pts] into which the time domain response will be written.
+        If not provided, the time domain response will be returned as a numpy array
+    max_mem_mb : unsigned int, optional. Default = 1024
+        Maximum memory (in megabytes) that may be used for the reconstruction buffers
+    block_size : unsigned int, optional. Default = None
+        Number of positions reconstructed at a time. Calculated from max_mem_mb and the available memory if not provided
+    dtype : numpy.dtype, optional. Default = numpy.float32
+        Data type of the time domain response
+    verbose : bool, optional. Default = False
+        Whether or not to print debugging statements
+
+    Returns
+    -------
+    time_resp : 2D numpy array or h5py.Dataset
+        Time domain response arranged as [position, time]. h5_target is returned if provided
+
+    Notes
+    -----
+    The condensed spectra are scattered into a reusable [block, num_pts // 2 + 1] buffer and a single real inverse
+    FFT is computed for the entire block. The real inverse FFT implicitly restores the (complex conjugate) negative
+    frequencies that were discarded when condensing the data.
+    """
+    if num_pts % 1 != 0 or num_pts < 1:
+        raise ValueError('num_pts should be a positive integer')
+    num_pts = int(num_pts)
+    if not isinstance(f_condensed_mat, (np.ndarray, h5py.Dataset)):
+        raise TypeError('f_condensed_mat should be a numpy array or a h5py.Dataset')
+    if f_condensed_mat.ndim != 2:
+        raise ValueError('f_condensed_mat should be a 2D array arranged as [position, frequency]')
+    if not np.iscomplexobj(np.empty(0, dtype=f_condensed_mat.dtype)):
+        raise TypeError('f_condensed_mat should be a complex array')
+    if not isinstance(hot_inds, (np.ndarray, list)):
+        raise TypeError('hot_inds should be array-like')
+    hot_inds = np.array(hot_inds)
+    if hot_inds.ndim > 1:
+        raise ValueError('hot_inds should be a 1D array')
+    if hot_inds.size != f_condensed_mat.shape[1]:
+        raise ValueError('Length of hot_inds: {} does not match the size of the frequency axis of f_condensed_mat: '
+                         '{}'.format(hot_inds.size, f_condensed_mat.shape[1]))
+
+    # Positive frequency bins in the shifted spectrum map directly to the bins of a real FFT:
+    rfft_inds = hot_inds.astype(np.int64) - num_pts // 2
+    if np.any(rfft_inds < 0) or np.any(rfft_inds > num_pts // 2):
+        raise ValueError('hot_inds should only contain the positive frequency bins of the FFT shifted spectrum')
+
+    num_pos = f_condensed_mat.shape[0]
+    if h5_target is not None:
+        if not isinstance(h5_target, h5py.Dataset):
+            raise TypeError('h5_target should be a h5py.Dataset')
+        if h5_target.shape != (num_pos, num_pts):
+            raise ValueError('h5_target should be of shape: {}'.format((num_pos, num_pts)))
+        time_resp = h5_target
+    else:
+        time_resp = np.zeros(shape=(num_pos, num_pts), dtype=dtype)
+
+    if block_size is None:
+        max_mem = min(max_mem_mb * 1024 ** 2, 0.75 * get_available_memory())
+        # complex128 buffer + float64 inverse FFT + cast to dtype + condensed row
+        b_per_position = (num_pts // 2 + 1) * 16 + num_pts * (8 + np.dtype(dtype).itemsize) + \
+            hot_inds.size * np.dtype(f_condensed_mat.dtype).itemsize
+        block_size = int(max_mem // b_per_position)
+        if h5_target is not None and h5_target.chunks is not None:
+            # Align the blocks with the chunks of the target dataset
+            block_size = max(h5_target.chunks[0], block_size - block_size % h5_target.chunks[0])
+    block_size = int(max(1, min(block_size, num_pos)))
+
+    if verbose:
+        print('Decompressing {} positions in blocks of {} positions'.format(num_pos, block_size))
+
+    # Only the hot columns are ever written to, so the rest of the buffer remains zero
+    f_buffer = np.zeros(shape=(block_size, num_pts // 2 + 1), dtype=np.complex128)
+
+    for start in range(0, num_pos, block_size):
+        stop = min(start + block_size, num_pos)
+        this_block = f_buffer[:stop - start]
+        this_block[:, rfft_inds] = f_condensed_mat[start:stop]
+        time_resp[start:stop] = np.fft.irfft(this_block, n=num_pts, axis=1).astype(dtype, copy=False)
+        if verbose:
+            print('Finished decompressing positions {} to {}'.format(start, stop))
+
+    return time_resp
+
+
+def _get_pixel_spec_dims(h5_main, pts_per_cycle):
+    """
+    Returns the spectroscopic dimensions that describe a single pixel's worth of data in the provided G-mode dataset
+
+    Parameters
+    ----------
+    h5_main : USIDataset object
+        Main dataset that contains the raw data that is only broken up by lines
+    pts_per_cycle : unsigned int
+        Number of points in a single pixel
+
+    Returns
+    -------
+    spec_dims : list of pyUSID.io.write_utils.Dimension objects
+        Spectroscopic dimensions within a single pixel, arranged from fastest to slowest varying
+    """
+    spec_inds = np.atleast_2d(h5_main.h5_spec_inds[:, :pts_per_cycle])
+    spec_vals = np.atleast_2d(h5_main.h5_spec_vals[:, :pts_per_cycle])
+    labels = get_attr(h5_main.h5_spec_vals, 'labels')
+    units = get_attr(h5_main.h5_spec_vals, 'units')
+
+    spec_dims = []
+    for dim_inds, dim_vals, label, unit in zip(spec_inds, spec_vals, labels, units):
+        _, first_inds = np.unique(dim_inds, return_index=True)
+        if first_inds.size > 1:
+            spec_dims.append(Dimension(label, unit, dim_vals[np.sort(first_inds)]))
+
+    if len(spec_dims) == 0 or np.prod([len(dim.values) for dim in spec_dims]) != pts_per_cycle:
+        # The spectroscopic dimensions do not tile neatly within a pixel. Fall back to the fastest dimension:
+        spec_dims = [Dimension(labels[0], units[0], spec_vals[0])]
+
+    return spec_dims
+
+
+def reshape_from_lines_to_pixels(h5_main, pts_per_cycle, scan_step_x_m=None, max_mem_mb=1024, progress_callback=None,
+                                 verbose=False):
     """
     Breaks up the provided raw G-mode dataset into lines and pixels (from just lines)
 
@@ -248,48 +382,84 @@ def reshape_from_lines_to_pixels(h5_main, pts_per_cycle, scan_step_x_m=None):
         Number of points in a single pixel
     scan_step_x_m : float
         Step in meters for pixels
+    max_mem_mb : unsigned int, optional. Default = 1024
+        Maximum memory (in megabytes) that may be used to hold a block of lines while reshaping
+    progress_callback : callable, optional. Default = None
+        Function that will be called as progress_callback(lines_done, num_lines) after each block of lines is written
+    verbose : bool, optional. Default = False
+        Whether or not to print debugging statements
 
     Returns
     -------
     h5_resh : h5py.Dataset object
         Reference to the main dataset that contains the reshaped data
+
+    Notes
+    -----
+    The data is copied in blocks of whole lines that are aligned with the chunks of both the source and the
+    reshaped datasets so that only a bounded amount of memory is used regardless of the size of the dataset.
+    The new X dimension is prepended (as the fastest varying position dimension) to the position dimensions of the
+    source dataset.
     """
     if not check_if_main(h5_main):
         raise TypeError('h5_main is not a Main dataset')
     h5_main = USIDataset(h5_main)
     if pts_per_cycle % 1 != 0 or pts_per_cycle < 1:
         raise TypeError('pts_per_cycle should be a positive integer')
+    pts_per_cycle = int(pts_per_cycle)
     if scan_step_x_m is not None:
         if not isinstance(scan_step_x_m, Number):
             raise TypeError('scan_step_x_m should be a real number')
     else:
         scan_step_x_m = 1
+    if progress_callback is not None and not callable(progress_callback):
+        raise TypeError('progress_callback should be a callable')
 
     if h5_main.shape[1] % pts_per_cycle != 0:
         warn('Error in reshaping the provided dataset to pixels. Check points per pixel')
         raise ValueError
 
+    num_lines = h5_main.shape[0]
     num_cols = int(h5_main.shape[1] / pts_per_cycle)
 
-    # TODO: DO NOT assume simple 1 spectral dimension!
-    single_ao = np.squeeze(h5_main.h5_spec_vals[:, :pts_per_cycle])
-
-    spec_dims = Dimension(get_attr(h5_main.h5_spec_vals, 'labels')[0],
-                          get_attr(h5_main.h5_spec_vals, 'units')[0], single_ao)
+    spec_dims = _get_pixel_spec_dims(h5_main, pts_per_cycle)
 
-    # TODO: DO NOT assume simple 1D in positions!
-    pos_dims = [Dimension('X', 'm', np.linspace(0, scan_step_x_m, num_cols)),
-                Dimension('Y', 'm', np.linspace(0, h5_main.h5_pos_vals[1, 0], h5_main.shape[0]))]
+    pos_units = get_attr(h5_main.h5_pos_vals, 'units')
+    pos_dims = [Dimension('X', 'm', np.linspace(0, scan_step_x_m, num_cols))]
+    for dim_name, dim_units in zip(get_attr(h5_main.h5_pos_vals, 'labels'), pos_units):
+        pos_dims.append(Dimension(dim_name, dim_units, h5_main.get_pos_values(dim_name)))
 
+    # Each pixel is typically filtered or fit on its own:
+    resh_chunks = plan_chunks((num_cols * num_lines, pts_per_cycle), h5_main.dtype, 'pixel',
+                              unit_chunks=(1, pts_per_cycle)).chunks
     h5_group = create_results_group(h5_main, 'Reshape')
-    # TODO: Create empty datasets and then write for very large datasets
-    h5_resh = write_main_dataset(h5_group, (num_cols * h5_main.shape[0], pts_per_cycle), 'Reshaped_Data',
+    h5_resh = write_main_dataset(h5_group, (num_cols * num_lines, pts_per_cycle), 'Reshaped_Data',
                                  get_attr(h5_main, 'quantity')[0], get_attr(h5_main, 'units')[0], pos_dims, spec_dims,
-                                 chunks=(10, pts_per_cycle), dtype=h5_main.dtype, compression=h5_main.compression)
+                                 chunks=resh_chunks, dtype=h5_main.dtype, compression=h5_main.compression)
+
+    # Blocks of lines should be made of whole chunks in both the source and the reshaped datasets:
+    src_chunk_lines = 1 if h5_main.chunks is None else h5_main.chunks[0]
+    resh_chunk_lines = resh_chunks[0] // gcd(resh_chunks[0], num_cols)
+    lines_unit = src_chunk_lines * resh_chunk_lines // gcd(src_chunk_lines, resh_chunk_lines)
+
+    max_mem = min(max_mem_mb * 1024 ** 2, 0.75 * get_available_memory())
+    b_per_line = h5_main.shape[1] * h5_main.dtype.itemsize
+    lines_per_block = max(lines_unit, int(max_mem // b_per_line) // lines_unit * lines_unit)
+    lines_per_block = min(lines_per_block, num_lines)
 
-    # TODO: DON'T write in one shot assuming small datasets fit in memory!
     print('Starting to reshape G-mode line data. Please be patient')
-    h5_resh[()] = np.reshape(h5_main[()], (-1, pts_per_cycle))
+    if verbose:
+        print('Reshaping {} lines in blocks of {} lines'.format(num_lines, lines_per_block))
+
+    for start in range(0, num_lines, lines_per_block):
+        stop = min(start + lines_per_block, num_lines)
+        h5_resh[start * num_cols: stop * num_cols] = np.reshape(h5_main[start:stop], (-1, pts_per_cycle))
+        if verbose:
+            print('Finished reshaping lines {} to {} of {}'.format(start, stop, num_lines))
+        if progress_callback is not None:
+            progress_callback(stop, num_lines)
+
+    h5_resh.file.flush()
 
     print('Finished reshaping G-mode line data to rows and columns')
 
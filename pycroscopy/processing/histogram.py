@@ -7,14 +7,10 @@ Created on Mar 1, 2016
 """
 
 from __future__ import division, print_function, absolute_import
+from multiprocessing.pool import ThreadPool
 import numpy as np
-import sys
 
-if sys.version_info.major == 3 and sys.version_info.minor >= 6:
-    disable_histogram = True
-else:
-    disable_histogram = False
-    from numpy_groupies import aggregate_np
+from pyUSID.processing.comp_utils import get_available_memory, recommend_cpu_cores
 
 
 def build_histogram(x_hist, data_mat, N_x_bins, N_y_bins, weighting_vec=1, min_resp=None, max_resp=None, func=None,
@@ -69,36 +65,36 @@ def build_histogram(x_hist, data_mat, N_x_bins, N_y_bins, weighting_vec=1, min_r
     y_hist = __scale_and_discretize(y_hist, N_y_bins, max_resp, min_resp, debug)
 
     '''
-    Combine x_hist and y_hist into one matrix
+    Combine x_hist and y_hist into one flat index
     '''
+    x_hist = np.asarray(x_hist, dtype=np.intp).ravel()
     if debug:
         print(np.shape(x_hist))
         print(np.shape(y_hist))
+    if x_hist.size != y_hist.size:
+        raise ValueError('x_hist has {} elements but the data has {}'.format(x_hist.size, y_hist.size))
+    if np.any(x_hist < 0) or np.any(x_hist >= N_x_bins):
+        raise ValueError('x_hist must lie within [0, N_x_bins)')
 
-    try:
-        group_idx = np.zeros((2, x_hist.size), dtype=np.int32)
-        group_idx[0, :] = x_hist
-        group_idx[1, :] = y_hist
-    except:
-        raise
+    flat_idx = x_hist * N_y_bins + y_hist.astype(np.intp)
 
     '''
     Aggregate matrix for histogram of current chunk
     '''
     if debug:
-        print(np.shape(group_idx))
+        print(np.shape(flat_idx))
         print(np.shape(weighting_vec))
         print(N_x_bins, N_y_bins)
 
-    try:
-        if not disable_histogram:
-            pixel_hist = aggregate_np(group_idx, weighting_vec, func='sum', size=(N_x_bins, N_y_bins), dtype=np.int32)
-        else:
-            pixel_hist = None
-    except:
-        raise
+    weights = None
+    if np.size(weighting_vec) > 1:
+        weights = np.ravel(weighting_vec)
+    elif weighting_vec != 1:
+        weights = np.full(flat_idx.size, weighting_vec)
 
-    return pixel_hist
+    pixel_hist = np.bincount(flat_idx, weights=weights, minlength=N_x_bins * N_y_bins)
+
+    return pixel_hist.reshape(N_x_bins, N_y_bins).astype(np.int32)
 
 
 def __scale_and_discretize(y_hist, N_y_bins, max_resp, min_resp, debug=False):
@@ -129,3 +125,239 @@ def __scale_and_discretize(y_hist, N_y_bins, max_resp, min_resp, debug=False):
         print('ymin', min(y_hist), 'ymax', max(y_hist))
 
     return y_hist
+
+
+def _get_rows_per_chunk(h5_main, col_inds, cores, max_mem_mb=1024, bytes_per_elem=0):
+    """
+    Number of rows of `h5_main` that each thread may hold in memory at once
+
+    Parameters
+    ----------
+    h5_main : h5py.Dataset or numpy.ndarray
+        2D dataset that will be read in blocks of rows
+    col_inds : sorted 1D numpy.ndarray of unsigned int or None
+        Columns that will be used from each row. Default - all columns.
+        The bounding slab of these columns is read, see `_read_rows`
+    cores : unsigned int
+        Number of threads that will each hold one block
+    max_mem_mb : unsigned int, optional. Default = 1024
+        Maximum memory (in MB) that may be used by all threads together
+    bytes_per_elem : unsigned int, optional. Default = 0
+        Scratch memory needed per element in addition to the raw data
+
+    Returns
+    -------
+    rows_per_chunk : unsigned int
+    """
+    max_mem = min(max_mem_mb * 1024 ** 2, 0.75 * get_available_memory())
+    if col_inds is None:
+        num_cols = read_cols = h5_main.shape[1]
+    else:
+        num_cols = col_inds.size
+        read_cols = col_inds[-1] - col_inds[0] + 1
+        if read_cols > num_cols:
+            # The selected columns are copied out of the slab:
+            read_cols += num_cols
+    bytes_per_row = max(1, read_cols) * h5_main.dtype.itemsize + max(1, num_cols) * bytes_per_elem
+    rows_per_chunk = max(1, int(max_mem // (bytes_per_row * cores)))
+    chunks = getattr(h5_main, 'chunks', None)
+    if chunks is not None and rows_per_chunk > chunks[0]:
+        # Whole HDF5 chunks per read so no chunk is decompressed twice
+        rows_per_chunk -= rows_per_chunk % chunks[0]
+    return min(rows_per_chunk, h5_main.shape[0])
+
+
+def _read_rows(h5_main, rows, col_inds):
+    """
+    Reads the requested columns of a block of rows
+
+    h5py fancy indexing is slow, so the bounding slab of columns is read instead
+    """
+    if col_inds is None:
+        return h5_main[rows]
+    data_mat = h5_main[rows, col_inds[0]: col_inds[-1] + 1]
+    if col_inds.size == data_mat.shape[1]:
+        return data_mat
+    return data_mat[:, col_inds - col_inds[0]]
+
+
+def _map_row_chunks(worker, h5_main, rows_per_chunk, cores):
+    """
+    Hands out the blocks of rows of `h5_main` to `cores` threads
+
+    Parameters
+    ----------
+    worker : callable
+        Called as worker(list of row slices) in each thread
+    h5_main : h5py.Dataset or numpy.ndarray
+    rows_per_chunk : unsigned int
+    cores : unsigned int
+
+    Returns
+    -------
+    results : list
+        Value returned by `worker` in each thread
+    """
+    num_rows = h5_main.shape[0]
+    row_chunks = [slice(start, min(start + rows_per_chunk, num_rows)) for start in
+                  range(0, num_rows, rows_per_chunk)]
+    cores = max(1, min(cores, len(row_chunks)))
+    if cores == 1:
+        return [worker(row_chunks)]
+    pool = ThreadPool(cores)
+    try:
+        # Interleave the blocks so that the threads read neighbouring rows at the same time
+        return pool.map(worker, [row_chunks[ind::cores] for ind in range(cores)])
+    finally:
+        pool.close()
+        pool.join()
+
+
+def get_response_range(h5_main, func=np.abs, col_inds=None, max_mem_mb=1024, cores=None, axis=1):
+    """
+    Maximum and minimum of `func` applied to `h5_main` along the given axis, found in a single streaming pass
+
+    Parameters
+    ----------
+    h5_main : h5py.Dataset or numpy.ndarray
+        2D dataset arranged as [position, spectroscopic]
+    func : callable, optional. Default = numpy.abs
+        Function applied to the data before finding the extrema
+    col_inds : 1D array-like of unsigned int, optional
+        Columns to consider. Default - all columns
+    max_mem_mb : unsigned int, optional. Default = 1024
+        Maximum memory (in MB) to use while reading
+    cores : unsigned int, optional
+        Number of threads to use. Default - as recommended by pyUSID
+    axis : int, optional. Default = 1
+        Axis along which the extrema are found, as in numpy.amax. 1 - extrema of each row (position).
+        0 - extrema of each column (spectroscopic step) over all positions
+
+    Returns
+    -------
+    max_resp : 1D numpy.ndarray
+        Maximum of func(h5_main) at each position (or at each column if axis = 0)
+    min_resp : 1D numpy.ndarray
+        Minimum of func(h5_main) at each position (or at each column if axis = 0)
+    """
+    if axis not in [0, 1]:
+        raise ValueError('axis must be 0 or 1')
+    if col_inds is not None:
+        col_inds = np.sort(np.asarray(col_inds, dtype=np.intp))
+    num_cols = h5_main.shape[1] if col_inds is None else col_inds.size
+    cores = recommend_cpu_cores(h5_main.shape[0], requested_cores=cores)
+    rows_per_chunk = _get_rows_per_chunk(h5_main, col_inds, cores, max_mem_mb=max_mem_mb, bytes_per_elem=8)
+
+    if axis == 0:
+        def _col_worker(row_chunks):
+            # Each thread keeps its own extrema which are combined at the end
+            col_max = np.full(num_cols, -np.inf)
+            col_min = np.full(num_cols, np.inf)
+            for rows in row_chunks:
+                y_mat = func(_read_rows(h5_main, rows, col_inds))
+                np.maximum(col_max, np.max(y_mat, axis=0), out=col_max)
+                np.minimum(col_min, np.min(y_mat, axis=0), out=col_min)
+            return col_max, col_min
+
+        results = _map_row_chunks(_col_worker, h5_main, rows_per_chunk, cores)
+        return np.maximum.reduce([res[0] for res in results]), np.minimum.reduce([res[1] for res in results])
+
+    max_resp = np.zeros(h5_main.shape[0])
+    min_resp = np.zeros(h5_main.shape[0])
+
+    def _worker(row_chunks):
+        # Each thread writes to disjoint rows of the outputs
+        for rows in row_chunks:
+            y_mat = func(_read_rows(h5_main, rows, col_inds))
+            max_resp[rows] = np.max(y_mat, axis=1)
+            min_resp[rows] = np.min(y_mat, axis=1)
+
+    _ = _map_row_chunks(_worker, h5_main, rows_per_chunk, cores)
+
+    return max_resp, min_resp
+
+
+def build_histograms_2d(h5_main, x_bins, num_x_bins, num_y_bins, funcs, min_vals, max_vals, col_inds=None,
+                        max_mem_mb=1024, cores=None, verbose=False):
+    """
+    Builds 2D histograms of `h5_main` by streaming blocks of rows through parallel threads.
+
+    Each thread bins its blocks of rows into its own histograms via numpy.bincount. The per-thread histograms are
+    summed once all the data has been read. Values of func(h5_main) are discretized exactly as in `build_histogram`.
+
+    Parameters
+    ----------
+    h5_main : h5py.Dataset or numpy.ndarray
+        2D dataset arranged as [position, spectroscopic]
+    x_bins : 1D array-like of unsigned int
+        x-axis bin of each column in `col_inds` (or of every column of `h5_main`)
+    num_x_bins : unsigned int
+        Number of bins in the x-direction
+    num_y_bins : unsigned int
+        Number of bins in the y-direction
+    funcs : list of callables
+        One histogram is built for each of these functions applied to the data
+    min_vals : list of float
+        Minimum value for y binning of each function
+    max_vals : list of float
+        Maximum value for y binning of each function
+    col_inds : 1D array-like of unsigned int, optional
+        Columns to histogram. Default - all columns
+    max_mem_mb : unsigned int, optional. Default = 1024
+        Maximum memory (in MB) to use by all threads together
+    cores : unsigned int, optional
+        Number of threads to use. Default - as recommended by pyUSID
+    verbose : bool, optional. Default = False
+        Whether or not to print progress
+
+    Returns
+    -------
+    hist_mat : 3D numpy.ndarray of int64
+        Histograms arranged as [function, x bin, y bin]
+    """
+    x_bins = np.asarray(x_bins, dtype=np.intp).ravel()
+    if col_inds is not None:
+        col_inds = np.asarray(col_inds, dtype=np.intp).ravel()
+        order = np.argsort(col_inds, kind='mergesort')
+        col_inds = col_inds[order]
+        if x_bins.size == order.size:
+            x_bins = x_bins[order]
+    num_cols = h5_main.shape[1] if col_inds is None else col_inds.size
+    if x_bins.size != num_cols:
+        raise ValueError('x_bins should have {} elements but has {}'.format(num_cols, x_bins.size))
+    if np.any(x_bins < 0) or np.any(x_bins >= num_x_bins):
+        raise ValueError('x_bins must lie within [0, num_x_bins)')
+    if not len(funcs) == len(min_vals) == len(max_vals):
+        raise ValueError('funcs, min_vals and max_vals should have the same length')
+
+    num_bins = num_x_bins * num_y_bins
+    x_offsets = x_bins * num_y_bins
+    inv_ranges = [1.0 / (max_val - min_val) if max_val > min_val else 0.0
+                  for min_val, max_val in zip(min_vals, max_vals)]
+
+    num_rows = h5_main.shape[0]
+    cores = recommend_cpu_cores(num_rows, requested_cores=cores)
+    # function output and flat bin indices:
+    rows_per_chunk = _get_rows_per_chunk(h5_main, col_inds, cores, max_mem_mb=max_mem_mb, bytes_per_elem=16)
+
+    def _worker(row_chunks):
+        hist_mat = np.zeros((len(funcs), num_bins), dtype=np.int64)
+        for rows in row_chunks:
+            data_mat = _read_rows(h5_main, rows, col_inds)
+            for ifunc, func in enumerate(funcs):
+                y_mat = np.asarray(func(data_mat), dtype=np.float64)
+                np.clip(y_mat, min_vals[ifunc], max_vals[ifunc], out=y_mat)
+                y_mat -= min_vals[ifunc]
+                y_mat *= inv_ranges[ifunc]
+                y_mat *= num_y_bins - 1
+                np.rint(y_mat, out=y_mat)
+                flat_idx = y_mat.astype(np.intp)
+                flat_idx += x_offsets
+                hist_mat[ifunc] += np.bincount(flat_idx.ravel(), minlength=num_bins)
+            if verbose:
+                print('Binned histograms of positions {} - {} of {}'.format(rows.start, rows.stop, num_rows))
+        return hist_mat
+
+    thread_hists = _map_row_chunks(_worker, h5_main, rows_per_chunk, cores)
+
+    return np.sum(thread_hists, axis=0).reshape(len(funcs), num_x_bins, num_y_bins)
@@ -10,21 +10,27 @@ Created on Jun 16, 2016
 
 from __future__ import division, print_function, absolute_import
 import os
+from functools import lru_cache
 from multiprocessing import cpu_count
 from warnings import warn
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.optimize import leastsq
 from scipy.signal import blackman
-from sklearn.utils import gen_batches
+try:
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    # numpy < 1.20
+    sliding_window_view = None
 
 from pyUSID import USIDataset
 from pyUSID.io.hdf_utils import get_h5_obj_refs, copy_attributes, link_h5_objects_as_attrs, find_results_groups, \
     link_as_main, check_for_old
 from pyUSID.processing.comp_utils import get_available_memory
-from pyUSID.io.write_utils import make_indices_matrix, get_aux_dset_slicing, INDICES_DTYPE, VALUES_DTYPE, calc_chunks
+from pyUSID.io.write_utils import make_indices_matrix, get_aux_dset_slicing, INDICES_DTYPE, VALUES_DTYPE
 from ..io.hdf_writer import HDFwriter
 from ..io.virtual_data import VirtualGroup, VirtualDataset
+from ..io.chunking import plan_chunks
 from .svd_utils import get_component_slice
 
 windata32 = np.dtype({'names': ['Image Data'],
@@ -37,6 +43,184 @@ wincompfft32 = np.dtype({'names': ['Image Data', 'FFT Real', 'FFT Imag'],
                          'formats': [np.float32, np.float32, np.float32]})
 
 
+def get_window_views(image, win_x, win_y, win_step_x=1, win_step_y=1):
+    """
+    Returns a read-only strided view of all the windows in the image without copying any data
+
+    Parameters
+    ----------
+    image : 2D numpy.ndarray
+        Image to be windowed
+    win_x : uint
+        Size of the window in the x-direction.
+    win_y : uint
+        Size of the window in the y-direction.
+    win_step_x : uint, optional. Default = 1
+        Step size in the x-direction between windows.
+    win_step_y : uint, optional. Default = 1
+        Step size in the y-direction between windows.
+
+    Returns
+    -------
+    windows : 4D numpy.ndarray
+        View of the image arranged as [window x-position, window y-position, win_x, win_y]. The windows are in the
+        same order as the window origins in `ImageWindow._get_window_pos_spec`
+    """
+    image = np.asarray(image)
+    if image.ndim != 2:
+        raise ValueError('image should be a 2D array')
+    if win_x > image.shape[0] or win_y > image.shape[1]:
+        raise ValueError('The window: {} cannot be larger than the image: {}'.format((win_x, win_y), image.shape))
+
+    if sliding_window_view is not None:
+        windows = sliding_window_view(image, (win_x, win_y))
+    else:
+        windows = np.lib.stride_tricks.as_strided(image,
+                                                  shape=(image.shape[0] - win_x + 1, image.shape[1] - win_y + 1,
+                                                         win_x, win_y),
+                                                  strides=image.strides * 2, writeable=False)
+
+    return windows[::win_step_x, ::win_step_y]
+
+
+def gen_window_grid_batches(nx, ny, batch_size):
+    """
+    Generates batches of windows on the grid of window origins. Batches are made of complete rows of windows if
+    possible or of fractions of a single row of windows otherwise.
+
+    Parameters
+    ----------
+    nx : uint
+        Number of window origins in the x-direction
+    ny : uint
+        Number of window origins in the y-direction
+    batch_size : uint
+        Maximum number of windows per batch
+
+    Yields
+    ------
+    batch : slice
+        Slice of the (flattened) window indices in this batch
+    rows : slice
+        Slice of the window origins in the x-direction in this batch
+    cols : slice
+        Slice of the window origins in the y-direction in this batch
+    """
+    batch_size = max(1, int(batch_size))
+    if batch_size >= ny:
+        rows_per_batch = batch_size // ny
+        for row_start in range(0, nx, rows_per_batch):
+            row_stop = min(row_start + rows_per_batch, nx)
+            yield slice(row_start * ny, row_stop * ny), slice(row_start, row_stop), slice(0, ny)
+    else:
+        for row in range(nx):
+            for col_start in range(0, ny, batch_size):
+                col_stop = min(col_start + batch_size, ny)
+                yield slice(row * ny + col_start, row * ny + col_stop), slice(row, row + 1), slice(col_start, col_stop)
+
+
+def gen_window_batches(windows, batch_size):
+    """
+    Generates batches of windows from the strided view of the windows. Only the batch being yielded is copied.
+
+    Parameters
+    ----------
+    windows : 4D numpy.ndarray
+        Windows arranged as [window x-position, window y-position, win_x, win_y] as returned by `get_window_views`
+    batch_size : uint
+        Maximum number of windows per batch
+
+    Yields
+    ------
+    batch : slice
+        Slice of the (flattened) window indices in this batch
+    batch_wins : 3D numpy.ndarray
+        Windows in this batch arranged as [window, win_x, win_y]
+    """
+    nx, ny, win_x, win_y = windows.shape
+    for batch, rows, cols in gen_window_grid_batches(nx, ny, batch_size):
+        yield batch, windows[rows, cols].reshape(-1, win_x, win_y)
+
+
+def get_window_counts(image_shape, win_x, win_y, win_step_x=1, win_step_y=1):
+    """
+    Calculates the number of windows that overlap each pixel of the image from the geometry of the windows alone
+
+    Parameters
+    ----------
+    image_shape : tuple of uint
+        Shape of the image
+    win_x : uint
+        Size of the window in the x-direction.
+    win_y : uint
+        Size of the window in the y-direction.
+    win_step_x : uint, optional. Default = 1
+        Step size in the x-direction between windows.
+    win_step_y : uint, optional. Default = 1
+        Step size in the y-direction between windows.
+
+    Returns
+    -------
+    counts : 2D numpy.ndarray of uint32
+        Number of windows that overlap each pixel
+    """
+    counts_1d = []
+    for im_len, win_len, step in zip(image_shape, [win_x, win_y], [win_step_x, win_step_y]):
+        origins = np.arange(0, im_len - win_len + 1, step)
+        edges = np.zeros(im_len + 1, dtype=np.int64)
+        edges[origins] += 1
+        edges[origins + win_len] -= 1
+        counts_1d.append(np.cumsum(edges[:-1]))
+
+    # The counts are separable since the windows lie on a regular grid
+    return np.outer(counts_1d[0], counts_1d[1]).astype(np.uint32)
+
+
+def overlap_add_windows(accum, windows, row_start, col_start, win_step_x=1, win_step_y=1):
+    """
+    Adds a grid of windows into the accumulated image in place.
+
+    Parameters
+    ----------
+    accum : numpy.ndarray
+        Accumulated image arranged as [x, y, ...]
+    windows : numpy.ndarray
+        Windows arranged as [window x-position, window y-position, win_x, win_y, ...]
+    row_start : uint
+        Index of the first window origin in the x-direction within the complete grid of window origins
+    col_start : uint
+        Index of the first window origin in the y-direction within the complete grid of window origins
+    win_step_x : uint, optional. Default = 1
+        Step size in the x-direction between windows.
+    win_step_y : uint, optional. Default = 1
+        Step size in the y-direction between windows.
+
+    Notes
+    -----
+    The same pixel of all the windows never overlaps, so each pixel of the window is added for all windows at once.
+    """
+    n_rows, n_cols, win_x, win_y = windows.shape[:4]
+    x_start = row_start * win_step_x
+    y_start = col_start * win_step_y
+    for dx in range(win_x):
+        x_slice = slice(x_start + dx, x_start + dx + (n_rows - 1) * win_step_x + 1, win_step_x)
+        for dy in range(win_y):
+            y_slice = slice(y_start + dy, y_start + dy + (n_cols - 1) * win_step_y + 1, win_step_y)
+            accum[x_slice, y_slice] += windows[:, :, dx, dy]
+
+
+def _normalize_by_counts(accum, counts):
+    """
+    Divides the accumulated image by the window counts, setting pixels that are not covered by any window to 0
+    """
+    if accum.ndim > counts.ndim:
+        counts = counts.reshape(counts.shape + (1,) * (accum.ndim - counts.ndim))
+    image = np.zeros(accum.shape, dtype=accum.dtype)
+    np.divide(accum, counts, out=image, where=np.broadcast_to(counts > 0, accum.shape))
+
+    return image
+
+
 class ImageWindow(object):
     """
     This class will handle the reading of a raw image file, creating windows from it, and writing those
@@ -83,6 +267,7 @@ class ImageWindow(object):
         self.h5_raw = h5_main
         self.h5_norm = None
         self.h5_wins = None
+        self.clean_wins = None
         self.h5_clean = None
         self.h5_noise = None
         self.h5_fft_clean = None
@@ -163,43 +348,29 @@ class ImageWindow(object):
         win_pix = win_x * win_y
 
         '''
-        Create slice object from the positions
+        Get a strided view of all the windows. No data is copied until a batch is processed
         '''
-        win_slices = [[slice(x, x + win_x), slice(y, y + win_y)] for x, y in win_pos_mat]
+        windows = get_window_views(image, win_x, win_y, win_step_x, win_step_y)
 
         '''
-        Calculate the size of a given batch that will fit in the available memory
+        Calculate the size of a given batch that will fit in the available memory.
+        Each window needs space for the structured output, a copy of the window and the complex FFT
         '''
-        mem_per_win = win_x * win_y * h5_wins.dtype.itemsize
+        mem_per_win = win_pix * (h5_wins.dtype.itemsize + image.itemsize + 16 * (win_fft != 'data'))
         if self.cores is None:
             free_mem = self.max_memory - image.size * image.itemsize
         else:
             free_mem = self.max_memory * 2 - image.size * image.itemsize
-        batch_size = int(free_mem / mem_per_win)
-        batch_slices = gen_batches(n_wins, batch_size)
+        batch_size = max(1, int(free_mem / mem_per_win))
+        if h5_wins.chunks is not None and batch_size > h5_wins.chunks[0]:
+            batch_size -= batch_size % h5_wins.chunks[0]
 
-        for ibatch, batch in enumerate(batch_slices):
-            batch_wins = np.zeros([batch.stop - batch.start, win_pix], dtype=win_type)
-            '''
-            Read each slice and write it to the dataset
-            '''
-            for islice, this_slice in enumerate(win_slices[batch]):
-                iwin = ibatch * batch_size + islice
-                selected = iwin % np.rint(n_wins / 10) == 0
-
-                if selected:
-                    per_done = np.rint(100 * iwin / n_wins)
-                    print('Windowing Image...{}% --pixels {}-{}, step # {}'.format(per_done,
-                                                                                   (this_slice[0].start,
-                                                                                    this_slice[1].start),
-                                                                                   (this_slice[0].stop,
-                                                                                    this_slice[1].stop),
-                                                                                   islice))
-
-                batch_wins[islice] = win_func(image[this_slice]).flatten()
-
-            h5_wins[batch] = batch_wins
-            self.hdf.flush()
+        for batch, batch_wins in gen_window_batches(windows, batch_size):
+            print('Windowing Image...{}% --windows {}-{}'.format(np.rint(100 * batch.start / n_wins),
+                                                                batch.start, batch.stop))
+            h5_wins[batch] = win_func(batch_wins).reshape(-1, win_pix)
+
+        self.hdf.flush()
 
         self.h5_wins = h5_wins
 
@@ -314,7 +485,7 @@ class ImageWindow(object):
         '''
         Calculate the chunk size
         '''
-        win_chunks = calc_chunks([n_wins, win_pix], win_type.itemsize, unit_chunks=[1, win_pix])
+        win_chunks = plan_chunks([n_wins, win_pix], win_type, 'pixel', unit_chunks=[1, win_pix]).chunks
 
         parent = h5_main.parent
 
@@ -445,7 +616,7 @@ class ImageWindow(object):
         Parameters
         ----------
         image : numpy.ndarray
-            Windowed image to take the FFT of
+            Windowed image to take the FFT of or a batch of windows arranged as [window, win_x, win_y]
 
         Returns
         -------
@@ -465,7 +636,7 @@ class ImageWindow(object):
         Parameters
         ----------
         image : numpy.ndarray
-            Windowed image to take the FFT of
+            Windowed image to take the FFT of or a batch of windows arranged as [window, win_x, win_y]
 
         Returns
         -------
@@ -475,7 +646,7 @@ class ImageWindow(object):
 
         """
         windows = np.empty_like(image, dtype=absfft32)
-        windows['FFT Magnitude'] = np.abs(np.fft.fftshift(np.fft.fft2(image)))
+        windows['FFT Magnitude'] = np.abs(np.fft.fftshift(np.fft.fft2(image), axes=(-2, -1)))
 
         return windows
 
@@ -487,7 +658,7 @@ class ImageWindow(object):
         Parameters
         ----------
         image : numpy.ndarray
-            Windowed image to take the FFT of
+            Windowed image to take the FFT of or a batch of windows arranged as [window, win_x, win_y]
 
         Returns
         -------
@@ -498,7 +669,7 @@ class ImageWindow(object):
         """
         windows = np.empty_like(image, dtype=winabsfft32)
         windows['Image Data'] = image
-        windows['FFT Magnitude'] = np.abs(np.fft.fftshift(np.fft.fft2(image)))
+        windows['FFT Magnitude'] = np.abs(np.fft.fftshift(np.fft.fft2(image), axes=(-2, -1)))
 
         return windows
 
@@ -510,7 +681,7 @@ class ImageWindow(object):
         Parameters
         ----------
         image : numpy.ndarray
-            Windowed image to take the FFT of
+            Windowed image to take the FFT of or a batch of windows arranged as [window, win_x, win_y]
 
         Returns
         -------
@@ -520,7 +691,7 @@ class ImageWindow(object):
         """
         windows = np.empty_like(image, dtype=wincompfft32)
         windows['Image Data'] = image
-        win_fft = np.fft.fftshift(np.fft.fft2(image))
+        win_fft = np.fft.fftshift(np.fft.fft2(image), axes=(-2, -1))
         windows['FFT Real'] = win_fft.real
         windows['FFT Imag'] = win_fft.imag
 
@@ -556,47 +727,41 @@ class ImageWindow(object):
         win_x = h5_win.parent.attrs['win_x']
         win_y = h5_win.parent.attrs['win_y']
         win_step_x = h5_win.parent.attrs['win_step_x']
-        win_step_y = h5_win.parent.attrs['win_step_x']
+        win_step_y = h5_win.parent.attrs['win_step_y']
 
         '''
         Calculate the steps taken to create original windows
         '''
-        x_steps = np.arange(0, im_x - win_x + 1, win_step_x)
-        y_steps = np.arange(0, im_y - win_y + 1, win_step_y)
+        nx = len(np.arange(0, im_x - win_x + 1, win_step_x))
+        ny = len(np.arange(0, im_y - win_y + 1, win_step_y))
+        n_wins = nx * ny
 
         '''
-        Initialize arrays to hold summed windows and counts for each position
+        Initialize array to hold summed windows. The number of windows that overlap each pixel
+        is calculated from the geometry of the windows
         '''
-        counts = np.zeros([im_x, im_y], np.uint8)
         accum = np.zeros([im_x, im_y], np.float32)
-
-        nx = len(x_steps)
-        ny = len(y_steps)
-        n_wins = nx * ny
+        counts = get_window_counts([im_x, im_y], win_x, win_y, win_step_x, win_step_y)
 
         '''
-        Create slice object from the positions
+        Calculate the size of a given batch that will fit in the available memory
         '''
-        win_slices = [[slice(x, x + win_x), slice(y, y + win_y)] for x, y in np.array([np.tile(x_steps, nx),
-                                                                                       np.repeat(y_steps, ny)]).T]
+        mem_per_win = win_x * win_y * h5_win.dtype.itemsize
+        batch_size = max(1, int((self.max_memory - accum.size * (accum.itemsize + counts.itemsize)) / mem_per_win))
 
         '''
-        Loop over all windows.  Increment counts for window positions and 
-        add current window to total.
+        Loop over batches of windows and add each batch of windows to the total.
         '''
-        ones = np.ones([win_x, win_y], dtype=counts.dtype)
-        for islice, this_slice in enumerate(win_slices):
-            selected = islice % np.rint(n_wins / 10) == 0
-            if selected:
-                per_done = np.rint(100 * islice / n_wins)
-                print('Reconstructing Image...{}% -- step # {}'.format(per_done, islice))
-            counts[this_slice] += ones
-
-            accum[this_slice] += h5_win[islice].reshape(win_x, win_y)
+        for batch, rows, cols in gen_window_grid_batches(nx, ny, batch_size):
+            print('Reconstructing Image...{}% -- windows {}-{}'.format(np.rint(100 * batch.start / n_wins),
+                                                                      batch.start, batch.stop))
+            batch_wins = h5_win[batch]
+            if batch_wins.dtype.names is not None:
+                batch_wins = batch_wins['Image Data']
+            overlap_add_windows(accum, batch_wins.reshape(rows.stop - rows.start, cols.stop - cols.start, win_x, win_y),
+                                rows.start, cols.start, win_step_x, win_step_y)
 
-        clean_image = accum / counts
-
-        clean_image[np.isnan(clean_image)] = 0
+        clean_image = _normalize_by_counts(accum, counts)
 
         clean_grp = VirtualGroup('Cleaned_Image', h5_win.parent.name[1:])
 
@@ -803,7 +968,7 @@ class ImageWindow(object):
 
         print('Cleaning the image by removing unwanted components.')
 
-        comp_slice = get_component_slice(components)
+        comp_slice, _ = get_component_slice(components)
 
         '''
         Read the 1st n_comp components from the SVD results
@@ -834,59 +999,48 @@ class ImageWindow(object):
         win_x = h5_win.parent.attrs['win_x']
         win_y = h5_win.parent.attrs['win_y']
 
+        win_step_x = h5_win.parent.attrs['win_step_x']
+        win_step_y = h5_win.parent.attrs['win_step_y']
+
         '''
-        Initialize arrays to hold summed windows and counts for each position
+        Initialize array to hold summed windows. The number of windows that overlap each pixel
+        is calculated from the geometry of the windows
         '''
-        counts = np.zeros([im_x, im_y], np.uint32)
         accum = np.zeros([im_x, im_y], np.float32)
+        counts = get_window_counts([im_x, im_y], win_x, win_y, win_step_x, win_step_y)
 
+        nx = len(np.arange(0, im_x - win_x + 1, win_step_x))
+        ny = len(np.arange(0, im_y - win_y + 1, win_step_y))
+        n_wins = nx * ny
         '''
-        Create slice object from the positions
-        '''
-        ds_win_pos = h5_win.file[h5_win.attrs['Position_Indices']][()]
-        win_slices = [[slice(x, x + win_x), slice(y, y + win_y)] for x, y in ds_win_pos]
-        n_wins = ds_win_pos.shape[0]
-        '''
-        Create a matrix to add when counting.
         h5_V is usually small so go ahead and take S.V
         '''
-        ones = np.ones([win_x, win_y], dtype=counts.dtype)
-        ds_V = np.dot(np.diag(h5_S[comp_slice]), h5_V['Image Data'][comp_slice, :])
+        ds_V = h5_S[comp_slice][:, None] * h5_V['Image Data'][comp_slice, :]
 
         '''
         Calculate the size of a given batch that will fit in the available memory
         '''
-        mem_per_win = ds_V.itemsize * ds_V.shape[1]
+        mem_per_win = ds_V.itemsize * (ds_V.shape[0] + ds_V.shape[1])
         if self.cores is None:
             free_mem = self.max_memory - ds_V.size * ds_V.itemsize
         else:
             free_mem = self.max_memory * 2 - ds_V.size * ds_V.itemsize
-        batch_size = int(free_mem / mem_per_win)
-        batch_slices = gen_batches(n_wins, batch_size)
+        batch_size = max(1, int(free_mem / mem_per_win))
 
         print('Reconstructing in batches of {} windows.'.format(batch_size))
 
         '''
-        Loop over all batches.  Increment counts for window positions and
-        add current window to total.
+        Loop over all batches. Build the windows in each batch with a single matrix product
+        and add the batch of windows to the total.
         '''
-        for ibatch, batch in enumerate(batch_slices):
-            ds_U = h5_U[batch, comp_slice]
-            batch_wins = np.dot(ds_U, ds_V).reshape([-1, win_x, win_y])
-            del ds_U
-            for islice, this_slice in enumerate(win_slices[batch]):
-                iwin = ibatch * batch_size + islice
-                if iwin % np.rint(n_wins / 10) == 0:
-                    per_done = np.rint(100 * iwin / n_wins)
-                    print('Reconstructing Image...{}% -- step # {}'.format(per_done, islice))
-
-                counts[this_slice] += ones
+        for batch, rows, cols in gen_window_grid_batches(nx, ny, batch_size):
+            print('Reconstructing Image...{}% -- windows {}-{}'.format(np.rint(100 * batch.start / n_wins),
+                                                                      batch.start, batch.stop))
+            batch_wins = np.dot(h5_U[batch, comp_slice], ds_V)
+            overlap_add_windows(accum, batch_wins.reshape(rows.stop - rows.start, cols.stop - cols.start, win_x, win_y),
+                                rows.start, cols.start, win_step_x, win_step_y)
 
-                accum[this_slice] += batch_wins[islice]
-
-        clean_image = np.divide(accum, counts)
-
-        clean_image[np.isnan(clean_image)] = 0
+        clean_image = _normalize_by_counts(accum, counts)
 
         if h5_win.file.attrs['normalized']:
             '''
@@ -1005,25 +1159,25 @@ class ImageWindow(object):
         win_x = h5_win.parent.attrs['win_x']
         win_y = h5_win.parent.attrs['win_y']
 
-        '''
-        Create slice object from the positions
-        '''
-        ds_win_pos = h5_win.file[h5_win.attrs['Position_Indices']][()]
-        win_slices = [[slice(x, x + win_x), slice(y, y + win_y), slice(None)] for x, y in ds_win_pos]
-        n_wins = len(ds_win_pos)
+        win_step_x = h5_win.parent.attrs['win_step_x']
+        win_step_y = h5_win.parent.attrs['win_step_y']
+
+        nx = len(np.arange(0, im_x - win_x + 1, win_step_x))
+        ny = len(np.arange(0, im_y - win_y + 1, win_step_y))
+        n_wins = nx * ny
 
         '''
         Go ahead and take the dot product of S and V.  Get the number of components
         from the length of S
         '''
-        ds_V = np.dot(np.diag(h5_S[comp_slice]), h5_V['Image Data'][comp_slice, :]).T
+        ds_V = (h5_S[comp_slice][:, None] * h5_V['Image Data'][comp_slice, :]).T
         num_comps = ds_V.shape[1]
 
         '''
-        Initialize arrays to hold summed windows and counts for each position
+        Initialize array to hold summed windows. The number of windows that overlap each pixel
+        is calculated from the geometry of the windows and is the same for all components
         '''
-        ones = np.ones([win_x, win_y, num_comps], dtype=np.uint32)
-        counts = np.zeros([im_x, im_y, num_comps], dtype=np.uint32)
+        counts = get_window_counts([im_x, im_y], win_x, win_y, win_step_x, win_step_y)
         clean_image = np.zeros([im_x, im_y, num_comps], dtype=np.float32)
 
         '''
@@ -1037,39 +1191,32 @@ class ImageWindow(object):
         batch_size = int(free_mem / mem_per_win)
         if batch_size < 1:
             raise MemoryError('Not enough memory to perform Image Cleaning.')
-        batch_slices = gen_batches(n_wins, batch_size)
 
         print('Reconstructing in batches of {} windows.'.format(batch_size))
         '''
-        Loop over all batches.  Increment counts for window positions and
-        add current window to total.
+        Loop over all batches and add each batch of windows to the total.
         '''
-        for ibatch, batch in enumerate(batch_slices):
+        for batch, rows, cols in gen_window_grid_batches(nx, ny, batch_size):
+            print('Reconstructing Image...{}% -- windows {}-{}'.format(np.rint(100 * batch.start / n_wins),
+                                                                      batch.start, batch.stop))
             ds_U = h5_U[batch, comp_slice]
             batch_wins = ds_U[:, None, :] * ds_V[None, :, :]
-            for islice, this_slice in enumerate(win_slices[batch]):
-                iwin = ibatch * batch_size + islice
-                if iwin % np.rint(n_wins / 10) == 0:
-                    per_done = np.rint(100 * iwin / n_wins)
-                    print('Reconstructing Image...{}% -- step # {}'.format(per_done, iwin))
-
-                counts[this_slice] += ones
-
-                clean_image[this_slice] += batch_wins[islice].reshape(win_x, win_y, num_comps)
+            overlap_add_windows(clean_image, batch_wins.reshape(rows.stop - rows.start, cols.stop - cols.start,
+                                                                win_x, win_y, num_comps),
+                                rows.start, cols.start, win_step_x, win_step_y)
 
         del ds_U, ds_V
 
-        clean_image /= counts
+        clean_image = _normalize_by_counts(clean_image, counts)
         del counts
-        clean_image[np.isnan(clean_image)] = 0
 
         '''
         Create datasets for results, link them properly, and write them to file
         '''
         clean_grp = VirtualGroup('Cleaned_Image_', win_svd.name[1:])
 
-        clean_chunking = calc_chunks([im_x * im_y, num_comps],
-                                     clean_image.dtype.itemsize)
+        # Cleaned images are viewed one component at a time:
+        clean_chunking = plan_chunks([im_x * im_y, num_comps], clean_image.dtype, 'spectral').chunks
         ds_clean = VirtualDataset('Cleaned_Image',
                                   data=clean_image.reshape(im_x * im_y, num_comps),
                                   chunking=clean_chunking,
@@ -1270,9 +1417,6 @@ class ImageWindow(object):
         im2 = image - np.mean(image)
         fim = np.fft.fftshift(np.fft.fft2(__hamming(im2)))
 
-        imrange = np.arange(-im_shape / 2, im_shape / 2)
-        uu, vv = np.meshgrid(imrange, imrange)
-
         '''
         Find max at each radial distance from the center
         '''
@@ -1281,16 +1425,8 @@ class ImageWindow(object):
         r_max = im_shape / 2
         r_vec = np.linspace(r_min, r_max, r_n, dtype=np.float32).transpose()
 
-        r_mat = np.abs(uu + 1j * vv)
-
         fimabs = np.abs(fim)
-        fimabs_max = np.zeros(r_n - 1)
-
-        for k in range(r_n - 1):
-            r1 = r_vec[k]
-            r2 = r_vec[k + 1]
-            r_ind = np.where(np.logical_and(r_mat >= r1, r_mat <= r2))
-            fimabs_max[k] = np.max(fimabs[r_ind])
+        _, fimabs_max, _, _ = radial_profile(fimabs, r_n - 1, (r_max - r_min) / (r_n - 1.0))
 
         r_vec = r_vec[:-1] + (r_max - r_min) / (r_n - 1.0) / 2.0
 
@@ -1436,6 +1572,114 @@ class ImageWindow(object):
         # plt.close(fig)
 
 
+@lru_cache(maxsize=32)
+def _get_radial_bins(shape, num_bins, bin_width, normalized):
+    """
+    Calculates (once per image shape and binning) the radial bin of each pixel along with the permutation that groups
+    the pixels by bin. Use `radial_profile` instead of calling this function directly.
+
+    Parameters
+    ----------
+    shape : tuple of uint
+        Shape of the 2D image
+    num_bins : uint
+        Number of radial bins
+    bin_width : float
+        Width of each radial bin
+    normalized : bool
+        If True, the coordinates span [-1, 1] along each axis. Else, the coordinates are in pixels from the center
+
+    Returns
+    -------
+    bin_inds : 1D numpy.ndarray
+        Radial bin of each (flattened) pixel. Pixels beyond the last bin are assigned to bin `num_bins`
+    sort_order : 1D numpy.ndarray
+        Permutation of the (flattened) pixels that sorts them by bin
+    bin_counts : 1D numpy.ndarray
+        Number of pixels in each radial bin
+    bin_starts : 1D numpy.ndarray
+        Position of the first pixel of each radial bin within the sorted pixels
+    """
+    if normalized:
+        axes = [np.linspace(-1, 1, num_pix) for num_pix in shape]
+    else:
+        axes = [np.arange(-num_pix / 2, num_pix / 2) for num_pix in shape]
+    x_mesh, y_mesh = np.meshgrid(*axes, indexing='ij')
+    r_vec = np.sqrt(x_mesh ** 2 + y_mesh ** 2).ravel()
+
+    bin_inds = np.minimum(np.floor(r_vec / bin_width), num_bins).astype(np.intp)
+    sort_order = np.argsort(bin_inds, kind='mergesort')
+    bin_counts = np.bincount(bin_inds, minlength=num_bins + 1)[:num_bins]
+    bin_starts = np.concatenate(([0], np.cumsum(bin_counts)[:-1]))
+
+    for arr in [bin_inds, sort_order, bin_counts, bin_starts]:
+        # The cached arrays are shared across calls
+        arr.setflags(write=False)
+
+    return bin_inds, sort_order, bin_counts, bin_starts
+
+
+def radial_profile(data_mat, num_bins, bin_width, normalized=False):
+    """
+    Calculates the statistics of the image within rings of increasing radius about the center of the image.
+    The mapping of pixels to rings is cached by image shape, so repeated calls on images of the same shape are fast.
+
+    Parameters
+    ----------
+    data_mat : 2D real numpy array
+        Image to analyze
+    num_bins : unsigned int
+        Number of radial bins. Bin k contains the pixels whose radius lies within [k, k + 1) * bin_width
+    bin_width : float
+        Width of each radial bin
+    normalized : bool, optional. Default = False
+        If True, the coordinates span [-1, 1] along each axis. Else, the coordinates are in pixels from the center
+
+    Returns
+    -------
+    rad_avg_vec : 1D real numpy array
+        Mean of the image within each radial bin
+    rad_max_vec : 1D real numpy array
+        Maximum of the image within each radial bin
+    rad_min_vec : 1D real numpy array
+        Minimum of the image within each radial bin
+    rad_std_vec : 1D real numpy array
+        Standard deviation of the image within each radial bin
+
+    Notes
+    -----
+    Bins that do not contain any pixels are set to NaN
+    """
+    data_mat = np.asarray(data_mat)
+    if data_mat.ndim != 2:
+        raise ValueError('data_mat should be a 2D array')
+    bin_inds, sort_order, bin_counts, bin_starts = _get_radial_bins(tuple(data_mat.shape), int(num_bins),
+                                                                    float(bin_width), bool(normalized))
+    data_vec = data_mat.ravel()
+    in_range = bin_inds < num_bins
+    filled = bin_counts > 0
+
+    rad_avg_vec = np.full(num_bins, np.nan)
+    rad_max_vec = np.full(num_bins, np.nan)
+    rad_min_vec = np.full(num_bins, np.nan)
+    rad_std_vec = np.full(num_bins, np.nan)
+
+    sums = np.bincount(bin_inds[in_range], weights=data_vec[in_range], minlength=num_bins)
+    rad_avg_vec[filled] = sums[filled] / bin_counts[filled]
+
+    deviations = data_vec[in_range] - rad_avg_vec[bin_inds[in_range]]
+    sq_sums = np.bincount(bin_inds[in_range], weights=deviations ** 2, minlength=num_bins)
+    rad_std_vec[filled] = np.sqrt(sq_sums[filled] / bin_counts[filled])
+
+    if np.any(filled):
+        # Pixels beyond the last bin are sorted to the end and must be excluded from the last bin
+        data_sorted = data_vec[sort_order[:bin_starts[-1] + bin_counts[-1]]]
+        rad_max_vec[filled] = np.maximum.reduceat(data_sorted, bin_starts[filled])
+        rad_min_vec[filled] = np.minimum.reduceat(data_sorted, bin_starts[filled])
+
+    return rad_avg_vec, rad_max_vec, rad_min_vec, rad_std_vec
+
+
 def radially_average_correlation(data_mat, num_r_bin):
     """
     Calculates the radially average correlation functions for a given 2D image
@@ -1461,13 +1705,6 @@ def radially_average_correlation(data_mat, num_r_bin):
         Standard deviation of the correlation as a function of feature size
 
     """
-    x_size = data_mat.shape[0]
-    y_size = data_mat.shape[1]
-
-    x_mesh, y_mesh = np.meshgrid(np.linspace(-1, 1, x_size),
-                                 np.linspace(-1, 1, y_size))
-    r_vec = np.sqrt(x_mesh ** 2 + y_mesh ** 2).flatten()
-
     s_mat = (np.abs(np.fft.fftshift(np.fft.fft2(data_mat)))) ** 2
     a_mat = np.abs(np.fft.fftshift((np.fft.ifft2(s_mat))))
 
@@ -1476,30 +1713,9 @@ def radially_average_correlation(data_mat, num_r_bin):
     max_a = np.max(a_mat)
     a_mat = a_mat / max_a
 
-    a_vec = a_mat.flatten()
-
     # bin results based on r
-    a_rad_avg_vec = np.zeros(num_r_bin)
-    a_rad_max_vec = np.zeros(a_rad_avg_vec.shape)
-    a_rad_min_vec = np.zeros(a_rad_avg_vec.shape)
-    a_rad_std_vec = np.zeros(a_rad_avg_vec.shape)
-    r_bin_vec = np.zeros(a_rad_avg_vec.shape)
-
     step = 1 / (num_r_bin * 1.0 - 1)
-    for k, r_bin in enumerate(np.linspace(0, 1, num_r_bin)):
-        b = np.where((r_vec < r_bin + step) and (r_vec > r_bin))[0]
-
-        if b.size == 0:
-            a_rad_avg_vec[k] = np.nan
-            a_rad_min_vec[k] = np.nan
-            a_rad_max_vec[k] = np.nan
-            a_rad_std_vec[k] = np.nan
-        else:
-            a_bin = a_vec[b]
-            a_rad_avg_vec[k] = np.mean(a_bin)
-            a_rad_min_vec[k] = np.min(a_bin)
-            a_rad_max_vec[k] = np.max(a_bin)
-            a_rad_std_vec[k] = np.std(a_bin)
-        r_bin_vec[k] = r_bin + 0.5 * step
+    a_rad_avg_vec, a_rad_max_vec, a_rad_min_vec, a_rad_std_vec = radial_profile(a_mat, num_r_bin, step,
+                                                                                normalized=True)
 
     return a_mat, a_rad_avg_vec, a_rad_max_vec, a_rad_min_vec, a_rad_std_vec
@@ -22,8 +22,9 @@ from pyUSID.io.hdf_utils import find_results_groups, get_indices_for_region_ref,
 from pyUSID.processing.comp_utils import get_available_memory
 from pyUSID.io.io_utils import format_time
 from pyUSID.io.dtype_utils import check_dtype, stack_real_to_target_dtype
-from pyUSID.io.write_utils import Dimension, calc_chunks
+from pyUSID.io.write_utils import Dimension
 from pyUSID import USIDataset
+from ..io.chunking import plan_chunks
 
 
 class SVD(Process):
@@ -194,14 +195,15 @@ class SVD(Process):
         write_simple_attrs(h5_svd_group, self.parms_dict)
         write_simple_attrs(h5_svd_group, {'svd_method': 'sklearn-randomized'})
 
+        # Abundance maps are read one component at a time and so are the eigenvectors:
         h5_u = write_main_dataset(h5_svd_group, np.float32(self.__u), 'U', 'Abundance', 'a.u.', None, comp_dim,
                                   h5_pos_inds=self.h5_main.h5_pos_inds, h5_pos_vals=self.h5_main.h5_pos_vals,
-                                  dtype=np.float32, chunks=calc_chunks(self.__u.shape, np.float32(0).itemsize))
+                                  dtype=np.float32, chunks=plan_chunks(self.__u.shape, np.float32, 'spectral').chunks)
         # print(get_attr(self.h5_main, 'quantity')[0])
         h5_v = write_main_dataset(h5_svd_group, self.__v, 'V', get_attr(self.h5_main, 'quantity')[0],
                                   'a.u.', comp_dim, None, h5_spec_inds=self.h5_main.h5_spec_inds,
                                   h5_spec_vals=self.h5_main.h5_spec_vals,
-                                  chunks=calc_chunks(self.__v.shape, self.h5_main.dtype.itemsize))
+                                  chunks=plan_chunks(self.__v.shape, self.__v.dtype, 'pixel').chunks)
 
         # No point making this 1D dataset a main dataset
         h5_s = h5_svd_group.create_dataset('S', data=np.float32(self.__s))
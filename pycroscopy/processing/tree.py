@@ -94,9 +94,71 @@ class Node(object):
         return '({}) --> {},{}'.format(self.name, str(self.children[0].name), str(self.children[1].name))
 
 
+class _NodeView(Node):
+    """
+    Read-only view of a single node in a ClusterTree. Exposes the same attributes as Node
+    but all information is looked up from the arrays within the ClusterTree.
+    """
+
+    def __init__(self, tree, index):
+        """
+        Parameters
+        ----------
+        tree : ClusterTree object
+            Tree this node belongs to
+        index : unsigned int
+            Index of this node within the tree
+        """
+        self._tree = tree
+        self._index = index
+
+    @property
+    def name(self):
+        return self._index
+
+    @property
+    def value(self):
+        if self._tree.node_values is None:
+            return None
+        return self._tree.node_values[self._index]
+
+    @property
+    def dist(self):
+        return self._tree.node_dists[self._index]
+
+    @property
+    def level(self):
+        return int(self._tree.node_levels[self._index])
+
+    @property
+    def num_nodes(self):
+        return int(self._tree.leaf_spans[self._index])
+
+    @property
+    def labels(self):
+        return self._tree.get_labels(self._index)
+
+    @property
+    def children(self):
+        if self._index < self._tree.num_leaves:
+            return []
+        return [self._tree.nodes[child] for child in self._tree.child_inds[self._index]]
+
+    @property
+    def parent(self):
+        parent = self._tree.parent_inds[self._index]
+        if parent < 0:
+            return None
+        return self._tree.nodes[parent]
+
+
 class ClusterTree(object):
     """
     Creates a tree representation from the provided linkage pairing. Useful for clustering
+
+    The tree is held in flat arrays indexed by node: leaves are nodes 0 to num_leaves - 1 and the node created by
+    row i of the linkage pairing is node num_leaves + i. The leaves are arranged in depth-first order so that the
+    leaves and the labels (positions) below any node form contiguous ranges of `leaf_order` and `label_perm`.
     """
 
     def __init__(self, linkage_pairing, labels, distances=None, centroids=None):
@@ -112,44 +174,147 @@ class ClusterTree(object):
         centroids : (Optional) 2D numpy array
             Mean responses for each of the clusters. These will be propagated up
         """
+        linkage_pairing = np.array(linkage_pairing)
         self.num_leaves = linkage_pairing.shape[0] + 1
         self.linkage = linkage_pairing
         self.centroids = centroids
-        """ this list maintains pointers to the nodes pertaining to that cluster id for quick look-ups
-        By default this lookup table just contains the number indices of these clusters.
-        They will be replaced with node objects as and when the objects are created"""
-        self.nodes = list()
+        num_nodes = self.num_leaves + linkage_pairing.shape[0]
+        internal = np.arange(self.num_leaves, num_nodes)
 
         # now the labels is a giant list of labels assigned for each of the positions.
         self.labels = np.array(labels, dtype=np.uint32)
-        """ the labels for the leaf nodes need to be calculated manually from the provided labels
-        Populate the lowest level nodes / leaves first:"""
-        for clust_id in range(self.num_leaves):
-            which_pos = np.where(self.labels == clust_id)
-            if centroids is not None:
-                self.nodes.append(Node(clust_id, value=centroids[clust_id], labels=which_pos))
-            else:
-                self.nodes.append(Node(clust_id, labels=which_pos))
-
-        for row in range(linkage_pairing.shape[0]):
-            """print 'working on', linkage_pairing[row]
-            we already have each of these children in our look-up table"""
-            childs = []  # this is an empty list that will hold all the children corresponding to this node
-            for col in range(linkage_pairing.shape[1]):
-                """ look at each child in this row
-                look up the node object corresponding to this label """
-                childs.append(self.nodes[int(linkage_pairing[row, col])])
-                # Now this row results in a new node. That is what we create here and assign the children to this node
-            new_node = Node(row + self.num_leaves, children=childs, compute_mean=centroids is not None)
-            # If distances are provided, add the distances attribute to this node.
+
+        """
+        Parent and children of each node. -1 for the children of leaves and the parent of the apex
+        """
+        self.child_inds = -np.ones((num_nodes, linkage_pairing.shape[1]), dtype=np.int64)
+        self.child_inds[internal] = linkage_pairing.astype(np.int64)
+        self.parent_inds = -np.ones(num_nodes, dtype=np.int64)
+        self.parent_inds[self.child_inds[internal]] = internal[:, None]
+        if np.any(self.child_inds[internal] >= internal[:, None]) or np.sum(self.parent_inds < 0) != 1:
+            raise ValueError('linkage_pairing does not describe a tree with a single apex')
+
+        self.node_dists = np.zeros(num_nodes)
+        if distances is not None:
             # This is the distance between the children
-            if distances is not None:
-                new_node.dist = distances[row]
-                # add this node to the look-up table:
-            self.nodes.append(new_node)
+            self.node_dists[internal] = distances
+
+        """
+        Level of each node and the number of leaves below it. Each row of the linkage only refers to nodes
+        created by earlier rows so a single pass bottom-up suffices.
+        """
+        self.node_levels = np.zeros(num_nodes, dtype=np.uint32)
+        self.leaf_spans = np.ones(num_nodes, dtype=np.int64)
+        for node in internal:
+            kids = self.child_inds[node]
+            self.node_levels[node] = self.node_levels[kids].max() + 1
+            self.leaf_spans[node] = self.leaf_spans[kids].sum()
+
+        """
+        Position of the first leaf below each node in the depth-first ordering of the leaves, found top-down
+        """
+        kid_spans = self.leaf_spans[self.child_inds[internal]]
+        kid_offsets = np.cumsum(kid_spans, axis=1) - kid_spans
+        self.leaf_starts = np.zeros(num_nodes, dtype=np.int64)
+        for node in internal[::-1]:
+            self.leaf_starts[self.child_inds[node]] = self.leaf_starts[node] + kid_offsets[node - self.num_leaves]
+        self.leaf_order = np.argsort(self.leaf_starts[:self.num_leaves])
 
+        """
+        Permutation that groups the positions by leaf in depth-first order, and the range of that permutation
+        which belongs to each node
+        """
+        valid = self.labels < self.num_leaves
+        leaf_keys = np.where(valid, self.leaf_starts[np.where(valid, self.labels, 0)], self.num_leaves)
+        self.label_perm = np.argsort(leaf_keys, kind='mergesort')[:np.count_nonzero(valid)].astype(np.uint32)
+        leaf_sizes = np.bincount(self.labels[valid], minlength=self.num_leaves)
+        label_cumsum = np.append(0, np.cumsum(leaf_sizes[self.leaf_order]))
+        self.label_starts = label_cumsum[self.leaf_starts]
+        self.label_counts = label_cumsum[self.leaf_starts + self.leaf_spans] - self.label_starts
+
+        """
+        Mean response of each node weighted by the number of positions within each of its leaves
+        """
+        self.node_values = None
+        if centroids is not None:
+            self.node_values = self.__get_weighted_means(np.asarray(centroids), leaf_sizes)
+
+        """ this list maintains light-weight Node objects for each cluster id for quick look-ups """
+        self.nodes = [_NodeView(self, ind) for ind in range(num_nodes)]
         self.tree = self.nodes[-1]
 
+    def __get_weighted_means(self, centroids, leaf_sizes):
+        """
+        Computes the mean response of every node from the centroids of the leaves
+
+        Parameters
+        ----------
+        centroids : 2D numpy array
+            Mean responses for each of the leaves
+        leaf_sizes : 1D numpy array
+            Number of positions in each leaf
+
+        Returns
+        -------
+        node_values : 2D numpy array
+            Mean responses for all nodes, starting with the leaves
+        """
+        weighted = centroids[self.leaf_order] * leaf_sizes[self.leaf_order].reshape((-1,) + (1,) * (centroids.ndim - 1))
+        # Pad so that the end of the last range is a valid index for reduceat:
+        weighted = np.concatenate([weighted, np.zeros((1,) + weighted.shape[1:], dtype=weighted.dtype)])
+        internal = slice(self.num_leaves, None)
+        bounds = np.vstack([self.leaf_starts[internal], self.leaf_starts[internal] + self.leaf_spans[internal]])
+        sums = np.add.reduceat(weighted, bounds.T.ravel(), axis=0)[::2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / self.label_counts[internal].reshape((-1,) + (1,) * (centroids.ndim - 1))
+        return np.concatenate([centroids, means.astype(centroids.dtype)])
+
+    def get_labels(self, node):
+        """
+        Positions in the main dataset that fall under the provided node
+
+        Parameters
+        ----------
+        node : unsigned int
+            Index of the node
+
+        Returns
+        -------
+        labels : 1D unsigned int numpy array
+            Sorted positions under this node
+        """
+        start = self.label_starts[node]
+        return np.sort(self.label_perm[start: start + self.label_counts[node]])
+
+    def get_leaves(self, node):
+        """
+        Leaves (cluster ids) that fall under the provided node in depth-first order
+
+        Parameters
+        ----------
+        node : unsigned int
+            Index of the node
+
+        Returns
+        -------
+        leaves : 1D numpy array
+        """
+        start = self.leaf_starts[node]
+        return self.leaf_order[start: start + self.leaf_spans[node]]
+
+    def get_traversal_order(self):
+        """
+        Depth-first (pre-order) traversal of all nodes starting at the apex: every node precedes its children,
+        which are visited in the order given in the linkage pairing.
+
+        Returns
+        -------
+        order : 1D numpy array
+            Indices of the nodes in the order of traversal
+        """
+        # Nodes sharing their first leaf lie on one path, where ancestors span more leaves
+        return np.lexsort((-self.leaf_spans, self.leaf_starts))
+
     def __str__(self):
         """
         Overrides the to string representation. Prints the names of the node and its children.
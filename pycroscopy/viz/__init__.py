@@ -12,8 +12,9 @@ Submodules
     image_cleaning_utils
 
 """
-from . import image_cleaning_utils
-from . import be_viz_utils
-from . import cluster_utils
+from ..lazy_loader import attach as _attach
+
+__getattr__, __dir__ = _attach(__name__,
+                               submodules=['image_cleaning_utils', 'be_viz_utils', 'cluster_utils', 'be_visualizers'])
 
 __all__ = ['be_viz_utils', 'cluster_utils', 'image_cleaning_utils']
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import numpy as np
+import sys
+sys.path.append("../../pycroscopy/")
+
+from pycroscopy.io.chunking import plan_chunks
+
+shape = (16384, 1024)
+max_chunk_mem = 256 * 1024
+
+
+class TestPlanChunks(unittest.TestCase):
+
+    def __check_size(self, chunks, dtype):
+        self.assertLessEqual(int(np.prod(chunks)) * np.dtype(dtype).itemsize, max_chunk_mem)
+
+    def test_pixel(self):
+        plan = plan_chunks(shape, np.float32, 'pixel')
+        self.assertEqual(plan.chunks, (64, 1024))
+        self.__check_size(plan.chunks, np.float32)
+
+    def test_spectral(self):
+        plan = plan_chunks(shape, np.float32, 'spectral')
+        self.assertEqual(plan.chunks, (16384, 4))
+        self.__check_size(plan.chunks, np.float32)
+
+    def test_balanced(self):
+        plan = plan_chunks(shape, np.float32, 'balanced')
+        self.assertEqual(plan.chunks, (1024, 64))
+        # Same number of chunks along both axes:
+        self.assertEqual(shape[0] // plan.chunks[0], shape[1] // plan.chunks[1])
+        # Cache holds all the chunks crossed by a single position or spectroscopic slice:
+        self.assertEqual(plan.cache_bytes, 16 * 1024 * 64 * 4)
+
+    def test_unit_chunks(self):
+        for access in ['pixel', 'spectral', 'balanced']:
+            plan = plan_chunks(shape, np.complex64, access, unit_chunks=(1, 100))
+            # Either whole spectra or multiples of the unit chunk:
+            self.assertTrue(plan.chunks[1] == shape[1] or plan.chunks[1] % 100 == 0)
+
+    def test_large_unit_chunks(self):
+        # A single spectrum is larger than the maximum chunk size:
+        plan = plan_chunks((10, 10 ** 6), np.float32, 'spectral', unit_chunks=(1, 10 ** 6))
+        self.assertEqual(plan.chunks, (1, 10 ** 6))
+        self.assertGreaterEqual(plan.cache_bytes, 4 * 10 ** 6)
+
+    def test_small_dataset(self):
+        for access in ['pixel', 'spectral', 'balanced']:
+            plan = plan_chunks((10, 7), np.float32, access)
+            self.assertEqual(plan.chunks, (10, 7))
+            self.assertEqual(plan.cache_bytes, 1024 ** 2)
+            self.assertEqual(plan.cache_slots, 521)
+
+    def test_max_cache_mem(self):
+        plan = plan_chunks((10 ** 6, 4), np.float32, 'balanced', max_chunk_mem=4096, max_cache_mem=2 * 1024 ** 2)
+        self.assertEqual(plan.cache_bytes, 2 * 1024 ** 2)
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            _ = plan_chunks(shape, np.float32, 'random')
+        with self.assertRaises(ValueError):
+            _ = plan_chunks((3, 4, 5), np.float32)
+        with self.assertRaises(ValueError):
+            _ = plan_chunks(shape, np.float32, unit_chunks=(1, 2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -900,6 +900,30 @@ class TestHDFWriter(unittest.TestCase):
 
         os.remove(file_path)
 
+    def test_repack(self):
+        file_path = 'test.h5'
+        self.__delete_existing_file(file_path)
+        data = np.random.rand(256, 128)
+        with h5py.File(file_path, mode='w') as h5_f:
+            h5_f.create_dataset('Kept', data=data, chunks=(16, 128), compression='gzip')
+            h5_f.create_dataset('Deleted', data=np.random.rand(512, 512))
+            h5_f['Kept'].attrs['labels'] = ['even_rows']
+            h5_f['Kept'].attrs['even_rows'] = h5_f['Kept'].regionref[::2]
+            del h5_f['Deleted']
+        size_before = os.path.getsize(file_path)
+
+        writer = HDFwriter(file_path)
+        writer.repack()
+        self.assertLess(os.path.getsize(file_path), size_before)
+        h5_dset = writer.file['Kept']
+        self.assertEqual(h5_dset.chunks, (16, 128))
+        self.assertEqual(h5_dset.compression, 'gzip')
+        self.assertTrue(np.array_equal(h5_dset[()], data))
+        self.assertTrue(np.array_equal(h5_dset[h5_dset.attrs['even_rows']], data[::2]))
+        self.assertNotIn('Deleted', writer.file)
+        writer.close()
+        os.remove(file_path)
+
 
 if __name__ == '__main__':
     unittest.main()
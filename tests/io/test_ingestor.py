@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import shutil
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../pycroscopy/")
+
+from pyUSID.io.translator import Translator
+from pycroscopy.io import translators
+from pycroscopy.io.translators import registry
+from pycroscopy.io.ingestor import ingest, ingest_many
+
+folder_path = 'test_ingest'
+
+
+class EchoTranslator(Translator):
+    """
+    Writes the contents of a .echo file to a HDF5 file
+    """
+
+    @staticmethod
+    def is_valid_file(file_path):
+        with open(file_path, 'rb') as file_handle:
+            if file_handle.read(4) == b'ECHO':
+                return file_path
+        return None
+
+    def translate(self, file_path, scale=1):
+        h5_path = os.path.abspath(os.path.splitext(file_path)[0] + '.h5')
+        with open(file_path, 'rb') as file_handle:
+            file_handle.seek(4)
+            data = np.frombuffer(file_handle.read(), dtype=np.uint8)
+        with h5py.File(h5_path, mode='w') as h5_f:
+            h5_f.create_dataset('Raw_Data', data=data * scale)
+        return h5_path
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+
+    def __write_file(self, file_name, contents):
+        file_path = os.path.join(folder_path, file_name)
+        with open(file_path, 'wb') as file_handle:
+            file_handle.write(contents)
+        return file_path
+
+    def test_all_translators_registered(self):
+        names = [spec.name for spec in registry.get_registered_translators()]
+        self.assertEqual(names, [trans_class.__name__ for trans_class in translators.all_translators])
+        for name in names:
+            self.assertIs(registry.get_translator_class(name), getattr(translators, name))
+
+    def test_unregistered(self):
+        with self.assertRaises(KeyError):
+            _ = registry.get_translator_class('NotATranslator')
+
+    def test_sniff_extension_and_magic(self):
+        ibw_path = self.__write_file('scan.ibw', b'\x05\x00' + b'\x00' * 30)
+        self.assertEqual(registry.sniff_translators(ibw_path), ['IgorIBWTranslator'])
+        bad_ibw_path = self.__write_file('bad.ibw', b'not igor')
+        self.assertEqual(registry.sniff_translators(bad_ibw_path), [])
+        bruker_path = self.__write_file('force.001', b'\\*Force file list\r\n')
+        self.assertEqual(registry.sniff_translators(bruker_path), ['BrukerAFMTranslator'])
+
+    def test_sniff_hdf5(self):
+        h5_path = os.path.join(folder_path, 'data.h5')
+        with h5py.File(h5_path, mode='w') as h5_f:
+            h5_f.create_dataset('x', data=[1])
+        self.assertEqual(registry.sniff_translators(h5_path), ['LabViewH5Patcher'])
+        fake_path = self.__write_file('fake.h5', b'not hdf5')
+        self.assertEqual(registry.sniff_translators(fake_path), [])
+
+    def test_sniff_siblings(self):
+        # Any file within a TRKPFM folder, as accepted by TRKPFMTranslator.is_valid_file():
+        log_path = self.__write_file('notes.log', b'log')
+        self.assertNotIn('TRKPFMTranslator', registry.sniff_translators(log_path))
+        _ = self.__write_file('scan_parm.mat', b'')
+        self.assertIn('TRKPFMTranslator', registry.sniff_translators(log_path))
+
+    def test_sniff_parents(self):
+        # Any file within or next to a 'newdataformat' folder, as accepted by BEPSndfTranslator.is_valid_file():
+        log_path = self.__write_file('notes.log', b'log')
+        self.assertNotIn('BEPSndfTranslator', registry.sniff_translators(log_path))
+        os.mkdir(os.path.join(folder_path, 'newdataformat'))
+        self.assertIn('BEPSndfTranslator', registry.sniff_translators(log_path))
+        ndf_path = self.__write_file(os.path.join('newdataformat', 'SS_0001'), b'')
+        self.assertIn('BEPSndfTranslator', registry.sniff_translators(ndf_path))
+        self.assertNotIn('TRKPFMTranslator', registry.sniff_translators(ndf_path))
+
+    def test_sniff_folder(self):
+        expected = [spec.name for spec in registry.get_registered_translators() if spec.folders]
+        self.assertEqual(registry.sniff_translators(folder_path), expected)
+        self.assertIn('GLineTranslator', expected)
+
+
+class TestIngest(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        registry.register_translator('EchoTranslator', __name__, extensions=['echo'], magic=[(0, b'ECHO')])
+        self.data = list()
+        self.file_paths = list()
+        for ind in range(4):
+            data = np.random.randint(0, 100, size=10 + ind).astype(np.uint8)
+            file_path = os.path.join(folder_path, 'file_{}.echo'.format(ind))
+            with open(file_path, 'wb') as file_handle:
+                file_handle.write(b'ECHO' + data.tobytes())
+            self.data.append(data)
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        registry._registry.pop('EchoTranslator')
+        shutil.rmtree(folder_path)
+
+    def __check_h5(self, h5_path, data):
+        with h5py.File(h5_path, mode='r') as h5_f:
+            self.assertTrue(np.array_equal(h5_f['Raw_Data'][()], data))
+
+    def test_ingest(self):
+        h5_path = ingest(self.file_paths[0], scale=2)
+        self.__check_h5(h5_path, self.data[0] * 2)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            _ = ingest(os.path.join(folder_path, 'missing.echo'))
+
+    def test_no_translator(self):
+        file_path = os.path.join(folder_path, 'file.unknown')
+        with open(file_path, 'wb') as file_handle:
+            file_handle.write(b'ECHO')
+        with self.assertRaises(NotImplementedError):
+            _ = ingest(file_path)
+
+    def test_ingest_many_serial(self):
+        h5_paths = ingest_many(self.file_paths, cores=1)
+        for h5_path, data in zip(h5_paths, self.data):
+            self.__check_h5(h5_path, data)
+
+    def test_ingest_many_processes(self):
+        h5_paths = ingest_many(self.file_paths, cores=2, force_translator='EchoTranslator', scale=3)
+        self.assertEqual(h5_paths, [os.path.abspath(os.path.splitext(path)[0] + '.h5') for path in self.file_paths])
+        for h5_path, data in zip(h5_paths, self.data):
+            self.__check_h5(h5_path, data * 3)
+
+    def test_ingest_many_invalid(self):
+        with self.assertRaises(TypeError):
+            _ = ingest_many(self.file_paths[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
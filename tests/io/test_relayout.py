@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../pycroscopy/")
+
+from pyUSID import USIDataset
+from pyUSID.io.hdf_utils import write_main_dataset
+from pyUSID.io.write_utils import Dimension
+from pycroscopy.io import relayout
+from pycroscopy.io.relayout import relayout_file
+from pycroscopy.io.chunking import plan_chunks
+
+source_path = 'test_relayout_source.h5'
+target_path = 'test_relayout_target.h5'
+main_path = '/Measurement_000/Channel_000/Raw_Data'
+num_x, num_y, num_bias = 30, 20, 50
+
+
+class TestRelayoutFile(unittest.TestCase):
+
+    def setUp(self):
+        # Smooth data so that it compresses well:
+        self.data = np.cumsum(np.random.rand(num_x * num_y, num_bias), axis=1).astype(np.float32)
+        self.stack = np.random.randint(0, 100, size=(7, 9, 11)).astype(np.int16)
+        self.compound = np.zeros(100, dtype=[('amp', np.float32), ('phase', np.int16)])
+        self.compound['amp'] = np.arange(100)
+        with h5py.File(source_path, mode='w') as h5_f:
+            h5_chan = h5_f.create_group('Measurement_000/Channel_000')
+            h5_main = write_main_dataset(h5_chan, self.data, 'Raw_Data', 'Current', 'nA',
+                                         [Dimension('X', 'm', num_x), Dimension('Y', 'm', num_y)],
+                                         Dimension('Bias', 'V', np.linspace(-1, 1, num_bias)))
+            h5_main.attrs['labels'] = ['corner']
+            h5_main.attrs['corner'] = h5_main.regionref[2:5, 3:9]
+            h5_f['Measurement_000'].attrs['notes'] = 'relayout'
+            h5_f.attrs['sizes'] = np.arange(3)
+            h5_f['Soft_Link'] = h5py.SoftLink(main_path)
+            h5_f.create_dataset('Stack', data=self.stack)
+            h5_main.parent['Stack_Link'] = h5_f['Stack']
+            h5_f.create_dataset('Scalar', data=3.5)
+            h5_f.create_dataset('Compound', data=self.compound)
+            h5_f.create_dataset('Growing', data=np.arange(10), maxshape=(None,), chunks=(4,))
+            h5_f.create_dataset('Refs', data=[h5_main.ref, h5_f['Stack'].ref],
+                                dtype=h5py.special_dtype(ref=h5py.Reference))
+
+    def tearDown(self):
+        for file_path in [source_path, target_path]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def __check_copy(self, h5_f):
+        h5_main = USIDataset(h5_f[main_path])
+        self.assertTrue(np.array_equal(h5_main[()], self.data))
+        self.assertTrue(np.array_equal(h5_f[h5_main.attrs['corner']][h5_main.attrs['corner']],
+                                       self.data[2:5, 3:9]))
+        self.assertEqual(h5_main.h5_pos_inds.file, h5_f)
+        self.assertTrue(np.allclose(h5_main.get_spec_values('Bias'), np.linspace(-1, 1, num_bias)))
+        h5_spec_inds = h5_main.h5_spec_inds
+        self.assertTrue(np.array_equal(h5_spec_inds[h5_spec_inds.attrs['Bias']].ravel(), np.arange(num_bias)))
+        self.assertEqual(h5_f['Measurement_000'].attrs['notes'], 'relayout')
+        self.assertTrue(np.array_equal(h5_f.attrs['sizes'], np.arange(3)))
+        self.assertEqual(h5_f.get('Soft_Link', getlink=True).path, main_path)
+        self.assertEqual(h5_f['Measurement_000/Channel_000/Stack_Link'], h5_f['Stack'])
+        self.assertTrue(np.array_equal(h5_f['Stack'][()], self.stack))
+        self.assertEqual(h5_f['Scalar'][()], 3.5)
+        self.assertTrue(np.array_equal(h5_f['Compound'][()], self.compound))
+        self.assertEqual(h5_f['Growing'].maxshape, (None,))
+        self.assertTrue(np.array_equal(h5_f['Growing'][()], np.arange(10)))
+        self.assertEqual([h5_f[ref] for ref in h5_f['Refs'][()]], [h5_f[main_path], h5_f['Stack']])
+        return h5_main
+
+    def test_gzip(self):
+        reports = relayout_file(source_path, target_path, access='pixel', verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            h5_main = self.__check_copy(h5_f)
+            self.assertEqual(h5_main.chunks, plan_chunks(self.data.shape, self.data.dtype, 'pixel').chunks)
+            self.assertEqual(h5_main.compression, 'gzip')
+            self.assertTrue(h5_main.shuffle)
+            self.assertEqual(h5_f['Stack'].compression, 'gzip')
+        reports = {rep.name: rep for rep in reports}
+        self.assertEqual(reports[main_path].raw_bytes, self.data.nbytes)
+        self.assertGreater(reports[main_path].ratio, 1)
+        self.assertGreater(reports[main_path].mb_per_sec, 0)
+
+    def test_gzip_many_blocks(self):
+        # Edge chunks along all axes and several blocks per dataset:
+        # Chunks can be specified under any of the paths to a dataset:
+        relayout_file(source_path, target_path,
+                      access={main_path: (7, 9), '/Measurement_000/Channel_000/Stack_Link': (2, 4, 3)},
+                      compression_opts=9, shuffle=False, max_mem_mb=1E-3, verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            h5_main = self.__check_copy(h5_f)
+            self.assertEqual(h5_main.chunks, (7, 9))
+            self.assertEqual(h5_main.compression_opts, 9)
+            self.assertFalse(h5_main.shuffle)
+            self.assertEqual(h5_f['Stack'].chunks, (2, 4, 3))
+
+    def test_threaded_blocks(self):
+        # Workers are capped at the number of logical cores, so call the helper directly:
+        with h5py.File(source_path, mode='r') as h5_src, h5py.File(target_path, mode='w') as h5_f:
+            h5_dst = h5_f.create_dataset('Raw_Data', shape=self.data.shape, dtype=self.data.dtype, chunks=(7, 9),
+                                         compression='gzip', shuffle=True)
+            tasks = [(h5_src[main_path], h5_dst, start, min(start + 70, self.data.shape[0]), 4, True)
+                     for start in range(0, self.data.shape[0], 70)]
+            _ = list(relayout.gen_ordered_results(relayout._copy_block, tasks, cores=3))
+            self.assertTrue(np.array_equal(h5_dst[()], self.data))
+
+    def test_lzf(self):
+        relayout_file(source_path, target_path, compression='lzf', verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            h5_main = self.__check_copy(h5_f)
+            self.assertEqual(h5_main.compression, 'lzf')
+            self.assertEqual(h5_main.chunks, plan_chunks(self.data.shape, self.data.dtype, 'balanced').chunks)
+
+    def test_keep(self):
+        with h5py.File(source_path, mode='r+') as h5_f:
+            del h5_f['Stack']
+            h5_f.create_dataset('Stack', data=self.stack, chunks=(1, 9, 11), compression='gzip', compression_opts=2)
+            del h5_f['Measurement_000/Channel_000/Stack_Link']
+            h5_f['Measurement_000/Channel_000/Stack_Link'] = h5_f['Stack']
+            h5_f['Refs'][1] = h5_f['Stack'].ref
+            main_chunks = h5_f[main_path].chunks
+        relayout_file(source_path, target_path, access=None, compression='keep', verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            h5_main = self.__check_copy(h5_f)
+            self.assertEqual(h5_main.chunks, main_chunks)
+            self.assertIsNone(h5_main.compression)
+            self.assertEqual(h5_f['Stack'].chunks, (1, 9, 11))
+            self.assertEqual(h5_f['Stack'].compression_opts, 2)
+
+    def test_no_compression(self):
+        relayout_file(source_path, target_path, compression=None, verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            h5_main = self.__check_copy(h5_f)
+            self.assertIsNone(h5_main.compression)
+            self.assertIsNone(h5_f['Stack'].chunks)
+
+    def test_blosc(self):
+        try:
+            import hdf5plugin
+        except ImportError:
+            with self.assertRaises(ImportError):
+                relayout_file(source_path, target_path, compression='blosc', verbose=False)
+            return
+        relayout_file(source_path, target_path, compression='blosc', verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            self.__check_copy(h5_f)
+
+    def test_hard_links_to_small_datasets(self):
+        with h5py.File(source_path, mode='r+') as h5_f:
+            h5_f.create_dataset('Empty', data=h5py.Empty(np.float32))
+            h5_grp = h5_f.create_group('Links')
+            for name in ['Scalar', 'Empty', 'Refs']:
+                h5_grp[name] = h5_f[name]
+            # A group linked to under two names along with its members:
+            h5_f['Links_Alias'] = h5_grp
+        relayout_file(source_path, target_path, verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            self.__check_copy(h5_f)
+            for name in ['Scalar', 'Empty', 'Refs']:
+                self.assertEqual(h5_f['Links/' + name], h5_f[name])
+                self.assertEqual(h5_f['Links_Alias/' + name], h5_f[name])
+            self.assertEqual(h5_f['Links_Alias'], h5_f['Links'])
+            self.assertIsNone(h5_f['Links/Empty'].shape)
+            self.assertEqual([h5_f[ref] for ref in h5_f['Links/Refs'][()]], [h5_f[main_path], h5_f['Stack']])
+
+    def test_refs_to_small_datasets(self):
+        with h5py.File(source_path, mode='r+') as h5_f:
+            # Created before the datasets that they point to:
+            h5_f.create_dataset('Arefs', data=[h5_f['Scalar'].ref, h5_f['Refs'].ref],
+                                dtype=h5py.special_dtype(ref=h5py.Reference))
+            h5_f.create_dataset('Zscalar', data=7)
+            h5_f['Arefs'][0] = h5_f['Zscalar'].ref
+            h5_f.create_dataset('Aref', data=h5_f['Zscalar'].ref, dtype=h5py.special_dtype(ref=h5py.Reference))
+        relayout_file(source_path, target_path, verbose=False)
+        with h5py.File(target_path, mode='r') as h5_f:
+            self.__check_copy(h5_f)
+            self.assertEqual([h5_f[ref] for ref in h5_f['Arefs'][()]], [h5_f['Zscalar'], h5_f['Refs']])
+            self.assertEqual(h5_f[h5_f['Aref'][()]], h5_f['Zscalar'])
+            self.assertEqual(h5_f['Zscalar'][()], 7)
+
+    def test_guessed_chunks(self):
+        self.assertEqual(relayout._guess_chunks((7, 9, 11), 2), (7, 9, 11))
+        chunks = relayout._guess_chunks((10 ** 6, 3), 8)
+        self.assertLessEqual(int(np.prod(chunks)) * 8, relayout.DEFAULT_CHUNK_MEM)
+        self.assertEqual(chunks[1], 3)
+        self.assertEqual(relayout._guess_chunks((0, 5), 4), (1, 5))
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            relayout_file(source_path, target_path, compression='zip')
+        with self.assertRaises(ValueError):
+            relayout_file(source_path, target_path, access='random')
+        with self.assertRaises(TypeError):
+            relayout_file(source_path, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
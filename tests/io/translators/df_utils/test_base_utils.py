@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import threading
+import time
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../../../pycroscopy/")
+
+from pycroscopy.io.translators.df_utils.base_utils import gen_ordered_results, read_binary_data, \
+    follow_acquisition, get_rows_per_batch
+
+
+class TestGenOrderedResults(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = [(val, 2) for val in range(50)]
+        self.expected = [val ** 2 for val in range(50)]
+
+    def test_serial(self):
+        self.assertEqual(list(gen_ordered_results(pow, self.tasks)), self.expected)
+
+    def test_threads(self):
+        self.assertEqual(list(gen_ordered_results(pow, self.tasks, cores=3)), self.expected)
+
+    def test_processes(self):
+        self.assertEqual(list(gen_ordered_results(pow, self.tasks, cores=2, use_processes=True)), self.expected)
+
+    def test_bounded_submission(self):
+        submitted = list()
+        lock = threading.Lock()
+
+        def func(val):
+            with lock:
+                submitted.append(val)
+            return val
+
+        results = gen_ordered_results(func, [(val,) for val in range(20)], cores=2, max_pending=3)
+        for ind, val in enumerate(results):
+            self.assertEqual(val, ind)
+            # Tasks are only submitted as results are consumed:
+            self.assertLessEqual(len(submitted), ind + 4)
+        results.close()
+
+
+class TestGetRowsPerBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = 'test_rows_per_batch.h5'
+        self.h5_f = h5py.File(self.file_path, mode='w')
+        self.h5_chunked = self.h5_f.create_dataset('Chunked', shape=(100, 10), dtype=np.float32, chunks=(8, 10))
+        self.h5_contig = self.h5_f.create_dataset('Contiguous', shape=(100, 10), dtype=np.float32)
+
+    def tearDown(self):
+        self.h5_f.close()
+        os.remove(self.file_path)
+
+    def test_whole_chunks(self):
+        # 30 rows fit, trimmed to 3 rows of chunks:
+        self.assertEqual(get_rows_per_batch(self.h5_chunked, 40, 30 * 40), 24)
+        self.assertEqual(get_rows_per_batch(self.h5_contig, 40, 30 * 40), 30)
+
+    def test_smaller_than_chunk(self):
+        self.assertEqual(get_rows_per_batch(self.h5_chunked, 40, 5 * 40), 5)
+        self.assertEqual(get_rows_per_batch(self.h5_chunked, 40, 10), 1)
+
+    def test_num_rows(self):
+        self.assertEqual(get_rows_per_batch(self.h5_chunked, 40, 1E9), 100)
+        self.assertEqual(get_rows_per_batch(self.h5_chunked, 40, 1E9, num_rows=17), 17)
+        self.assertEqual(get_rows_per_batch(self.h5_chunked, 40, 1E9, num_rows=0), 1)
+
+
+class TestFollowAcquisition(unittest.TestCase):
+
+    def setUp(self):
+        self.start_time = time.time()
+        self.batches = list()
+
+    def count_complete(self):
+        # One unit is completed every 20 ms until 10 units are done:
+        return min(10, int((time.time() - self.start_time) / 0.02))
+
+    def write_batch(self, start, stop):
+        self.batches.append((start, stop))
+
+    def __check_batches(self, num_written):
+        self.assertEqual(self.batches[0][0], 0)
+        self.assertEqual(self.batches[-1][1], num_written)
+        for (_, prev_stop), (start, stop) in zip(self.batches[:-1], self.batches[1:]):
+            self.assertEqual(start, prev_stop)
+            self.assertLess(start, stop)
+
+    def test_complete(self):
+        num_written = follow_acquisition(self.count_complete, self.write_batch, 10, poll_interval=0.01, timeout=5)
+        self.assertEqual(num_written, 10)
+        self.assertGreater(len(self.batches), 1)
+        self.__check_batches(num_written)
+
+    def test_timeout(self):
+        start = time.time()
+        num_written = follow_acquisition(self.count_complete, self.write_batch, 20, poll_interval=0.01,
+                                         timeout=0.2)
+        self.assertEqual(num_written, 10)
+        self.assertLess(time.time() - start, 5)
+        self.__check_batches(num_written)
+
+    def test_nothing_recorded(self):
+        num_written = follow_acquisition(lambda: 0, self.write_batch, 10, poll_interval=0.01, timeout=0.05)
+        self.assertEqual(num_written, 0)
+        self.assertEqual(self.batches, [])
+
+
+class TestReadBinaryData(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = 'test_binary_data.bin'
+        self.header = b'header' * 3
+        self.shorts = np.arange(-20, 20, dtype='h')
+        self.floats = np.random.rand(15).astype('f')
+        with open(self.file_path, 'wb') as file_handle:
+            file_handle.write(self.header)
+            file_handle.write(self.shorts.tobytes())
+            file_handle.write(self.floats.tobytes())
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def __check(self, mmap):
+        shorts = read_binary_data(self.file_path, len(self.header), self.shorts.nbytes, 2, mmap=mmap)
+        floats = read_binary_data(self.file_path, len(self.header) + self.shorts.nbytes, self.floats.nbytes, 4,
+                                  mmap=mmap)
+        self.assertEqual(isinstance(floats, np.memmap), mmap)
+        self.assertTrue(np.array_equal(shorts, self.shorts))
+        self.assertTrue(np.array_equal(floats, self.floats))
+        # Lengths beyond the end of the file are truncated:
+        floats = read_binary_data(self.file_path, len(self.header) + self.shorts.nbytes, 2 * self.floats.nbytes, 4,
+                                  mmap=mmap)
+        self.assertTrue(np.array_equal(floats, self.floats))
+
+    def test_read(self):
+        self.__check(False)
+
+    def test_mmap(self):
+        self.__check(True)
+
+    def test_mmap_read_only(self):
+        shorts = read_binary_data(self.file_path, len(self.header), self.shorts.nbytes, 2, mmap=True)
+        with self.assertRaises(ValueError):
+            shorts[0] = 1
+
+    def test_invalid_precision(self):
+        with self.assertRaises(NotImplementedError):
+            _ = read_binary_data(self.file_path, 0, 16, 8, mmap=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
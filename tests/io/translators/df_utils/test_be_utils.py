@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../../../pycroscopy/")
+
+from pycroscopy.io.translators.df_utils.be_utils import BEHistogram
+
+file_path = 'test_be_utils.h5'
+num_pix, num_steps, num_bins = 9, 3, 5
+
+
+class TestBEHistogram(unittest.TestCase):
+
+    def setUp(self):
+        num_cols = num_steps * num_bins
+        self.data = (np.random.rand(num_pix, num_cols) + 1j * np.random.rand(num_pix, num_cols)).astype(np.complex64)
+        self.h5_f = h5py.File(file_path, mode='w')
+        self.h5_main = self.h5_f.create_dataset('Raw_Data', data=self.data)
+        aux_dsets = {'UDVS_Indices': np.repeat(np.arange(num_steps), num_bins),
+                     'Spectroscopic_Indices': np.vstack((np.tile(np.arange(num_bins), num_steps),
+                                                         np.repeat(np.arange(num_steps), num_bins))),
+                     'Bin_Frequencies': np.linspace(3E+5, 4E+5, num_bins)}
+        for name, data in aux_dsets.items():
+            self.h5_main.attrs[name] = self.h5_f.create_dataset(name, data=data).ref
+
+    def tearDown(self):
+        self.h5_f.close()
+        os.remove(file_path)
+
+    def test_plot_group_response_range(self):
+        # The range is set by the extrema of each spectral step over all pixels:
+        hist = BEHistogram()
+        _ = hist.buildPlotGroupHist(self.h5_main, np.arange(num_steps * num_bins), max_mem_mb=1E-3, cores=1)
+        max_resp = np.amax(np.abs(self.data), axis=0)
+        min_resp = np.amin(np.abs(self.data), axis=0)
+        self.assertTrue(np.isclose(hist.max_response, np.mean(max_resp) + 3 * np.std(max_resp)))
+        self.assertTrue(np.isclose(hist.min_response, np.mean(min_resp) - 3 * np.std(min_resp)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,11 +3,14 @@ Unit Test created by Christopher Smith on 7/17/18
 """
 from __future__ import division, print_function, unicode_literals, absolute_import
 import unittest
+import os
+import h5py
 import numpy as np
 import sys
 sys.path.append("../../../../pycroscopy/")
 
-from pycroscopy.io.translators.df_utils.image_utils import unnest_parm_dicts, try_tag_to_string, no_bin
+from pycroscopy.io.translators.df_utils.image_utils import unnest_parm_dicts, try_tag_to_string, no_bin, \
+    write_image_stack
 
 class TestImageUtils(unittest.TestCase):
 
@@ -53,4 +56,48 @@ class TestImageUtils(unittest.TestCase):
         test_strings = []
 
 
-        pass
\ No newline at end of file
+        pass
+
+
+def _get_image(stack, ind):
+    return stack[ind]
+
+
+class TestWriteImageStack(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = 'test_image_stack.h5'
+        self.stack = np.random.rand(11, 6, 5).astype(np.float32)
+        self.tasks = [(self.stack, ind) for ind in range(self.stack.shape[0])]
+
+    def tearDown(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def __check_stack(self, images_in_rows, chunks, **kwargs):
+        num_images, num_pixels = self.stack.shape[0], self.stack[0].size
+        shape = (num_images, num_pixels) if images_in_rows else (num_pixels, num_images)
+        with h5py.File(self.file_path, mode='w') as h5_f:
+            h5_main = h5_f.create_dataset('Raw_Data', shape=shape, dtype=np.float32, chunks=chunks)
+            h5_mean_spec = h5_f.create_dataset('Image_Means', data=np.zeros(num_images, dtype=np.float32))
+            h5_ronch = h5_f.create_dataset('Stack_Mean', data=np.zeros(num_pixels, dtype=np.float32))
+            write_image_stack(_get_image, self.tasks, h5_main, h5_mean_spec, h5_ronch,
+                              images_in_rows=images_in_rows, **kwargs)
+            flat = self.stack.reshape(num_images, -1)
+            self.assertTrue(np.allclose(h5_main[()], flat if images_in_rows else flat.T))
+            self.assertTrue(np.allclose(h5_mean_spec[()], flat.mean(axis=1)))
+            self.assertTrue(np.allclose(h5_ronch[()], flat.mean(axis=0)))
+
+    def test_rows_single_slab(self):
+        self.__check_stack(True, (2, 30))
+
+    def test_rows_many_slabs_threads(self):
+        # Only a few images fit in memory at a time:
+        self.__check_stack(True, (2, 30), cores=3, max_mem_mb=5E-4)
+
+    def test_columns_many_slabs(self):
+        self.__check_stack(False, (30, 3), cores=2, max_mem_mb=5E-4)
+
+    def test_processes(self):
+        self.__check_stack(True, (1, 30), cores=2, use_processes=True)
+
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.AR_hdf5 import ARhdf5
+
+file_path = 'test_ar_force_map.h5'
+out_name = 'test_ar_force_map_translated'
+num_cols, num_rows = 4, 3
+channels = ['Defl', 'ZSnsr']
+dwell_pts, ret_pts = 3, 7
+
+
+class TestARhdf5(unittest.TestCase):
+
+    def setUp(self):
+        self.out_path = out_name + '.h5'
+        for path in [file_path, self.out_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        ext_lengths = np.random.randint(10, 15, size=(num_cols, num_rows))
+        self.curves = dict()
+        str_dtype = h5py.special_dtype(vlen=str)
+        with h5py.File(file_path, mode='w') as h5_f:
+            h5_f.attrs['Note'] = '\n'.join(['ARDoIVPointsPerSec: 1000', 'FastScanSize: 1e-06',
+                                            'MicroscopeModel: MFP3D', 'Version: 16.1'])
+            h5_fmap = h5_f.create_group('ForceMap')
+            h5_fmap.attrs['Segments'] = np.array(['Ext', 'Dwell', 'Ret'], dtype=str_dtype)
+            h5_fmap.attrs['Channels'] = np.array(channels, dtype=str_dtype)
+            segments = np.stack([ext_lengths, ext_lengths + dwell_pts, ext_lengths + dwell_pts + ret_pts], axis=2)
+            h5_fmap.create_dataset('Segments', data=segments)
+            for column in range(num_cols):
+                for row in range(num_rows):
+                    curve = np.random.rand(len(channels), segments[column, row, -1] + 1).astype(np.float32)
+                    h5_fmap.create_dataset(str(column) + ':' + str(row), data=curve)
+                    self.curves[(column, row)] = curve[:, ext_lengths[column, row] - ext_lengths.min():]
+            h5_img = h5_f.create_group('Image')
+            self.height = np.random.rand(num_cols, num_rows)
+            h5_img.create_dataset('MapHeight', data=self.height)
+
+    def tearDown(self):
+        for path in [file_path, self.out_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __check_translation(self, max_mem_mb):
+        h5_path = ARhdf5(max_mem_mb=max_mem_mb).translate(file_path, out_name)
+        self.assertEqual(os.path.abspath(h5_path), os.path.abspath(self.out_path))
+        with h5py.File(h5_path, mode='r') as h5_f:
+            h5_meas = h5_f['Measurement_000']
+            for index, channel in enumerate(channels):
+                h5_raw = h5_meas['Channel_00{}/Raw_{}'.format(index, channel)]
+                # Positions are ordered with the columns varying fastest:
+                expected = np.array([self.curves[(column, row)][index] for row in range(num_rows)
+                                     for column in range(num_cols)])
+                self.assertEqual(h5_raw.dtype, np.float32)
+                self.assertEqual(h5_raw.shape, expected.shape)
+                self.assertTrue(np.array_equal(h5_raw[()], expected))
+                # Ancillary datasets are shared across channels:
+                self.assertEqual(h5_f[h5_raw.attrs['Position_Indices']],
+                                 h5_meas['Channel_000/Position_Indices'])
+                self.assertEqual(h5_f[h5_raw.attrs['Spectroscopic_Values']],
+                                 h5_meas['Channel_000/Spectroscopic_Values'])
+            self.assertNotIn('Position_Indices', h5_meas['Channel_001'])
+            h5_img = h5_meas['Channel_002/Img_MapHeight']
+            self.assertTrue(np.allclose(h5_img[()], self.height.reshape(-1, 1, order='F')))
+
+    def test_single_batch(self):
+        self.__check_translation(1024)
+
+    def test_many_batches(self):
+        self.__check_translation(1E-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
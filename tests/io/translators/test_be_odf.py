@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import shutil
+import time
+import warnings
+from multiprocessing import Process
+import h5py
+import numpy as np
+from scipy.io import savemat
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.be_odf import BEodfParser, BEodfTranslator
+
+num_pix, num_bins = 11, 24
+real_path, imag_path = 'test_be_odf_real.dat', 'test_be_odf_imag.dat'
+folder_path = 'test_be_odf_beps'
+# Out-of-field DC spectroscopy with 4 voltage steps, each with bins_per_step bins:
+num_rows, num_cols, bins_per_step, num_steps = 3, 4, 6, 4
+beps_parms = '''<File Parameters>
+date_and_time : 1:1:1
+<grid Parameters>
+num_rows : {}
+num_cols : {}
+<BE Parameters>
+phase_content : chirp-sinc hybrid
+amplitude_[V] : 1
+center_frequency_[Hz] : 350000
+band_width_[Hz] : 100000
+band_edge_trim : 0.1
+<VS Parameters>
+mode : DC modulation mode
+amplitude_[V] : 10
+offset_[V] : 0
+steps_per_full_cycle : {}
+number_of_cycles : 1
+cycle_fraction : full
+cycle_phase_shift : 0
+measure_in_field_loops : out-of-field
+<FORC Parameters>
+num_of_FORC_cycles : 1
+V_high1_[V] : 1
+V_high2_[V] : 1
+V_low1_[V] : -1
+V_low2_[V] : -1
+'''.format(num_rows, num_cols, num_steps)
+
+
+def _append_pixels(path_dict, data, start, stop):
+    # Mimics the acquisition software which appends each pixel to the real and imaginary data files:
+    for pix_ind in range(start, stop):
+        time.sleep(0.05)
+        for field, data_mat in data.items():
+            for part, vals in zip(['real', 'imag'], [data_mat.real, data_mat.imag]):
+                with open(path_dict[field + '_' + part], 'ab') as file_handle:
+                    file_handle.write(vals[pix_ind].astype(np.float32).tobytes())
+
+
+class TestBEodfParser(unittest.TestCase):
+
+    def setUp(self):
+        self.data = (np.random.rand(num_pix, num_bins) + 1j * np.random.rand(num_pix, num_bins)).astype(np.complex64)
+        self.data.real.astype(np.float32).tofile(real_path)
+        self.data.imag.astype(np.float32).tofile(imag_path)
+        self.parser = BEodfParser(real_path, imag_path, num_pix, num_bins * 4)
+
+    def tearDown(self):
+        self.parser.close()
+        for file_path in [real_path, imag_path]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def test_read_pixel(self):
+        for pix_ind in range(num_pix):
+            raw_vec = self.parser.read_pixel()
+            self.assertEqual(raw_vec.dtype, np.complex64)
+            self.assertTrue(np.array_equal(raw_vec, self.data[pix_ind]))
+        self.assertIsNone(self.parser.read_pixel())
+        self.parser.seek_to_pixel(4)
+        self.assertTrue(np.array_equal(self.parser.read_pixel(), self.data[4]))
+
+    def test_get_pixels(self):
+        real_mat, imag_mat = self.parser.get_pixels(3, 7)
+        self.assertIsInstance(real_mat, np.memmap)
+        self.assertTrue(np.array_equal(real_mat, self.data.real[3:7]))
+        self.assertTrue(np.array_equal(imag_mat, self.data.imag[3:7]))
+        with self.assertRaises(ValueError):
+            _ = self.parser.get_pixels(3, num_pix + 1)
+
+    def test_read_pixels_into_buffer(self):
+        buffer = np.zeros((num_pix + 2, num_bins), dtype=np.complex64)
+        ret_val = self.parser.read_pixels(2, 9, out=buffer[1:8])
+        self.assertTrue(np.shares_memory(ret_val, buffer))
+        self.assertTrue(np.array_equal(buffer[1:8], self.data[2:9]))
+        self.assertFalse(np.any(buffer[0]))
+        with self.assertRaises(ValueError):
+            _ = self.parser.read_pixels(2, 9, out=np.zeros((7, num_bins), dtype=np.complex128))
+
+    def test_read_all_data(self):
+        raw_vec = self.parser.read_all_data()
+        self.assertEqual(raw_vec.dtype, np.complex64)
+        self.assertTrue(np.array_equal(raw_vec, self.data.ravel()))
+
+    def test_refresh(self):
+        short_paths = ['short_' + real_path, 'short_' + imag_path]
+        for file_path in short_paths:
+            open(file_path, 'wb').close()
+        parser = BEodfParser(short_paths[0], short_paths[1], num_pix, num_bins * 4)
+        self.assertEqual(parser.num_complete_pixels, 0)
+        for file_path, vals in zip(short_paths, [self.data.real, self.data.imag]):
+            with open(file_path, 'ab') as file_handle:
+                # Including part of a value:
+                file_handle.write(vals[:3].astype(np.float32).tobytes() + b'\x00\x01')
+        parser.refresh()
+        self.assertEqual(parser.num_complete_pixels, 3)
+        real_mat, imag_mat = parser.get_pixels(0, 3)
+        self.assertTrue(np.array_equal(real_mat, self.data.real[:3]))
+        parser.close()
+        del parser, real_mat, imag_mat
+        for file_path in short_paths:
+            os.remove(file_path)
+
+    def test_incomplete_files(self):
+        short_paths = ['short_' + real_path, 'short_' + imag_path]
+        self.data.real.astype(np.float32).ravel()[:-5].tofile(short_paths[0])
+        self.data.imag.astype(np.float32).ravel()[:-5].tofile(short_paths[1])
+        parser = BEodfParser(short_paths[0], short_paths[1], num_pix, num_bins * 4)
+        self.assertEqual(parser.num_complete_pixels, num_pix - 1)
+        buffer = np.zeros(num_pix * num_bins, dtype=np.complex64)
+        raw_vec = parser.read_all_data(out=buffer)
+        self.assertEqual(raw_vec.size, num_pix * num_bins - 5)
+        self.assertTrue(np.array_equal(buffer[:-5], self.data.ravel()[:-5]))
+        parser.close()
+        del parser, raw_vec
+        for file_path in short_paths:
+            os.remove(file_path)
+
+
+class TestReadBEPSData(unittest.TestCase):
+
+    def setUp(self):
+        self.h5_path = 'test_be_odf.h5'
+        self.path_dict = dict()
+        self.data = dict()
+        for field in ['write', 'read']:
+            data = (np.random.rand(num_pix, num_bins) + 1j * np.random.rand(num_pix, num_bins)).astype(np.complex64)
+            self.data[field] = data
+            for part, vals in zip(['real', 'imag'], [data.real, data.imag]):
+                file_path = 'test_be_odf_{}_{}.dat'.format(field, part)
+                vals.astype(np.float32).tofile(file_path)
+                self.path_dict[field + '_' + part] = file_path
+
+    def tearDown(self):
+        for file_path in list(self.path_dict.values()) + [self.h5_path]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def __read(self, mode, tot_bins, add_pixel=False, **kwargs):
+        tran = BEodfTranslator(max_mem_mb=5E-3, num_rand_spectra=4, cores=1, **kwargs)
+        with h5py.File(self.h5_path, mode='w') as h5_f:
+            tran.h5_raw = h5_f.create_dataset('Raw_Data', shape=(num_pix + int(add_pixel), tot_bins),
+                                              dtype=np.complex64, chunks=(2, tot_bins))
+            tran._BEodfTranslator__read_beps_data(self.path_dict, 4, mode, add_pixel=add_pixel)
+            raw_mat = tran.h5_raw[()]
+        return tran, raw_mat
+
+    def __follow(self, mode, tot_bins, stop_pix, timeout):
+        # Only the first two pixels have been recorded when the translation starts:
+        fields = ['write'] if mode == 'in-field' else ['write', 'read']
+        data = {field: self.data[field] for field in fields}
+        for field, data_mat in data.items():
+            for part, vals in zip(['real', 'imag'], [data_mat.real, data_mat.imag]):
+                vals[:2].astype(np.float32).tofile(self.path_dict[field + '_' + part])
+        # The instrument writes from a separate process:
+        writer = Process(target=_append_pixels, args=(self.path_dict, data, 2, stop_pix))
+        writer.start()
+        tran = BEodfTranslator(max_mem_mb=5E-3, num_rand_spectra=4, cores=1)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with h5py.File(self.h5_path, mode='w') as h5_f:
+                tran.h5_raw = h5_f.create_dataset('Raw_Data', shape=(num_pix, tot_bins), dtype=np.complex64,
+                                                  chunks=(2, tot_bins))
+                tran._BEodfTranslator__follow_data(self.path_dict, 4, mode, poll_interval=0.01, timeout=timeout)
+                raw_mat = tran.h5_raw[()]
+                self.assertEqual(tran.h5_raw.attrs['last_pixel'], stop_pix)
+        writer.join()
+        return tran, raw_mat, [str(w.message) for w in caught]
+
+    def __check(self, tran, raw_mat, expected):
+        # The data may or may not have been conjugated
+        if not np.array_equal(raw_mat[:num_pix], expected):
+            expected = np.conjugate(expected)
+        self.assertTrue(np.array_equal(raw_mat[:num_pix], expected))
+        self.assertTrue(np.allclose(tran.max_resp[:num_pix], np.max(np.abs(expected), axis=1)))
+        self.assertTrue(np.allclose(tran.min_resp[:num_pix], np.min(np.abs(expected), axis=1)))
+        self.assertTrue(np.allclose(np.abs(tran.mean_resp), np.abs(np.mean(expected, axis=0))))
+
+    def test_in_field(self):
+        tran, raw_mat = self.__read('in-field', num_bins)
+        self.__check(tran, raw_mat, self.data['write'])
+
+    def test_follow(self):
+        tran, raw_mat, messages = self.__follow('in-field', num_bins, num_pix, 5)
+        self.assertEqual([msg for msg in messages if msg.startswith('Acquisition stopped')], [])
+        self.__check(tran, raw_mat, self.data['write'])
+
+    def test_follow_stopped(self):
+        stop_pix = 5
+        tran, raw_mat, messages = self.__follow('in and out-of-field', 2 * num_bins, stop_pix, 0.5)
+        self.assertIn('Acquisition stopped after {} of {} pixels'.format(stop_pix, num_pix), messages)
+        step_size = num_bins // 2
+        expected = np.zeros((stop_pix, 2 * num_bins), dtype=np.complex64)
+        for pix_ind in range(stop_pix):
+            raw_3d = expected[pix_ind].reshape(4, step_size)
+            raw_3d[0::2] = self.data['write'][pix_ind].reshape(2, step_size)
+            raw_3d[1::2] = self.data['read'][pix_ind].reshape(2, step_size)
+        if not np.array_equal(raw_mat[:stop_pix], expected):
+            expected = np.conjugate(expected)
+        self.assertTrue(np.array_equal(raw_mat[:stop_pix], expected))
+        self.assertFalse(np.any(raw_mat[stop_pix:]))
+        self.assertTrue(np.allclose(tran.max_resp[:stop_pix], np.max(np.abs(expected), axis=1)))
+        self.assertTrue(np.allclose(np.abs(tran.mean_resp), np.abs(np.mean(expected, axis=0))))
+
+    def test_in_and_out_of_field(self):
+        # Per-pixel interleaving of UDVS steps as done previously:
+        expected = np.zeros((num_pix, 2 * num_bins), dtype=np.complex64)
+        step_size = num_bins // 2
+        for pix_ind in range(num_pix):
+            raw_mat = np.empty((4, step_size), dtype=np.complex64)
+            raw_mat[0::2] = self.data['write'][pix_ind].reshape(2, step_size)
+            raw_mat[1::2] = self.data['read'][pix_ind].reshape(2, step_size)
+            expected[pix_ind] = raw_mat.ravel()
+        for background in [False, True]:
+            tran, raw_mat = self.__read('in and out-of-field', 2 * num_bins, add_pixel=True,
+                                        write_in_background=background)
+            self.__check(tran, raw_mat, expected)
+            self.assertFalse(np.any(raw_mat[-1]))
+
+
+class TestTranslate(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        self.parm_path = os.path.join(folder_path, folder_path + '_parm.txt')
+        with open(self.parm_path, 'w') as file_handle:
+            file_handle.write(beps_parms)
+        fft_be_wave = np.fft.fftshift(np.fft.fft(np.sin(np.linspace(0, 20 * np.pi, 64))))
+        savemat(os.path.join(folder_path, folder_path + '_more_parms.mat'),
+                {'BE_bin_ind': np.arange(20, 20 + bins_per_step) + 1,
+                 'BE_bin_w': np.linspace(3E+5, 4E+5, bins_per_step), 'FFT_BE_wave': fft_be_wave})
+        shape = (num_rows * num_cols, num_steps * bins_per_step)
+        self.data = {'read': (np.random.rand(*shape) + 1j * np.random.rand(*shape)).astype(np.complex64)}
+        self.path_dict = {'read_' + part: os.path.join(folder_path, folder_path + '_read_{}.dat'.format(part))
+                          for part in ['real', 'imag']}
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+
+    def __translate(self, **kwargs):
+        tran = BEodfTranslator(num_rand_spectra=4, cores=1)
+        h5_path = tran.translate(self.parm_path, show_plots=False, save_plots=False, **kwargs)
+        with h5py.File(h5_path, mode='r') as h5_f:
+            h5_chan = h5_f['Measurement_000/Channel_000']
+            datasets = {name: h5_chan[name][()] for name in ['Raw_Data', 'Spectroscopic_Values', 'UDVS']}
+            datasets['last_pixel'] = h5_chan['Raw_Data'].attrs.get('last_pixel')
+        os.remove(h5_path)
+        return datasets
+
+    def test_follow_matches_finished_files(self):
+        data_mat = self.data['read']
+        for part, vals in zip(['real', 'imag'], [data_mat.real, data_mat.imag]):
+            vals.tofile(self.path_dict['read_' + part])
+        expected = self.__translate()
+        # The size of Raw_Data was inferred from the size of the finished data files:
+        self.assertEqual(expected['Raw_Data'].shape, data_mat.shape)
+        self.assertIsNone(expected['last_pixel'])
+
+        # Only the first two pixels have been recorded when the translation starts:
+        for part, vals in zip(['real', 'imag'], [data_mat.real, data_mat.imag]):
+            vals[:2].tofile(self.path_dict['read_' + part])
+        writer = Process(target=_append_pixels, args=(self.path_dict, self.data, 2, data_mat.shape[0]))
+        writer.start()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            followed = self.__translate(follow=True, poll_interval=0.01, timeout=5)
+        writer.join()
+        self.assertEqual([str(w.message) for w in caught if str(w.message).startswith('Acquisition stopped')], [])
+
+        # Here, the size of Raw_Data was derived from the parameters instead:
+        self.assertEqual(followed['Raw_Data'].shape, data_mat.shape)
+        self.assertEqual(followed['last_pixel'], data_mat.shape[0])
+        for name in ['Spectroscopic_Values', 'UDVS']:
+            self.assertTrue(np.array_equal(followed[name], expected[name], equal_nan=True))
+        # Whether or not the data is conjugated is decided from randomly chosen spectra:
+        for raw_mat in [expected['Raw_Data'], followed['Raw_Data']]:
+            self.assertTrue(np.array_equal(raw_mat, data_mat) or np.array_equal(raw_mat, np.conjugate(data_mat)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import time
+import warnings
+from multiprocessing import Process
+import numpy as np
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.beps_ndf import BEPSndfParser, BEPSndfTranslator, _index_ndf_pixels, _iter_ndf_pixels
+
+file_path = 'test_beps_ndf_1_1.dat'
+num_rows, num_cols = 3, 4
+
+
+def make_ndf_pixel(pix_ind, num_bins, num_steps):
+    """
+    Builds the float32 stream of a single pixel in the BEPS new data format
+    """
+    s3, s4 = 8, 3
+    s1, s2 = s3 + 2 * num_bins, s4 + num_steps
+    data_mat = np.zeros((s1, s2), dtype=np.float32)
+    data_mat[0, :2] = [s1, s2]
+    data_mat[1, :2] = [2 * num_bins, num_steps]
+    data_mat[2, :3] = [1, 1, 0]
+    data_mat[3] = [num_rows, pix_ind // num_cols + 1, pix_ind // num_cols] + [0] * num_steps
+    data_mat[4] = [num_cols, pix_ind % num_cols + 1, pix_ind % num_cols] + [0] * num_steps
+    data_mat[5, :3] = [1, 1, 0]
+    # Excitation waveform - real and imaginary halves in column 1:
+    data_mat[s3: s3 + num_bins, 1] = 1
+    data_mat[s3: s3 + 2 * num_bins, 2] = np.arange(2 * num_bins)
+    data_mat[0, s4:] = np.arange(num_steps)
+    data_mat[s3:, s4:] = np.random.rand(2 * num_bins, num_steps)
+    return np.hstack([[s1 * s2 + 2, pix_ind + 1], data_mat.ravel()]).astype(np.float32)
+
+
+def _append_pixels(pixels):
+    # Mimics the acquisition software which appends each pixel to the file, a part at a time:
+    for pixel in pixels:
+        time.sleep(0.05)
+        with open(file_path, 'ab') as file_handle:
+            file_handle.write(pixel[:5].tobytes())
+            file_handle.flush()
+            time.sleep(0.01)
+            file_handle.write(pixel[5:].tobytes())
+
+
+class TestBEPSndfParser(unittest.TestCase):
+
+    def setUp(self):
+        # Pixels change length (number of UDVS steps) part way through the file:
+        self.pixels = [make_ndf_pixel(ind, 4, 5 if ind < 7 else 6) for ind in range(num_rows * num_cols)]
+        np.hstack(self.pixels).tofile(file_path)
+
+    def tearDown(self):
+        for item in [file_path, file_path + '.pix_index.npz']:
+            if os.path.exists(item):
+                os.remove(item)
+
+    def test_index(self):
+        offsets, lengths = _index_ndf_pixels(np.hstack(self.pixels), max_run=3)
+        self.assertTrue(np.array_equal(lengths, [pix.size for pix in self.pixels]))
+        self.assertTrue(np.array_equal(offsets, np.cumsum([0] + [pix.size for pix in self.pixels[:-1]])))
+
+    def test_incomplete_last_pixel(self):
+        data_vec = np.hstack(self.pixels)[:-3]
+        offsets, lengths = _index_ndf_pixels(data_vec)
+        self.assertEqual(offsets.size, len(self.pixels) - 1)
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            _ = _index_ndf_pixels(np.hstack([[-1], self.pixels[0]]).astype(np.float32))
+
+    def test_scout_and_random_access(self):
+        parser = BEPSndfParser(file_path)
+        self.assertEqual(parser.get_num_pixels(), len(self.pixels))
+        self.assertEqual(parser.get_spatial_pixels(), (1, 1, num_cols, num_rows))
+        pix = parser.get_pixel(9)
+        self.assertEqual(pix.spatial_index, 9)
+        self.assertEqual(pix.num_steps, 6)
+        parser.seek_to_pixel(8)
+        self.assertEqual(parser.read_pixel().spatial_index, 8)
+
+    def test_sidecar_cache(self):
+        parser = BEPSndfParser(file_path)
+        self.assertTrue(os.path.exists(file_path + '.pix_index.npz'))
+        offsets = parser.get_pixel_offsets()[0]
+        self.assertTrue(np.array_equal(BEPSndfParser(file_path).get_pixel_offsets()[0], offsets))
+        del parser
+        # A modified file must be indexed again:
+        np.hstack(self.pixels + [make_ndf_pixel(len(self.pixels), 4, 6)]).tofile(file_path)
+        os.utime(file_path, (0, 12345))
+        self.assertEqual(BEPSndfParser(file_path, scout=False).get_num_pixels(), len(self.pixels) + 1)
+
+    def test_refresh(self):
+        # Only two pixels and part of the third have been recorded when the file is opened:
+        np.hstack(self.pixels[:2] + [self.pixels[2][:7]]).tofile(file_path)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            parser = BEPSndfParser(file_path, scout=False, use_cache=False)
+            self.assertEqual(parser.get_num_pixels(), 2)
+            # The instrument writes from a separate process:
+            writer = Process(target=_append_pixels, args=([self.pixels[2][7:]] + self.pixels[3:],))
+            writer.start()
+            start_time = time.time()
+            while parser.get_num_pixels() < len(self.pixels) and time.time() - start_time < 10:
+                time.sleep(0.01)
+                parser.refresh()
+            writer.join()
+        self.assertEqual([str(w.message) for w in caught], [])
+        expected = _index_ndf_pixels(np.hstack(self.pixels))
+        for found, exp in zip(parser.get_pixel_offsets(), expected):
+            self.assertTrue(np.array_equal(found, exp))
+        self.assertEqual(parser.get_pixel(len(self.pixels) - 1).spatial_index, len(self.pixels) - 1)
+
+    def test_parallel_parsing(self):
+        parser = BEPSndfParser(file_path, use_cache=False)
+        self.assertFalse(os.path.exists(file_path + '.pix_index.npz'))
+        for cores in [1, 2]:
+            pixels = list(_iter_ndf_pixels([parser], [None], cores=cores, pix_per_task=5))
+            self.assertEqual([pix[1].spatial_index for pix in pixels], list(range(len(self.pixels))))
+            for pix_ind, pix in enumerate(pixels):
+                expected = parser.get_pixel(pix_ind)
+                self.assertTrue(np.allclose(pix[1].spectrogram_vec, expected.spectrogram_vec))
+
+    def test_missing_pixels(self):
+        # The file of the second wave type holds none of the pixels expected from the first:
+        short_path = file_path.replace('_1_1', '_1_2')
+        open(short_path, 'wb').close()
+        parsers = [BEPSndfParser(file_path, use_cache=False),
+                   BEPSndfParser(short_path, wave_type=-1, scout=False, use_cache=False)]
+        tran = BEPSndfTranslator(cores=1)
+        tran.parm_dict = {'VS_mode': 'DC modulation mode'}
+        tran.max_pixels = parsers[0].get_num_pixels()
+        try:
+            with self.assertRaises(ValueError) as context:
+                tran._read_data(parsers, np.array([1, -1]), False, False, False)
+            self.assertIn('only contain 0 of the {} pixels'.format(len(self.pixels)), str(context.exception))
+        finally:
+            os.remove(short_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.bruker_afm import BrukerAFMTranslator
+
+file_path = 'test_bruker.001'
+h5_path = 'test_bruker_001.h5'
+samps_per_line, num_lines = 3, 2
+trace_pts, retrace_pts = 4, 5
+header_size = 2048
+
+
+class TestBrukerAFMTranslator(unittest.TestCase):
+
+    def setUp(self):
+        for path in [file_path, h5_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        self.image = np.random.rand(num_lines, samps_per_line).astype('f')
+        num_pos = num_lines * samps_per_line
+        self.force_map = np.random.randint(-2 ** 15, 2 ** 15, size=(num_pos, trace_pts + retrace_pts)).astype('h')
+        lines = ['\\*File list', '\\Version: 0x09200201',
+                 '\\*Ciao image list', '\\Data offset: {}'.format(header_size),
+                 '\\Data length: {}'.format(self.image.nbytes), '\\Bytes/pixel: 4',
+                 '\\Samps/line: {}'.format(samps_per_line), '\\Number of lines: {}'.format(num_lines),
+                 '\\@2:Image Data: S [Height] "Height"',
+                 '\\*Ciao force image list', '\\Data offset: {}'.format(header_size + self.image.nbytes),
+                 '\\Data length: {}'.format(self.force_map.nbytes), '\\Bytes/pixel: 2',
+                 '\\Samps/line: {} {}'.format(trace_pts, retrace_pts),
+                 '\\@4:Image Data: S [DeflectionError] "Deflection Error"',
+                 '\\*File list end']
+        header = ('\r\n'.join(lines) + '\r\n').encode('utf-8')
+        with open(file_path, 'wb') as file_handle:
+            file_handle.write(header + b'\x00' * (header_size - len(header)))
+            file_handle.write(self.image.tobytes())
+            file_handle.write(self.force_map.tobytes())
+
+    def tearDown(self):
+        for path in [file_path, h5_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __check_force_map(self, max_mem_mb):
+        out_path = BrukerAFMTranslator(max_mem_mb=max_mem_mb).translate(file_path)
+        self.assertEqual(out_path, h5_path)
+        with h5py.File(out_path, mode='r') as h5_f:
+            self.assertEqual(h5_f.attrs['data_type'], 'Bruker_AFM_Force_Map')
+            h5_img = h5_f['Measurement_000/Channel_000/Raw_Data']
+            self.assertTrue(np.allclose(h5_img[()], self.image.reshape(-1, 1)))
+            h5_force = h5_f['Measurement_000/Channel_001/Raw_Data']
+            self.assertEqual(h5_force.dtype, np.float32)
+            self.assertTrue(np.array_equal(h5_force[()], np.float32(self.force_map)))
+
+    def test_force_map_single_block(self):
+        self.__check_force_map(1024)
+
+    def test_force_map_many_blocks(self):
+        self.__check_force_map(2 * (trace_pts + retrace_pts) * 6 / 1024 ** 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import shutil
+import time
+from multiprocessing import Process
+import warnings
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators import gmode_iv
+from pycroscopy.io.translators.gmode_iv import GIVTranslator
+
+folder_path = 'test_giv'
+num_lines, num_chans = 6, 2
+samp_rate, frequency = 1000, 100
+# 5 cycles of the excitation plus 3 extra points:
+line_pts = 53
+missing_line = 4
+
+
+def _record_lines(line_paths, temp_paths):
+    # Mimics the acquisition software which saves one file per line:
+    for line_path, temp_path in zip(line_paths, temp_paths):
+        time.sleep(0.05)
+        os.rename(temp_path, line_path)
+
+
+class TestGIVTranslator(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        self.parm_path = os.path.join(folder_path, 'parms.mat')
+        with h5py.File(self.parm_path, mode='w') as h5_f:
+            for key, val in {'samp_rate': samp_rate, 'amp_gain': 9, 'frequency': frequency, 'line_time': 0.053,
+                             'num_lines': num_lines, 'scan_height': 1E-6, 'scan_width': 1E-6,
+                             'scan_speed': 1E-6}.items():
+                h5_f.create_dataset(key, data=[[val]])
+            h5_f.create_dataset('excit_wfm', data=np.sin(np.linspace(0, 10 * np.pi, line_pts))[np.newaxis])
+        self.expected = np.zeros((num_chans, num_lines, line_pts - 3), dtype=np.float16)
+        for line_ind in range(num_lines):
+            if line_ind + 1 == missing_line:
+                continue
+            data = np.random.rand(line_pts, num_chans)
+            with h5py.File(os.path.join(folder_path, 'line_{}.mat'.format(line_ind + 1)), mode='w') as h5_f:
+                h5_f.create_dataset('data', data=data)
+            self.expected[:, line_ind] = data[:-3].T
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+
+    def __check_translation(self, **kwargs):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            h5_path = GIVTranslator(**kwargs).translate(self.parm_path)
+        self.assertIn('File not found for: line {}'.format(missing_line - 1), [str(w.message) for w in caught])
+        with h5py.File(h5_path, mode='r') as h5_f:
+            for chan in range(num_chans):
+                h5_main = h5_f['Measurement_000/Channel_00{}/Raw_Data'.format(chan)]
+                self.assertEqual(h5_main.dtype, np.float16)
+                self.assertTrue(np.array_equal(h5_main[()], self.expected[chan]))
+                # Only written when following an acquisition:
+                self.assertNotIn('last_pixel', h5_main.attrs)
+
+    def test_single_batch(self):
+        self.__check_translation()
+
+    def test_many_batches(self):
+        self.__check_translation(max_mem_mb=4 * num_chans * (line_pts - 3) * 2 / 1024 ** 2)
+
+    def test_threaded_reads(self):
+        # Workers are capped at the number of logical cores, so call the helper directly:
+        tasks = [(os.path.join(folder_path, 'line_{}.mat'.format(line_ind + 1)), slice(0, -3), num_chans,
+                  line_pts - 3) for line_ind in range(num_lines)]
+        lines = list(gmode_iv.gen_ordered_results(gmode_iv._read_line_file, tasks, cores=3))
+        self.assertIsNone(lines[missing_line - 1][0])
+        for line_ind, (line_data, _) in enumerate(lines):
+            if line_data is not None:
+                self.assertTrue(np.array_equal(line_data, self.expected[:, line_ind]))
+
+    def __follow_translation(self, stop_line, timeout):
+        # Only the first line has been recorded when the translation starts:
+        line_paths = [os.path.join(folder_path, 'line_{}.mat'.format(line_ind + 1)) for line_ind in range(num_lines)]
+        temp_paths = [line_path + '.tmp' for line_path in line_paths]
+        for line_path, temp_path in zip(line_paths[1:], temp_paths[1:]):
+            if os.path.exists(line_path):
+                os.rename(line_path, temp_path)
+        # The missing line is recorded late so that the lines after it are not written yet:
+        self.expected[:, missing_line - 1] = self.expected[:, 0]
+        shutil.copy(line_paths[0], temp_paths[missing_line - 1])
+
+        # The instrument writes from a separate process:
+        writer = Process(target=_record_lines, args=(line_paths[1:stop_line], temp_paths[1:stop_line]))
+        writer.start()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            h5_path = GIVTranslator().translate(self.parm_path, follow=True, poll_interval=0.01, timeout=timeout)
+        writer.join()
+        with h5py.File(h5_path, mode='r') as h5_f:
+            for chan in range(num_chans):
+                h5_main = h5_f['Measurement_000/Channel_00{}/Raw_Data'.format(chan)]
+                self.assertEqual(h5_main.shape, self.expected[chan].shape)
+                self.assertEqual(h5_main.attrs['last_pixel'], stop_line)
+                self.assertTrue(np.array_equal(h5_main[:stop_line], self.expected[chan, :stop_line]))
+        return [str(w.message) for w in caught]
+
+    def test_follow(self):
+        messages = self.__follow_translation(num_lines, 5)
+        self.assertEqual([msg for msg in messages if msg.startswith('Acquisition stopped')], [])
+
+    def test_follow_stopped(self):
+        messages = self.__follow_translation(missing_line + 1, 0.5)
+        self.assertIn('Acquisition stopped after {} of {} lines'.format(missing_line + 1, num_lines), messages)
+
+    def test_wrong_channels(self):
+        _, message = gmode_iv._read_line_file(os.path.join(folder_path, 'line_1.mat'), slice(0, -3),
+                                              num_chans + 1, line_pts - 3)
+        self.assertEqual(message, 'No data found for Line ')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import shutil
+import time
+from multiprocessing import Process
+import warnings
+import h5py
+import numpy as np
+from scipy.io import savemat
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.gmode_line import GLineTranslator
+
+folder_path = 'test_gline'
+num_rows, num_cols, pts_per_pix = 7, 5, 16
+
+
+def _append_rows(data_mats, stop_row):
+    # Mimics the acquisition software which appends each line to the data files of all channels:
+    for row_ind in range(stop_row):
+        time.sleep(0.05)
+        for chan, data_mat in enumerate(data_mats):
+            data_path = os.path.join(folder_path, folder_path + '_bigtime_0{}.dat'.format(chan))
+            with open(data_path, 'ab') as file_handle:
+                file_handle.write(data_mat[row_ind].tobytes())
+
+
+class TestGLineTranslator(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        be_wave = np.sin(np.linspace(0, 2 * np.pi, pts_per_pix))
+        savemat(os.path.join(folder_path, folder_path + '_all.mat'),
+                {'BE_wave': be_wave, 'FFT_BE_wave': np.fft.fft(be_wave), 'total_cols': num_cols,
+                 'total_rows': num_rows})
+        with open(os.path.join(folder_path, folder_path + '_parms.txt'), 'w') as file_handle:
+            file_handle.write('<IO>\nIO rate : 4 MHz\n<BE>\ncenter frequency [Hz] : 350000\n')
+        self.data = list()
+        for chan in range(2):
+            data_mat = np.random.rand(num_rows, num_cols * pts_per_pix).astype(np.float32)
+            data_mat.tofile(os.path.join(folder_path, folder_path + '_bigtime_0{}.dat'.format(chan)))
+            self.data.append(data_mat)
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+
+    def __check_translation(self, max_mem_mb):
+        translator = GLineTranslator(max_mem_mb=max_mem_mb)
+        h5_path = translator.translate(os.path.join(folder_path, folder_path + '_parms.txt'))
+        with h5py.File(h5_path, mode='r') as h5_f:
+            # Channels are created in the order in which the data files are listed in the folder:
+            found = list()
+            for chan in range(len(self.data)):
+                h5_main = h5_f['Measurement_000/Channel_00{}/Raw_Data'.format(chan)]
+                self.assertEqual(h5_main.dtype, np.float16)
+                # Only written when following an acquisition:
+                self.assertNotIn('last_pixel', h5_main.attrs)
+                found += [ind for ind, data_mat in enumerate(self.data)
+                          if np.array_equal(h5_main[()], data_mat.astype(np.float16))]
+            self.assertEqual(sorted(found), list(range(len(self.data))))
+
+    def test_single_block(self):
+        self.__check_translation(1024)
+
+    def test_many_blocks(self):
+        # Only a couple of rows fit in memory at a time:
+        self.__check_translation(2E-3)
+
+    def __follow_translation(self, stop_row, timeout):
+        for chan in range(len(self.data)):
+            open(os.path.join(folder_path, folder_path + '_bigtime_0{}.dat'.format(chan)), 'wb').close()
+        # The instrument writes from a separate process:
+        writer = Process(target=_append_rows, args=(self.data, stop_row))
+        writer.start()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            h5_path = GLineTranslator().translate(os.path.join(folder_path, folder_path + '_parms.txt'), follow=True,
+                                                  poll_interval=0.01, timeout=timeout)
+        writer.join()
+        with h5py.File(h5_path, mode='r') as h5_f:
+            for chan in range(len(self.data)):
+                h5_main = h5_f['Measurement_000/Channel_00{}/Raw_Data'.format(chan)]
+                self.assertEqual(h5_main.shape, (num_rows, num_cols * pts_per_pix))
+                self.assertEqual(h5_main.attrs['last_pixel'], stop_row)
+                found = [np.array_equal(h5_main[:stop_row], data_mat[:stop_row].astype(np.float16))
+                         for data_mat in self.data]
+                self.assertTrue(any(found))
+        return [str(w.message) for w in caught]
+
+    def test_follow(self):
+        messages = self.__follow_translation(num_rows, 5)
+        self.assertEqual([msg for msg in messages if msg.startswith('Acquisition stopped')], [])
+
+    def test_follow_stopped(self):
+        messages = self.__follow_translation(3, 0.5)
+        self.assertIn('Acquisition stopped after 3 of {} lines'.format(num_rows), messages)
+
+    def test_read_data_block_alignment(self):
+        data_path = os.path.join(folder_path, folder_path + '_bigtime_00.dat')
+        translator = GLineTranslator(max_mem_mb=1E-3)
+        translator.num_rows = num_rows
+        translator.__bytes_per_row__ = 4 * num_cols * pts_per_pix
+        with h5py.File(os.path.join(folder_path, 'test.h5'), mode='w') as h5_f:
+            h5_dset = h5_f.create_dataset('Raw_Data', shape=(num_rows, num_cols * pts_per_pix), dtype=np.float16,
+                                          chunks=(3, pts_per_pix))
+            translator._read_data(data_path, h5_dset)
+            self.assertTrue(np.array_equal(h5_dset[()], self.data[0].astype(np.float16)))
+
+
+if __name__ == '__main__':
+    unittest.main()
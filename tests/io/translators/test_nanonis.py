@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.nanonis import NanonisTranslatorCorrect
+from pycroscopy.io.translators.df_utils.nanonispy.read import Grid
+
+file_path = 'test_nanonis_grid.3ds'
+h5_path = 'test_nanonis_grid.h5'
+# The translator only handles square grids
+nx, ny, num_sweep = 3, 3, 8
+param_names = ['Sweep Start', 'Sweep End', 'X (m)', 'Y (m)', 'Z (m)']
+channels = ['Current (A)', 'Current [bwd] (A)', 'Z (m)']
+
+
+class TestNanonisGrid(unittest.TestCase):
+
+    def setUp(self):
+        for path in [file_path, h5_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        header = {'Grid dim': '"{} x {}"'.format(nx, ny), 'Grid settings': '0;0;1E-8;1E-8;0',
+                  'Sweep Signal': '"Bias (V)"', 'Fixed parameters': '"Sweep Start;Sweep End"',
+                  'Experiment parameters': '"X (m);Y (m);Z (m)"', '# Parameters (4 byte)': len(param_names),
+                  'Experiment size (bytes)': 4 * num_sweep * len(channels), 'Points': num_sweep,
+                  'Channels': '"' + ';'.join(channels) + '"', 'Delay before measuring (s)': 0,
+                  'Experiment': '"Grid Spectroscopy"', 'Start time': '"01.01.2020 10:00:00"',
+                  'End time': '"01.01.2020 11:00:00"', 'User': '', 'Comment': ''}
+        header_str = '\r\n'.join(['{}={}'.format(key, val) for key, val in header.items()])
+        header_str += '\r\n:HEADER_END:\r\n'
+        self.params = np.random.rand(nx, ny, len(param_names)).astype('>f4')
+        self.params[:, :, 0] = -1
+        self.params[:, :, 1] = 1
+        self.data = np.random.rand(nx, ny, len(channels), num_sweep).astype('>f4')
+        with open(file_path, 'wb') as file_handle:
+            file_handle.write(header_str.encode('utf-8'))
+            pixels = np.concatenate([self.params, self.data.reshape(nx, ny, -1)], axis=2)
+            file_handle.write(pixels.astype('>f4').tobytes())
+
+    def tearDown(self):
+        for path in [file_path, h5_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_grid_mmap(self):
+        grid = Grid(file_path, mmap=True)
+        grid_read = Grid(file_path)
+        for chan_ind, chan_name in enumerate(channels):
+            self.assertIsInstance(grid.signals[chan_name].base, np.memmap)
+            self.assertTrue(np.array_equal(grid.signals[chan_name], self.data[:, :, chan_ind]))
+            self.assertTrue(np.array_equal(grid.signals[chan_name], grid_read.signals[chan_name]))
+        self.assertTrue(np.array_equal(grid.signals['topo'], self.params[:, :, 4]))
+        self.assertTrue(np.allclose(grid.signals['sweep_signal'], np.linspace(-1, 1, num_sweep)))
+
+    def __check_translation(self, max_mem_mb, data_channels, expected_inds):
+        out_path = NanonisTranslatorCorrect(max_mem_mb=max_mem_mb).translate(file_path,
+                                                                              data_channels=data_channels)
+        self.assertEqual(out_path, os.path.abspath(h5_path))
+        with h5py.File(out_path, mode='r') as h5_f:
+            h5_meas = h5_f['Measurement_000']
+            self.assertEqual(len([key for key in h5_meas.keys() if key.startswith('Channel')]), len(expected_inds))
+            for ind, chan_ind in enumerate(expected_inds):
+                h5_raw = h5_meas['Channel_00{}/Raw_Data'.format(ind)]
+                self.assertEqual(h5_raw.dtype, np.float32)
+                self.assertTrue(np.array_equal(h5_raw[()], self.data[:, :, chan_ind].reshape(nx * ny, -1)))
+
+    def test_translate_all_channels(self):
+        self.__check_translation(1024, ['Current forward', 'Current backward', 'Z forward'], [0, 1, 2])
+
+    def test_translate_selected_channels(self):
+        self.__check_translation(2 * num_sweep * 4 * 2 / 1024 ** 2, ['Z forward', 'Current backward'], [2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
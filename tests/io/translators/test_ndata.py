@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Chris Smith
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import io
+import json
+import shutil
+import zipfile
+import h5py
+import numpy as np
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.ndata import NDataTranslator, _read_ndata_array, _get_ndata_nbytes
+
+folder_path = 'test_ndata'
+h5_path = 'test_ndata.h5'
+
+
+class TestNDataTranslator(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        self.data = [np.random.rand(3, 4, 6, 8).astype(np.float32) for _ in range(3)]
+        for ind, data in enumerate(self.data):
+            buff = io.BytesIO()
+            np.save(buff, data)
+            with zipfile.ZipFile(os.path.join(folder_path, 'scan_{}.ndata'.format(ind)), 'w') as this_zip:
+                this_zip.writestr('data.npy', buff.getvalue())
+                this_zip.writestr('metadata.json', json.dumps({'properties': {'index': ind}}))
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+        if os.path.exists(h5_path):
+            os.remove(h5_path)
+
+    def test_read_from_zip(self):
+        data = _read_ndata_array(os.path.join(folder_path, 'scan_0.ndata'))
+        self.assertTrue(np.array_equal(data, self.data[0]))
+        # Nothing is extracted to the working directory:
+        self.assertFalse(os.path.exists('data.npy'))
+
+    def test_decoded_size(self):
+        self.assertEqual(_get_ndata_nbytes(os.path.join(folder_path, 'scan_0.ndata')), self.data[0].nbytes)
+        npy_path = os.path.join(folder_path, 'scan.npy')
+        np.save(npy_path, self.data[1].astype(np.float64))
+        self.assertEqual(_get_ndata_nbytes(npy_path), 2 * self.data[1].nbytes)
+
+    def __check_translation(self, cores, bin_factor=None, max_mem_mb=1024):
+        translator = NDataTranslator(cores=cores, max_mem_mb=max_mem_mb)
+        translator.translate(h5_path, folder_path, bin_factor=bin_factor)
+        self.assertFalse(os.path.exists('data.npy') or os.path.exists('metadata.json'))
+        with h5py.File(h5_path, mode='r') as h5_f:
+            for meas_ind in range(len(self.data)):
+                h5_meas = h5_f['Measurement_00{}'.format(meas_ind)]
+                ind = h5_meas.attrs['properties-index']
+                expected = self.data[ind]
+                if bin_factor is not None:
+                    expected = expected.reshape(3, 4, 3, 2, 4, 2).mean(axis=(3, 5))
+                expected = expected.reshape(12, -1)
+                h5_chan = h5_meas['Channel_000']
+                self.assertTrue(np.allclose(h5_chan['Raw_Data'][()], expected))
+                self.assertTrue(np.allclose(h5_chan['Mean_Ronchigram'][()], expected.mean(axis=0)))
+                self.assertTrue(np.allclose(h5_chan['Mean_Spectrogram'][()], expected.mean(axis=1)))
+
+    def test_serial(self):
+        self.__check_translation(1)
+
+    def test_threads_binned(self):
+        self.__check_translation(2, bin_factor=2)
+
+    def test_memory_limited(self):
+        # Smaller than a single file. Files are still loaded one at a time:
+        self.__check_translation(2, max_mem_mb=1E-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import shutil
+import numpy as np
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.pifm import PiFMTranslator
+
+folder_path = 'test_pifm'
+x_len, y_len, num_pts = 5, 4, 7
+spec_scale, img_scale = 0.25, 1.5E-3
+
+
+class TestPiFMTranslator(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        self.parm_path = os.path.join(folder_path, 'scan.txt')
+        lines = [';ANFATEC Parameterfile', 'xPixel : {}'.format(x_len), 'yPixel : {}'.format(y_len),
+                 'XScanRange : 10', 'YScanRange : 8', 'xCenter : 0', 'yCenter : 0', 'XPhysUnit : um',
+                 'YPhysUnit : um',
+                 'FileDesc2Begin', 'FileName : Spectrogram.int', 'Caption : hyPIRFwd', 'BytesPerPixel : 28',
+                 'Scale : {}'.format(spec_scale), 'PhysUnit : V', 'Offset : 0', 'DataType : Spectrogram',
+                 'BytesPerReading : 4', 'FileNameWavelengths : SpectrogramWavelengths.txt',
+                 'PhysUnitWavelengths : 1/cm', 'FileDesc2End',
+                 'FileDescBegin', 'FileName : Topo.int', 'Caption : Topography', 'Scale : {}'.format(img_scale),
+                 'PhysUnit : nm', 'Offset : 0', 'FileDescEnd']
+        with open(self.parm_path, 'w') as file_handle:
+            file_handle.write('\n'.join(lines) + '\n')
+        np.savetxt(os.path.join(folder_path, 'SpectrogramWavelengths.txt'), np.linspace(800, 1800, num_pts))
+        # Files are written line (y) by line:
+        self.spec_raw = np.random.randint(-2 ** 20, 2 ** 20, size=(y_len, x_len, num_pts)).astype('i4')
+        self.spec_raw.tofile(os.path.join(folder_path, 'Spectrogram.int'))
+        self.img_raw = np.random.randint(-2 ** 20, 2 ** 20, size=(y_len, x_len)).astype('i4')
+        self.img_raw.tofile(os.path.join(folder_path, 'Topo.int'))
+        # Expected values as decoded by the original nested loops:
+        self.spectrogram = np.zeros((x_len, y_len, num_pts))
+        self.img = np.zeros((x_len, y_len))
+        for y in range(y_len):
+            for x in range(x_len):
+                self.spectrogram[x, y] = self.spec_raw[y, x] * spec_scale
+                self.img[x, y] = self.img_raw[y, x] * img_scale
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+
+    def test_read(self):
+        translator = PiFMTranslator()
+        translator.get_path(self.parm_path)
+        translator.read_anfatec_params()
+        translator.read_file_desc()
+        translator.read_spectrograms()
+        translator.read_imgs()
+        self.assertIsInstance(translator.raw_spectrograms['Spectrogram.int'].base, np.memmap)
+        # Scaled values, as before the raw readings were memory-mapped:
+        self.assertEqual(translator.spectrograms['Spectrogram.int'].dtype, np.float32)
+        self.assertTrue(np.allclose(translator.spectrograms['Spectrogram.int'], self.spectrogram))
+        spectrogram = translator.get_spectrogram('Spectrogram.int')
+        self.assertEqual(spectrogram.dtype, np.float32)
+        self.assertTrue(np.allclose(spectrogram, self.spectrogram))
+        self.assertTrue(np.allclose(translator.get_spectrogram('Spectrogram.int', slice(1, 3)),
+                                    self.spectrogram[1:3]))
+        self.assertEqual(translator.imgs['Topo.int'].dtype, np.float32)
+        self.assertTrue(np.allclose(translator.imgs['Topo.int'], self.img))
+
+    def test_set_spectrograms(self):
+        translator = PiFMTranslator(max_mem_mb=2 * y_len * num_pts * 8 / 1024 ** 2)
+        translator.get_path(self.parm_path)
+        translator.read_anfatec_params()
+        translator.read_file_desc()
+        translator.read_spectrograms()
+        translator.make_pos_vals_inds_dims()
+        # Assigned spectrograms are the ones that are written:
+        translator.spectrograms = {'Spectrogram.int': 2 * self.spectrogram}
+        self.assertTrue(np.allclose(translator.get_spectrogram('Spectrogram.int', slice(1, 3)),
+                                    2 * self.spectrogram[1:3]))
+        translator.create_hdf5_file()
+        try:
+            translator.write_spectrograms()
+            h5_raw = translator.h5_f['Measurement_000/Channel_000/Raw_Data']
+            self.assertTrue(np.allclose(h5_raw[()], 2 * self.spectrogram.reshape(-1, num_pts)))
+        finally:
+            translator.h5_f.close()
+
+    def __check_translation(self, max_mem_mb):
+        h5_f = PiFMTranslator(max_mem_mb=max_mem_mb).translate(self.parm_path)
+        try:
+            h5_raw = h5_f['Measurement_000/Channel_000/Raw_Data']
+            self.assertEqual(h5_raw.shape, (x_len * y_len, num_pts))
+            self.assertTrue(np.allclose(h5_raw[()], self.spectrogram.reshape(-1, num_pts)))
+            h5_img = h5_f['Measurement_000/Channel_001/Raw_Topography']
+            self.assertTrue(np.allclose(h5_img[()], self.img.reshape(-1, 1)))
+        finally:
+            h5_f.close()
+
+    def test_translate_single_batch(self):
+        self.__check_translation(1024)
+
+    def test_translate_many_batches(self):
+        self.__check_translation(2 * y_len * num_pts * 8 / 1024 ** 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import shutil
+from io import StringIO
+import h5py
+import numpy as np
+from scipy.io import savemat
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators import sporc
+from pycroscopy.io.translators.sporc import SporcTranslator
+from pycroscopy.io.chunking import plan_chunks
+
+folder_path = 'test_sporc'
+num_rows, num_cols, num_pts = 3, 5, 32
+missing = [(2, 4), (3, 1)]
+
+
+class TestSporcTranslator(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        self.parm_path = os.path.join(folder_path, 'parms.mat')
+        savemat(self.parm_path,
+                {'IOparms': {'sampRate': 1E+6, 'downSampRate': 1E+5, 'AO0_amp': 1},
+                 'aiChans': 1, 'numrows': num_rows, 'numcols': num_cols,
+                 'sporcParms': {'V_max': 10, 'N_steps': 4, 'N_reps': 2, 't_max': 0.1, 'f_cutoff': 1000,
+                                'f_rolloff': 100},
+                 'FORC_vec': np.random.rand(num_pts),
+                 'ind_vecs': np.random.rand(5, num_pts)})
+        self.expected = np.zeros((num_rows * num_cols, num_pts), dtype=np.float16)
+        for row_ind in range(1, num_rows + 1):
+            for col_ind in range(1, num_cols + 1):
+                if (row_ind, col_ind) in missing:
+                    continue
+                data = np.fft.fftshift(np.fft.fft(np.random.rand(num_pts)))
+                savemat(os.path.join(folder_path, 'result_r{}_c{}.mat'.format(row_ind, col_ind)), {'data': data})
+                self.expected[(row_ind - 1) * num_cols + col_ind - 1] = np.real(np.fft.ifft(np.fft.ifftshift(data)))
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+
+    def __check_translation(self, **kwargs):
+        h5_path = SporcTranslator(**kwargs).translate(self.parm_path)
+        self.assertEqual(h5_path, os.path.abspath(os.path.join(folder_path, folder_path + '.h5')))
+        with h5py.File(h5_path, mode='r') as h5_f:
+            h5_main = h5_f['Measurement_000/Channel_000/Raw_Data']
+            self.assertEqual(h5_main.dtype, np.float16)
+            self.assertEqual(h5_main.chunks, plan_chunks(self.expected.shape, np.float16, 'pixel',
+                                                         unit_chunks=(1, num_pts)).chunks)
+            self.assertTrue(np.array_equal(h5_main[()], self.expected))
+
+    def test_single_batch(self):
+        self.__check_translation()
+
+    def test_many_batches(self):
+        self.__check_translation(max_mem_mb=3 * num_pts * 2 / 1024 ** 2)
+
+    def test_parallel(self):
+        # Workers are capped at the number of logical cores, so call the helper directly:
+        file_paths = [os.path.join(folder_path, 'result_r2_c{}.mat'.format(col_ind))
+                      for col_ind in range(1, num_cols + 1)]
+        results = list(sporc.gen_ordered_results(sporc._read_sporc_pixels, [(file_paths[:2], num_pts),
+                                                                              (file_paths[2:], num_pts)],
+                                                 cores=2, use_processes=True))
+        self.assertTrue(np.array_equal(np.vstack([res[0] for res in results]), self.expected[num_cols: 2 * num_cols]))
+        self.assertEqual(np.hstack([res[1] for res in results]).tolist(), [True, True, True, False, True])
+
+    def test_missing_pixels_reported(self):
+        translator = SporcTranslator()
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            translator.translate(self.parm_path)
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        for row_ind, col_ind in missing:
+            self.assertIn('File for row {} col {} not found'.format(row_ind, col_ind), output)
+
+
+if __name__ == '__main__':
+    unittest.main()
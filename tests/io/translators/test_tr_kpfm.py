@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import shutil
+import h5py
+import numpy as np
+from scipy.io import savemat
+import sys
+sys.path.append("../../../pycroscopy/")
+
+from pycroscopy.io.translators.tr_kpfm import TRKPFMTranslator
+
+folder_path = 'test_trkpfm'
+num_rows, num_cols = 3, 4
+num_dc, num_time = 3, 4
+# Rows and columns in the spectrogram of each pixel:
+s1, s2 = num_time, 2 * num_dc
+data_length = s1 * s2 + 5
+
+
+def write_dat_file(file_path, spectrograms):
+    header = np.array([data_length, 0, 0, s1, s2], dtype=np.float32)
+    with open(file_path, 'wb') as file_handle:
+        for spectrogram in spectrograms:
+            header.tofile(file_handle)
+            spectrogram.astype(np.float32).tofile(file_handle)
+
+
+class TestTRKPFMTranslator(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.mkdir(folder_path)
+        self.parm_path = os.path.join(folder_path, 'trkpfm_parm.mat')
+        savemat(self.parm_path, {'IO_rate': 1E+6, 'IO_time': 0.1, 'dc_amp_vec': np.arange(2 * num_dc),
+                                 'num_rows': num_rows, 'num_cols': num_cols})
+        # Real and imaginary parts of the spectrograms of each harmonic:
+        self.expected = [[np.random.rand(num_rows * num_cols, s2, s1).astype(np.float32) for _ in range(2)]
+                         for _ in range(2)]
+
+    def tearDown(self):
+        shutil.rmtree(folder_path)
+
+    def __write_files(self, num_pixels):
+        for harm, parts in enumerate(self.expected):
+            for part_ind, spectrograms in enumerate(parts):
+                write_dat_file(os.path.join(folder_path, 'trkpfm_ch{:02d}.dat'.format(2 * harm + part_ind)),
+                               spectrograms[:num_pixels])
+
+    def __check_translation(self, max_mem_mb, num_pixels=num_rows * num_cols):
+        self.__write_files(num_pixels)
+        h5_path = TRKPFMTranslator(max_mem_mb=max_mem_mb).translate(self.parm_path)
+        with h5py.File(h5_path, mode='r') as h5_f:
+            for harm, (real, imag) in enumerate(self.expected):
+                h5_main = h5_f['Measurement_000/Channel_00{}/Raw_Data'.format(harm)]
+                self.assertEqual(h5_main.dtype, np.complex64)
+                expected = np.zeros(h5_main.shape, dtype=np.complex64)
+                expected[:num_pixels].real = real[:num_pixels].reshape(num_pixels, -1)
+                expected[:num_pixels].imag = imag[:num_pixels].reshape(num_pixels, -1)
+                self.assertTrue(np.array_equal(h5_main[()], expected))
+
+    def test_single_block(self):
+        self.__check_translation(1024)
+
+    def test_many_blocks(self):
+        self.__check_translation(5 * (data_length - 5) * 24 / 1024 ** 2)
+
+    def test_last_pixel_absent(self):
+        self.__check_translation(5 * (data_length - 5) * 24 / 1024 ** 2, num_pixels=num_rows * num_cols - 1)
+
+    def test_repeated_rows(self):
+        self.expected[0][1][2, 3] = self.expected[0][1][2, 1]
+        self.__write_files(num_rows * num_cols)
+        h5_path = TRKPFMTranslator().translate(self.parm_path)
+        with h5py.File(h5_path, mode='r') as h5_f:
+            imag = h5_f['Measurement_000/Channel_000/Raw_Data'][2].imag.reshape(s2, s1)
+            self.assertTrue(np.all(np.isnan(imag[3])))
+            self.assertTrue(np.array_equal(imag[1], self.expected[0][1][2, 1]))
+            self.assertEqual(np.isnan(imag).sum(), s1)
+
+    def test_rows_repeated_across_pixels(self):
+        # A stalled acquisition repeats rows of earlier pixels, in other blocks:
+        self.expected[1][0][9, 0] = self.expected[1][0][0, 4]
+        self.expected[1][0][10, 2] = self.expected[1][0][9, 0]
+        self.__write_files(num_rows * num_cols)
+        h5_path = TRKPFMTranslator(max_mem_mb=5 * (data_length - 5) * 24 / 1024 ** 2).translate(self.parm_path)
+        with h5py.File(h5_path, mode='r') as h5_f:
+            real = h5_f['Measurement_000/Channel_001/Raw_Data'][()].real.reshape(-1, s2, s1)
+            self.assertTrue(np.array_equal(real[0, 4], self.expected[1][0][0, 4]))
+            self.assertTrue(np.all(np.isnan(real[9, 0])))
+            self.assertTrue(np.all(np.isnan(real[10, 2])))
+            self.assertEqual(np.isnan(real).sum(), 2 * s1)
+
+    def test_read_file_blocks(self):
+        self.__write_files(num_rows * num_cols)
+        file_path = os.path.join(folder_path, 'trkpfm_ch00.dat')
+        with open(file_path, 'rb') as file_handle:
+            first = TRKPFMTranslator.read_file(data_length, file_handle, max_pixels=5)
+            rest = TRKPFMTranslator.read_file(data_length, file_handle)
+            self.assertTrue(file_handle.closed)
+        self.assertEqual((len(first), len(rest)), (5, num_rows * num_cols - 5))
+        self.assertTrue(np.array_equal(rest[0], self.expected[0][0][5].T))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import numpy as np
+
+import sys
+sys.path.append("../../../pycroscopy/")
+from pycroscopy.processing.fft import LowPassFilter, NoiseBandFilter, HarmonicPassFilter, BandPassFilter, \
+    build_composite_freq_filter, clear_filter_cache, set_filter_cache_size
+
+num_pts = 2 ** 12
+samp_rate = 1E+6
+
+
+class TestFilterCache(unittest.TestCase):
+
+    def setUp(self):
+        clear_filter_cache()
+        set_filter_cache_size(32)
+
+    def tearDown(self):
+        clear_filter_cache()
+        set_filter_cache_size(32)
+
+    def test_filters_shared(self):
+        for make_filter in [lambda: LowPassFilter(num_pts, samp_rate, 1E+5),
+                            lambda: NoiseBandFilter(num_pts, samp_rate, [2E+4, 3E+4], [1E+3, 2E+3]),
+                            lambda: HarmonicPassFilter(num_pts, samp_rate, 5E+4, 5E+3, 4),
+                            lambda: BandPassFilter(num_pts, samp_rate, 1E+5, 2E+4)]:
+            first = make_filter()
+            second = make_filter()
+            self.assertIs(first.value, second.value)
+            self.assertFalse(second.value.flags.writeable)
+
+    def test_different_parms(self):
+        first = LowPassFilter(num_pts, samp_rate, 1E+5)
+        second = LowPassFilter(num_pts, samp_rate, 1E+5, roll_off=0.1)
+        third = LowPassFilter(num_pts // 2, samp_rate, 1E+5)
+        self.assertFalse(np.array_equal(first.value, second.value))
+        self.assertEqual(third.value.size, num_pts // 2)
+
+    def test_fir_not_confused_with_boxcar(self):
+        boxcar = BandPassFilter(num_pts, samp_rate, 1E+5, 2E+4)
+        fir = BandPassFilter(num_pts, samp_rate, 1E+5, 2E+4, fir=True, fir_taps=199)
+        self.assertIsNot(boxcar.value, fir.value)
+        self.assertFalse(np.array_equal(boxcar.value, fir.value))
+
+    def test_composite(self):
+        filters = [LowPassFilter(num_pts, samp_rate, 1E+5), NoiseBandFilter(num_pts, samp_rate, [2E+4], [1E+3])]
+        comp_filter = build_composite_freq_filter(filters)
+        self.assertTrue(np.allclose(comp_filter, filters[0].value * filters[1].value))
+        self.assertFalse(comp_filter.flags.writeable)
+        self.assertIs(build_composite_freq_filter(filters), comp_filter)
+        # Components are not modified:
+        self.assertTrue(np.all(filters[1].value[filters[0].value == 0] >= 0))
+        single = build_composite_freq_filter(filters[0])
+        self.assertIsNot(single, filters[0].value)
+        self.assertTrue(np.allclose(single, filters[0].value))
+
+    def test_bounded(self):
+        set_filter_cache_size(2)
+        first = LowPassFilter(num_pts, samp_rate, 1E+5)
+        _ = LowPassFilter(num_pts, samp_rate, 2E+5)
+        _ = LowPassFilter(num_pts, samp_rate, 3E+5)
+        self.assertIsNot(LowPassFilter(num_pts, samp_rate, 1E+5).value, first.value)
+
+    def test_disabled(self):
+        set_filter_cache_size(0)
+        first = LowPassFilter(num_pts, samp_rate, 1E+5)
+        self.assertIsNot(LowPassFilter(num_pts, samp_rate, 1E+5).value, first.value)
+        self.assertFalse(first.value.flags.writeable)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Suhas Somnath
+"""
+
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd  # Python 2
+import h5py
+import numpy as np
+
+import sys
+sys.path.append("../../../pycroscopy/")
+from pycroscopy.processing.gmode_utils import decompress_response, decompress_response_batch, \
+    reshape_from_lines_to_pixels
+from pyUSID import USIDataset
+from pyUSID.io.hdf_utils import write_main_dataset
+from pyUSID.io.write_utils import Dimension
+
+
+class TestDecompressResponse(unittest.TestCase):
+
+    def setUp(self):
+        self.num_pts = 128
+        self.num_pos = 7
+        self.time_resp = np.random.rand(self.num_pos, self.num_pts)
+        f_resp = np.fft.fftshift(np.fft.fft(self.time_resp, axis=1), axes=1)
+        comp_filter = np.zeros(self.num_pts)
+        comp_filter[self.num_pts // 2 - 12: self.num_pts // 2 + 13] = 1
+        hot_inds = np.where(comp_filter > 0)[0]
+        # Same as SignalFilter - only keep the positive half of the frequencies:
+        self.hot_inds = np.uint(hot_inds[int(0.5 * len(hot_inds)):])
+        self.f_condensed = f_resp[:, self.hot_inds]
+        self.expected = np.real(np.fft.ifft(np.fft.ifftshift(f_resp * comp_filter, axes=1), axis=1))
+
+    @staticmethod
+    def __delete_existing_file(file_path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def test_single_position(self):
+        time_resp = decompress_response(self.f_condensed[0], self.num_pts, self.hot_inds)
+        self.assertEqual(time_resp.shape, (self.num_pts,))
+        self.assertTrue(np.allclose(time_resp, self.expected[0], atol=1E-5))
+
+    def test_batch_numpy(self):
+        time_resp = decompress_response_batch(self.f_condensed, self.num_pts, self.hot_inds, block_size=3)
+        self.assertEqual(time_resp.dtype, np.float32)
+        self.assertTrue(np.allclose(time_resp, self.expected, atol=1E-5))
+
+    def test_batch_h5_target(self):
+        file_path = 'test_decompress.h5'
+        self.__delete_existing_file(file_path)
+        with h5py.File(file_path, mode='w') as h5_f:
+            h5_cond = h5_f.create_dataset('Condensed_Data', data=self.f_condensed)
+            h5_target = h5_f.create_dataset('Decompressed', shape=self.expected.shape, dtype=np.float32,
+                                            chunks=(2, self.num_pts))
+            ret_val = decompress_response_batch(h5_cond, self.num_pts, self.hot_inds, h5_target=h5_target)
+            self.assertEqual(ret_val, h5_target)
+            self.assertTrue(np.allclose(h5_target[()], self.expected, atol=1E-5))
+        os.remove(file_path)
+
+    def test_batch_negative_freqs(self):
+        with self.assertRaises(ValueError):
+            _ = decompress_response_batch(self.f_condensed, self.num_pts, self.hot_inds - 20)
+
+    def test_batch_real_data(self):
+        with self.assertRaises(TypeError):
+            _ = decompress_response_batch(np.abs(self.f_condensed), self.num_pts, self.hot_inds)
+
+
+class TestReshapeFromLinesToPixels(unittest.TestCase):
+
+    @staticmethod
+    def __delete_existing_file(file_path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def __write_line_data(self, h5_f, spec_dims, pos_dims, main_shape):
+        self.line_data = np.random.rand(*main_shape).astype(np.float32)
+        h5_grp = h5_f.create_group('Measurement_000/Channel_000')
+        return write_main_dataset(h5_grp, self.line_data, 'Raw_Data', 'Deflection', 'V', pos_dims, spec_dims,
+                                  chunks=(1, main_shape[1]))
+
+    def test_single_spec_dim(self):
+        file_path = 'test_reshape.h5'
+        self.__delete_existing_file(file_path)
+        num_rows, num_cols, pts_per_cycle = 13, 7, 16
+        wave = np.sin(np.linspace(0, 2 * np.pi, pts_per_cycle))
+        progress = []
+        with h5py.File(file_path, mode='w') as h5_f:
+            h5_main = self.__write_line_data(h5_f, Dimension('Excitation', 'V', np.tile(wave, num_cols)),
+                                             Dimension('Y', 'm', np.arange(num_rows)),
+                                             (num_rows, num_cols * pts_per_cycle))
+            h5_resh = reshape_from_lines_to_pixels(h5_main, pts_per_cycle, scan_step_x_m=1E-6, max_mem_mb=1E-4,
+                                                   progress_callback=lambda done, tot: progress.append(done))
+            self.assertIsInstance(h5_resh, USIDataset)
+            self.assertTrue(np.allclose(h5_resh[()], self.line_data.reshape(-1, pts_per_cycle)))
+            self.assertEqual(sorted(h5_resh.pos_dim_labels), ['X', 'Y'])
+            self.assertEqual(h5_resh.spec_dim_labels, ['Excitation'])
+            self.assertTrue(np.allclose(h5_resh.get_spec_values('Excitation'), wave))
+            self.assertTrue(np.allclose(h5_resh.get_pos_values('Y'), np.arange(num_rows)))
+            # Reshaped pixels are chunked for per-pixel access:
+            self.assertEqual(h5_resh.chunks[1], pts_per_cycle)
+            # Blocks must be whole chunks of the reshaped dataset:
+            chunk_lines = h5_resh.chunks[0] // gcd(h5_resh.chunks[0], num_cols)
+            self.assertEqual(progress[-1], num_rows)
+            for done in progress[:-1]:
+                self.assertEqual(done % chunk_lines, 0)
+        os.remove(file_path)
+
+    def test_multi_dims(self):
+        file_path = 'test_reshape.h5'
+        self.__delete_existing_file(file_path)
+        num_rows, num_reps, num_cols, num_bias, num_cycles = 3, 2, 5, 6, 2
+        bias = np.linspace(-1, 1, num_bias)
+        spec_dims = [Dimension('Bias', 'V', bias), Dimension('Cycle', '', num_cycles),
+                     Dimension('Column', '', num_cols)]
+        pos_dims = [Dimension('Y', 'm', np.arange(num_rows)), Dimension('Repeat', '', num_reps)]
+        with h5py.File(file_path, mode='w') as h5_f:
+            h5_main = self.__write_line_data(h5_f, spec_dims, pos_dims,
+                                             (num_rows * num_reps, num_cols * num_bias * num_cycles))
+            h5_resh = reshape_from_lines_to_pixels(h5_main, num_bias * num_cycles)
+            self.assertTrue(np.allclose(h5_resh[()], self.line_data.reshape(-1, num_bias * num_cycles)))
+            self.assertEqual(sorted(h5_resh.pos_dim_labels), ['Repeat', 'X', 'Y'])
+            self.assertEqual(sorted(h5_resh.spec_dim_labels), ['Bias', 'Cycle'])
+            self.assertTrue(np.allclose(h5_resh.get_spec_values('Bias'), bias))
+        os.remove(file_path)
+
+    def test_invalid_pts_per_cycle(self):
+        file_path = 'test_reshape.h5'
+        self.__delete_existing_file(file_path)
+        with h5py.File(file_path, mode='w') as h5_f:
+            h5_main = self.__write_line_data(h5_f, Dimension('Excitation', 'V', 12), Dimension('Y', 'm', 3), (3, 12))
+            with self.assertRaises(ValueError):
+                _ = reshape_from_lines_to_pixels(h5_main, 5)
+        os.remove(file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
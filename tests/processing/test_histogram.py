@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Chris Smith
+"""
+
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import h5py
+import numpy as np
+
+import sys
+sys.path.append("../../../pycroscopy/")
+from pycroscopy.processing.histogram import build_histogram, build_histograms_2d, get_response_range, \
+    _get_rows_per_chunk
+
+num_pos, num_cols = 37, 24
+num_x_bins, num_y_bins = 6, 11
+
+
+class TestHistograms(unittest.TestCase):
+
+    def setUp(self):
+        self.data = (np.random.randn(num_pos, num_cols) + 1j * np.random.randn(num_pos, num_cols)).astype(np.complex64)
+        self.col_inds = np.arange(2, num_cols, 3)
+        self.x_bins = np.arange(self.col_inds.size) % num_x_bins
+        self.funcs = [np.abs, np.angle, np.real]
+        self.min_vals = [0.1, -np.pi, -1.5]
+        self.max_vals = [2.0, np.pi, 1.5]
+
+    @staticmethod
+    def __delete_existing_file(file_path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def __get_expected(self):
+        x_hist = np.tile(self.x_bins, num_pos)
+        expected = list()
+        for func, min_val, max_val in zip(self.funcs, self.min_vals, self.max_vals):
+            expected.append(build_histogram(x_hist, self.data[:, self.col_inds], num_x_bins, num_y_bins,
+                                            min_resp=min_val, max_resp=max_val, func=func))
+        return np.array(expected)
+
+    def test_build_histogram(self):
+        x_hist = np.tile(self.x_bins, num_pos)
+        y_vals = np.abs(self.data[:, self.col_inds]).ravel()
+        y_bins = np.rint((np.clip(y_vals, 0.1, 2.0) - 0.1) / 1.9 * (num_y_bins - 1)).astype(int)
+        expected = np.zeros((num_x_bins, num_y_bins))
+        np.add.at(expected, (x_hist, y_bins), 1)
+        hist = build_histogram(x_hist, self.data[:, self.col_inds], num_x_bins, num_y_bins, min_resp=0.1,
+                               max_resp=2.0, func=np.abs)
+        self.assertEqual(hist.dtype, np.int32)
+        self.assertTrue(np.all(hist == expected))
+
+    def test_numpy_threads(self):
+        hist = build_histograms_2d(self.data, self.x_bins, num_x_bins, num_y_bins, self.funcs, self.min_vals,
+                                   self.max_vals, col_inds=self.col_inds, max_mem_mb=1E-3, cores=3)
+        self.assertEqual(hist.shape, (len(self.funcs), num_x_bins, num_y_bins))
+        self.assertTrue(np.all(hist == self.__get_expected()))
+        self.assertTrue(np.all(hist.sum(axis=(1, 2)) == num_pos * self.col_inds.size))
+
+    def test_h5_single_thread(self):
+        file_path = 'test_histogram.h5'
+        self.__delete_existing_file(file_path)
+        with h5py.File(file_path, mode='w') as h5_f:
+            h5_main = h5_f.create_dataset('Raw_Data', data=self.data, chunks=(4, num_cols))
+            hist = build_histograms_2d(h5_main, self.x_bins, num_x_bins, num_y_bins, self.funcs, self.min_vals,
+                                       self.max_vals, col_inds=self.col_inds, max_mem_mb=1E-3, cores=1)
+            self.assertTrue(np.all(hist == self.__get_expected()))
+        os.remove(file_path)
+
+    def test_invalid_x_bins(self):
+        with self.assertRaises(ValueError):
+            _ = build_histograms_2d(self.data, self.x_bins + num_x_bins, num_x_bins, num_y_bins, self.funcs,
+                                    self.min_vals, self.max_vals, col_inds=self.col_inds)
+        with self.assertRaises(ValueError):
+            _ = build_histograms_2d(self.data, self.x_bins[1:], num_x_bins, num_y_bins, self.funcs,
+                                    self.min_vals, self.max_vals, col_inds=self.col_inds)
+
+    def test_response_range(self):
+        max_resp, min_resp = get_response_range(self.data, max_mem_mb=1E-3, cores=2)
+        self.assertTrue(np.allclose(max_resp, np.max(np.abs(self.data), axis=1)))
+        self.assertTrue(np.allclose(min_resp, np.min(np.abs(self.data), axis=1)))
+        max_resp, _ = get_response_range(self.data, func=np.real, col_inds=self.col_inds)
+        self.assertTrue(np.allclose(max_resp, np.max(np.real(self.data[:, self.col_inds]), axis=1)))
+        # Extrema of each column over all rows:
+        max_resp, min_resp = get_response_range(self.data, max_mem_mb=1E-3, cores=2, axis=0)
+        self.assertTrue(np.allclose(max_resp, np.max(np.abs(self.data), axis=0)))
+        self.assertTrue(np.allclose(min_resp, np.min(np.abs(self.data), axis=0)))
+        with self.assertRaises(ValueError):
+            _ = get_response_range(self.data, axis=2)
+
+    def test_rows_per_chunk_interleaved(self):
+        # Every other column, as for in-field / out-of-field steps, still reads the whole slab of columns:
+        data = np.zeros((4096, 1000), dtype=np.float32)
+        col_inds = np.arange(0, 1000, 2)
+        rows = _get_rows_per_chunk(data, col_inds, 1, max_mem_mb=1)
+        self.assertLessEqual(rows * (col_inds[-1] - col_inds[0] + 1) * data.itemsize, 1024 ** 2)
+        self.assertLess(rows, _get_rows_per_chunk(data, None, 1, max_mem_mb=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Chris Smith
+"""
+
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import numpy as np
+
+import sys
+sys.path.append("../../../pycroscopy/")
+from pycroscopy.processing.image_processing import ImageWindow, get_window_views, gen_window_batches, \
+    gen_window_grid_batches, get_window_counts, overlap_add_windows, radial_profile, radially_average_correlation, \
+    _get_radial_bins
+
+im_x, im_y = 23, 17
+win_x, win_y = 5, 4
+win_step_x, win_step_y = 2, 3
+
+
+class TestWindowing(unittest.TestCase):
+
+    def setUp(self):
+        self.image = np.random.rand(im_x, im_y).astype(np.float32)
+        x_steps = np.arange(0, im_x - win_x + 1, win_step_x)
+        y_steps = np.arange(0, im_y - win_y + 1, win_step_y)
+        # Same order as the window origins in ImageWindow._get_window_pos_spec:
+        self.win_pos = np.array([np.repeat(x_steps, len(y_steps)), np.tile(y_steps, len(x_steps))]).T
+        self.expected = np.array([self.image[x: x + win_x, y: y + win_y] for x, y in self.win_pos])
+
+    def test_window_views(self):
+        windows = get_window_views(self.image, win_x, win_y, win_step_x, win_step_y)
+        self.assertTrue(np.shares_memory(windows, self.image))
+        self.assertTrue(np.allclose(windows.reshape(-1, win_x, win_y), self.expected))
+
+    def test_window_views_too_large(self):
+        with self.assertRaises(ValueError):
+            _ = get_window_views(self.image, im_x + 1, win_y)
+
+    def __check_batches(self, batch_size):
+        windows = get_window_views(self.image, win_x, win_y, win_step_x, win_step_y)
+        covered = np.zeros(self.expected.shape[0], dtype=np.uint32)
+        for batch, batch_wins in gen_window_batches(windows, batch_size):
+            self.assertLessEqual(batch_wins.shape[0], batch_size)
+            self.assertTrue(np.allclose(batch_wins, self.expected[batch]))
+            covered[batch] += 1
+        self.assertTrue(np.all(covered == 1))
+
+    def test_batches_of_rows(self):
+        self.__check_batches(13)
+
+    def test_batches_within_rows(self):
+        self.__check_batches(2)
+
+    def test_batched_fft_funcs(self):
+        for func in [ImageWindow.win_data_func, ImageWindow.abs_fft_func, ImageWindow.win_abs_fft_func,
+                     ImageWindow.win_comp_fft_func]:
+            batch_out = func(self.expected)
+            for win, win_out in zip(self.expected, batch_out):
+                single_out = func(win)
+                for name in single_out.dtype.names:
+                    self.assertTrue(np.allclose(win_out[name], single_out[name], atol=1E-5))
+
+
+class TestOverlapAdd(unittest.TestCase):
+
+    def setUp(self):
+        x_steps = np.arange(0, im_x - win_x + 1, win_step_x)
+        y_steps = np.arange(0, im_y - win_y + 1, win_step_y)
+        self.nx, self.ny = len(x_steps), len(y_steps)
+        self.win_pos = np.array([np.repeat(x_steps, self.ny), np.tile(y_steps, self.nx)]).T
+        self.windows = np.random.rand(self.nx * self.ny, win_x, win_y)
+        self.accum = np.zeros([im_x, im_y])
+        self.counts = np.zeros([im_x, im_y])
+        for (x, y), win in zip(self.win_pos, self.windows):
+            self.accum[x: x + win_x, y: y + win_y] += win
+            self.counts[x: x + win_x, y: y + win_y] += 1
+
+    def test_window_counts(self):
+        counts = get_window_counts([im_x, im_y], win_x, win_y, win_step_x, win_step_y)
+        self.assertEqual(counts.dtype, np.uint32)
+        self.assertTrue(np.all(counts == self.counts))
+
+    def test_window_counts_no_overflow(self):
+        counts = get_window_counts([300, 300], 20, 20)
+        self.assertEqual(counts.max(), 400)
+
+    def __check_overlap_add(self, batch_size):
+        accum = np.zeros([im_x, im_y])
+        for batch, rows, cols in gen_window_grid_batches(self.nx, self.ny, batch_size):
+            batch_wins = self.windows[batch].reshape(rows.stop - rows.start, cols.stop - cols.start, win_x, win_y)
+            overlap_add_windows(accum, batch_wins, rows.start, cols.start, win_step_x, win_step_y)
+        self.assertTrue(np.allclose(accum, self.accum))
+
+    def test_overlap_add_rows(self):
+        self.__check_overlap_add(15)
+
+    def test_overlap_add_within_rows(self):
+        self.__check_overlap_add(3)
+
+    def test_overlap_add_components(self):
+        num_comps = 3
+        windows = np.random.rand(self.nx, self.ny, win_x, win_y, num_comps)
+        accum = np.zeros([im_x, im_y, num_comps])
+        overlap_add_windows(accum, windows, 0, 0, win_step_x, win_step_y)
+        for comp in range(num_comps):
+            expected = np.zeros([im_x, im_y])
+            overlap_add_windows(expected, windows[..., comp], 0, 0, win_step_x, win_step_y)
+            self.assertTrue(np.allclose(accum[..., comp], expected))
+
+
+class TestRadialProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.image = np.random.rand(im_x, im_y)
+
+    def __check_profile(self, num_bins, bin_width, normalized):
+        if normalized:
+            axes = [np.linspace(-1, 1, num_pix) for num_pix in self.image.shape]
+        else:
+            axes = [np.arange(-num_pix / 2, num_pix / 2) for num_pix in self.image.shape]
+        x_mesh, y_mesh = np.meshgrid(*axes, indexing='ij')
+        r_bins = np.floor(np.sqrt(x_mesh ** 2 + y_mesh ** 2) / bin_width)
+
+        avg, max_vec, min_vec, std = radial_profile(self.image, num_bins, bin_width, normalized=normalized)
+        for ind in range(num_bins):
+            ring = self.image[r_bins == ind]
+            if ring.size == 0:
+                self.assertTrue(np.isnan(avg[ind]))
+                continue
+            self.assertAlmostEqual(avg[ind], np.mean(ring))
+            self.assertAlmostEqual(std[ind], np.std(ring))
+            self.assertEqual(max_vec[ind], np.max(ring))
+            self.assertEqual(min_vec[ind], np.min(ring))
+
+    def test_normalized(self):
+        self.__check_profile(8, 1 / 7.0, True)
+
+    def test_pixels(self):
+        self.__check_profile(5, 1.5, False)
+
+    def test_bins_cached(self):
+        _get_radial_bins.cache_clear()
+        _ = radial_profile(self.image, 5, 1.5)
+        _ = radial_profile(np.random.rand(im_x, im_y), 5, 1.5)
+        self.assertEqual(_get_radial_bins.cache_info().hits, 1)
+        bin_inds = _get_radial_bins(self.image.shape, 5, 1.5, False)[0]
+        self.assertFalse(bin_inds.flags.writeable)
+
+    def test_radially_average_correlation(self):
+        a_mat, a_avg, a_max, a_min, a_std = radially_average_correlation(self.image, 10)
+        self.assertEqual(a_mat.shape, self.image.shape)
+        for vec in [a_avg, a_max, a_min, a_std]:
+            self.assertEqual(vec.shape, (10,))
+        self.assertTrue(np.all(a_min[~np.isnan(a_min)] <= a_max[~np.isnan(a_max)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import numpy as np
+from scipy.cluster.hierarchy import linkage
+
+import sys
+sys.path.append("../../../pycroscopy/")
+from pycroscopy.processing.tree import Node, ClusterTree
+
+num_clusters, num_pos, num_pts = 9, 200, 5
+
+
+class TestClusterTree(unittest.TestCase):
+
+    def setUp(self):
+        self.labels = np.random.randint(0, num_clusters, size=num_pos)
+        self.labels[:num_clusters] = np.arange(num_clusters)
+        self.centroids = np.random.rand(num_clusters, num_pts)
+        pairing = linkage(self.centroids, 'weighted')
+        self.linkage = pairing[:, :2]
+        self.distances = pairing[:, 2]
+        self.tree = ClusterTree(self.linkage, self.labels, distances=self.distances, centroids=self.centroids)
+        self.expected = self.__build_node_tree()
+
+    def __build_node_tree(self):
+        # Tree of standalone Node objects
+        nodes = [Node(ind, value=self.centroids[ind], labels=np.where(self.labels == ind)[0])
+                 for ind in range(num_clusters)]
+        for row, pair in enumerate(self.linkage):
+            node = Node(row + num_clusters, children=[nodes[int(ind)] for ind in pair], compute_mean=True)
+            node.dist = self.distances[row]
+            nodes.append(node)
+        return nodes
+
+    def test_nodes_match(self):
+        self.assertEqual(len(self.tree.nodes), len(self.expected))
+        for node, expected in zip(self.tree.nodes, self.expected):
+            self.assertIsInstance(node, Node)
+            self.assertEqual(node.name, expected.name)
+            self.assertTrue(np.array_equal(node.labels, expected.labels))
+            self.assertTrue(np.allclose(node.value, expected.value))
+            self.assertEqual(node.level, expected.level)
+            self.assertEqual(node.num_nodes, expected.num_nodes)
+            self.assertEqual(node.dist, expected.dist)
+            self.assertEqual([child.name for child in node.children], [child.name for child in expected.children])
+            if expected.parent is None:
+                self.assertIsNone(node.parent)
+            else:
+                self.assertEqual(node.parent.name, expected.parent.name)
+        self.assertEqual(self.tree.tree.name, len(self.expected) - 1)
+        self.assertEqual(self.tree.tree.labels.size, num_pos)
+
+    def test_traversal_order(self):
+        order = []
+
+        def _visit(node):
+            order.append(node.name)
+            for child in node.children:
+                _visit(child)
+
+        _visit(self.expected[-1])
+        self.assertEqual(list(self.tree.get_traversal_order()), order)
+
+    def test_leaves(self):
+        for node in range(len(self.expected)):
+            leaves = self.tree.get_leaves(node)
+            self.assertEqual(leaves.size, self.expected[node].num_nodes)
+            self.assertTrue(np.array_equal(np.sort(self.labels[self.tree.get_labels(node)]),
+                                           np.sort(self.labels[np.in1d(self.labels, leaves)])))
+
+    def test_no_centroids(self):
+        tree = ClusterTree(self.linkage, self.labels)
+        self.assertIsNone(tree.tree.value)
+        self.assertEqual(tree.tree.dist, 0)
+
+    def test_invalid_linkage(self):
+        with self.assertRaises(ValueError):
+            _ = ClusterTree(np.array([[0, 1], [0, 2]]), [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+@author: Suhas Somnath
+"""
+from __future__ import division, print_function, unicode_literals, absolute_import
+import unittest
+import os
+import subprocess
+import sys
+
+sys.path.append("../pycroscopy/")
+from pycroscopy.lazy_loader import is_lazy
+
+repo_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def get_imported_modules(statement):
+    """
+    Returns the names of all modules imported by executing the statement in a fresh interpreter
+    """
+    script = statement + '\nimport sys\nprint("\\n".join(sys.modules.keys()))'
+    output = subprocess.check_output([sys.executable, '-c', script], cwd=repo_path)
+    return set(output.decode('utf-8').split())
+
+
+@unittest.skipUnless(is_lazy, 'Lazy imports require python 3.7 or newer')
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_pycroscopy(self):
+        modules = get_imported_modules('import pycroscopy')
+        for heavy in ['matplotlib', 'sklearn', 'pyUSID', 'pycroscopy.io.translators']:
+            self.assertNotIn(heavy, modules)
+
+    def test_import_translators(self):
+        modules = get_imported_modules('import pycroscopy.io.translators')
+        self.assertNotIn('matplotlib', modules)
+        self.assertNotIn('pycroscopy.io.translators.be_odf', modules)
+
+    def test_only_requested_translator(self):
+        modules = get_imported_modules('from pycroscopy.io.translators import IgorIBWTranslator')
+        trans_modules = [name for name in modules if name.startswith('pycroscopy.io.translators.')]
+        self.assertEqual(trans_modules, ['pycroscopy.io.translators.igor_ibw'])
+        self.assertNotIn('sklearn', modules)
+
+
+class TestPublicNames(unittest.TestCase):
+
+    def test_translators(self):
+        import pycroscopy as px
+        from pycroscopy.io import translators
+        for name in translators.__all__:
+            self.assertIs(getattr(px.io, name), getattr(translators, name))
+        self.assertEqual(len(translators.all_translators), 22)
+        self.assertIs(translators.all_translators[0], translators.BEodfTranslator)
+        self.assertIn('all_translators', dir(translators))
+        self.assertIs(px.translators, translators)
+        self.assertIs(px.ImageTranslator, translators.image.ImageTranslator)
+
+    def test_processing_and_analysis(self):
+        import pycroscopy as px
+        for pkg in [px.processing, px.analysis, px.viz]:
+            for name in pkg.__all__:
+                self.assertTrue(hasattr(pkg, name))
+                self.assertIn(name, dir(pkg))
+        self.assertIs(px.processing.ClusterTree, px.processing.tree.ClusterTree)
+        self.assertIs(px.analysis.be_sho, px.analysis.utils.be_sho)
+
+    def test_missing_name(self):
+        import pycroscopy as px
+        with self.assertRaises(AttributeError):
+            _ = px.processing.not_a_module
+        with self.assertRaises(ImportError):
+            from pycroscopy.io.translators import NotATranslator
+
+
+if __name__ == '__main__':
+    unittest.main()